@@ -3,9 +3,17 @@
 Re-exports:
     - BaseAgent: abstract base for all agents
     - BaseAgentConfig: base model for agent configuration
+    - AgentRegistry, AdapterSpec, agent_registry: adapter lookup by agent type
 """
 
 from .base import BaseAgent
 from .model import BaseAgentConfig
+from .registry import AdapterSpec, AgentRegistry, agent_registry
 
-__all__ = ["BaseAgent", "BaseAgentConfig"]
+__all__ = [
+    "AdapterSpec",
+    "AgentRegistry",
+    "BaseAgent",
+    "BaseAgentConfig",
+    "agent_registry",
+]
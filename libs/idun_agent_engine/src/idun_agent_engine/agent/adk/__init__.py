@@ -0,0 +1,7 @@
+"""Google ADK agent package."""
+
+from .adk import AdkAgent
+from .adk_model import AdkAgentConfig
+from .session_store import SqliteSessionService
+
+__all__ = ["AdkAgent", "AdkAgentConfig", "SqliteSessionService"]
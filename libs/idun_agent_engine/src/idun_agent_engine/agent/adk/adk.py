@@ -0,0 +1,461 @@
+"""Google ADK agent adapter.
+
+Runs an ADK agent with a `Runner` and relays its events as ag-ui events as the
+runner yields them: with `streaming` on, the model's partial responses become
+text message deltas while it is still generating. Sessions are kept by an ADK
+session service, in memory or in the engine's SQLite database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+from ag_ui.core import events as ag_events
+from google.adk.agents import BaseAgent as AdkBaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.genai import types
+
+from idun_agent_engine.agent.base import BaseAgent
+from idun_agent_engine.agent.sources import source_fingerprint
+from idun_agent_engine.debug import slow_runs
+from idun_agent_engine.log import log_context
+from idun_agent_engine.observability.tracing import engine_tracer
+
+from .adk_model import AdkAgentConfig
+from .session_store import SqliteSessionService
+
+logger = logging.getLogger(__name__)
+
+
+def _text(event: Any) -> str:
+    """Text of an event's parts, leaving out the model's thoughts."""
+    parts = event.content.parts if event.content and event.content.parts else []
+    return "".join(p.text for p in parts if p.text and not p.thought)
+
+
+class _EventTranslator:
+    """Translates the events of one ADK run into ag-ui events."""
+
+    def __init__(self) -> None:
+        self._author: str | None = None
+        self._message_id: str | None = None
+        self.final_text = ""
+
+    def _step(self, author: str) -> list[Any]:
+        if author == self._author:
+            return []
+        events = self.close()
+        if self._author is not None:
+            events.append(
+                ag_events.StepFinishedEvent(
+                    type=ag_events.EventType.STEP_FINISHED, step_name=self._author
+                )
+            )
+        self._author = author
+        events.append(
+            ag_events.StepStartedEvent(
+                type=ag_events.EventType.STEP_STARTED, step_name=author
+            )
+        )
+        return events
+
+    def _content(self, text: str) -> list[Any]:
+        events: list[Any] = []
+        if self._message_id is None:
+            self._message_id = f"msg_{uuid.uuid4()}"
+            events.append(
+                ag_events.TextMessageStartEvent(
+                    type=ag_events.EventType.TEXT_MESSAGE_START,
+                    message_id=self._message_id,
+                    role="assistant",
+                )
+            )
+        events.append(
+            ag_events.TextMessageContentEvent(
+                type=ag_events.EventType.TEXT_MESSAGE_CONTENT,
+                message_id=self._message_id,
+                delta=text,
+            )
+        )
+        return events
+
+    def close(self) -> list[Any]:
+        """End the message being streamed, if any."""
+        if self._message_id is None:
+            return []
+        message_id, self._message_id = self._message_id, None
+        return [
+            ag_events.TextMessageEndEvent(
+                type=ag_events.EventType.TEXT_MESSAGE_END, message_id=message_id
+            )
+        ]
+
+    def translate(self, event: Any) -> list[Any]:
+        """The ag-ui events for one ADK event."""
+        events = self._step(event.author)
+        text = _text(event)
+        if event.partial:
+            if text:
+                events += self._content(text)
+            return events
+
+        # The complete response repeats the partial ones it follows
+        streamed = self._message_id is not None
+        if text and not streamed:
+            events += self._content(text)
+        events += self.close()
+        if text and event.is_final_response():
+            self.final_text = text
+
+        for call in event.get_function_calls():
+            tool_call_id = call.id or f"call_{uuid.uuid4()}"
+            events.append(
+                ag_events.ToolCallStartEvent(
+                    type=ag_events.EventType.TOOL_CALL_START,
+                    tool_call_id=tool_call_id,
+                    tool_call_name=call.name or "",
+                )
+            )
+            if call.args:
+                events.append(
+                    ag_events.ToolCallArgsEvent(
+                        type=ag_events.EventType.TOOL_CALL_ARGS,
+                        tool_call_id=tool_call_id,
+                        delta=json.dumps(call.args, default=str),
+                    )
+                )
+            events.append(
+                ag_events.ToolCallEndEvent(
+                    type=ag_events.EventType.TOOL_CALL_END, tool_call_id=tool_call_id
+                )
+            )
+        for response in event.get_function_responses():
+            events.append(
+                ag_events.ToolCallResultEvent(
+                    type=ag_events.EventType.TOOL_CALL_RESULT,
+                    message_id=f"msg_{uuid.uuid4()}",
+                    tool_call_id=response.id or "",
+                    content=json.dumps(response.response, default=str),
+                    role="tool",
+                )
+            )
+        return events
+
+    def finish(self) -> list[Any]:
+        """Close the message and step still open at the end of the run."""
+        events = self.close()
+        if self._author is not None:
+            events.append(
+                ag_events.StepFinishedEvent(
+                    type=ag_events.EventType.STEP_FINISHED, step_name=self._author
+                )
+            )
+            self._author = None
+        return events
+
+
+class AdkAgent(BaseAgent[AdkAgentConfig]):
+    """Google ADK agent adapter streaming the runner's events natively."""
+
+    config_model = AdkAgentConfig
+
+    def __init__(self) -> None:
+        """Initialize an unconfigured AdkAgent."""
+        self._id = str(uuid.uuid4())
+        self._configuration: AdkAgentConfig | None = None  # type: ignore[assignment]
+        self._name = "Unnamed ADK Agent"
+        self._agent: AdkBaseAgent | None = None
+        self._runner: Runner | None = None
+        self._sessions: BaseSessionService | None = None
+        self._connection: aiosqlite.Connection | None = None
+        self._app_name = ""
+        self._fingerprint: str | None = None
+        self._infos: dict[str, Any] = {
+            "status": "Uninitialized",
+            "name": self._name,
+            "id": self._id,
+        }
+
+    @property
+    def id(self) -> str:
+        """Return unique identifier for this agent instance."""
+        return self._id
+
+    @property
+    def agent_type(self) -> str:
+        """Return agent type label."""
+        return "ADK"
+
+    @property
+    def name(self) -> str:
+        """Return configured human-readable agent name."""
+        return self._name
+
+    @property
+    def agent_instance(self) -> AdkBaseAgent:
+        """Return the root ADK agent.
+
+        Raises:
+            RuntimeError: If the agent is not yet initialized.
+        """
+        if self._agent is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        return self._agent
+
+    @property
+    def configuration(self) -> AdkAgentConfig:
+        """Return validated configuration.
+
+        Raises:
+            RuntimeError: If the agent has not been configured yet.
+        """
+        if not self._configuration:
+            raise RuntimeError("Agent not configured. Call initialize() first.")
+        return self._configuration
+
+    @property
+    def fingerprint(self) -> str:
+        """Return a digest of the configuration and the agent module source."""
+        if self._fingerprint is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        return self._fingerprint
+
+    @property
+    def persistence_path(self) -> str | None:
+        """Return the SQLite session store file, when one is configured."""
+        if self._configuration is None or self._configuration.session_store is None:
+            return None
+        return self._configuration.session_store.db_path
+
+    @property
+    def session_service(self) -> BaseSessionService:
+        """Return the ADK session service keeping this agent's sessions."""
+        if self._sessions is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        return self._sessions
+
+    @property
+    def infos(self) -> dict[str, Any]:
+        """Return diagnostic information about the agent instance."""
+        return self._infos
+
+    async def initialize(self, config: AdkAgentConfig) -> None:  # type: ignore[override]
+        """Load the root agent, open the session store and create the runner."""
+        self._configuration = AdkAgentConfig.model_validate(config)
+        self._name = self._configuration.name or "Unnamed ADK Agent"
+        self._app_name = self._configuration.app_name or self._name
+        self._infos["name"] = self._name
+
+        definition = self._configuration.agent_definition
+        self._agent = await asyncio.to_thread(self._load_agent, definition)
+        digest = hashlib.sha256(self._configuration.model_dump_json().encode())
+        digest.update(
+            (
+                await asyncio.to_thread(
+                    source_fingerprint, definition.rsplit(":", 1)[0]
+                )
+            ).encode()
+        )
+        self._fingerprint = digest.hexdigest()
+
+        store = self._configuration.session_store
+        if store is not None:
+            self._connection = await aiosqlite.connect(store.db_path)
+            sessions = SqliteSessionService(self._connection)
+            await sessions.setup()
+            self._sessions = sessions
+        else:
+            self._sessions = InMemorySessionService()
+        self._runner = Runner(
+            app_name=self._app_name,
+            agent=self._agent,
+            session_service=self._sessions,
+        )
+        self._infos.update(
+            {
+                "status": "Initialized",
+                "agent_definition": definition,
+                "app_name": self._app_name,
+                "session_store": store.model_dump() if store else "memory",
+                "fingerprint": self._fingerprint,
+                "config_used": self._configuration.model_dump(),
+            }
+        )
+
+    async def close(self) -> None:
+        """Close the runner's toolsets and the session store."""
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            await runner.close()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+            logger.debug("Session store connection closed")
+
+    def _load_agent(self, agent_definition: str) -> AdkBaseAgent:
+        """Load the root agent from a `path.py:variable` definition."""
+        try:
+            module_path, variable = agent_definition.rsplit(":", 1)
+        except ValueError:
+            raise ValueError(
+                "agent_definition must be in the format "
+                "'path/to/file.py:variable_name'"
+            ) from None
+
+        try:
+            spec = importlib.util.spec_from_file_location(variable, module_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Could not load spec for module at {module_path}")
+            module = importlib.util.module_from_spec(spec)
+            source = Path(module_path).read_bytes()
+            # Do not pass this module's `from __future__` imports on to user code
+            code = compile(source, module_path, "exec", dont_inherit=True)
+            exec(code, module.__dict__)
+            agent = getattr(module, variable)
+        except Exception as e:
+            # User code may fail in any way, a SyntaxError included
+            raise ValueError(
+                f"Failed to load agent from {agent_definition}: {e}"
+            ) from e
+
+        if not isinstance(agent, AdkBaseAgent):
+            raise TypeError(
+                f"The variable '{variable}' from {module_path} is not an ADK agent."
+            )
+        return agent
+
+    async def _session(self, session_id: str) -> Session:
+        """Return the session, creating it on its first run."""
+        assert self._sessions is not None and self._configuration is not None
+        app_name, user_id = self._app_name, self._configuration.user_id
+        session = await self._sessions.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is not None:
+            return session
+        try:
+            return await self._sessions.create_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+        except ValueError:  # created by a concurrent run in the meantime
+            session = await self._sessions.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            if session is None:
+                raise
+            return session
+
+    @staticmethod
+    def _parse(message: Any) -> tuple[str, str]:
+        if (
+            not isinstance(message, dict)
+            or "query" not in message
+            or "session_id" not in message
+        ):
+            raise ValueError(
+                "Message must be a dictionary with 'query' and 'session_id' keys."
+            )
+        return message["query"], message["session_id"]
+
+    async def _run(
+        self, query: str, session_id: str, streaming: bool
+    ) -> AsyncIterator[Any]:
+        if self._runner is None or self._configuration is None:
+            raise RuntimeError(
+                "Agent not initialized. Call initialize() before processing messages."
+            )
+        await self._session(session_id)
+        run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE
+        )
+        async for event in self._runner.run_async(
+            user_id=self._configuration.user_id,
+            session_id=session_id,
+            new_message=types.Content(role="user", parts=[types.Part(text=query)]),
+            run_config=run_config,
+        ):
+            yield event
+
+    async def invoke(self, message: Any) -> Any:
+        """Run the agent on the query and return its final response text."""
+        query, session_id = self._parse(message)
+        translator = _EventTranslator()
+        with (
+            slow_runs.track(None, session_id, "invoke"),
+            engine_tracer.span(
+                "idun.agent.invoke",
+                {"idun.agent": self._name, "idun.session_id": session_id},
+            ),
+        ):
+            async for event in self._run(query, session_id, streaming=False):
+                if event.error_code or event.error_message:
+                    raise RuntimeError(event.error_message or event.error_code)
+                translator.translate(event)
+        return translator.final_text
+
+    async def stream(self, message: Any) -> AsyncGenerator[Any]:
+        """Run the agent, relaying its events as ag-ui events as they are produced."""
+        query, session_id = self._parse(message)
+        assert self._configuration is not None
+        run_id = f"run_{uuid.uuid4()}"
+        translator = _EventTranslator()
+        with (
+            slow_runs.track(run_id, session_id, "stream") as timeline,
+            engine_tracer.span(
+                "idun.agent.stream",
+                {
+                    "idun.agent": self._name,
+                    "idun.session_id": session_id,
+                    "idun.run_id": run_id,
+                },
+            ),
+            log_context(run_id=run_id),
+        ):
+            yield ag_events.RunStartedEvent(
+                type=ag_events.EventType.RUN_STARTED,
+                run_id=run_id,
+                thread_id=session_id,
+            )
+            try:
+                async for event in self._run(
+                    query, session_id, self._configuration.streaming
+                ):
+                    if event.error_code or event.error_message:
+                        for ag_event in translator.finish():
+                            yield ag_event
+                        yield ag_events.RunErrorEvent(
+                            type=ag_events.EventType.RUN_ERROR,
+                            message=event.error_message or str(event.error_code),
+                            code=event.error_code,
+                        )
+                        return
+                    for ag_event in translator.translate(event):
+                        if timeline is not None:
+                            timeline.event(str(ag_event.type.value), run_id)
+                        yield ag_event
+            except Exception as e:  # noqa: BLE001 - the agent's own failure
+                logger.exception("ADK run failed")
+                yield ag_events.RunErrorEvent(
+                    type=ag_events.EventType.RUN_ERROR, message=str(e)
+                )
+                return
+
+            for ag_event in translator.finish():
+                yield ag_event
+            yield ag_events.RunFinishedEvent(
+                type=ag_events.EventType.RUN_FINISHED,
+                run_id=run_id,
+                thread_id=session_id,
+                result={"output": translator.final_text},
+            )
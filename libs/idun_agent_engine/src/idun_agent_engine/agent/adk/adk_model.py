@@ -0,0 +1,27 @@
+"""Configuration model for Google ADK agents."""
+
+from idun_agent_engine.agent.langgraph.langgraph_model import SqliteCheckpointConfig
+from idun_agent_engine.agent.model import BaseAgentConfig
+
+
+class AdkAgentConfig(BaseAgentConfig):
+    """Configuration model for Google ADK agents.
+
+    This model validates the 'config' block for an agent of type 'adk'.
+
+    Attributes:
+        agent_definition: `path/to/file.py:variable` naming the root ADK agent.
+        app_name: ADK application name; defaults to `name`.
+        user_id: ADK user owning the engine's sessions.
+        session_store: SQLite database keeping ADK sessions across restarts, the
+            same file as a LangGraph checkpointer can be. Sessions are kept in
+            memory when unset.
+        streaming: Stream the model's partial responses on `/agent/stream`;
+            otherwise each response is sent whole once complete.
+    """
+
+    agent_definition: str
+    app_name: str | None = None
+    user_id: str = "idun"
+    session_store: SqliteCheckpointConfig | None = None
+    streaming: bool = True
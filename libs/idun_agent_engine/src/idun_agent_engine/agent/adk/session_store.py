@@ -0,0 +1,277 @@
+"""ADK session service backed by the engine's SQLite database.
+
+Sessions, their events and the app- and user-scoped state live in `idun_adk_*`
+tables next to the other engine tables of the file, written through the same
+`aiosqlite` connection type as the LangGraph checkpointer so no call blocks the
+event loop.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from typing import Any
+
+import aiosqlite
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.state import State
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idun_adk_sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+CREATE TABLE IF NOT EXISTS idun_adk_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idun_adk_events_session
+    ON idun_adk_events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS idun_adk_app_state (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS idun_adk_user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _split_state(
+    delta: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Split a state delta into its app, user and session parts, dropping `temp:`."""
+    app: dict[str, Any] = {}
+    user: dict[str, Any] = {}
+    session: dict[str, Any] = {}
+    for key, value in delta.items():
+        if key.startswith(State.APP_PREFIX):
+            app[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session[key] = value
+    return app, user, session
+
+
+def _dumps(state: dict[str, Any]) -> str:
+    return json.dumps(state, default=str)
+
+
+class SqliteSessionService(BaseSessionService):
+    """ADK `BaseSessionService` storing sessions in SQLite through `aiosqlite`."""
+
+    def __init__(self, conn: aiosqlite.Connection) -> None:
+        """Store sessions through `conn`; call `setup` before use."""
+        self._conn = conn
+
+    async def setup(self) -> None:
+        """Create the session tables if needed."""
+        await self._conn.executescript(_SCHEMA)
+        await self._conn.commit()
+
+    async def _scoped_state(self, app_name: str, user_id: str) -> dict[str, Any]:
+        """App and user state, with their prefixes, to merge into a session."""
+        state: dict[str, Any] = {}
+        async with self._conn.execute(
+            "SELECT state FROM idun_adk_app_state WHERE app_name = ?", (app_name,)
+        ) as cursor:
+            if row := await cursor.fetchone():
+                for key, value in json.loads(row[0]).items():
+                    state[State.APP_PREFIX + key] = value
+        async with self._conn.execute(
+            "SELECT state FROM idun_adk_user_state WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        ) as cursor:
+            if row := await cursor.fetchone():
+                for key, value in json.loads(row[0]).items():
+                    state[State.USER_PREFIX + key] = value
+        return state
+
+    async def _update_scoped(
+        self, app_name: str, user_id: str, app: dict[str, Any], user: dict[str, Any]
+    ) -> None:
+        if app:
+            current = await self._scoped_state(app_name, user_id)
+            merged = {
+                k.removeprefix(State.APP_PREFIX): v
+                for k, v in current.items()
+                if k.startswith(State.APP_PREFIX)
+            }
+            merged.update(app)
+            await self._conn.execute(
+                "INSERT OR REPLACE INTO idun_adk_app_state VALUES (?, ?)",
+                (app_name, _dumps(merged)),
+            )
+        if user:
+            current = await self._scoped_state(app_name, user_id)
+            merged = {
+                k.removeprefix(State.USER_PREFIX): v
+                for k, v in current.items()
+                if k.startswith(State.USER_PREFIX)
+            }
+            merged.update(user)
+            await self._conn.execute(
+                "INSERT OR REPLACE INTO idun_adk_user_state VALUES (?, ?, ?)",
+                (app_name, user_id, _dumps(merged)),
+            )
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        """Create a session, failing if `session_id` is already taken.
+
+        Raises:
+            ValueError: If the session already exists.
+        """
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        app, user, own = _split_state(state or {})
+        now = time.time()
+        try:
+            await self._conn.execute(
+                "INSERT INTO idun_adk_sessions VALUES (?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, _dumps(own), now),
+            )
+        except aiosqlite.IntegrityError:
+            raise ValueError(f"Session already exists: {session_id}") from None
+        await self._update_scoped(app_name, user_id, app, user)
+        await self._conn.commit()
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state={**own, **await self._scoped_state(app_name, user_id)},
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        """Load a session with its events (all, or as limited by `config`)."""
+        async with self._conn.execute(
+            "SELECT state, update_time FROM idun_adk_sessions "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            (app_name, user_id, session_id),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        query = (
+            "SELECT event FROM idun_adk_events "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        )
+        params: list[Any] = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq DESC"
+        if config and config.num_recent_events:
+            query += " LIMIT ?"
+            params.append(config.num_recent_events)
+        async with self._conn.execute(query, params) as cursor:
+            rows = list(await cursor.fetchall())
+        events = [Event.model_validate_json(event) for (event,) in reversed(rows)]
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state={**json.loads(row[0]), **await self._scoped_state(app_name, user_id)},
+            events=events,
+            last_update_time=row[1],
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        """List a user's sessions, without their events or state."""
+        async with self._conn.execute(
+            "SELECT session_id, update_time FROM idun_adk_sessions "
+            "WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return ListSessionsResponse(
+            sessions=[
+                Session(
+                    id=session_id,
+                    app_name=app_name,
+                    user_id=user_id,
+                    last_update_time=update_time,
+                )
+                for session_id, update_time in rows
+            ]
+        )
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        """Delete a session and its events."""
+        key = (app_name, user_id, session_id)
+        await self._conn.execute(
+            "DELETE FROM idun_adk_events "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            key,
+        )
+        await self._conn.execute(
+            "DELETE FROM idun_adk_sessions "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            key,
+        )
+        await self._conn.commit()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Apply `event` to `session` and store it; partial events are not kept."""
+        if event.partial:
+            return event
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        delta = event.actions.state_delta if event.actions else None
+        app, user, _ = _split_state(delta or {})
+        own = {
+            key: value
+            for key, value in session.state.items()
+            if not key.startswith(
+                (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+            )
+        }
+        key = (session.app_name, session.user_id, session.id)
+        await self._conn.execute(
+            "INSERT INTO idun_adk_events "
+            "(app_name, user_id, session_id, timestamp, event) VALUES (?, ?, ?, ?, ?)",
+            (*key, event.timestamp, event.model_dump_json(exclude_none=True)),
+        )
+        await self._conn.execute(
+            "UPDATE idun_adk_sessions SET state = ?, update_time = ? "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            (_dumps(own), event.timestamp, *key),
+        )
+        await self._update_scoped(session.app_name, session.user_id, app, user)
+        await self._conn.commit()
+        return event
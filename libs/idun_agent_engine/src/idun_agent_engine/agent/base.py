@@ -3,9 +3,11 @@
 Defines the abstract `BaseAgent` used by all agent implementations.
 """
 
+import hashlib
+import uuid
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
-from typing import Any
+from typing import Any, ClassVar
 
 from .model import BaseAgentConfig
 
@@ -16,6 +18,9 @@ class BaseAgent[ConfigType: BaseAgentConfig](ABC):
     Implements the public protocol that concrete agent adapters must follow.
     """
 
+    config_model: ClassVar[type[BaseAgentConfig]] = BaseAgentConfig
+    """Model validating the `agent.config` block of this adapter."""
+
     _configuration: ConfigType
 
     @property
@@ -47,6 +52,25 @@ class BaseAgent[ConfigType: BaseAgentConfig](ABC):
         """
         return self._configuration
 
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of what determines the agent's answers.
+
+        Used to key response caches, so two instances with the same fingerprint
+        must answer identically. Defaults to a digest of the configuration;
+        adapters that load code from disk should include its source.
+        """
+        return hashlib.sha256(self.configuration.model_dump_json().encode()).hexdigest()
+
+    @property
+    def persistence_path(self) -> str | None:
+        """Path of the SQLite file backing the agent's persistence, if any.
+
+        Engine features that must be shared between workers (such as idempotency
+        keys) keep their tables alongside the agent's checkpoints in this file.
+        """
+        return None
+
     @property
     @abstractmethod
     def infos(self) -> dict[str, Any]:
@@ -64,6 +88,32 @@ class BaseAgent[ConfigType: BaseAgentConfig](ABC):
         """
         pass
 
+    def adopt_persistence(self, previous: "BaseAgent") -> None:
+        """Reuse persistence resources from the instance this one replaces.
+
+        Called before `initialize` during a hot reload so both versions share the
+        same checkpointer instead of reopening it. The default does nothing and
+        the new instance sets up its own persistence.
+
+        Args:
+            previous: The agent instance currently serving traffic.
+        """
+        return None
+
+    async def warmup(self, queries: list[str]) -> None:
+        """Prime the agent before it starts serving traffic.
+
+        The default implementation sends each synthetic query through `invoke`
+        on a throwaway session so that connection pools and model clients are
+        opened ahead of the first real request. Adapters can override this to
+        add framework-specific priming.
+
+        Args:
+            queries: Synthetic queries to run, in order.
+        """
+        for query in queries:
+            await self.invoke({"query": query, "session_id": f"warmup-{uuid.uuid4()}"})
+
     @abstractmethod
     async def invoke(self, message: Any) -> Any:
         """Process a single input message and return a response.
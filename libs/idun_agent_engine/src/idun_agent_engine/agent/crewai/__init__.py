@@ -1,5 +1,6 @@
 """CrewAI agent package."""
 
-from .crewai import CrewAIAgent
+from .crewai import CrewAIAgent, CrewRunError
+from .crewai_model import CrewAIAgentConfig
 
-__all__ = ["CrewAIAgent"]
+__all__ = ["CrewAIAgent", "CrewAIAgentConfig", "CrewRunError"]
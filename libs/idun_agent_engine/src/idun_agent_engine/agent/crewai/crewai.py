@@ -1,53 +1,562 @@
-"""CrewAI agent adapter (placeholder)."""
+"""CrewAI agent adapter.
+
+CrewAI runs crews synchronously, so each run executes on a thread of a pool
+owned by the agent instead of the event loop. The crew's step and task
+callbacks are translated into ag-ui events on that thread and handed to the
+event loop through a thread-safe bridge, which `stream` relays as they come.
+
+Threads cannot be interrupted, so a run that times out or whose client goes
+away is cancelled cooperatively: its next step or task callback raises, which
+ends the crew and frees its worker. Its slot is only given back once the thread
+has actually finished, so the pool never runs more crews than `max_workers`.
+"""
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+import asyncio
+import contextvars
+import functools
+import hashlib
+import importlib.util
+import json
+import logging
+import uuid
+from collections import Counter
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+from ag_ui.core import events as ag_events
+
 from idun_agent_engine.agent.base import BaseAgent
-from idun_agent_engine.agent.model import BaseAgentConfig
+from idun_agent_engine.agent.sources import source_fingerprint
+from idun_agent_engine.debug import slow_runs
+from idun_agent_engine.log import log_context
+from idun_agent_engine.observability.tracing import engine_tracer
+
+from .crewai_model import CrewAIAgentConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CrewRunError(Exception):
+    """Raised when a crew run is rejected or does not finish in time."""
+
+    def __init__(self, message: str, code: str) -> None:
+        """Describe the failure; `code` is reported on `RunErrorEvent`."""
+        super().__init__(message)
+        self.code = code
+
+
+class CrewRunCancelledError(Exception):
+    """Raised inside a crew's callbacks to stop a cancelled run."""
+
+
+class _EventBridge:
+    """Carries ag-ui events from a crew's worker thread to the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, streaming: bool) -> None:
+        self._loop = loop
+        self._streaming = streaming
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self.cancelled = False
+
+    def check(self) -> None:
+        """Stop the crew if its run was cancelled (worker thread)."""
+        if self.cancelled:
+            raise CrewRunCancelledError("Crew run cancelled")
+
+    def emit(self, event: Any) -> None:
+        """Queue `event` for the loop (worker thread); raises once cancelled."""
+        self.check()
+        if self._streaming:
+            try:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+            except RuntimeError:  # loop closed while the crew was running
+                self.cancelled = True
+
+    def close(self) -> None:
+        """Mark the end of the events (event loop)."""
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Any:
+        """Next event, or None once the run has finished."""
+        return await self._queue.get()
+
+
+class _CrewRunEvents:
+    """Translates one crew run's callbacks into ag-ui events."""
+
+    def __init__(self, bridge: _EventBridge, tasks: list[Any]) -> None:
+        self._bridge = bridge
+        self._tasks = tasks
+        self._index = 0
+        self._step: str | None = None
+
+    def _start_task(self) -> None:
+        if self._step is None:
+            task = self._tasks[self._index] if self._index < len(self._tasks) else None
+            self._step = getattr(task, "name", None) or f"task_{self._index}"
+            self._bridge.emit(
+                ag_events.StepStartedEvent(
+                    type=ag_events.EventType.STEP_STARTED, step_name=self._step
+                )
+            )
+
+    def on_step(self, step: Any) -> None:
+        """Report a tool used by an agent as a tool call."""
+        self._start_task()
+        tool = getattr(step, "tool", None)
+        if not tool:
+            self._bridge.check()
+            return
+        tool_call_id = f"call_{uuid.uuid4()}"
+        self._bridge.emit(
+            ag_events.ToolCallStartEvent(
+                type=ag_events.EventType.TOOL_CALL_START,
+                tool_call_id=tool_call_id,
+                tool_call_name=str(tool),
+            )
+        )
+        arguments = getattr(step, "tool_input", None)
+        if arguments:
+            self._bridge.emit(
+                ag_events.ToolCallArgsEvent(
+                    type=ag_events.EventType.TOOL_CALL_ARGS,
+                    tool_call_id=tool_call_id,
+                    delta=(
+                        arguments
+                        if isinstance(arguments, str)
+                        else json.dumps(arguments, default=str)
+                    ),
+                )
+            )
+        self._bridge.emit(
+            ag_events.ToolCallEndEvent(
+                type=ag_events.EventType.TOOL_CALL_END, tool_call_id=tool_call_id
+            )
+        )
+
+    def on_task(self, output: Any) -> None:
+        """Report a finished task's output as an assistant message."""
+        self._start_task()
+        text = getattr(output, "raw", None)
+        text = str(output if text is None else text)
+        if text:
+            message_id = f"msg_{uuid.uuid4()}"
+            self._bridge.emit(
+                ag_events.TextMessageStartEvent(
+                    type=ag_events.EventType.TEXT_MESSAGE_START,
+                    message_id=message_id,
+                    role="assistant",
+                )
+            )
+            self._bridge.emit(
+                ag_events.TextMessageContentEvent(
+                    type=ag_events.EventType.TEXT_MESSAGE_CONTENT,
+                    message_id=message_id,
+                    delta=text,
+                )
+            )
+            self._bridge.emit(
+                ag_events.TextMessageEndEvent(
+                    type=ag_events.EventType.TEXT_MESSAGE_END, message_id=message_id
+                )
+            )
+        self._bridge.emit(
+            ag_events.StepFinishedEvent(
+                type=ag_events.EventType.STEP_FINISHED, step_name=self._step or ""
+            )
+        )
+        self._step = None
+        self._index += 1
+
+
+def _chain(first: Callable[[Any], None], then: Any) -> Callable[[Any], None]:
+    """Call `first`, then the crew's own callback if it had one."""
+    if not callable(then):
+        return first
+
+    def callback(value: Any) -> None:
+        first(value)
+        then(value)
+
+    return callback
+
+
+class _Slots:
+    """Admission of runs: a free worker and a free slot in the run's session."""
+
+    def __init__(self, workers: int, per_session: int) -> None:
+        self._workers = asyncio.Semaphore(workers)
+        self._per_session = per_session
+        self._sessions: dict[str, asyncio.Semaphore] = {}
+        self._users: Counter[str] = Counter()
+        self.queued = 0
+
+    async def acquire(self, session_id: str, timeout: float) -> Callable[[], None]:
+        """Wait for a slot; returns the callable giving it back.
+
+        Raises:
+            CrewRunError: If no slot is free within `timeout` seconds.
+        """
+        session = self._sessions.setdefault(
+            session_id, asyncio.Semaphore(self._per_session)
+        )
+        self._users[session_id] += 1
+        self.queued += 1
+        acquired_session = False
+        try:
+            async with asyncio.timeout(timeout):
+                await session.acquire()
+                acquired_session = True
+                await self._workers.acquire()
+        except TimeoutError:
+            if acquired_session:
+                session.release()
+            self._leave(session_id)
+            raise CrewRunError(
+                f"No crew worker became free within {timeout}s.", "crew_busy"
+            ) from None
+        except BaseException:
+            if acquired_session:
+                session.release()
+            self._leave(session_id)
+            raise
+        finally:
+            self.queued -= 1
 
+        def release() -> None:
+            self._workers.release()
+            session.release()
+            self._leave(session_id)
 
-class CrewAIAgent(BaseAgent[BaseAgentConfig]):
-    """Placeholder for a future CrewAI agent implementation."""
+        return release
+
+    def _leave(self, session_id: str) -> None:
+        self._users[session_id] -= 1
+        if self._users[session_id] <= 0:
+            del self._users[session_id]
+            self._sessions.pop(session_id, None)
+
+
+class CrewAIAgent(BaseAgent[CrewAIAgentConfig]):
+    """CrewAI agent adapter running crews on a dedicated thread pool."""
+
+    config_model = CrewAIAgentConfig
 
     def __init__(self) -> None:
-        """Initialize placeholder with optional configuration slot."""
-        self._configuration: BaseAgentConfig | None = None
+        """Initialize an unconfigured CrewAIAgent."""
+        self._id = str(uuid.uuid4())
+        self._configuration: CrewAIAgentConfig | None = None  # type: ignore[assignment]
+        self._name = "Unnamed CrewAI Agent"
+        self._crew: Any = None
+        self._fingerprint: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: _Slots | None = None
+        self._active: set[_EventBridge] = set()
+        self._infos: dict[str, Any] = {
+            "status": "Uninitialized",
+            "name": self._name,
+            "id": self._id,
+        }
 
     @property
-    def id(self) -> str:  # pragma: no cover - placeholder
-        """Return unique identifier (not implemented)."""
-        raise NotImplementedError
+    def id(self) -> str:
+        """Return unique identifier for this agent instance."""
+        return self._id
 
     @property
-    def agent_type(self) -> str:  # pragma: no cover - placeholder
+    def agent_type(self) -> str:
         """Return agent type label."""
         return "CrewAI"
 
     @property
-    def agent_instance(self) -> Any:  # pragma: no cover - placeholder
-        """Return underlying instance (not implemented)."""
-        raise NotImplementedError
+    def name(self) -> str:
+        """Return configured human-readable agent name."""
+        return self._name
+
+    @property
+    def agent_instance(self) -> Any:
+        """Return the crew (or crew factory) loaded from the definition.
+
+        Raises:
+            RuntimeError: If the agent is not yet initialized.
+        """
+        if self._crew is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        return self._crew
+
+    @property
+    def configuration(self) -> CrewAIAgentConfig:
+        """Return validated configuration.
+
+        Raises:
+            RuntimeError: If the agent has not been configured yet.
+        """
+        if not self._configuration:
+            raise RuntimeError("Agent not configured. Call initialize() first.")
+        return self._configuration
+
+    @property
+    def fingerprint(self) -> str:
+        """Return a digest of the configuration and the crew module source."""
+        if self._fingerprint is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        return self._fingerprint
 
     @property
-    def infos(self) -> dict[str, Any]:  # pragma: no cover - placeholder
-        """Return diagnostic information for placeholder agent."""
-        return {"status": "NotImplemented"}
-
-    async def initialize(
-        self, config: dict[str, Any]
-    ) -> None:  # pragma: no cover - placeholder
-        """Initialize agent with provided config (not implemented)."""
-        raise NotImplementedError("CrewAIAgent is not implemented yet")
-
-    async def invoke(self, message: Any) -> Any:  # pragma: no cover - placeholder
-        """Process a single message (not implemented)."""
-        raise NotImplementedError("CrewAIAgent is not implemented yet")
-
-    async def stream(
-        self, message: Any
-    ) -> AsyncGenerator[Any]:  # pragma: no cover - placeholder
-        """Stream responses for a message (not implemented)."""
-        raise NotImplementedError("CrewAIAgent is not implemented yet")
+    def infos(self) -> dict[str, Any]:
+        """Return diagnostic information about the agent instance."""
+        if self._slots is not None:
+            self._infos["runs"] = {
+                "active": len(self._active),
+                "queued": self._slots.queued,
+            }
+        return self._infos
+
+    async def initialize(self, config: CrewAIAgentConfig) -> None:  # type: ignore[override]
+        """Load the crew definition and start the worker pool."""
+        self._configuration = CrewAIAgentConfig.model_validate(config)
+        self._name = self._configuration.name or "Unnamed CrewAI Agent"
+        self._infos["name"] = self._name
+
+        definition = self._configuration.crew_definition
+        self._crew = await asyncio.to_thread(self._load_crew, definition)
+        module_path = definition.rsplit(":", 1)[0]
+        digest = hashlib.sha256(self._configuration.model_dump_json().encode())
+        digest.update(
+            (await asyncio.to_thread(source_fingerprint, module_path)).encode()
+        )
+        self._fingerprint = digest.hexdigest()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._configuration.max_workers,
+            thread_name_prefix="idun-crew",
+        )
+        self._slots = _Slots(
+            self._configuration.max_workers, self._configuration.max_runs_per_session
+        )
+        self._infos.update(
+            {
+                "status": "Initialized",
+                "crew_definition": definition,
+                "fingerprint": self._fingerprint,
+                "max_workers": self._configuration.max_workers,
+                "config_used": self._configuration.model_dump(),
+            }
+        )
+
+    async def close(self) -> None:
+        """Cancel running crews and shut the worker pool down."""
+        for bridge in list(self._active):
+            bridge.cancelled = True
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load_crew(self, crew_definition: str) -> Any:
+        """Load the crew, or crew factory, from a `path.py:variable` definition."""
+        try:
+            module_path, variable = crew_definition.rsplit(":", 1)
+        except ValueError:
+            raise ValueError(
+                "crew_definition must be in the format 'path/to/file.py:variable_name'"
+            ) from None
+
+        try:
+            spec = importlib.util.spec_from_file_location(variable, module_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Could not load spec for module at {module_path}")
+            module = importlib.util.module_from_spec(spec)
+            source = Path(module_path).read_bytes()
+            # Do not pass this module's `from __future__` imports on to user code
+            code = compile(source, module_path, "exec", dont_inherit=True)
+            exec(code, module.__dict__)
+            crew = getattr(module, variable)
+        except Exception as e:
+            # User code may fail in any way, a SyntaxError included
+            raise ValueError(f"Failed to load crew from {crew_definition}: {e}") from e
+
+        if hasattr(crew, "kickoff"):
+            if not callable(getattr(crew, "copy", None)):
+                raise TypeError(
+                    f"The crew '{variable}' from {module_path} cannot be copied for "
+                    "each run; define a callable returning a new crew instead."
+                )
+        elif not callable(crew):
+            raise TypeError(
+                f"The variable '{variable}' from {module_path} is neither a Crew "
+                "nor a callable returning one."
+            )
+        return crew
+
+    def _new_crew(self) -> Any:
+        """A crew for one run; crews keep state, so runs never share one."""
+        if hasattr(self._crew, "kickoff"):
+            return self._crew.copy()
+        return self._crew()
+
+    def _kickoff(self, query: str, session_id: str, bridge: _EventBridge) -> Any:
+        """Run a crew to completion (worker thread)."""
+        assert self._configuration is not None
+        bridge.check()
+        crew = self._new_crew()
+        events = _CrewRunEvents(bridge, list(getattr(crew, "tasks", None) or []))
+        crew.step_callback = _chain(
+            events.on_step, getattr(crew, "step_callback", None)
+        )
+        crew.task_callback = _chain(
+            events.on_task, getattr(crew, "task_callback", None)
+        )
+        inputs = {
+            **self._configuration.inputs,
+            self._configuration.query_input: query,
+            "session_id": session_id,
+        }
+        return crew.kickoff(inputs=inputs)
+
+    async def _submit(
+        self, query: str, session_id: str, bridge: _EventBridge
+    ) -> asyncio.Future[Any]:
+        """Start a run once a slot is free; returns the future of its output."""
+        if self._executor is None or self._slots is None:
+            raise RuntimeError(
+                "Agent not initialized. Call initialize() before processing messages."
+            )
+        assert self._configuration is not None
+        release = await self._slots.acquire(
+            session_id, self._configuration.queue_timeout_seconds
+        )
+        context = contextvars.copy_context()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                functools.partial(
+                    context.run, self._kickoff, query, session_id, bridge
+                ),
+            )
+        except BaseException:
+            release()
+            raise
+        self._active.add(bridge)
+
+        def finished(_: asyncio.Future[Any]) -> None:
+            self._active.discard(bridge)
+            release()
+            bridge.close()
+
+        future.add_done_callback(finished)
+        return future
+
+    @staticmethod
+    def _parse(message: Any) -> tuple[str, str]:
+        if (
+            not isinstance(message, dict)
+            or "query" not in message
+            or "session_id" not in message
+        ):
+            raise ValueError(
+                "Message must be a dictionary with 'query' and 'session_id' keys."
+            )
+        return message["query"], message["session_id"]
+
+    @staticmethod
+    def _output_text(output: Any) -> str:
+        text = getattr(output, "raw", None)
+        return str(output if text is None else text)
+
+    async def invoke(self, message: Any) -> Any:
+        """Run the crew on the query and return its final output.
+
+        Raises:
+            CrewRunError: If no worker is free in time or the run times out.
+        """
+        query, session_id = self._parse(message)
+        assert self._configuration is not None
+        bridge = _EventBridge(asyncio.get_running_loop(), streaming=False)
+        with (
+            slow_runs.track(None, session_id, "invoke"),
+            engine_tracer.span(
+                "idun.agent.invoke",
+                {"idun.agent": self._name, "idun.session_id": session_id},
+            ),
+        ):
+            future = await self._submit(query, session_id, bridge)
+            try:
+                output = await asyncio.wait_for(
+                    asyncio.shield(future), self._configuration.run_timeout_seconds
+                )
+            except TimeoutError:
+                raise self._timed_out() from None
+            finally:
+                bridge.cancelled = True
+        return self._output_text(output)
+
+    def _timed_out(self) -> CrewRunError:
+        assert self._configuration is not None
+        timeout = self._configuration.run_timeout_seconds
+        logger.warning("Crew run timed out after %ss; stopping it", timeout)
+        return CrewRunError(f"Crew run exceeded {timeout}s.", "crew_timeout")
+
+    async def stream(self, message: Any) -> AsyncGenerator[Any]:
+        """Run the crew, streaming its steps, tool calls and task outputs as ag-ui events."""
+        query, session_id = self._parse(message)
+        assert self._configuration is not None
+        run_id = f"run_{uuid.uuid4()}"
+        bridge = _EventBridge(asyncio.get_running_loop(), streaming=True)
+        with (
+            slow_runs.track(run_id, session_id, "stream") as timeline,
+            engine_tracer.span(
+                "idun.agent.stream",
+                {
+                    "idun.agent": self._name,
+                    "idun.session_id": session_id,
+                    "idun.run_id": run_id,
+                },
+            ),
+            log_context(run_id=run_id),
+        ):
+            yield ag_events.RunStartedEvent(
+                type=ag_events.EventType.RUN_STARTED,
+                run_id=run_id,
+                thread_id=session_id,
+            )
+            try:
+                future = await self._submit(query, session_id, bridge)
+                async with asyncio.timeout(self._configuration.run_timeout_seconds):
+                    while (event := await bridge.get()) is not None:
+                        if timeline is not None:
+                            timeline.event(str(event.type.value), run_id)
+                        yield event
+                    output = await future
+            except TimeoutError:
+                error = self._timed_out()
+                yield ag_events.RunErrorEvent(
+                    type=ag_events.EventType.RUN_ERROR,
+                    message=str(error),
+                    code=error.code,
+                )
+                return
+            except CrewRunError as e:
+                yield ag_events.RunErrorEvent(
+                    type=ag_events.EventType.RUN_ERROR, message=str(e), code=e.code
+                )
+                return
+            except Exception as e:  # noqa: BLE001 - the crew's own failure
+                logger.exception("Crew run failed")
+                yield ag_events.RunErrorEvent(
+                    type=ag_events.EventType.RUN_ERROR, message=str(e)
+                )
+                return
+            finally:
+                # Also stops the crew when the client goes away mid-stream
+                bridge.cancelled = True
+
+            yield ag_events.RunFinishedEvent(
+                type=ag_events.EventType.RUN_FINISHED,
+                run_id=run_id,
+                thread_id=session_id,
+                result={"output": self._output_text(output)},
+            )
@@ -0,0 +1,37 @@
+"""Configuration model for CrewAI agents."""
+
+from typing import Any
+
+from pydantic import Field
+
+from idun_agent_engine.agent.model import BaseAgentConfig
+
+
+class CrewAIAgentConfig(BaseAgentConfig):
+    """Configuration model for CrewAI agents.
+
+    This model validates the 'config' block for an agent of type 'crewai'.
+    Crews run synchronously, each on a thread of a pool owned by the agent.
+
+    Attributes:
+        crew_definition: `path/to/file.py:variable`, naming a `Crew` (copied for
+            every run) or a callable returning a new one.
+        query_input: Kickoff input receiving the user query.
+        inputs: Additional kickoff inputs, the same for every run.
+        max_workers: Threads running crews; at most this many run at once.
+        max_runs_per_session: Runs of one session executing at once; further
+            runs of that session wait for one of them to finish.
+        queue_timeout_seconds: How long a run waits for a free worker before
+            it is rejected.
+        run_timeout_seconds: Time allowed to a run, or None for no limit. A
+            run over time is reported as failed and its crew stops at its next
+            step or task.
+    """
+
+    crew_definition: str
+    query_input: str = "query"
+    inputs: dict[str, Any] = Field(default_factory=dict)
+    max_workers: int = Field(default=4, gt=0)
+    max_runs_per_session: int = Field(default=1, gt=0)
+    queue_timeout_seconds: float = Field(default=30.0, ge=0)
+    run_timeout_seconds: float | None = Field(default=300.0, gt=0)
@@ -1,10 +1,59 @@
-"""LangGraph agent package."""
+"""LangGraph agent package.
 
-from .langgraph import LanggraphAgent
-from .langgraph_model import LangGraphAgentConfig, SqliteCheckpointConfig
+The agent and the node executors are imported on first access, so loading
+the configuration models (as the adapter registry and the config builder do)
+does not import LangGraph.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from .graph_cache import (
+    GraphCache,
+    evict_local_modules,
+    graph_cache,
+    local_sources,
+    source_fingerprint,
+)
+from .langgraph_model import (
+    LangGraphAgentConfig,
+    NodeExecutorConfig,
+    SqliteCheckpointConfig,
+)
+
+if TYPE_CHECKING:
+    from .executors import NodeExecutor, cpu_bound, route_nodes
+    from .langgraph import LanggraphAgent
+
+_LAZY = {
+    "LanggraphAgent": ".langgraph",
+    "NodeExecutor": ".executors",
+    "cpu_bound": ".executors",
+    "route_nodes": ".executors",
+}
 
 __all__ = [
+    "GraphCache",
     "LanggraphAgent",
     "LangGraphAgentConfig",
+    "NodeExecutor",
+    "NodeExecutorConfig",
     "SqliteCheckpointConfig",
+    "cpu_bound",
+    "evict_local_modules",
+    "graph_cache",
+    "local_sources",
+    "route_nodes",
+    "source_fingerprint",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the agent and executor names on first access."""
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,73 @@
+"""SQLite checkpointer with engine spans around checkpoint load and save.
+
+Loads and saves are also timed on the timeline of the run they serve, if any.
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from idun_agent_engine.debug import current_timeline
+from idun_agent_engine.observability.tracing import engine_tracer
+
+
+def _thread_attributes(config: RunnableConfig) -> dict[str, Any]:
+    thread_id = config.get("configurable", {}).get("thread_id")
+    return {"idun.session_id": str(thread_id)} if thread_id is not None else {}
+
+
+class TracedAsyncSqliteSaver(AsyncSqliteSaver):
+    """`AsyncSqliteSaver` recording `idun.checkpoint.*` spans."""
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Load the checkpoint of a thread."""
+        timeline, started = current_timeline(), time.perf_counter()
+        with engine_tracer.span(
+            "idun.checkpoint.load", _thread_attributes(config)
+        ) as span:
+            result = await super().aget_tuple(config)
+            span.set_attribute("idun.checkpoint.found", result is not None)
+        if timeline is not None:
+            timeline.span("checkpoint", "load", started)
+        return result
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint."""
+        timeline, started = current_timeline(), time.perf_counter()
+        with engine_tracer.span("idun.checkpoint.save", _thread_attributes(config)):
+            result = await super().aput(config, checkpoint, metadata, new_versions)
+        if timeline is not None:
+            timeline.span("checkpoint", "save", started)
+        return result
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save the pending writes of a task."""
+        timeline, started = current_timeline(), time.perf_counter()
+        with engine_tracer.span(
+            "idun.checkpoint.save_writes",
+            {**_thread_attributes(config), "idun.checkpoint.writes": len(writes)},
+        ):
+            await super().aput_writes(config, writes, task_id, task_path)
+        if timeline is not None:
+            timeline.span("checkpoint", "save_writes", started)
@@ -0,0 +1,260 @@
+"""Dedicated executors for the synchronous and CPU-bound nodes of a graph.
+
+LangGraph runs synchronous node functions on the event loop's default executor,
+shared with every `asyncio.to_thread` call of the process. `route_nodes` moves
+them to executors owned by the agent instead:
+
+- synchronous nodes run on a thread pool sized by `executors.sync_workers`;
+- CPU-bound nodes, tagged with `cpu_bound` or listed in `executors.cpu_nodes`,
+  run on a process pool so they do not hold the GIL of the serving process.
+
+A CPU-bound node receives only the graph state, pickled to a worker process,
+and its update is pickled back. Functions of the graph module are looked up by
+file and name in the worker, which executes the module once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import copy
+import dataclasses
+import functools
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import time
+from collections.abc import Callable, Collection
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables.config import run_in_executor
+from langgraph.graph import StateGraph
+
+from idun_agent_engine.metrics import engine_metrics
+
+_CPU_BOUND = "__idun_cpu_bound__"
+
+
+def cpu_bound[F: Callable[..., Any]](func: F) -> F:
+    """Mark a synchronous node function as CPU-bound.
+
+    When the agent has a CPU executor, the node runs in a worker process.
+    """
+    setattr(func, _CPU_BOUND, True)
+    return func
+
+
+def _timed_call(
+    func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[float, Any]:
+    """Call `func` on a worker, returning when it started with its result."""
+    started = time.time()
+    try:
+        return started, func(*args, **kwargs)
+    except StopIteration as e:
+        # A StopIteration cannot be set on a future
+        raise RuntimeError from e
+
+
+_modules: dict[str, dict[str, Any]] = {}
+"""Graph modules executed in this worker process, by path."""
+
+
+@dataclasses.dataclass(frozen=True)
+class _ModuleFunction:
+    """A function of a graph module, referenced by file and qualified name.
+
+    Graph modules are executed from their file rather than imported, so their
+    functions cannot be pickled by reference; this is sent instead.
+    """
+
+    path: str
+    qualname: str
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        namespace = _modules.get(self.path)
+        if namespace is None:
+            spec = importlib.util.spec_from_file_location(
+                Path(self.path).stem, self.path
+            )
+            if spec is None:
+                raise ImportError(f"Could not load spec for module at {self.path}")
+            module = importlib.util.module_from_spec(spec)
+            source = Path(self.path).read_bytes()
+            # Do not pass this module's `from __future__` imports on to user code
+            code = compile(source, self.path, "exec", dont_inherit=True)
+            exec(code, module.__dict__)
+            namespace = _modules[self.path] = module.__dict__
+        target: Any = namespace[self.qualname.split(".")[0]]
+        for part in self.qualname.split(".")[1:]:
+            target = getattr(target, part)
+        return target(*args, **kwargs)
+
+
+class NodeExecutor:
+    """A pool running node functions, reporting its queue to the engine metrics.
+
+    Calls beyond `workers` wait in the pool's queue; `queued`, `active` and the
+    wait before each call starts are exported under the executor's `kind`.
+    """
+
+    def __init__(self, kind: str, workers: int) -> None:
+        """Create a thread (`kind="sync"`) or process (`kind="cpu"`) executor.
+
+        The pool itself is started on the first call.
+        """
+        self.kind = kind
+        self.workers = workers
+        self._pool: Executor | None = None
+        self._in_flight = 0
+        self._queued_gauge = engine_metrics.executor_queued.labels(kind)
+        self._active_gauge = engine_metrics.executor_active.labels(kind)
+        self._wait = engine_metrics.executor_wait.labels(kind)
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(self._in_flight - self.workers, 0)
+
+    @property
+    def active(self) -> int:
+        """Calls running on a worker."""
+        return min(self._in_flight, self.workers)
+
+    def describe(self) -> dict[str, int]:
+        """Pool size and current load, for the agent's infos."""
+        return {"workers": self.workers, "active": self.active, "queued": self.queued}
+
+    def _start(self) -> Executor:
+        if self.kind == "cpu":
+            # Forking a process running the event loop's threads is unsafe
+            return ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return ThreadPoolExecutor(self.workers, thread_name_prefix="idun-node")
+
+    def _track(self, delta: int) -> None:
+        queued, active = self.queued, self.active
+        self._in_flight += delta
+        self._queued_gauge.inc(self.queued - queued)
+        self._active_gauge.inc(self.active - active)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `func` on the pool and return its result."""
+        call: Callable[[], tuple[float, Any]] = functools.partial(
+            _timed_call, func, args, kwargs
+        )
+        if self.kind != "cpu":
+            # Nodes read their config from context variables, as on LangGraph's executor
+            call = functools.partial(contextvars.copy_context().run, call)
+        if self._pool is None:
+            self._pool = self._start()
+        submitted = time.time()
+        self._track(1)
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(
+                self._pool, call
+            )
+        finally:
+            self._track(-1)
+        self._wait.observe(max(started - submitted, 0.0))
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for running calls; queued ones are dropped."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _sync_function(runnable: Any) -> Callable[..., Any] | None:
+    """The function of a node LangGraph would run on the default executor."""
+    afunc = getattr(runnable, "afunc", None)
+    if (
+        getattr(runnable, "func", None) is not None
+        and isinstance(afunc, functools.partial)
+        and afunc.func is run_in_executor
+    ):
+        func: Callable[..., Any] = runnable.func
+        return func
+    return None
+
+
+def _process_target(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """What to send to a worker process to call `func`.
+
+    Raises:
+        ValueError: If the function cannot be found again in a worker.
+    """
+    try:
+        pickle.dumps(func)
+        return func
+    except (pickle.PicklingError, AttributeError, TypeError):
+        pass
+    qualname = getattr(func, "__qualname__", "")
+    code = getattr(func, "__code__", None)
+    if code is None or "<" in qualname:
+        raise ValueError(
+            f"CPU-bound node '{name}' must be a module-level function to run in a "
+            "worker process."
+        )
+    return _ModuleFunction(os.path.abspath(code.co_filename), qualname)
+
+
+def _routed(runnable: Any, afunc: Callable[..., Any]) -> Any:
+    routed = copy.copy(runnable)
+    routed.afunc = functools.wraps(runnable.func)(afunc)
+    return routed
+
+
+def route_nodes(
+    builder: StateGraph,
+    sync: NodeExecutor | None,
+    cpu: NodeExecutor | None,
+    cpu_nodes: Collection[str] = (),
+) -> StateGraph:
+    """Return a copy of `builder` running its nodes on the given executors.
+
+    Synchronous nodes run on `sync` (LangGraph's default executor when None).
+    Nodes tagged with `cpu_bound` or named in `cpu_nodes` run on `cpu`, or
+    with the other synchronous nodes when it is None. `builder` is unchanged,
+    and returned as is when no node is moved.
+
+    Raises:
+        ValueError: If a name in `cpu_nodes` is not a node of the graph, or a
+            CPU-bound node is not a synchronous function taking only the state.
+    """
+    if unknown := sorted(set(cpu_nodes) - set(builder.nodes)):
+        raise ValueError(f"cpu_nodes {unknown} are not nodes of the graph")
+    nodes = dict(builder.nodes)
+    for name, spec in builder.nodes.items():
+        node: Any = spec.runnable
+        func = _sync_function(node)
+        tagged = name in cpu_nodes or getattr(
+            getattr(node, "func", None), _CPU_BOUND, False
+        )
+        if tagged and cpu is not None:
+            if func is None:
+                raise ValueError(
+                    f"CPU-bound node '{name}' must be a synchronous function."
+                )
+            if node.func_accepts:
+                raise ValueError(
+                    f"CPU-bound node '{name}' runs in a worker process and can only "
+                    f"take the state, not {sorted(node.func_accepts)}."
+                )
+            target = _process_target(name, func)
+            runnable = _routed(node, functools.partial(cpu.run, target))
+        elif func is not None and sync is not None:
+            runnable = _routed(node, functools.partial(sync.run, func))
+        else:
+            continue
+        nodes[name] = dataclasses.replace(spec, runnable=runnable)
+    if nodes == builder.nodes:
+        return builder
+    routed = copy.copy(builder)
+    routed.nodes = nodes
+    return routed
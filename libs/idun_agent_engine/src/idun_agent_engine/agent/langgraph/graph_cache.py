@@ -0,0 +1,115 @@
+"""Process-wide cache of loaded and compiled LangGraph graphs.
+
+Loading a graph executes the user's module and compiling it validates the whole
+graph; both repeat on every agent initialization (startup, hot reload, several
+apps in one process). Entries are keyed by a fingerprint of the module source
+and of the local modules it imports, so an unchanged graph is executed once per
+process and compiled once per checkpointer and store.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ..sources import evict_local_modules, local_sources, source_fingerprint
+
+__all__ = [
+    "MAX_ENTRIES",
+    "GraphCache",
+    "evict_local_modules",
+    "graph_cache",
+    "local_sources",
+    "source_fingerprint",
+]
+
+MAX_ENTRIES = 16
+"""Graphs kept at once; the least recently used one is evicted first."""
+
+
+@dataclass
+class _Entry:
+    builder: Any
+    compiled: Any = None
+    checkpointer: Any = None
+    store: Any = None
+
+
+class GraphCache:
+    """LRU of graph builders and their compiled graph, keyed by source fingerprint."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        """Create an empty cache holding up to `max_entries` graphs."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def builder(
+        self, key: tuple[str, str], load: Callable[[], Any]
+    ) -> tuple[Any, bool]:
+        """Return the builder stored under `key`, calling `load` on a miss.
+
+        Returns the builder and whether it came from the cache. `load` runs
+        outside the lock; concurrent misses on the same key may both load it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.builder, True
+            self.misses += 1
+        builder = load()
+        with self._lock:
+            self._entries[key] = _Entry(builder)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return builder, False
+
+    def compiled(self, key: tuple[str, str], checkpointer: Any, store: Any) -> Any:
+        """Return the graph compiled for `key` with the same checkpointer and store."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is None
+                or entry.compiled is None
+                or entry.checkpointer is not checkpointer
+                or entry.store is not store
+            ):
+                return None
+            return entry.compiled
+
+    def store_compiled(
+        self, key: tuple[str, str], compiled: Any, checkpointer: Any, store: Any
+    ) -> None:
+        """Remember the graph compiled for `key` with `checkpointer` and `store`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.compiled = compiled
+                entry.checkpointer = checkpointer
+                entry.store = store
+
+    def clear(self) -> None:
+        """Drop every cached graph."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the entry count and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+graph_cache = GraphCache()
+"""Graphs loaded by LangGraph agents in this process."""
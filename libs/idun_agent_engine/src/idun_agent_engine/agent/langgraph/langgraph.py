@@ -1,24 +1,101 @@
 """LangGraph agent adapter implementing the BaseAgent protocol."""
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import importlib.util
+import logging
+import os
+import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from pathlib import Path
 from typing import Any
 
 import aiosqlite
 from ag_ui.core import events as ag_events
 from ag_ui.core import types as ag_types
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import StateGraph
 
 from idun_agent_engine import observability
 from idun_agent_engine.agent import base as agent_base
 from idun_agent_engine.agent.langgraph import langgraph_model as lg_model
+from idun_agent_engine.agent.langgraph.checkpoint import TracedAsyncSqliteSaver
+from idun_agent_engine.agent.langgraph.executors import NodeExecutor, route_nodes
+from idun_agent_engine.agent.langgraph.graph_cache import graph_cache
+from idun_agent_engine.agent.sources import source_fingerprint
+from idun_agent_engine.debug import TimelineCallback, current_timeline, slow_runs
+from idun_agent_engine.log import log_context
+from idun_agent_engine.metrics import StreamTimer, engine_metrics, node_profiler
+from idun_agent_engine.observability.sampling import TraceSampler, sampling_scope
+from idun_agent_engine.observability.tracing import engine_tracer
+from idun_agent_engine.usage import (
+    RunUsage,
+    TokenBudgetExceededError,
+    UsageCallback,
+    usage_tracker,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _TranslationClock:
+    """Splits the time spent producing ag-ui events between graph and translation.
+
+    `graph` wraps the LangGraph event stream and `translated` wraps the ag-ui
+    event stream built from it; time spent waiting on the consumer is excluded.
+    """
+
+    def __init__(self) -> None:
+        """Start with empty counters."""
+        self.graph_seconds = 0.0
+        self.total_seconds = 0.0
+        self.graph_events = 0
+        self.emitted = 0
+
+    async def graph(self, events: AsyncIterator[Any]) -> AsyncGenerator[Any]:
+        """Re-yield LangGraph events, timing the graph."""
+        while True:
+            start = time.perf_counter()
+            try:
+                event = await anext(events)
+            except StopAsyncIteration:
+                break
+            finally:
+                self.graph_seconds += time.perf_counter() - start
+            self.graph_events += 1
+            yield event
+
+    async def translated(self, events: AsyncIterator[Any]) -> AsyncGenerator[Any]:
+        """Re-yield ag-ui events, timing graph and translation together."""
+        while True:
+            start = time.perf_counter()
+            try:
+                event = await anext(events)
+            except StopAsyncIteration:
+                break
+            finally:
+                self.total_seconds += time.perf_counter() - start
+            self.emitted += 1
+            yield event
+
+    def attributes(self) -> dict[str, Any]:
+        """Span attributes describing the run's event stream."""
+        return {
+            "idun.graph.events": self.graph_events,
+            "idun.graph.ms": self.graph_seconds * 1000,
+            "idun.events.count": self.emitted,
+            "idun.events.translate_ms": (self.total_seconds - self.graph_seconds)
+            * 1000,
+        }
 
 
 class LanggraphAgent(agent_base.BaseAgent):
     """LangGraph agent adapter implementing the BaseAgent protocol."""
 
+    config_model = lg_model.LangGraphAgentConfig
+
     def __init__(self):
         """Initialize an unconfigured LanggraphAgent with default state."""
         self._id = str(uuid.uuid4())
@@ -29,6 +106,10 @@ class LanggraphAgent(agent_base.BaseAgent):
         self._checkpointer: Any = None
         self._store: Any = None
         self._connection: Any = None
+        self._persistence_donor: LanggraphAgent | None = None
+        self._node_executors: list[NodeExecutor] = []
+        self._fingerprint: str | None = None
+        self._source_fingerprint: str | None = None
         self._configuration: lg_model.LangGraphAgentConfig | None = None
         self._name: str = "Unnamed LangGraph Agent"
         self._infos: dict[str, Any] = {
@@ -37,8 +118,11 @@ class LanggraphAgent(agent_base.BaseAgent):
             "id": self._id,
         }
         # Observability (provider-agnostic)
+        self._obs_handler: observability.ObservabilityHandlerBase | None = None
         self._obs_callbacks: list[Any] | None = None
         self._obs_run_name: str | None = None
+        self._obs_task: asyncio.Task[None] | None = None
+        self._sampler: TraceSampler | None = None
 
     @property
     def id(self) -> str:
@@ -87,16 +171,52 @@ class LanggraphAgent(agent_base.BaseAgent):
             raise RuntimeError("Agent not configured. Call initialize() first.")
         return self._configuration
 
+    @property
+    def fingerprint(self) -> str:
+        """Return a digest of the configuration and the graph module source."""
+        if self._fingerprint is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        return self._fingerprint
+
+    @property
+    def persistence_path(self) -> str | None:
+        """Return the SQLite checkpointer file, when one is configured."""
+        if self._configuration is None:
+            return None
+        checkpointer = self._configuration.checkpointer
+        if isinstance(checkpointer, lg_model.SqliteCheckpointConfig):
+            return checkpointer.db_path
+        return None
+
     @property
     def infos(self) -> dict[str, Any]:
         """Return diagnostic information about the agent instance."""
         self._infos["underlying_agent_type"] = (
             str(type(self._agent_instance)) if self._agent_instance else "N/A"
         )
+        if self._node_executors:
+            self._infos["executors"] = {
+                e.kind: e.describe() for e in self._node_executors
+            }
         return self._infos
 
     async def initialize(self, config: lg_model.LangGraphAgentConfig) -> None:
-        """Initialize the LangGraph agent asynchronously."""
+        """Initialize the LangGraph agent asynchronously.
+
+        A failed initialization releases what was set up so far; a connection
+        shared by the agent being replaced stays with that agent.
+        """
+        try:
+            await self._initialize(config)
+        except BaseException:
+            self._persistence_donor = None
+            await self.close()
+            raise
+        donor, self._persistence_donor = self._persistence_donor, None
+        if donor is not None:
+            self._connection, donor._connection = donor._connection, None
+
+    async def _initialize(self, config: lg_model.LangGraphAgentConfig) -> None:
         self._configuration = lg_model.LangGraphAgentConfig.model_validate(config)
 
         self._name = self._configuration.name or "Unnamed LangGraph Agent"
@@ -135,25 +255,33 @@ class LanggraphAgent(agent_base.BaseAgent):
             if provider == "langfuse" and not options.get("run_name"):
                 options["run_name"] = self._name
 
-            handler, info = observability.create_observability_handler(
-                {
-                    "provider": provider,
-                    "enabled": True,
-                    "options": options,
-                }
+            handler_config = {
+                "provider": provider,
+                "enabled": True,
+                "options": options,
+                "export": getattr(obs_cfg, "export", None),
+                "providers": getattr(obs_cfg, "providers", None) or [],
+            }
+            # Provider setup imports SDKs and may call the collector: run it in the
+            # background so neither startup nor requests wait on it. Runs started
+            # before it completes are simply not traced.
+            self._infos["observability"] = {
+                "enabled": True,
+                "provider": provider or "multi",
+                "status": "initializing",
+            }
+            self._sampler = TraceSampler(getattr(obs_cfg, "sampling", None))
+            self._infos["sampling"] = self._sampler.describe()
+            self._obs_task = asyncio.create_task(
+                self._setup_observability(
+                    handler_config, getattr(obs_cfg, "init_timeout_seconds", 10.0)
+                )
             )
-            if handler:
-                self._obs_callbacks = handler.get_callbacks()
-                self._obs_run_name = handler.get_run_name()
-            if info:
-                self._infos["observability"] = dict(info)
 
-        graph_builder = self._load_graph_builder(self._configuration.graph_definition)
+        await self._load_graph()
         self._infos["graph_definition"] = self._configuration.graph_definition
-
-        self._agent_instance = graph_builder.compile(
-            checkpointer=self._checkpointer, store=self._store
-        )
+        self._fingerprint = self._compute_fingerprint()
+        self._infos["fingerprint"] = self._fingerprint
 
         if self._agent_instance:
             self._input_schema = self._agent_instance.input_schema
@@ -167,18 +295,103 @@ class LanggraphAgent(agent_base.BaseAgent):
         self._infos["status"] = "Initialized"
         self._infos["config_used"] = self._configuration.model_dump()
 
+    async def _setup_observability(
+        self, handler_config: dict[str, Any], timeout: float
+    ) -> None:
+        """Create the observability handler off the event loop, bounded by `timeout`."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        try:
+            handler, info = await asyncio.wait_for(
+                asyncio.to_thread(
+                    observability.create_observability_handler, handler_config
+                ),
+                timeout,
+            )
+        except TimeoutError:
+            self._infos["observability"]["status"] = "timed_out"
+            logger.warning("Observability setup did not finish within %ss", timeout)
+            return
+        except Exception as e:  # noqa: BLE001
+            self._infos["observability"]["status"] = "failed"
+            logger.warning("Observability setup failed: %s", e)
+            return
+
+        info = dict(info or {})
+        if handler:
+            self._obs_handler = handler
+            self._obs_callbacks = handler.get_callbacks()
+            self._obs_run_name = handler.get_run_name()
+            # Credential checks are informational; tracing is already enabled
+            remaining = max(deadline - asyncio.get_running_loop().time(), 0.0)
+            try:
+                verified = await asyncio.wait_for(
+                    asyncio.to_thread(handler.verify), remaining
+                )
+            except Exception:  # noqa: BLE001
+                verified = None
+            if verified is not None:
+                info["verified"] = verified
+        info["status"] = "ready"
+        self._infos["observability"] = info
+
+    def adopt_persistence(self, previous: agent_base.BaseAgent) -> None:
+        """Share the checkpointer of the LangGraph agent being replaced.
+
+        The checkpointer is only reused in `_setup_persistence` when its
+        configuration is unchanged. Ownership of the connection moves to this
+        instance once it is fully initialized, so closing the previous one
+        leaves it open while a failed reload leaves it with the previous one.
+        """
+        if isinstance(previous, LanggraphAgent):
+            self._persistence_donor = previous
+
+    async def warmup(self, queries: list[str]) -> None:
+        """Open persistence eagerly, then run the synthetic warmup queries."""
+        if self._agent_instance is None:
+            raise RuntimeError(
+                "Agent not initialized. Call initialize() before warming up."
+            )
+        # The SQLite saver creates its tables lazily on first access; do it now so
+        # the first real request does not pay for it.
+        if self._checkpointer is not None and hasattr(self._checkpointer, "setup"):
+            await self._checkpointer.setup()
+        await super().warmup(queries)
+
     async def close(self):
-        """Closes any open resources, like database connections."""
+        """Flushes observability, then closes open resources like database connections."""
+        for executor in self._node_executors:
+            executor.shutdown()
+        if self._obs_task is not None and not self._obs_task.done():
+            self._obs_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._obs_task
+        if self._obs_handler is not None:
+            await asyncio.to_thread(self._obs_handler.flush)
         if self._connection:
             await self._connection.close()
             self._connection = None
-            print("Database connection closed.")
+            logger.debug("Database connection closed")
 
     async def _setup_persistence(self) -> None:
         """Configures the agent's persistence (checkpoint and store) asynchronously."""
         if not self._configuration:
             return
 
+        donor, self._persistence_donor = self._persistence_donor, None
+        if (
+            donor is not None
+            and donor._connection is not None
+            and donor._configuration is not None
+            and donor._configuration.checkpointer == self._configuration.checkpointer
+        ):
+            # Borrowed until `initialize` succeeds and takes the connection over
+            self._persistence_donor = donor
+            self._checkpointer = donor._checkpointer
+            self._store = donor._store
+            self._infos["checkpointer"] = donor._infos.get("checkpointer")
+            self._infos["checkpointer_shared"] = True
+            return
+
         if self._configuration.checkpointer:
             if isinstance(
                 self._configuration.checkpointer, lg_model.SqliteCheckpointConfig
@@ -186,7 +399,7 @@ class LanggraphAgent(agent_base.BaseAgent):
                 self._connection = await aiosqlite.connect(
                     self._configuration.checkpointer.db_path
                 )
-                self._checkpointer = AsyncSqliteSaver(conn=self._connection)
+                self._checkpointer = TracedAsyncSqliteSaver(conn=self._connection)
                 self._infos["checkpointer"] = (
                     self._configuration.checkpointer.model_dump()
                 )
@@ -196,6 +409,110 @@ class LanggraphAgent(agent_base.BaseAgent):
         if self._configuration.store:
             raise NotImplementedError("Store functionality is not yet implemented.")
 
+    def _run_config(
+        self, thread_id: str, message: dict[str, Any]
+    ) -> tuple[dict[str, Any], bool | None]:
+        """Build the graph run config, attaching callbacks only to sampled runs.
+
+        Also returns the sampling decision, or None when tracing is not configured.
+        """
+        config: dict[str, Any] = {"configurable": {"thread_id": thread_id}}
+        if self._sampler is None:
+            return config, None
+        sampled = self._sampler.decide(thread_id, message.get("trace"))
+        if sampled and self._obs_callbacks:
+            config["callbacks"] = self._obs_callbacks
+            if self._obs_run_name:
+                config["run_name"] = self._obs_run_name
+        return config, sampled
+
+    async def _load_graph(self) -> None:
+        """Load and compile the graph, reusing the process-wide graph cache.
+
+        Loading executes user code and compiling can be slow; both run off the
+        event loop so a hot reload does not stall requests being served.
+        """
+        assert self._configuration is not None
+        graph_definition = self._configuration.graph_definition
+        module_path, _, variable = graph_definition.rpartition(":")
+        start = time.perf_counter()
+        try:
+            self._source_fingerprint = await asyncio.to_thread(
+                source_fingerprint, module_path
+            )
+        except OSError:
+            # Unreadable or malformed definition: loading reports the error
+            self._source_fingerprint = None
+        fingerprinted = time.perf_counter()
+
+        use_cache = self._configuration.cache_graph and bool(self._source_fingerprint)
+        key = (self._source_fingerprint or "", variable)
+        load = functools.partial(self._load_graph_builder, graph_definition)
+        if use_cache:
+            graph_builder, cached = await asyncio.to_thread(
+                graph_cache.builder, key, load
+            )
+        else:
+            graph_builder, cached = await asyncio.to_thread(load), False
+        graph_builder = self._route_nodes(graph_builder)
+        # Routed nodes call this instance's executors: their graph is not shared
+        routed = bool(self._node_executors)
+        loaded = time.perf_counter()
+
+        compiled = (
+            graph_cache.compiled(key, self._checkpointer, self._store)
+            if use_cache and not routed
+            else None
+        )
+        compiled_cached = compiled is not None
+        if compiled is None:
+            compiled = await asyncio.to_thread(
+                graph_builder.compile,
+                checkpointer=self._checkpointer,
+                store=self._store,
+            )
+            if use_cache and not routed:
+                graph_cache.store_compiled(
+                    key, compiled, self._checkpointer, self._store
+                )
+        self._agent_instance = compiled
+
+        self._infos["graph_load"] = {
+            "cache": ("hit" if cached else "miss") if use_cache else "disabled",
+            "compiled_from_cache": compiled_cached,
+            "fingerprint_ms": round((fingerprinted - start) * 1000, 3),
+            "load_ms": round((loaded - fingerprinted) * 1000, 3),
+            "compile_ms": round((time.perf_counter() - loaded) * 1000, 3),
+        }
+
+    def _route_nodes(self, graph_builder: StateGraph) -> StateGraph:
+        """Move synchronous and CPU-bound nodes to the configured executors."""
+        assert self._configuration is not None
+        config = self._configuration.executors
+        sync = (
+            NodeExecutor("sync", config.sync_workers) if config.sync_workers else None
+        )
+        cpu = (
+            NodeExecutor("cpu", config.cpu_workers or os.cpu_count() or 1)
+            if config.cpu_workers != 0
+            else None
+        )
+        routed = route_nodes(graph_builder, sync, cpu, config.cpu_nodes)
+        if routed is not graph_builder:
+            self._node_executors = [e for e in (sync, cpu) if e is not None]
+        return routed
+
+    def _compute_fingerprint(self) -> str:
+        """Digest the validated configuration and the graph sources."""
+        assert self._configuration is not None
+        digest = hashlib.sha256(self._configuration.model_dump_json().encode())
+        if self._source_fingerprint:
+            digest.update(self._source_fingerprint.encode())
+        else:
+            module_path = self._configuration.graph_definition.rsplit(":", 1)[0]
+            digest.update(Path(module_path).read_bytes())
+        return digest.hexdigest()
+
     def _load_graph_builder(self, graph_definition: str) -> StateGraph:
         """Loads a StateGraph instance from a specified path."""
         try:
@@ -213,7 +530,13 @@ class LanggraphAgent(agent_base.BaseAgent):
                 raise ImportError(f"Could not load spec for module at {module_path}")
 
             module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            # Compile from source rather than exec_module: the bytecode cache is
+            # validated by whole-second mtime and size, which can serve a stale
+            # graph when the file is edited quickly during hot reloads. Future
+            # imports of this module must not leak into user code either.
+            source = Path(module_path).read_bytes()
+            code = compile(source, module_path, "exec", dont_inherit=True)
+            exec(code, module.__dict__)
 
             graph_builder = getattr(module, graph_variable_name)
         except (FileNotFoundError, ImportError, AttributeError) as e:
@@ -248,13 +571,30 @@ class LanggraphAgent(agent_base.BaseAgent):
             )
 
         graph_input = {"messages": [("user", message["query"])]}
-        config: dict[str, Any] = {"configurable": {"thread_id": message["session_id"]}}
-        if self._obs_callbacks:
-            config["callbacks"] = self._obs_callbacks
-            if self._obs_run_name:
-                config["run_name"] = self._obs_run_name
-
-        output = await self._agent_instance.ainvoke(graph_input, config)
+        config, sampled = self._run_config(message["session_id"], message)
+        run_usage = usage_tracker.start_run(self._name, message["session_id"])
+        callbacks = list(config.get("callbacks", ()))
+        if node_profiler.enabled:
+            callbacks.append(node_profiler.callback)
+        if run_usage is not None:
+            callbacks.append(UsageCallback(usage_tracker, run_usage))
+        if callbacks:
+            config["callbacks"] = callbacks
+
+        with (
+            slow_runs.track(None, message["session_id"], "invoke") as timeline,
+            engine_tracer.span(
+                "idun.agent.invoke",
+                {"idun.agent": self._name, "idun.session_id": message["session_id"]},
+            ),
+            sampling_scope(sampled),
+        ):
+            if timeline is not None:
+                config["callbacks"] = [
+                    *config.get("callbacks", ()),
+                    TimelineCallback(timeline),
+                ]
+            output = await self._agent_instance.ainvoke(graph_input, config)
 
         if output and "messages" in output and output["messages"]:
             response_message = output["messages"][-1]
@@ -291,22 +631,75 @@ class LanggraphAgent(agent_base.BaseAgent):
                 "Unsupported message format for process_message_stream. Expects {'query': str, 'session_id': str}"
             )
 
-        config: dict[str, Any] = {"configurable": {"thread_id": thread_id}}
-        if self._obs_callbacks:
-            config["callbacks"] = self._obs_callbacks
-            if self._obs_run_name:
-                config["run_name"] = self._obs_run_name
-
+        config, sampled = self._run_config(thread_id, message)
+        try:
+            run_usage = usage_tracker.start_run(self._name, thread_id)
+        except TokenBudgetExceededError as e:
+            yield ag_events.RunErrorEvent(
+                type=ag_events.EventType.RUN_ERROR, message=str(e), code=e.code
+            )
+            return
+        graph_events = self._agent_instance.astream_events(
+            graph_input, config=config, version="v2"
+        )
+        with (
+            slow_runs.track(run_id, thread_id, "stream"),
+            engine_tracer.span(
+                "idun.agent.stream",
+                {
+                    "idun.agent": self._name,
+                    "idun.session_id": thread_id,
+                    "idun.run_id": run_id,
+                },
+            ) as span,
+            sampling_scope(sampled),
+            log_context(run_id=run_id),
+        ):
+            if not engine_tracer.enabled:
+                async for event in self._translate_events(
+                    graph_events, run_id, thread_id, run_usage
+                ):
+                    yield event
+                return
+
+            clock = _TranslationClock()
+            async for event in clock.translated(
+                self._translate_events(
+                    clock.graph(graph_events), run_id, thread_id, run_usage
+                )
+            ):
+                yield event
+            span.set_attributes(clock.attributes())
+
+    async def _translate_events(
+        self,
+        graph_events: AsyncIterator[Any],
+        run_id: str,
+        thread_id: str,
+        run_usage: RunUsage | None = None,
+    ) -> AsyncGenerator[Any]:
+        """Translate the graph's LangGraph events into ag-ui events.
+
+        Model token usage is added to `run_usage`; if the session goes over its
+        budget the stream ends with a `RunErrorEvent` instead of `RunFinished`.
+        """
         current_message_id: str | None = None
         current_tool_call_id: str | None = None
         tool_call_name: str | None = None
         current_step_name = None
+        stream_timer = StreamTimer(engine_metrics)
+        node_timer = node_profiler.run_timer()
+        timeline = current_timeline()
 
-        async for event in self._agent_instance.astream_events(
-            graph_input, config=config, version="v2"
-        ):
+        async for event in graph_events:
             kind = event["event"]
             name = event["name"]
+            if node_timer is not None:
+                node_timer.observe(event)
+            if timeline is not None:
+                timeline.event(
+                    kind, name, event.get("metadata", {}).get("langgraph_node")
+                )
 
             if kind == "on_chain_start":
                 current_step_name = name
@@ -337,6 +730,20 @@ class LanggraphAgent(agent_base.BaseAgent):
             elif kind == "on_llm_end":
                 yield ag_events.ThinkingEndEvent(type=ag_events.EventType.THINKING_END)
 
+            elif kind == "on_chat_model_end":
+                if run_usage is not None:
+                    try:
+                        usage_tracker.record(
+                            run_usage, event["data"].get("output"), event["metadata"]
+                        )
+                    except TokenBudgetExceededError as e:
+                        yield ag_events.RunErrorEvent(
+                            type=ag_events.EventType.RUN_ERROR,
+                            message=str(e),
+                            code=e.code,
+                        )
+                        return
+
             elif kind == "on_chat_model_stream":
                 chunk = event["data"]["chunk"]
                 if not current_message_id and (chunk.content or chunk.tool_calls):
@@ -348,6 +755,7 @@ class LanggraphAgent(agent_base.BaseAgent):
                     )
 
                 if chunk.content:
+                    stream_timer.token()
                     yield ag_events.TextMessageContentEvent(
                         type=ag_events.EventType.TEXT_MESSAGE_CONTENT,
                         message_id=current_message_id or "",
@@ -415,6 +823,10 @@ class LanggraphAgent(agent_base.BaseAgent):
                 type=ag_events.EventType.TEXT_MESSAGE_END, message_id=current_message_id or ""
             )
 
+        stream_timer.finish()
         yield ag_events.RunFinishedEvent(
-            type=ag_events.EventType.RUN_FINISHED, run_id=run_id, thread_id=thread_id
+            type=ag_events.EventType.RUN_FINISHED,
+            run_id=run_id,
+            thread_id=thread_id,
+            result={"usage": run_usage.to_dict()} if run_usage is not None else None,
         )
@@ -3,7 +3,7 @@
 from typing import Any, Literal
 from urllib.parse import urlparse
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 from idun_agent_engine.agent.model import BaseAgentConfig
 
@@ -34,6 +34,24 @@ class SqliteCheckpointConfig(BaseModel):
         return path
 
 
+class NodeExecutorConfig(BaseModel):
+    """Executors running the graph's synchronous and CPU-bound nodes.
+
+    Attributes:
+        sync_workers: Threads of a pool dedicated to synchronous nodes. When
+            unset they run on the event loop's default executor, shared with
+            the rest of the process.
+        cpu_workers: Processes running CPU-bound nodes (those tagged with
+            `cpu_bound` or named in `cpu_nodes`); defaults to the CPU count.
+            0 runs them with the other synchronous nodes.
+        cpu_nodes: Names of further nodes to treat as CPU-bound.
+    """
+
+    sync_workers: int | None = Field(default=None, gt=0)
+    cpu_workers: int | None = Field(default=None, ge=0)
+    cpu_nodes: list[str] = Field(default_factory=list)
+
+
 # A single checkpointer type for now (kept as alias for future extension).
 CheckpointConfig = SqliteCheckpointConfig
 
@@ -45,5 +63,8 @@ class LangGraphAgentConfig(BaseAgentConfig):
     """
 
     graph_definition: str
+    # Reuse the graph loaded and compiled from identical sources in this process
+    cache_graph: bool = True
     checkpointer: CheckpointConfig | None = None
+    executors: NodeExecutorConfig = Field(default_factory=NodeExecutorConfig)
     store: dict[str, Any] | None = None  # Placeholder for store config
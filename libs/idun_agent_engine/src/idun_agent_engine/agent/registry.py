@@ -0,0 +1,215 @@
+"""Registry of agent adapters, resolved lazily by agent type.
+
+Each adapter pairs a `BaseAgent` subclass with the configuration model of its
+`agent.config` block. Adapters are referenced by `module:attribute` paths and
+imported only when their type is selected, so installing more frameworks does
+not slow startup down.
+
+Built-in adapters are registered below. Third-party packages add theirs through
+the `idun_agent_engine.adapters` entry point group: the entry point name is the
+agent type and its value points either to an `AdapterSpec` or directly to the
+agent class, whose `config_model` attribute names its configuration model::
+
+    [project.entry-points."idun_agent_engine.adapters"]
+    myframework = "my_package.adapter:MyFrameworkAgent"
+
+Entry points are only scanned when a type is not a built-in one.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any
+
+from .base import BaseAgent
+from .model import BaseAgentConfig
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "idun_agent_engine.adapters"
+
+
+def _resolve(reference: Any) -> Any:
+    """Import a `module:attribute` reference; other objects are returned as is."""
+    if not isinstance(reference, str):
+        return reference
+    module_name, _, attribute = reference.partition(":")
+    target: Any = importlib.import_module(module_name)
+    for part in attribute.split(".") if attribute else ():
+        target = getattr(target, part)
+    return target
+
+
+@dataclass
+class AdapterSpec:
+    """An agent adapter and the configuration model of its `config` block.
+
+    Attributes:
+        agent: Agent class, or `module:Class` to import it on first use.
+        config: Configuration model, or `module:Model`. Defaults to the agent
+            class's `config_model`.
+        description: One-line summary shown when listing adapters.
+    """
+
+    agent: Any
+    config: Any = None
+    description: str = ""
+    _agent_class: type[BaseAgent] | None = field(default=None, init=False, repr=False)
+    _config_model: type[BaseAgentConfig] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def agent_class(self) -> type[BaseAgent]:
+        """Import and return the agent class."""
+        if self._agent_class is None:
+            agent_class = self._import(self.agent)
+            if not (
+                isinstance(agent_class, type) and issubclass(agent_class, BaseAgent)
+            ):
+                raise ValueError(f"{self.agent!r} is not a BaseAgent subclass.")
+            self._agent_class = agent_class
+        return self._agent_class
+
+    def config_model(self) -> type[BaseAgentConfig]:
+        """Import and return the configuration model.
+
+        When the spec names no model, the agent class (and so its framework) is
+        imported to read its `config_model`.
+        """
+        if self._config_model is None:
+            if self.config is None:
+                config_model = self.agent_class().config_model
+            else:
+                config_model = self._import(self.config)
+            if not (
+                isinstance(config_model, type)
+                and issubclass(config_model, BaseAgentConfig)
+            ):
+                raise ValueError(f"{self.config!r} is not a BaseAgentConfig subclass.")
+            self._config_model = config_model
+        return self._config_model
+
+    @staticmethod
+    def _import(reference: Any) -> Any:
+        try:
+            return _resolve(reference)
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"Could not import adapter {reference!r}: {e}") from e
+
+
+class AgentRegistry:
+    """Maps agent types (case-insensitive) to their adapter."""
+
+    def __init__(self, group: str | None = ENTRY_POINT_GROUP) -> None:
+        """Create a registry discovering entry points in `group` (None disables it)."""
+        self.group = group
+        self._adapters: dict[str, tuple[str, AdapterSpec]] = {}
+        self._entry_points: dict[str, EntryPoint] | None = None
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        agent: Any,
+        config: Any = None,
+        description: str = "",
+    ) -> None:
+        """Register an adapter for agent type `name`, replacing any previous one.
+
+        Args:
+            name: Agent type, as written in `agent.type`.
+            agent: Agent class or `module:Class` reference.
+            config: Configuration model or `module:Model` reference; defaults
+                to the agent class's `config_model`.
+            description: One-line summary of the adapter.
+        """
+        with self._lock:
+            self._adapters[name.lower()] = (
+                name,
+                AdapterSpec(agent, config, description),
+            )
+
+    def discover(self) -> None:
+        """Scan installed packages for adapter entry points, without importing them."""
+        found: dict[str, EntryPoint] = {}
+        if self.group is not None:
+            for entry_point in entry_points(group=self.group):
+                found.setdefault(entry_point.name.lower(), entry_point)
+        with self._lock:
+            self._entry_points = found
+
+    def _spec(self, name: str) -> AdapterSpec:
+        key = name.lower()
+        with self._lock:
+            registered = self._adapters.get(key)
+        if registered is not None:
+            return registered[1]
+        if self._entry_points is None:
+            self.discover()
+        assert self._entry_points is not None
+        entry_point = self._entry_points.get(key)
+        if entry_point is None:
+            raise ValueError(
+                f"Unsupported agent type: {name}. "
+                f"Available types: {', '.join(self.names())}"
+            )
+        try:
+            target = entry_point.load()
+        except Exception as e:
+            raise ValueError(
+                f"Could not load the '{name}' adapter from {entry_point.value}: {e}"
+            ) from e
+        spec = target if isinstance(target, AdapterSpec) else AdapterSpec(target)
+        logger.debug("Loaded agent adapter '%s' from %s", name, entry_point.value)
+        with self._lock:
+            self._adapters.setdefault(key, (entry_point.name, spec))
+            return self._adapters[key][1]
+
+    def names(self) -> list[str]:
+        """Return the registered and discoverable agent types."""
+        if self._entry_points is None:
+            self.discover()
+        with self._lock:
+            names = {key: name for key, (name, _) in self._adapters.items()}
+            for key, entry_point in (self._entry_points or {}).items():
+                names.setdefault(key, entry_point.name)
+        return sorted(names.values())
+
+    def agent_class(self, name: str) -> type[BaseAgent]:
+        """Return the agent class of type `name`, importing it if needed."""
+        return self._spec(name).agent_class()
+
+    def config_model(self, name: str) -> type[BaseAgentConfig]:
+        """Return the configuration model of type `name`, importing it if needed."""
+        return self._spec(name).config_model()
+
+    def create(self, name: str) -> BaseAgent:
+        """Instantiate an (uninitialized) agent of type `name`."""
+        return self.agent_class(name)()
+
+
+agent_registry = AgentRegistry()
+"""Process-wide adapter registry used to resolve `agent.type`."""
+
+agent_registry.register(
+    "langgraph",
+    "idun_agent_engine.agent.langgraph.langgraph:LanggraphAgent",
+    "idun_agent_engine.agent.langgraph.langgraph_model:LangGraphAgentConfig",
+    "LangGraph StateGraph loaded from a Python file",
+)
+agent_registry.register(
+    "CREWAI",
+    "idun_agent_engine.agent.crewai.crewai:CrewAIAgent",
+    "idun_agent_engine.agent.crewai.crewai_model:CrewAIAgentConfig",
+    "CrewAI crew loaded from a Python file, run on a thread pool",
+)
+agent_registry.register(
+    "ADK",
+    "idun_agent_engine.agent.adk.adk:AdkAgent",
+    "idun_agent_engine.agent.adk.adk_model:AdkAgentConfig",
+    "Google ADK agent loaded from a Python file, streamed natively",
+)
@@ -0,0 +1,87 @@
+"""Source files of a user's agent module and of the local modules it imports.
+
+Adapters fingerprint these files to cache what they load from an unchanged
+definition, and the hot reloader watches and re-imports them. Nothing here
+depends on an agent framework.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import sys
+from pathlib import Path
+
+
+def _imported_modules(tree: ast.Module) -> set[str]:
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _local_module(root: Path, name: str) -> Path | None:
+    base = root.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def local_sources(module_path: str | Path) -> list[Path]:
+    """Return a module and the modules next to it that it imports, recursively.
+
+    Imports are resolved against the module's directory, which is where local
+    helper modules live; installed packages are not followed.
+    """
+    entry = Path(module_path).resolve()
+    root = entry.parent
+    seen: dict[Path, None] = {}
+    pending = [entry]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen[path] = None
+        try:
+            tree = ast.parse(path.read_bytes(), str(path))
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for name in sorted(_imported_modules(tree)):
+            local = _local_module(root, name)
+            if local is not None:
+                pending.append(local.resolve())
+    return list(seen)
+
+
+def evict_local_modules(module_path: str | Path) -> list[str]:
+    """Drop the local modules imported by a module from `sys.modules`.
+
+    Executing an edited agent module again would otherwise import its helper
+    modules from `sys.modules`, as they were before the edit. Returns the names
+    of the evicted modules.
+    """
+    sources = set(local_sources(module_path))
+    names = {path.name for path in sources}
+    evicted = []
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file and Path(file).name in names and Path(file).resolve() in sources:
+            del sys.modules[name]
+            evicted.append(name)
+    return evicted
+
+
+def source_fingerprint(module_path: str | Path) -> str:
+    """Digest the source of a module and of its local imports."""
+    digest = hashlib.sha256()
+    for path in sorted(local_sources(module_path)):
+        digest.update(str(path).encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1,46 @@
+"""Benchmarks measuring the engine's overhead under load.
+
+Run `python -m idun_agent_engine.bench` to compare observability
+configurations; see `runner` for the measured quantities. `idun bench` drives
+a single engine with the load generator of `load`.
+"""
+
+from .collectors import StandInCollector
+from .fake_model import FakeStreamingChatModel
+from .load import (
+    LoadResult,
+    LoadSettings,
+    arrival_offsets,
+    format_load_results,
+    run_app,
+    run_load,
+)
+from .runner import (
+    MODES,
+    SCENARIOS,
+    BenchmarkSettings,
+    ModeResult,
+    ScenarioResult,
+    format_results,
+    run_scenario,
+    run_suite,
+)
+
+__all__ = [
+    "MODES",
+    "SCENARIOS",
+    "BenchmarkSettings",
+    "FakeStreamingChatModel",
+    "LoadResult",
+    "LoadSettings",
+    "ModeResult",
+    "ScenarioResult",
+    "StandInCollector",
+    "arrival_offsets",
+    "format_load_results",
+    "format_results",
+    "run_app",
+    "run_load",
+    "run_scenario",
+    "run_suite",
+]
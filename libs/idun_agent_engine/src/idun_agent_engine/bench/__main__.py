@@ -0,0 +1,74 @@
+"""Command line entry point: `python -m idun_agent_engine.bench`."""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from .runner import (
+    MODES,
+    SCENARIOS,
+    BenchmarkSettings,
+    format_results,
+    run_scenario,
+    run_suite,
+)
+
+
+def _parser() -> argparse.ArgumentParser:
+    defaults = BenchmarkSettings()
+    parser = argparse.ArgumentParser(
+        prog="python -m idun_agent_engine.bench",
+        description="Measure throughput, latency, TTFT and CPU per request of the "
+        "engine under each observability configuration.",
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=SCENARIOS,
+        help="Run a single scenario in this process instead of the whole suite.",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--warmup-requests", type=int, default=defaults.warmup_requests)
+    parser.add_argument("--tokens", type=int, default=defaults.tokens)
+    parser.add_argument("--token-delay-ms", type=float, default=defaults.token_delay_ms)
+    parser.add_argument(
+        "--collector-latency-ms", type=float, default=defaults.collector_latency_ms
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns a non-zero status if any request failed."""
+    args = _parser().parse_args(argv)
+    settings = BenchmarkSettings(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup_requests=args.warmup_requests,
+        tokens=args.tokens,
+        token_delay_ms=args.token_delay_ms,
+        collector_latency_ms=args.collector_latency_ms,
+        modes=tuple(args.modes),
+    )
+
+    if args.scenario:
+        results = [asyncio.run(run_scenario(args.scenario, settings))]
+    else:
+        results = run_suite(settings)
+        print(format_results(results))
+
+    if args.output:
+        payload = [r.to_dict() for r in results]
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload[0] if args.scenario else payload, f, indent=2)
+    elif args.scenario:
+        print(format_results(results))
+
+    failed = sum(mode.errors for result in results for mode in result.modes)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Stand-in ADK agent served during benchmarks.
+
+The ADK counterpart of `graphs.streaming_graph`, loaded by path like any user
+agent (`agent_definition`) and shaped by the same `IDUN_BENCH_*` variables, so
+both adapters serve identical replies and tool rounds.
+"""
+
+import asyncio
+import os
+
+from google.adk.agents import LlmAgent
+
+from idun_agent_engine.bench.fake_adk_model import FakeStreamingLlm
+from idun_agent_engine.bench.graphs import (
+    TOKEN_DELAY_ENV,
+    TOKENS_ENV,
+    TOOL_CALLS_ENV,
+    TOOL_LATENCY_ENV,
+)
+
+tool_latency_seconds = float(os.getenv(TOOL_LATENCY_ENV, "0")) / 1000
+
+
+async def lookup(query: str) -> str:
+    """Look the query up (stands in for a remote call)."""
+    if tool_latency_seconds:
+        await asyncio.sleep(tool_latency_seconds)
+    return f"result for {query}"
+
+
+root_agent = LlmAgent(
+    name="bench",
+    model=FakeStreamingLlm(
+        reply=" ".join(f"token{i}" for i in range(int(os.getenv(TOKENS_ENV, "32")))),
+        token_delay_seconds=float(os.getenv(TOKEN_DELAY_ENV, "0")) / 1000,
+        tool_calls=int(os.getenv(TOOL_CALLS_ENV, "0")),
+    ),
+    tools=[lookup],
+)
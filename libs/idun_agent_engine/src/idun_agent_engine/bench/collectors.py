@@ -0,0 +1,119 @@
+"""Local stand-ins for the observability backends used in benchmarks.
+
+`StandInCollector` accepts whatever the Langfuse and Phoenix exporters send
+(OTLP/HTTP spans, Langfuse ingestion batches, credential checks) and answers
+like the real service would, so handlers run their full export path offline.
+"""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class _CollectorRequestHandler(BaseHTTPRequestHandler):
+    server: "_CollectorServer"
+
+    def _reply(self, status: int, body: dict[str, Any]) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        # Langfuse `auth_check()` lists the projects of the key pair
+        self._reply(200, {"data": [{"id": "idun-bench", "name": "idun-bench"}]})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        size = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(size)
+        self.server.record(self.path, size)
+        if self.server.latency_seconds:
+            threading.Event().wait(self.server.latency_seconds)
+        if self.path.endswith("/ingestion"):
+            self._reply(207, {"successes": [], "errors": []})
+        else:
+            self._reply(200, {})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _CollectorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency_seconds: float) -> None:
+        super().__init__(("127.0.0.1", 0), _CollectorRequestHandler)
+        self.latency_seconds = latency_seconds
+        self.requests = 0
+        self.bytes_received = 0
+        self.paths: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, path: str, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += size
+            self.paths[path] += 1
+
+
+class StandInCollector:
+    """HTTP server on a free local port standing in for a tracing backend.
+
+    Use as a context manager; `url` is the base URL to configure as the
+    provider host or collector endpoint.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        """Create the collector; `latency_seconds` delays every export response."""
+        self.latency_seconds = latency_seconds
+        self._server: _CollectorServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running collector."""
+        if self._server is None:
+            raise RuntimeError("Collector not started.")
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "StandInCollector":
+        """Start serving in a background thread."""
+        self._server = _CollectorServer(self.latency_seconds)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="idun-bench-collector", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of export requests and bytes received."""
+        if self._server is None:
+            return {"requests": 0, "bytes": 0}
+        return {
+            "requests": self._server.requests,
+            "bytes": self._server.bytes_received,
+        }
+
+    def requests_by_path(self) -> dict[str, int]:
+        """Return the number of export requests received per URL path."""
+        if self._server is None:
+            return {}
+        return dict(self._server.paths)
+
+    def __enter__(self) -> "StandInCollector":
+        """Start the collector."""
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the collector."""
+        self.stop()
@@ -0,0 +1,84 @@
+"""Deterministic ADK model for benchmarks, the counterpart of `fake_model`."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+
+class FakeStreamingLlm(BaseLlm):
+    """ADK model replying with a fixed text, streamed one word at a time.
+
+    Behaves like `FakeStreamingChatModel`: the same reply split into the same
+    tokens, `token_delay_seconds` between them, and `tool_calls` rounds calling
+    `tool_name` before the reply of each user turn. When streaming, every word
+    is a partial response and the whole reply follows, as Gemini models do.
+    """
+
+    model: str = "idun-bench-fake"
+    reply: str
+    token_delay_seconds: float = 0.0
+    tool_calls: int = 0
+    tool_name: str = "lookup"
+
+    def _tokens(self) -> list[str]:
+        words = self.reply.split(" ")
+        return [words[0], *(f" {word}" for word in words[1:])]
+
+    def _tool_call(self, request: LlmRequest) -> types.FunctionCall | None:
+        """The tool call due in this round of the user turn, if any."""
+        rounds = 0
+        for content in reversed(request.contents):
+            parts = content.parts or []
+            if content.role == "user" and any(p.text for p in parts):
+                break
+            rounds += sum(p.function_response is not None for p in parts)
+        if rounds >= self.tool_calls:
+            return None
+        return types.FunctionCall(
+            id=f"call_{rounds}", name=self.tool_name, args={"query": f"query {rounds}"}
+        )
+
+    def _usage(self, request: LlmRequest) -> types.GenerateContentResponseUsageMetadata:
+        prompt = sum(
+            len((p.text or "").split())
+            for content in request.contents
+            for p in content.parts or []
+        )
+        output = len(self._tokens())
+        return types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt,
+            candidates_token_count=output,
+            total_token_count=prompt + output,
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Yield the tool call or reply, word by word when `stream` is set."""
+        usage = self._usage(llm_request)
+        call = self._tool_call(llm_request)
+        if call is not None:
+            yield LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(function_call=call)]
+                ),
+                usage_metadata=usage,
+            )
+            return
+        if stream:
+            for token in self._tokens():
+                if self.token_delay_seconds:
+                    await asyncio.sleep(self.token_delay_seconds)
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=token)]),
+                    partial=True,
+                )
+        elif self.token_delay_seconds:
+            await asyncio.sleep(self.token_delay_seconds * len(self._tokens()))
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.reply)]),
+            usage_metadata=usage,
+            turn_complete=True,
+        )
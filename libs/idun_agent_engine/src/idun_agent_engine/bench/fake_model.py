@@ -0,0 +1,149 @@
+"""Deterministic chat model for benchmarks."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """Chat model replying with a fixed text, streamed one word at a time.
+
+    `token_delay_seconds` stands in for the model's inter-token latency, so
+    runs are deterministic yet keep the shape of a real streaming call. Usage
+    is reported like a provider would, counting one token per word.
+
+    With `tool_calls` set, each user turn first gets that many responses
+    calling `tool_name`, one per round, before the text reply.
+    """
+
+    reply: str
+    token_delay_seconds: float = 0.0
+    model_name: str = "idun-bench-fake"
+    tool_calls: int = 0
+    tool_name: str = "lookup"
+
+    @property
+    def _llm_type(self) -> str:
+        return "idun-bench-fake"
+
+    def _tokens(self) -> list[str]:
+        words = self.reply.split(" ")
+        return [words[0], *(f" {word}" for word in words[1:])]
+
+    def _tool_call(self, messages: list[BaseMessage]) -> dict[str, Any] | None:
+        """The tool call due in this round of the user turn, if any."""
+        rounds = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            rounds += isinstance(message, ToolMessage)
+        if rounds >= self.tool_calls:
+            return None
+        return {
+            "name": self.tool_name,
+            "args": {"query": f"query {rounds}"},
+            "id": f"call_{rounds}",
+            "type": "tool_call",
+        }
+
+    def _usage(self, messages: list[BaseMessage]) -> UsageMetadata:
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        output_tokens = len(self._tokens())
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tool_call = self._tool_call(messages)
+        message = AIMessage(
+            content="" if tool_call else self.reply,
+            tool_calls=[tool_call] if tool_call else [],
+            usage_metadata=self._usage(messages),
+            response_metadata={"model_name": self.model_name},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.token_delay_seconds:
+            await asyncio.sleep(self.token_delay_seconds * len(self._tokens()))
+        return self._generate(messages, stop, **kwargs)
+
+    def _chunks(self, messages: list[BaseMessage]) -> list[ChatGenerationChunk]:
+        """One chunk per word; the last one carries the usage."""
+        tool_call = self._tool_call(messages)
+        if tool_call is not None:
+            chunk = AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {
+                        "name": tool_call["name"],
+                        "args": json.dumps(tool_call["args"]),
+                        "id": tool_call["id"],
+                        "index": 0,
+                    }
+                ],
+                usage_metadata=self._usage(messages),
+                response_metadata={"model_name": self.model_name},
+            )
+            return [ChatGenerationChunk(message=chunk)]
+        tokens = self._tokens()
+        chunks = [AIMessageChunk(content=token) for token in tokens[:-1]]
+        chunks.append(
+            AIMessageChunk(
+                content=tokens[-1],
+                usage_metadata=self._usage(messages),
+                response_metadata={"model_name": self.model_name},
+            )
+        )
+        return [ChatGenerationChunk(message=chunk) for chunk in chunks]
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from self._chunks(messages)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        for chunk in self._chunks(messages):
+            if self.token_delay_seconds:
+                await asyncio.sleep(self.token_delay_seconds)
+            yield chunk
@@ -0,0 +1,66 @@
+"""Stand-in graphs served during benchmarks.
+
+Loaded by path like any user graph (`graph_definition`). The reply length and
+per-token delay come from `IDUN_BENCH_TOKENS` and `IDUN_BENCH_TOKEN_DELAY_MS`,
+and the tool rounds per turn and tool latency from `IDUN_BENCH_TOOL_CALLS` and
+`IDUN_BENCH_TOOL_LATENCY_MS`, all read when the engine imports this module.
+"""
+
+import asyncio
+import operator
+import os
+from typing import Annotated, Any, TypedDict
+
+from langchain_core.tools import tool
+from langgraph.graph import END, StateGraph
+from langgraph.prebuilt import ToolNode, tools_condition
+
+from idun_agent_engine.bench.fake_model import FakeStreamingChatModel
+
+TOKENS_ENV = "IDUN_BENCH_TOKENS"
+TOKEN_DELAY_ENV = "IDUN_BENCH_TOKEN_DELAY_MS"
+TOOL_CALLS_ENV = "IDUN_BENCH_TOOL_CALLS"
+TOOL_LATENCY_ENV = "IDUN_BENCH_TOOL_LATENCY_MS"
+
+
+class ChatState(TypedDict):
+    """Conversation state: the accumulated message list."""
+
+    messages: Annotated[list, operator.add]
+
+
+def _model() -> FakeStreamingChatModel:
+    tokens = int(os.getenv(TOKENS_ENV, "32"))
+    delay_ms = float(os.getenv(TOKEN_DELAY_ENV, "0"))
+    return FakeStreamingChatModel(
+        reply=" ".join(f"token{i}" for i in range(tokens)),
+        token_delay_seconds=delay_ms / 1000,
+        tool_calls=int(os.getenv(TOOL_CALLS_ENV, "0")),
+    )
+
+
+model = _model()
+tool_latency_seconds = float(os.getenv(TOOL_LATENCY_ENV, "0")) / 1000
+
+
+@tool
+async def lookup(query: str) -> str:
+    """Look the query up (stands in for a remote call)."""
+    if tool_latency_seconds:
+        await asyncio.sleep(tool_latency_seconds)
+    return f"result for {query}"
+
+
+async def chat(state: ChatState) -> dict[str, Any]:
+    """Answer the conversation with the fake model."""
+    return {"messages": [await model.ainvoke(state["messages"])]}
+
+
+streaming_graph = StateGraph(ChatState)
+streaming_graph.add_node("chat", chat)
+streaming_graph.add_node("tools", ToolNode([lookup]))
+streaming_graph.set_entry_point("chat")
+streaming_graph.add_conditional_edges(
+    "chat", tools_condition, {"tools": "tools", END: END}
+)
+streaming_graph.add_edge("tools", "chat")
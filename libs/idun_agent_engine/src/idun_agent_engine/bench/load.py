@@ -0,0 +1,256 @@
+"""Load generator behind `idun bench`.
+
+Requests are sent either in a closed loop, where `concurrency` clients each
+send their next request as soon as the previous one finished, or in an open
+loop, where requests arrive at a fixed `rate` (uniformly spaced or Poisson)
+whatever the engine's response time, with at most `concurrency` in flight. In
+the open loop latency is measured from the scheduled arrival, so time spent
+queued behind a slow engine counts against it.
+
+Streamed runs also report the time to first token and the inter-token latency,
+read from the timing of the `TEXT_MESSAGE_CONTENT` events.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import httpx
+
+from .runner import MODES, percentile, serve
+
+ARRIVALS = ("poisson", "uniform")
+
+
+@dataclass
+class LoadSettings:
+    """Shape of the load sent to each endpoint."""
+
+    modes: tuple[str, ...] = MODES
+    requests: int = 200
+    concurrency: int = 8
+    rate: float | None = None
+    arrival: str = "poisson"
+    seed: int = 0
+    warmup_requests: int = 10
+    timeout_seconds: float = 60.0
+
+    def __post_init__(self) -> None:
+        """Reject settings that cannot describe a run."""
+        if unknown := set(self.modes) - set(MODES):
+            raise ValueError(f"Unknown modes {sorted(unknown)}, expected {MODES}")
+        if self.arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival {self.arrival!r}, expected {ARRIVALS}")
+        if self.requests < 1 or self.concurrency < 1:
+            raise ValueError("requests and concurrency must be at least 1")
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("rate must be positive")
+
+
+@dataclass
+class LoadResult:
+    """Measurements of one endpoint; times are in milliseconds."""
+
+    mode: str
+    requests: int
+    errors: int
+    duration_seconds: float
+    throughput_rps: float
+    offered_rps: float | None
+    latency_ms: dict[str, float]
+    ttft_ms: dict[str, float] | None = None
+    itl_ms: dict[str, float] | None = None
+    tokens_per_second: float | None = None
+    error_samples: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a plain dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class _Sample:
+    latency: float
+    ttft: float | None = None
+    token_gaps: list[float] = field(default_factory=list)
+    tokens: int = 0
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    """p50/p95/p99/max of `values` (seconds) in milliseconds."""
+    summary = {f"p{q}": percentile(values, q) for q in (50, 95, 99)}
+    summary["max"] = max(values, default=0.0)
+    return {key: round(value * 1000, 3) for key, value in summary.items()}
+
+
+def arrival_offsets(
+    requests: int, rate: float, arrival: str = "poisson", seed: int = 0
+) -> list[float]:
+    """Scheduled send times, in seconds from the start, of an open-loop run."""
+    if arrival == "uniform":
+        return [i / rate for i in range(requests)]
+    rng = random.Random(seed)
+    offsets: list[float] = []
+    now = 0.0
+    for _ in range(requests):
+        offsets.append(now)
+        now += rng.expovariate(rate)
+    return offsets
+
+
+async def _send(
+    client: httpx.AsyncClient, mode: str, session_id: str, start: float
+) -> _Sample:
+    """Send one request; timings are relative to `start` (`perf_counter`).
+
+    Raises:
+        RuntimeError: If the engine answers with an error or the stream ends
+            without `RUN_FINISHED`.
+    """
+    payload = {"session_id": session_id, "query": "benchmark"}
+    if mode == "invoke":
+        response = await client.post("/agent/invoke", json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return _Sample(time.perf_counter() - start)
+
+    sample = _Sample(0.0)
+    finished = False
+    last_token: float | None = None
+    async with client.stream("POST", "/agent/stream", json=payload) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        async for line in response.aiter_lines():
+            if "TEXT_MESSAGE_CONTENT" in line:
+                now = time.perf_counter()
+                if last_token is None:
+                    sample.ttft = now - start
+                else:
+                    sample.token_gaps.append(now - last_token)
+                last_token = now
+                sample.tokens += 1
+            elif "RUN_ERROR" in line:
+                raise RuntimeError("RUN_ERROR event")
+            finished = finished or "RUN_FINISHED" in line
+    if not finished:
+        raise RuntimeError("stream ended without RUN_FINISHED")
+    sample.latency = time.perf_counter() - start
+    return sample
+
+
+async def drive(
+    client: httpx.AsyncClient, mode: str, settings: LoadSettings, requests: int
+) -> LoadResult:
+    """Send `requests` requests to `mode` with the load shape of `settings`."""
+    samples: list[_Sample] = []
+    errors: list[str] = []
+
+    async def one(i: int, start: float | None = None) -> None:
+        try:
+            if start is None:
+                start = time.perf_counter()
+            sample = await _send(client, mode, f"bench-{mode}-{i}", start)
+        except (httpx.HTTPError, RuntimeError) as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        else:
+            samples.append(sample)
+
+    began = time.perf_counter()
+    if settings.rate is None:
+        pending = iter(range(requests))
+
+        async def client_loop() -> None:
+            for i in pending:
+                await one(i)
+
+        await asyncio.gather(*(client_loop() for _ in range(settings.concurrency)))
+    else:
+        slots = asyncio.Semaphore(settings.concurrency)
+
+        async def scheduled(i: int, offset: float) -> None:
+            arrival = began + offset
+            await asyncio.sleep(max(arrival - time.perf_counter(), 0.0))
+            async with slots:
+                await one(i, arrival)
+
+        offsets = arrival_offsets(
+            requests, settings.rate, settings.arrival, settings.seed
+        )
+        await asyncio.gather(*(scheduled(i, o) for i, o in enumerate(offsets)))
+    duration = time.perf_counter() - began
+
+    streamed = mode == "stream"
+    ttfts = [s.ttft for s in samples if s.ttft is not None]
+    gaps = [gap for s in samples for gap in s.token_gaps]
+    tokens = sum(s.tokens for s in samples)
+    return LoadResult(
+        mode=mode,
+        requests=requests,
+        errors=len(errors),
+        duration_seconds=round(duration, 3),
+        throughput_rps=round(len(samples) / duration, 2) if duration else 0.0,
+        offered_rps=settings.rate,
+        latency_ms=_summary([s.latency for s in samples]),
+        ttft_ms=_summary(ttfts) if streamed and ttfts else None,
+        itl_ms=_summary(gaps) if streamed and gaps else None,
+        tokens_per_second=(
+            round(tokens / duration, 2) if streamed and duration else None
+        ),
+        error_samples=errors[:5],
+    )
+
+
+async def run_load(base_url: str, settings: LoadSettings) -> list[LoadResult]:
+    """Warm the engine at `base_url` up, then measure every mode of `settings`."""
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=settings.timeout_seconds
+    ) as client:
+        if settings.warmup_requests:
+            warmup = LoadSettings(
+                modes=settings.modes,
+                concurrency=settings.concurrency,
+                timeout_seconds=settings.timeout_seconds,
+            )
+            for mode in settings.modes:
+                await drive(client, mode, warmup, settings.warmup_requests)
+        return [
+            await drive(client, mode, settings, settings.requests)
+            for mode in settings.modes
+        ]
+
+
+async def run_app(app: Any, settings: LoadSettings) -> list[LoadResult]:
+    """Serve `app` in this process and run the load against it.
+
+    The load generator shares the event loop with the engine; target a
+    separate process with `run_load` when client overhead matters.
+    """
+    async with serve(app) as base_url:
+        return await run_load(base_url, settings)
+
+
+def _cell(summary: dict[str, float] | None, key: str) -> str:
+    return "-" if summary is None else f"{summary[key]:.2f}"
+
+
+def format_load_results(results: list[LoadResult]) -> str:
+    """Render load results as a fixed-width table."""
+    header = (
+        f"{'mode':<8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'ttft p50':>10}{'ttft p99':>10}{'itl p50':>10}{'itl p99':>10}"
+        f"{'tok/s':>10}{'errors':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        tokens = "-" if r.tokens_per_second is None else f"{r.tokens_per_second:.1f}"
+        lines.append(
+            f"{r.mode:<8}{r.throughput_rps:>9.1f}"
+            f"{r.latency_ms['p50']:>10.2f}{r.latency_ms['p95']:>10.2f}"
+            f"{r.latency_ms['p99']:>10.2f}"
+            f"{_cell(r.ttft_ms, 'p50'):>10}{_cell(r.ttft_ms, 'p99'):>10}"
+            f"{_cell(r.itl_ms, 'p50'):>10}{_cell(r.itl_ms, 'p99'):>10}"
+            f"{tokens:>10}{r.errors:>8}"
+        )
+    return "\n".join(lines)
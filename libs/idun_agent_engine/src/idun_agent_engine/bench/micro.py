@@ -0,0 +1,343 @@
+"""Micro-benchmarks of the engine's hot paths, compared against stored baselines.
+
+Each case times one operation in isolation:
+
+- `translate_events`: `LanggraphAgent._translate_events` over the LangGraph
+  events of a recorded run of the stand-in graph (one text reply).
+- `sse_encode`: framing the resulting ag-ui events as server-sent events.
+- `checkpoint_write_<n>` / `checkpoint_read_<n>`: saving and loading a thread
+  of `n` messages with the engine's SQLite checkpointer.
+- `config_validate` / `config_load`: validating an engine configuration, from
+  a dictionary or from a YAML file.
+- `graph_load` / `graph_compile`: executing a graph module and compiling the
+  graph it defines.
+- `stream_langgraph` / `stream_adk`: a whole `stream` run of each adapter
+  serving the same fake streaming model, through to its last ag-ui event, so
+  the adapters' streaming overheads can be compared. `stream_adk` imports
+  Google ADK, which takes a while the first time.
+
+Timings are per operation: like `timeit`, each repeat runs the operation
+enough times to last `target_seconds`, and the median over repeats is kept.
+Everything runs locally on temporary files, without network access.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import itertools
+import json
+import platform
+import statistics
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+import yaml
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import Checkpoint, empty_checkpoint
+
+from ..agent.langgraph.checkpoint import TracedAsyncSqliteSaver
+from ..agent.langgraph.langgraph import LanggraphAgent
+from ..agent.registry import agent_registry
+from ..core.config_builder import ConfigBuilder
+from ..core.engine_config import EngineConfig
+from ..server.routers.agent import sse_event
+from . import graphs
+from .runner import engine_config
+
+CHECKPOINT_SIZES = (10, 100, 1000)
+DEFAULT_TOLERANCE = 0.25
+"""Slowdown over the baseline median tolerated before a case is flagged."""
+
+Operation = Callable[[], Any]
+Case = Callable[[], contextlib.AbstractAsyncContextManager[Operation]]
+
+
+@dataclass
+class MicroResult:
+    """Timing of one case, in microseconds per operation."""
+
+    name: str
+    number: int
+    repeats: int
+    median_us: float
+    min_us: float
+
+
+@dataclass
+class Regression:
+    """A case slower than its baseline by more than the tolerance."""
+
+    name: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def ratio(self) -> float:
+        """Current over baseline median."""
+        return self.current_us / self.baseline_us
+
+
+async def _record_run() -> list[Any]:
+    graph = graphs.streaming_graph.compile()
+    graph_input = {"messages": [{"role": "user", "content": "benchmark"}]}
+    return [event async for event in graph.astream_events(graph_input, version="v2")]
+
+
+async def _translate(agent: LanggraphAgent, events: list[Any]) -> list:
+    async def replay() -> AsyncIterator[Any]:
+        for event in events:
+            yield event
+
+    return [e async for e in agent._translate_events(replay(), "run_0", "thread_0")]
+
+
+@contextlib.asynccontextmanager
+async def _translate_events() -> AsyncIterator[Operation]:
+    agent, events = LanggraphAgent(), await _record_run()
+
+    async def op() -> None:
+        await _translate(agent, events)
+
+    yield op
+
+
+@contextlib.asynccontextmanager
+async def _sse_encode() -> AsyncIterator[Operation]:
+    ag_events = await _translate(LanggraphAgent(), await _record_run())
+
+    def op() -> None:
+        for event in ag_events:
+            sse_event(event)
+
+    yield op
+
+
+def _thread(size: int) -> Checkpoint:
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "messages": [
+            (HumanMessage if i % 2 == 0 else AIMessage)(
+                content=f"message {i} " + "lorem ipsum " * 20, id=f"msg_{i}"
+            )
+            for i in range(size)
+        ]
+    }
+    checkpoint["channel_versions"] = {"messages": 1}
+    return checkpoint
+
+
+@contextlib.asynccontextmanager
+async def _saver() -> AsyncIterator[TracedAsyncSqliteSaver]:
+    with tempfile.TemporaryDirectory(prefix="idun-micro-") as tmp:
+        async with aiosqlite.connect(Path(tmp) / "checkpoint.db") as conn:
+            saver = TracedAsyncSqliteSaver(conn=conn)
+            await saver.setup()
+            yield saver
+
+
+def _checkpoint_write(size: int) -> Case:
+    @contextlib.asynccontextmanager
+    async def case() -> AsyncIterator[Operation]:
+        checkpoint = _thread(size)
+        config: Any = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+        async with _saver() as saver:
+
+            async def op() -> None:
+                await saver.aput(config, checkpoint, {}, {"messages": 1})
+
+            yield op
+
+    return case
+
+
+def _checkpoint_read(size: int) -> Case:
+    @contextlib.asynccontextmanager
+    async def case() -> AsyncIterator[Operation]:
+        config: Any = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+        async with _saver() as saver:
+            await saver.aput(config, _thread(size), {}, {"messages": 1})
+
+            async def op() -> None:
+                if await saver.aget_tuple(config) is None:
+                    raise RuntimeError("checkpoint not found")
+
+            yield op
+
+    return case
+
+
+def _engine_config() -> dict[str, Any]:
+    return {
+        "server": {"api": {"port": 8000}, "admin": {"token": "secret"}},
+        "agent": {
+            "type": "langgraph",
+            "config": {
+                "name": "Benchmark Agent",
+                "graph_definition": f"{graphs.__file__}:streaming_graph",
+                "checkpointer": {"type": "sqlite", "db_url": "sqlite:///bench.db"},
+            },
+        },
+    }
+
+
+@contextlib.asynccontextmanager
+async def _config_validate() -> AsyncIterator[Operation]:
+    config = _engine_config()
+    yield lambda: EngineConfig.model_validate(config)
+
+
+@contextlib.asynccontextmanager
+async def _config_load() -> AsyncIterator[Operation]:
+    with tempfile.TemporaryDirectory(prefix="idun-micro-") as tmp:
+        path = Path(tmp) / "config.yaml"
+        path.write_text(yaml.safe_dump(_engine_config()))
+        yield lambda: ConfigBuilder.load_from_file(str(path))
+
+
+@contextlib.asynccontextmanager
+async def _graph_load() -> AsyncIterator[Operation]:
+    agent, definition = LanggraphAgent(), f"{graphs.__file__}:streaming_graph"
+    yield lambda: agent._load_graph_builder(definition)
+
+
+@contextlib.asynccontextmanager
+async def _graph_compile() -> AsyncIterator[Operation]:
+    yield graphs.streaming_graph.compile
+
+
+def _stream(adapter: str) -> Case:
+    @contextlib.asynccontextmanager
+    async def case() -> AsyncIterator[Operation]:
+        agent_config = engine_config("none", None, adapter)["agent"]
+        agent: Any = agent_registry.create(agent_config["type"])
+        await agent.initialize(agent_config["config"])
+        sessions = itertools.count()
+
+        async def op() -> None:
+            message = {"session_id": f"micro_{next(sessions)}", "query": "benchmark"}
+            events = [event async for event in agent.stream(message)]
+            if events[-1].type.value != "RUN_FINISHED":
+                raise RuntimeError(f"{adapter} run failed: {events[-1]}")
+
+        try:
+            yield op
+        finally:
+            await agent.close()
+
+    return case
+
+
+CASES: dict[str, Case] = {
+    "translate_events": _translate_events,
+    "sse_encode": _sse_encode,
+    **{f"checkpoint_write_{n}": _checkpoint_write(n) for n in CHECKPOINT_SIZES},
+    **{f"checkpoint_read_{n}": _checkpoint_read(n) for n in CHECKPOINT_SIZES},
+    "config_validate": _config_validate,
+    "config_load": _config_load,
+    "graph_load": _graph_load,
+    "graph_compile": _graph_compile,
+    "stream_langgraph": _stream("langgraph"),
+    "stream_adk": _stream("adk"),
+}
+
+
+async def _timed(op: Operation, number: int) -> float:
+    if inspect.iscoroutinefunction(op):
+        start = time.perf_counter()
+        for _ in range(number):
+            await op()
+    else:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+    return time.perf_counter() - start
+
+
+async def _measure(name: str, repeats: int, target_seconds: float) -> MicroResult:
+    async with CASES[name]() as op:
+        await _timed(op, 1)
+        number = 1
+        while (elapsed := await _timed(op, number)) < target_seconds:
+            number *= 2 if elapsed * 10 > target_seconds else 10
+        timings = [await _timed(op, number) / number for _ in range(repeats)]
+    return MicroResult(
+        name=name,
+        number=number,
+        repeats=repeats,
+        median_us=round(statistics.median(timings) * 1e6, 3),
+        min_us=round(min(timings) * 1e6, 3),
+    )
+
+
+async def run_micro(
+    names: list[str] | None = None, repeats: int = 5, target_seconds: float = 0.2
+) -> list[MicroResult]:
+    """Run the named cases (all by default), one after the other.
+
+    Raises:
+        ValueError: If a name is not a known case.
+    """
+    names = list(CASES) if names is None else names
+    if unknown := [name for name in names if name not in CASES]:
+        raise ValueError(f"Unknown cases {unknown}, expected some of {list(CASES)}")
+    return [await _measure(name, repeats, target_seconds) for name in names]
+
+
+def run_micro_sync(
+    names: list[str] | None = None, repeats: int = 5, target_seconds: float = 0.2
+) -> list[MicroResult]:
+    """Run `run_micro` in a fresh event loop."""
+    return asyncio.run(run_micro(names, repeats, target_seconds))
+
+
+def save_baseline(results: list[MicroResult], path: str | Path) -> None:
+    """Write results, and the interpreter and machine they ran on, as JSON."""
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {r.name: asdict(r) for r in results},
+    }
+    Path(path).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: str | Path) -> dict[str, float]:
+    """Read the median per case of a baseline written by `save_baseline`."""
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {name: r["median_us"] for name, r in payload["results"].items()}
+
+
+def compare(
+    results: list[MicroResult],
+    baseline: dict[str, float],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """Return the cases slower than `baseline` by more than `tolerance`.
+
+    Cases missing from the baseline are not compared.
+    """
+    return [
+        Regression(r.name, baseline[r.name], r.median_us)
+        for r in results
+        if baseline.get(r.name) and r.median_us > baseline[r.name] * (1 + tolerance)
+    ]
+
+
+def format_micro_results(
+    results: list[MicroResult], baseline: dict[str, float] | None = None
+) -> str:
+    """Render results as a fixed-width table, with the change from `baseline`."""
+    header = f"{'case':<24}{'median us':>14}{'min us':>14}{'ops':>10}{'change':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        before = (baseline or {}).get(r.name)
+        change = f"{(r.median_us / before - 1) * 100:+.1f}%" if before else "-"
+        lines.append(
+            f"{r.name:<24}{r.median_us:>14.2f}{r.min_us:>14.2f}"
+            f"{r.number:>10}{change:>10}"
+        )
+    return "\n".join(lines)
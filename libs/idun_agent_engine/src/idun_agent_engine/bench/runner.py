@@ -0,0 +1,383 @@
+"""Load runner measuring the engine under each observability configuration.
+
+A scenario serves the stand-in graph with uvicorn on a free local port, points
+the observability provider at a `StandInCollector`, and drives `/agent/invoke`
+and `/agent/stream` with a fixed number of concurrent clients. Providers
+install process-wide instrumentation, so `run_suite` runs every scenario in
+its own interpreter.
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+import httpx
+import uvicorn
+
+from ..core.app_factory import create_app
+from . import graphs
+from .collectors import StandInCollector
+
+SCENARIOS = ("none", "langfuse", "phoenix", "multi")
+MODES = ("invoke", "stream")
+ADAPTERS = ("langgraph", "adk")
+ADK_AGENT_PATH = Path(graphs.__file__).with_name("adk_agents.py")
+"""Stand-in ADK agent, referenced by path so ADK is only imported when served."""
+SETUP_TIMEOUT_SECONDS = 60.0
+"""Provider setup budget; first imports of the provider SDKs can be slow."""
+
+
+@dataclass
+class BenchmarkSettings:
+    """Load shape shared by every scenario of a run."""
+
+    requests: int = 200
+    concurrency: int = 8
+    warmup_requests: int = 10
+    tokens: int = 32
+    token_delay_ms: float = 0.0
+    collector_latency_ms: float = 0.0
+    modes: tuple[str, ...] = MODES
+
+    def to_argv(self) -> list[str]:
+        """Command line flags reproducing these settings."""
+        argv: list[str] = []
+        for f in fields(self):
+            value = getattr(self, f.name)
+            flag = f"--{f.name.replace('_', '-')}"
+            argv += [flag, *value] if isinstance(value, tuple) else [flag, str(value)]
+        return argv
+
+
+@dataclass
+class ModeResult:
+    """Measurements for one endpoint of one scenario."""
+
+    mode: str
+    requests: int
+    errors: int
+    duration_seconds: float
+    throughput_rps: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    cpu_ms_per_request: float
+    ttft_p50_ms: float | None = None
+    ttft_p99_ms: float | None = None
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one observability configuration."""
+
+    scenario: str
+    observability_status: str | None
+    modes: list[ModeResult] = field(default_factory=list)
+    collector: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a plain dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ScenarioResult":
+        """Rebuild a result written by `to_dict`."""
+        modes = [ModeResult(**mode) for mode in data.get("modes", [])]
+        return cls(**{**data, "modes": modes})
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (`q` between 0 and 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _provider_options(provider: str, collector_url: str | None) -> dict[str, Any]:
+    if provider == "langfuse":
+        return {
+            "host": collector_url,
+            "public_key": "pk-lf-idun-bench",
+            "secret_key": "sk-lf-idun-bench",
+        }
+    return {
+        "collector_endpoint": f"{collector_url}/v1/traces",
+        "project_name": "idun-bench",
+    }
+
+
+def engine_config(
+    scenario: str, collector_url: str | None, adapter: str = "langgraph"
+) -> dict[str, Any]:
+    """Engine configuration serving the stand-in agent for `scenario`.
+
+    `langfuse` and `phoenix` use each provider's own handler; `multi` serves
+    both through the shared callback dispatcher. With `adapter="adk"` the
+    equivalent ADK agent is served instead of the graph, without observability.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario {scenario!r}, expected one of {SCENARIOS}")
+    if adapter not in ADAPTERS:
+        raise ValueError(f"Unknown adapter {adapter!r}, expected one of {ADAPTERS}")
+    if adapter == "adk":
+        if scenario != "none":
+            raise ValueError("The ADK stand-in only runs the 'none' scenario")
+        return {
+            "server": {"idempotency": {"enabled": False}},
+            "agent": {
+                "type": "adk",
+                "config": {
+                    "name": "Benchmark Agent (adk)",
+                    "agent_definition": f"{ADK_AGENT_PATH}:root_agent",
+                },
+            },
+        }
+    agent_config: dict[str, Any] = {
+        "name": f"Benchmark Agent ({scenario})",
+        "graph_definition": f"{graphs.__file__}:streaming_graph",
+        # The graph reads its shape from the environment at import time
+        "cache_graph": False,
+    }
+    if scenario in ("langfuse", "phoenix"):
+        agent_config["observability"] = {
+            "provider": scenario,
+            "enabled": True,
+            "init_timeout_seconds": SETUP_TIMEOUT_SECONDS,
+            "options": _provider_options(scenario, collector_url),
+        }
+    elif scenario == "multi":
+        agent_config["observability"] = {
+            "enabled": True,
+            "init_timeout_seconds": SETUP_TIMEOUT_SECONDS,
+            "providers": [
+                {"provider": p, "options": _provider_options(p, collector_url)}
+                for p in ("langfuse", "phoenix")
+            ],
+        }
+    return {
+        "server": {"idempotency": {"enabled": False}},
+        "agent": {"type": "langgraph", "config": agent_config},
+    }
+
+
+async def _invoke_once(client: httpx.AsyncClient, session_id: str) -> float | None:
+    """Return the latency of one invoke request, or None if it failed."""
+    payload = {"session_id": session_id, "query": "benchmark"}
+    start = time.perf_counter()
+    response = await client.post("/agent/invoke", json=payload)
+    if response.status_code != 200:
+        return None
+    return time.perf_counter() - start
+
+
+async def _stream_once(
+    client: httpx.AsyncClient, session_id: str
+) -> tuple[float, float | None] | None:
+    """Return the latency and time to first token of one stream request."""
+    payload = {"session_id": session_id, "query": "benchmark"}
+    start = time.perf_counter()
+    ttft: float | None = None
+    finished = False
+    async with client.stream("POST", "/agent/stream", json=payload) as response:
+        if response.status_code != 200:
+            return None
+        async for line in response.aiter_lines():
+            if ttft is None and "TEXT_MESSAGE_CONTENT" in line:
+                ttft = time.perf_counter() - start
+            finished = finished or "RUN_FINISHED" in line
+    if not finished:
+        return None
+    return time.perf_counter() - start, ttft
+
+
+async def _measure(
+    client: httpx.AsyncClient, mode: str, requests: int, concurrency: int
+) -> ModeResult:
+    """Send `requests` requests to `mode` from `concurrency` clients."""
+    latencies: list[float] = []
+    ttfts: list[float] = []
+    errors = 0
+    pending = iter(range(requests))
+
+    async def client_loop() -> None:
+        nonlocal errors
+        for i in pending:
+            session_id = f"bench-{mode}-{i}"
+            try:
+                if mode == "stream":
+                    outcome = await _stream_once(client, session_id)
+                    if outcome is not None:
+                        latency, ttft = outcome
+                        if ttft is not None:
+                            ttfts.append(ttft)
+                        latencies.append(latency)
+                        continue
+                else:
+                    elapsed = await _invoke_once(client, session_id)
+                    if elapsed is not None:
+                        latencies.append(elapsed)
+                        continue
+            except httpx.HTTPError:
+                pass
+            errors += 1
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    return ModeResult(
+        mode=mode,
+        requests=requests,
+        errors=errors,
+        duration_seconds=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 2) if duration else 0.0,
+        latency_p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        latency_p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        cpu_ms_per_request=round(cpu * 1000 / requests, 3) if requests else 0.0,
+        ttft_p50_ms=round(percentile(ttfts, 50) * 1000, 3) if ttfts else None,
+        ttft_p99_ms=round(percentile(ttfts, 99) * 1000, 3) if ttfts else None,
+    )
+
+
+@contextlib.asynccontextmanager
+async def serve(app: Any) -> AsyncIterator[str]:
+    """Serve `app` with uvicorn on a free local port and yield its base URL."""
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    )
+    serve_task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if serve_task.done():
+                serve_task.result()
+                raise RuntimeError("Benchmark server exited during startup.")
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+async def _wait_for_observability(
+    app: Any, timeout: float = SETUP_TIMEOUT_SECONDS + 5
+) -> str | None:
+    """Wait until background provider setup settles; return its status."""
+    deadline = time.monotonic() + timeout
+    while True:
+        infos = app.state.agent.infos.get("observability") or {}
+        status = infos.get("status")
+        if status != "initializing" or time.monotonic() > deadline:
+            return status
+        await asyncio.sleep(0.05)
+
+
+async def run_scenario(
+    scenario: str, settings: BenchmarkSettings | None = None
+) -> ScenarioResult:
+    """Serve the stand-in graph under `scenario` and measure every mode.
+
+    CPU time is process-wide, so it includes the load generator and the export
+    threads; compare scenarios against `none` rather than reading it in isolation.
+    """
+    settings = settings or BenchmarkSettings()
+    os.environ[graphs.TOKENS_ENV] = str(settings.tokens)
+    os.environ[graphs.TOKEN_DELAY_ENV] = str(settings.token_delay_ms)
+
+    with contextlib.ExitStack() as stack:
+        collector = None
+        if scenario != "none":
+            collector = stack.enter_context(
+                StandInCollector(settings.collector_latency_ms / 1000)
+            )
+        app = create_app(
+            config_dict=engine_config(scenario, collector.url if collector else None)
+        )
+        async with serve(app) as base_url:
+            status = await _wait_for_observability(app)
+            async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+                await _measure(
+                    client, "invoke", settings.warmup_requests, settings.concurrency
+                )
+                modes = [
+                    await _measure(
+                        client, mode, settings.requests, settings.concurrency
+                    )
+                    for mode in settings.modes
+                ]
+
+        return ScenarioResult(
+            scenario=scenario,
+            observability_status=status,
+            modes=modes,
+            collector=collector.stats() if collector else {},
+        )
+
+
+def run_suite(
+    settings: BenchmarkSettings | None = None,
+    scenarios: tuple[str, ...] = SCENARIOS,
+) -> list[ScenarioResult]:
+    """Run each scenario in a fresh interpreter and collect the results.
+
+    Raises:
+        RuntimeError: If a scenario process fails.
+    """
+    settings = settings or BenchmarkSettings()
+    results: list[ScenarioResult] = []
+    with tempfile.TemporaryDirectory(prefix="idun-bench-") as tmp:
+        for scenario in scenarios:
+            output = Path(tmp) / f"{scenario}.json"
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "idun_agent_engine.bench",
+                    "--scenario",
+                    scenario,
+                    "--output",
+                    str(output),
+                    *settings.to_argv(),
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0 or not output.exists():
+                raise RuntimeError(
+                    f"Benchmark scenario {scenario!r} failed:\n{proc.stderr[-2000:]}"
+                )
+            results.append(ScenarioResult.from_dict(json.loads(output.read_text())))
+    return results
+
+
+def format_results(results: list[ScenarioResult]) -> str:
+    """Render results as a fixed-width table."""
+    header = (
+        f"{'scenario':<10}{'mode':<8}{'req/s':>9}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'ttft p50':>10}{'ttft p99':>10}{'cpu ms/req':>12}{'errors':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        for mode in result.modes:
+            ttft50 = "-" if mode.ttft_p50_ms is None else f"{mode.ttft_p50_ms:.2f}"
+            ttft99 = "-" if mode.ttft_p99_ms is None else f"{mode.ttft_p99_ms:.2f}"
+            lines.append(
+                f"{result.scenario:<10}{mode.mode:<8}{mode.throughput_rps:>9.1f}"
+                f"{mode.latency_p50_ms:>10.2f}{mode.latency_p99_ms:>10.2f}"
+                f"{ttft50:>10}{ttft99:>10}{mode.cpu_ms_per_request:>12.2f}"
+                f"{mode.errors:>8}"
+            )
+    return "\n".join(lines)
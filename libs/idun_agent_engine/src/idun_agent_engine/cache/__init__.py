@@ -0,0 +1,17 @@
+"""Response cache package for the agent invoke path."""
+
+from .base import (
+    ResponseCache,
+    create_response_cache,
+    make_cache_key,
+    normalize_query,
+)
+from .model import ResponseCacheConfig
+
+__all__ = [
+    "ResponseCache",
+    "ResponseCacheConfig",
+    "create_response_cache",
+    "make_cache_key",
+    "normalize_query",
+]
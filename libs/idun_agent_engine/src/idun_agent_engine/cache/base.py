@@ -0,0 +1,115 @@
+"""Response cache base classes, key derivation and factory."""
+
+from __future__ import annotations
+
+import hashlib
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .model import ResponseCacheConfig
+
+
+@dataclass
+class CacheStats:
+    """Counters maintained by every cache backend (per process)."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class ResponseCache(ABC):
+    """Abstract response cache with TTL expiry and LRU eviction by bytes."""
+
+    backend: str
+
+    def __init__(self, config: ResponseCacheConfig) -> None:
+        """Initialize the cache with its configuration."""
+        self.config = config
+        self.counters = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Return the cached value for `key`, or None on miss or expiry."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        """Store `value` under `key`, evicting least recently used entries if needed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def size(self) -> tuple[int, int]:
+        """Return (entry count, stored bytes)."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release backend resources. No-op by default."""
+        return None
+
+    async def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters together with the current cache size."""
+        entries, total_bytes = await self.size()
+        return {
+            "backend": self.backend,
+            **asdict(self.counters),
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.config.max_bytes,
+        }
+
+
+def normalize_query(query: str, case_sensitive: bool = True) -> str:
+    """Normalize a query for exact matching: trim and collapse whitespace."""
+    normalized = " ".join(query.split())
+    return normalized if case_sensitive else normalized.casefold()
+
+
+def make_cache_key(
+    fingerprint: str,
+    query: str,
+    session_id: str | None = None,
+    case_sensitive: bool = True,
+) -> str:
+    """Derive a cache key from the agent fingerprint and normalized query.
+
+    Args:
+        fingerprint: Agent fingerprint (configuration and graph source).
+        query: Raw user query.
+        session_id: Session to scope the entry to, or None to share across sessions.
+        case_sensitive: Whether queries differing only in case are distinct.
+    """
+    digest = hashlib.sha256()
+    for part in (fingerprint, session_id or "", normalize_query(query, case_sensitive)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def create_response_cache(
+    config: ResponseCacheConfig | dict[str, Any] | None,
+) -> ResponseCache | None:
+    """Factory returning the configured cache backend, or None when disabled."""
+    if config is None:
+        return None
+    if not isinstance(config, ResponseCacheConfig):
+        config = ResponseCacheConfig.model_validate(config)
+    if not config.enabled:
+        return None
+
+    if config.backend == "sqlite":
+        from .sqlite import SqliteResponseCache
+
+        return SqliteResponseCache(config)
+
+    from .memory import InMemoryResponseCache
+
+    return InMemoryResponseCache(config)
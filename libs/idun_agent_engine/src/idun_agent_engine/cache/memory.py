@@ -0,0 +1,65 @@
+"""In-process response cache backend."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from .base import ResponseCache
+from .model import ResponseCacheConfig
+
+
+class InMemoryResponseCache(ResponseCache):
+    """LRU cache bounded by total value bytes, local to one worker process."""
+
+    backend = "memory"
+
+    def __init__(self, config: ResponseCacheConfig) -> None:
+        """Create an empty cache."""
+        super().__init__(config)
+        # key -> (expires_at, value, size); order is least to most recently used
+        self._entries: OrderedDict[str, tuple[float, str, int]] = OrderedDict()
+        self._bytes = 0
+
+    def _drop(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    async def get(self, key: str) -> str | None:
+        """Return a live entry and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            self._drop(key)
+            self.counters.expirations += 1
+            self.counters.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: str) -> None:
+        """Insert or replace an entry, then evict LRU entries above `max_bytes`."""
+        size = len(value.encode())
+        if size > self.config.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.config.ttl_seconds, value, size)
+        self._bytes += size
+        self.counters.stores += 1
+        while self._bytes > self.config.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.counters.evictions += 1
+
+    async def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self._bytes = 0
+
+    async def size(self) -> tuple[int, int]:
+        """Return (entry count, stored bytes)."""
+        return len(self._entries), self._bytes
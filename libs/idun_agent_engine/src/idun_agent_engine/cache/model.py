@@ -0,0 +1,36 @@
+"""Response cache configuration model."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ResponseCacheConfig(BaseModel):
+    """Opt-in exact-match cache for `/agent/invoke` responses.
+
+    Entries are keyed on the agent fingerprint (config + graph source) and the
+    normalized query, so a reload with a changed graph never serves stale answers.
+    Cache hits skip the graph entirely, which also means nothing is written to the
+    session's checkpoint history: enable it for stateless agents.
+
+    Example YAML:
+      server:
+        response_cache:
+          enabled: true
+          backend: "sqlite"       # or "memory"
+          ttl_seconds: 600
+          max_bytes: 33554432
+          session_scoped: false
+    """
+
+    enabled: bool = Field(default=False)
+    backend: Literal["memory", "sqlite"] = Field(default="memory")
+    ttl_seconds: float = Field(default=300.0, gt=0)
+    max_bytes: int = Field(default=16 * 1024 * 1024, gt=0)
+    # Include the session id in the key so sessions never share answers
+    session_scoped: bool = Field(default=False)
+    case_sensitive: bool = Field(default=True)
+    # Only used by the sqlite backend; share one file between workers
+    sqlite_path: str = Field(default="idun_response_cache.db")
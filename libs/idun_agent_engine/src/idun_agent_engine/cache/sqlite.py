@@ -0,0 +1,139 @@
+"""SQLite response cache backend, shareable between worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import aiosqlite
+
+from .base import ResponseCache
+from .model import ResponseCacheConfig
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idun_response_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idun_response_cache_lru
+    ON idun_response_cache (last_access);
+"""
+
+
+class SqliteResponseCache(ResponseCache):
+    """On-disk LRU cache bounded by bytes; all workers pointing at the file share it.
+
+    Timestamps use wall-clock time since entries outlive and cross processes.
+    Hit/miss counters remain per process.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, config: ResponseCacheConfig) -> None:
+        """Prepare the cache; the connection is opened lazily on first use."""
+        super().__init__(config)
+        self._connection: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._connection is not None:
+            return self._connection
+        async with self._connect_lock:
+            if self._connection is None:
+                conn = await aiosqlite.connect(self.config.sqlite_path)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA busy_timeout=5000")
+                await conn.executescript(_SCHEMA)
+                await conn.commit()
+                self._connection = conn
+        return self._connection
+
+    async def get(self, key: str) -> str | None:
+        """Return a live entry and refresh its LRU position."""
+        conn = await self._conn()
+        now = time.time()
+        async with conn.execute(
+            "SELECT value, expires_at FROM idun_response_cache WHERE key = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            self.counters.misses += 1
+            return None
+        value, expires_at = row
+        if expires_at <= now:
+            await conn.execute("DELETE FROM idun_response_cache WHERE key = ?", (key,))
+            await conn.commit()
+            self.counters.expirations += 1
+            self.counters.misses += 1
+            return None
+        await conn.execute(
+            "UPDATE idun_response_cache SET last_access = ? WHERE key = ?", (now, key)
+        )
+        await conn.commit()
+        self.counters.hits += 1
+        return str(value)
+
+    async def set(self, key: str, value: str) -> None:
+        """Insert or replace an entry, purge expired ones and evict LRU above `max_bytes`."""
+        size = len(value.encode())
+        if size > self.config.max_bytes:
+            return
+        conn = await self._conn()
+        now = time.time()
+        await conn.execute(
+            "INSERT OR REPLACE INTO idun_response_cache "
+            "(key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            (key, value, size, now + self.config.ttl_seconds, now),
+        )
+        cursor = await conn.execute(
+            "DELETE FROM idun_response_cache WHERE expires_at <= ?", (now,)
+        )
+        self.counters.expirations += max(cursor.rowcount, 0)
+        self.counters.stores += 1
+
+        async with conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM idun_response_cache"
+        ) as cursor:
+            row = await cursor.fetchone()
+        excess = (row[0] if row else 0) - self.config.max_bytes
+        if excess > 0:
+            # Walk entries from least recently used until enough bytes are freed.
+            victims: list[str] = []
+            async with conn.execute(
+                "SELECT key, size FROM idun_response_cache ORDER BY last_access"
+            ) as cursor:
+                async for victim_key, victim_size in cursor:
+                    victims.append(victim_key)
+                    excess -= victim_size
+                    if excess <= 0:
+                        break
+            await conn.executemany(
+                "DELETE FROM idun_response_cache WHERE key = ?",
+                [(victim,) for victim in victims],
+            )
+            self.counters.evictions += len(victims)
+        await conn.commit()
+
+    async def clear(self) -> None:
+        """Remove every entry."""
+        conn = await self._conn()
+        await conn.execute("DELETE FROM idun_response_cache")
+        await conn.commit()
+
+    async def size(self) -> tuple[int, int]:
+        """Return (entry count, stored bytes)."""
+        conn = await self._conn()
+        async with conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM idun_response_cache"
+        ) as cursor:
+            row = await cursor.fetchone()
+        return (int(row[0]), int(row[1])) if row else (0, 0)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
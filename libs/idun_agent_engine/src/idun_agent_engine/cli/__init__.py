@@ -1,10 +1,8 @@
 """Command Line Interface for Idun Agent Engine.
 
-This module will provide CLI tools for:
-- Generating boilerplate projects
-- Running agents from the command line
-- Validating configurations
-- Deploying agents to various platforms
+The `idun` command is defined in `main`:
+- `idun bench` - Load-test an engine with a deterministic fake model
+- `idun microbench` - Time the engine's hot paths against a baseline
 
 Future commands will include:
 - `idun init` - Create a new agent project
@@ -12,5 +10,3 @@ Future commands will include:
 - `idun validate` - Validate configuration files
 - `idun deploy` - Deploy to cloud platforms
 """
-
-# Future CLI entry points will be defined here
@@ -0,0 +1,197 @@
+"""The `idun` command."""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any
+
+from ..bench import graphs
+from ..bench.load import (
+    ARRIVALS,
+    LoadResult,
+    LoadSettings,
+    format_load_results,
+    run_app,
+    run_load,
+)
+from ..bench.micro import (
+    CASES,
+    DEFAULT_TOLERANCE,
+    compare,
+    format_micro_results,
+    load_baseline,
+    run_micro_sync,
+    save_baseline,
+)
+from ..bench.runner import ADAPTERS, MODES, engine_config
+from ..core.app_factory import create_app
+
+
+def _bench_parser(subparsers: Any) -> None:
+    defaults = LoadSettings()
+    parser = subparsers.add_parser(
+        "bench",
+        help="Load-test an engine.",
+        description="Drive /agent/invoke and /agent/stream and report throughput, "
+        "latency, time to first token and inter-token latency. Without --url or "
+        "--config, an engine serving a deterministic fake streaming model is "
+        "started in this process.",
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Benchmark an engine already running here.")
+    target.add_argument("--config", help="Start an engine from this config file.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=defaults.concurrency,
+        help="Clients (closed loop) or maximum requests in flight (with --rate).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Arrival rate in requests per second; omit for a closed loop.",
+    )
+    parser.add_argument("--arrival", choices=ARRIVALS, default=defaults.arrival)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--warmup-requests", type=int, default=defaults.warmup_requests)
+    parser.add_argument("--timeout", type=float, default=defaults.timeout_seconds)
+    fake = parser.add_argument_group("fake model (built-in engine only)")
+    fake.add_argument(
+        "--adapter",
+        choices=ADAPTERS,
+        default="langgraph",
+        help="Serve the fake model from a LangGraph graph or a Google ADK agent.",
+    )
+    fake.add_argument("--tokens", type=int, default=32)
+    fake.add_argument("--token-delay-ms", type=float, default=0.0)
+    fake.add_argument(
+        "--tool-calls", type=int, default=0, help="Tool rounds before each reply."
+    )
+    fake.add_argument("--tool-latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--format", choices=("table", "json"), default="table", dest="output_format"
+    )
+    parser.add_argument("--output", help="Also write the results as JSON here.")
+    parser.set_defaults(handler=_bench)
+
+
+def _bench(args: argparse.Namespace) -> int:
+    settings = LoadSettings(
+        modes=tuple(args.modes),
+        requests=args.requests,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        arrival=args.arrival,
+        seed=args.seed,
+        warmup_requests=args.warmup_requests,
+        timeout_seconds=args.timeout,
+    )
+    results: list[LoadResult]
+    if args.url:
+        results = asyncio.run(run_load(args.url, settings))
+    else:
+        if args.config:
+            app = create_app(config_path=args.config)
+        else:
+            os.environ[graphs.TOKENS_ENV] = str(args.tokens)
+            os.environ[graphs.TOKEN_DELAY_ENV] = str(args.token_delay_ms)
+            os.environ[graphs.TOOL_CALLS_ENV] = str(args.tool_calls)
+            os.environ[graphs.TOOL_LATENCY_ENV] = str(args.tool_latency_ms)
+            config = engine_config("none", None, args.adapter)
+            # Keep stdout for the report
+            config["server"]["logging"] = {"level": "WARNING"}
+            app = create_app(config_dict=config)
+        results = asyncio.run(run_app(app, settings))
+
+    payload = {
+        "settings": {**vars(settings), "modes": list(settings.modes)},
+        "results": [r.to_dict() for r in results],
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    if args.output_format == "json":
+        print(json.dumps(payload, indent=2))
+    else:
+        print(format_load_results(results))
+    return 1 if any(r.errors for r in results) else 0
+
+
+def _microbench_parser(subparsers: Any) -> None:
+    parser = subparsers.add_parser(
+        "microbench",
+        help="Time the engine's hot paths against a baseline.",
+        description="Time event translation, SSE encoding, checkpoint reads and "
+        "writes, config validation, graph loading and whole streamed runs per "
+        "adapter in isolation. With "
+        "--baseline, exit non-zero when a case is slower than the baseline by "
+        "more than --tolerance.",
+    )
+    parser.add_argument(
+        "cases", nargs="*", metavar="CASE", help=f"Cases to run: {', '.join(CASES)}."
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--target-seconds",
+        type=float,
+        default=0.2,
+        help="Minimum duration of each repeat.",
+    )
+    parser.add_argument("--baseline", help="Compare with the baseline in this file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown over the baseline median, as a fraction.",
+    )
+    parser.add_argument("--save", help="Write the results as a baseline here.")
+    parser.add_argument(
+        "--format", choices=("table", "json"), default="table", dest="output_format"
+    )
+    parser.set_defaults(handler=_microbench)
+
+
+def _microbench(args: argparse.Namespace) -> int:
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    results = run_micro_sync(args.cases or None, args.repeats, args.target_seconds)
+    if args.save:
+        save_baseline(results, args.save)
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    if args.output_format == "json":
+        payload = {
+            "results": [vars(r) for r in results],
+            "regressions": [
+                {**vars(r), "ratio": round(r.ratio, 3)} for r in regressions
+            ],
+        }
+        print(json.dumps(payload, indent=2))
+    else:
+        print(format_micro_results(results, baseline))
+        for r in regressions:
+            print(
+                f"REGRESSION {r.name}: {r.current_us:.2f} us vs "
+                f"{r.baseline_us:.2f} us baseline ({r.ratio:.2f}x)"
+            )
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the `idun` command; returns the process exit status."""
+    parser = argparse.ArgumentParser(prog="idun", description="Idun Agent Engine.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _bench_parser(subparsers)
+    _microbench_parser(subparsers)
+    args = parser.parse_args(argv)
+    try:
+        return int(args.handler(args))
+    except ValueError as e:
+        parser.error(str(e))
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,13 +5,19 @@ application with their agent integrated. It handles all the complexity of
 setting up routes, dependencies, and lifecycle management behind the scenes.
 """
 
+import asyncio
 from typing import Any
 
 from fastapi import FastAPI
 
+from ..log import configure_logging
 from ..server.lifespan import lifespan
+from ..server.middleware import MetricsMiddleware, TracingMiddleware
+from ..server.routers.admin import admin_router
 from ..server.routers.agent import agent_router
 from ..server.routers.base import base_router
+from ..server.routers.debug import debug_router
+from ..server.runs import RunTracker
 from .config_builder import ConfigBuilder
 from .engine_config import EngineConfig
 
@@ -33,7 +39,8 @@ def create_app(
         config_dict: Optional dictionary containing configuration. If provided,
             takes precedence over config_path. Useful for programmatic configuration.
         engine_config: Pre-validated EngineConfig instance (from ConfigBuilder.build()).
-            Takes precedence over other options.
+            Takes precedence over other options. When combined with config_path,
+            the file is only used as the source for hot reloads.
 
     Returns:
         FastAPI: A configured FastAPI application ready to serve your agent.
@@ -43,6 +50,8 @@ def create_app(
         config_path=config_path, config_dict=config_dict, engine_config=engine_config
     )
 
+    configure_logging(validated_config.server.logging)
+
     # Create the FastAPI application
     app = FastAPI(
         lifespan=lifespan,
@@ -55,9 +64,24 @@ def create_app(
 
     # Store configuration in app state for lifespan to use
     app.state.engine_config = validated_config
+    # Not ready until the lifespan has initialized (and warmed up) the agent
+    app.state.ready = False
+    app.state.agent_init_lock = asyncio.Lock()
+    app.state.run_tracker = RunTracker()
+    # Remember the source file (if any) so hot reloads can re-read it
+    app.state.config_path = (
+        config_path if config_path or engine_config or config_dict else "config.yaml"
+    )
+
+    if validated_config.server.metrics.enabled:
+        app.add_middleware(MetricsMiddleware)
+    if validated_config.server.tracing.enabled:
+        app.add_middleware(TracingMiddleware)
 
     # Include the routers
     app.include_router(agent_router, prefix="/agent", tags=["Agent"])
     app.include_router(base_router, tags=["Base"])
+    app.include_router(admin_router, prefix="/admin", tags=["Admin"])
+    app.include_router(debug_router, prefix="/debug", tags=["Debug"])
 
     return app
@@ -4,20 +4,22 @@ This module provides a fluent API for building configuration objects using Pydan
 This approach ensures type safety, validation, and consistency with the rest of the codebase.
 """
 
+import logging
 from pathlib import Path
 from typing import Any
 
 import yaml
 
-from idun_agent_engine.server.server_config import ServerAPIConfig
+from idun_agent_engine.server.server_config import ServerAPIConfig, WarmupConfig
 
 from ..agent.base import BaseAgent
-from ..agent.langgraph.langgraph_model import (
-    LangGraphAgentConfig,
-    SqliteCheckpointConfig,
-)
+from ..agent.registry import agent_registry
+from ..executor import ExecutorPoolAgent
+from ..log import redact
 from .engine_config import AgentConfig, EngineConfig, ServerConfig
 
+logger = logging.getLogger(__name__)
+
 
 class ConfigBuilder:
     """A fluent builder for creating Idun Agent Engine configurations using Pydantic models.
@@ -52,10 +54,28 @@ class ConfigBuilder:
         Returns:
             ConfigBuilder: This builder instance for method chaining
         """
-        # Create new API config with updated port
+        # Create new API config with updated port, keeping other server settings
         api_config = ServerAPIConfig(port=port)
-        self._server_config = ServerConfig(
-            api=api_config,
+        self._server_config = self._server_config.model_copy(update={"api": api_config})
+        return self
+
+    def with_warmup(
+        self, queries: list[str], timeout_seconds: float = 30.0
+    ) -> "ConfigBuilder":
+        """Enable the startup warmup phase.
+
+        Args:
+            queries: Synthetic queries run through the agent before it is marked ready
+            timeout_seconds: Upper bound for the whole warmup phase
+
+        Returns:
+            ConfigBuilder: This builder instance for method chaining
+        """
+        warmup_config = WarmupConfig(
+            enabled=True, queries=queries, timeout_seconds=timeout_seconds
+        )
+        self._server_config = self._server_config.model_copy(
+            update={"warmup": warmup_config}
         )
         return self
 
@@ -93,7 +113,7 @@ class ConfigBuilder:
             ServerAPIConfig(port=api_port) if api_port else self._server_config.api
         )
 
-        self._server_config = ServerConfig(api=api_config)
+        self._server_config = self._server_config.model_copy(update={"api": api_config})
         return self
 
     def with_langgraph_agent(
@@ -114,6 +134,12 @@ class ConfigBuilder:
         Returns:
             ConfigBuilder: This builder instance for method chaining
         """
+        # Imported here so that building other agent types skips LangGraph
+        from ..agent.langgraph.langgraph_model import (
+            LangGraphAgentConfig,
+            SqliteCheckpointConfig,
+        )
+
         # Build the agent config dictionary
         agent_config_dict = {
             "name": name,
@@ -145,27 +171,18 @@ class ConfigBuilder:
         when the AgentConfig is created.
 
         Args:
-            agent_type: The type of agent (e.g., "crewai", "autogen")
+            agent_type: The type of agent, as registered in the agent registry
             config: Configuration dictionary specific to the agent type
 
         Returns:
             ConfigBuilder: This builder instance for method chaining
+
+        Raises:
+            ValueError: If the agent type is unknown or the config is invalid
         """
-        if agent_type == "langgraph":
-            self._agent_config = AgentConfig(
-                type="langgraph",
-                config=LangGraphAgentConfig.model_validate(config)
-            )
-        # elif agent_type == "ADK":
-        #     self._agent_config = ADKAgentSpec(
-        #         type="ADK", config=BaseAgentConfig.model_validate(config)
-        #     )
-        # elif agent_type == "CREWAI":
-        #     self._agent_config = CrewAIAgentSpec(
-        #         type="CREWAI", config=BaseAgentConfig.model_validate(config)
-        #     )
-        else:
-            raise ValueError(f"Unsupported agent type: {agent_type}")
+        self._agent_config = AgentConfig.model_validate(
+            {"type": agent_type, "config": config}
+        )
         return self
 
     def build(self) -> EngineConfig:
@@ -219,11 +236,18 @@ class ConfigBuilder:
         return await self.initialize_agent_from_config(engine_config)
 
     @staticmethod
-    async def initialize_agent_from_config(engine_config: EngineConfig) -> BaseAgent:
+    async def initialize_agent_from_config(
+        engine_config: EngineConfig, previous_agent: BaseAgent | None = None
+    ) -> BaseAgent:
         """Initialize an agent instance from a validated EngineConfig.
 
         Args:
             engine_config: Validated configuration object
+            previous_agent: Instance being replaced during a hot reload; its
+                persistence is shared with the new instance when compatible
+
+        With `server.executor_pool` enabled, the returned agent relays runs to
+        executor processes, each initializing the agent itself.
 
         Returns:
             BaseAgent: Initialized agent instance
@@ -232,28 +256,22 @@ class ConfigBuilder:
             ValueError: If agent type is unsupported
         """
         agent_config_obj = engine_config.agent.config
-        print(engine_config)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initializing agent with config %s", redact(engine_config))
         agent_type = engine_config.agent.type
 
-        # Initialize the appropriate agent
-        agent_instance = None
-        if agent_type == "langgraph":
-            from idun_agent_engine.agent.langgraph.langgraph import LanggraphAgent
-
-            agent_instance = LanggraphAgent()
-        elif agent_type == "CREWAI":
-            from idun_agent_engine.agent.crewai.crewai import CrewAIAgent
-
-            agent_instance = CrewAIAgent()
-        # Future agent types can be added here:
-        # elif agent_type == "crewai":
-        #     from ..agent.crewai.agent import CrewAIAgent
-        #     agent_instance = CrewAIAgent()
-        # elif agent_type == "autogen":
-        #     from ..agent.autogen.agent import AutoGenAgent
-        #     agent_instance = AutoGenAgent()
-        else:
-            raise ValueError(f"Unsupported agent type: {agent_type}")
+        pool_config = engine_config.server.executor_pool
+        if pool_config.enabled:
+            # Executor processes load the agent; this process only relays runs
+            pool_agent = ExecutorPoolAgent(pool_config)
+            await pool_agent.initialize(engine_config)  # type: ignore[arg-type]
+            return pool_agent
+
+        # The adapter is imported only now that its type is selected
+        agent_instance = agent_registry.create(agent_type)
+
+        if previous_agent is not None:
+            agent_instance.adopt_persistence(previous_agent)
 
         # Initialize the agent with its configuration
         await agent_instance.initialize(agent_config_obj)  # type: ignore[arg-type]
@@ -272,20 +290,7 @@ class ConfigBuilder:
         Raises:
             ValueError: If agent type is unsupported
         """
-        if agent_type == "langgraph":
-            from ..agent.langgraph.langgraph import LanggraphAgent
-
-            return LanggraphAgent
-        elif agent_type == "CREWAI":
-            from ..agent.crewai.crewai import CrewAIAgent
-
-            return CrewAIAgent
-        # Future agent types can be added here:
-        # elif agent_type == "crewai":
-        #     from ..agent.crewai.agent import CrewAIAgent
-        #     return CrewAIAgent
-        else:
-            raise ValueError(f"Unsupported agent type: {agent_type}")
+        return agent_registry.agent_class(agent_type)
 
     @staticmethod
     def validate_agent_config(
@@ -303,15 +308,8 @@ class ConfigBuilder:
         Raises:
             ValueError: If agent type is unsupported or config is invalid
         """
-        if agent_type == "langgraph":
-            validated_config = LangGraphAgentConfig.model_validate(config)
-            return validated_config.model_dump()
-        # Future agent types can be added here:
-        # elif agent_type == "crewai":
-        #     validated_config = CrewAIAgentConfig.model_validate(config)
-        #     return validated_config.model_dump()
-        else:
-            raise ValueError(f"Unsupported agent type: {agent_type}")
+        config_model = agent_registry.config_model(agent_type)
+        return config_model.model_validate(config).model_dump()
 
     @staticmethod
     def load_from_file(config_path: str = "config.yaml") -> EngineConfig:
@@ -382,19 +380,19 @@ class ConfigBuilder:
         """
         if engine_config:
             # Use pre-validated EngineConfig (from ConfigBuilder)
-            print("✅ Using pre-validated EngineConfig")
+            logger.debug("Using pre-validated EngineConfig")
             return engine_config
         elif config_dict:
             # Validate dictionary config
-            print("✅ Validated dictionary configuration")
+            logger.debug("Validated dictionary configuration")
             return EngineConfig.model_validate(config_dict)
         elif config_path:
             # Load from file using ConfigBuilder
-            print(f"✅ Loaded configuration from {config_path}")
+            logger.debug("Loading configuration from %s", config_path)
             return ConfigBuilder.load_from_file(config_path)
         else:
             # Default to loading config.yaml
-            print("✅ Loaded default configuration from config.yaml")
+            logger.debug("Loading default configuration from config.yaml")
             return ConfigBuilder.load_from_file("config.yaml")
 
     @classmethod
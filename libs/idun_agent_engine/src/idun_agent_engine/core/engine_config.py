@@ -4,22 +4,51 @@ This module contains the core configuration models for the entire Engine engine.
 These models define the overall structure and validation for the complete system.
 """
 
-from typing import Literal
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    Field,
+    SerializeAsAny,
+    ValidationInfo,
+    field_validator,
+)
 
-from idun_agent_engine.agent.langgraph.langgraph_model import LangGraphAgentConfig
 from idun_agent_engine.agent.model import BaseAgentConfig
+from idun_agent_engine.agent.registry import agent_registry
 from idun_agent_engine.server.server_config import ServerConfig
 
 
 class AgentConfig(BaseModel):
-    """Configuration for agent specification and settings."""
+    """Configuration for agent specification and settings.
 
-    type: Literal["langgraph", "ADK", "CREWAI"] = Field(default="langgraph")
-    config: BaseAgentConfig | LangGraphAgentConfig = Field(
-        default_factory=BaseAgentConfig
-    )
+    `type` names an adapter of the agent registry; `config` is validated with
+    that adapter's configuration model.
+    """
+
+    type: str = Field(default="langgraph")
+    config: SerializeAsAny[BaseAgentConfig] = Field(default_factory=BaseAgentConfig)
+
+    @field_validator("type")
+    @classmethod
+    def type_must_be_registered(cls, value: str) -> str:
+        """Resolve the adapter now so unknown types fail at validation."""
+        agent_registry.config_model(value)
+        return value
+
+    @field_validator("config", mode="before")
+    @classmethod
+    def validate_with_adapter_model(cls, value: Any, info: ValidationInfo) -> Any:
+        """Validate the config block with the selected adapter's model."""
+        agent_type = info.data.get("type")
+        if agent_type is None:
+            return value
+        model = agent_registry.config_model(agent_type)
+        if isinstance(value, model):
+            return value
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+        return model.model_validate(value)
 
 
 class EngineConfig(BaseModel):
@@ -4,9 +4,14 @@ This module provides convenient functions to run FastAPI applications created wi
 the Idun Agent Engine. It handles common deployment scenarios and provides sensible defaults.
 """
 
+import logging
+import math
+
 import uvicorn
 from fastapi import FastAPI
 
+logger = logging.getLogger(__name__)
+
 
 def run_server(
     app: FastAPI,
@@ -15,6 +20,7 @@ def run_server(
     reload: bool = False,
     log_level: str = "info",
     workers: int | None = None,
+    timeout_graceful_shutdown: float | None = None,
 ) -> None:
     """Run a FastAPI application created with Idun Agent Engine.
 
@@ -28,6 +34,8 @@ def run_server(
         reload: Enable auto-reload for development. Defaults to False
         log_level: Logging level. Defaults to "info"
         workers: Number of worker processes. If None, uses single process
+        timeout_graceful_shutdown: Seconds in-flight requests may run after a
+            shutdown signal. Defaults to the app's `server.shutdown.drain_timeout_seconds`
 
     Example:
         from idun_agent_engine import create_app, run_server
@@ -41,15 +49,22 @@ def run_server(
         # Run in production mode
         run_server(app, workers=4)
     """
-    print(f"🌐 Starting Idun Agent Engine server on http://{host}:{port}")
-    print(f"📚 API documentation available at http://{host}:{port}/docs")
+    logger.info("Starting Idun Agent Engine server on http://%s:%s", host, port)
+    logger.info("API documentation available at http://%s:%s/docs", host, port)
 
     if reload and workers:
-        print(
-            "⚠️  Warning: reload=True is incompatible with workers > 1. Disabling reload."
+        logger.warning(
+            "reload=True is incompatible with workers > 1. Disabling reload."
         )
         reload = False
 
+    if timeout_graceful_shutdown is None:
+        engine_config = getattr(app.state, "engine_config", None)
+        if engine_config is not None:
+            timeout_graceful_shutdown = (
+                engine_config.server.shutdown.drain_timeout_seconds
+            )
+
     uvicorn.run(
         app,
         host=host,
@@ -57,6 +72,11 @@ def run_server(
         # reload=reload,
         log_level=log_level,
         # workers=workers
+        timeout_graceful_shutdown=(
+            math.ceil(timeout_graceful_shutdown)
+            if timeout_graceful_shutdown is not None
+            else None
+        ),
     )
 
 
@@ -80,22 +100,22 @@ def run_server_from_config(config_path: str = "config.yaml", **kwargs) -> None:
     # Load configuration using ConfigBuilder
     engine_config = ConfigBuilder.load_from_file(config_path)
 
-    # Create app with the loaded config
-    app = create_app(engine_config=engine_config)
+    # Create app with the loaded config (the path is kept for hot reloads)
+    app = create_app(config_path=config_path, engine_config=engine_config)
 
     # Extract port from config if not overridden
     if "port" not in kwargs:
         kwargs["port"] = engine_config.server.api.port
 
     # Show configuration info
-    print(f"🔧 Loaded configuration from {config_path}")
+    logger.info("Loaded configuration from %s", config_path)
     # Best-effort: handle both dict-like and model access
     agent_name = (
         engine_config.agent.config.get("name")  # type: ignore[call-arg, index]
         if hasattr(engine_config.agent.config, "get")
         else getattr(engine_config.agent.config, "name", "Unknown")
     )
-    print(f"🤖 Agent: {agent_name} ({engine_config.agent.type})")
+    logger.info("Agent: %s (%s)", agent_name, engine_config.agent.type)
 
     run_server(app, **kwargs)
 
@@ -135,12 +155,12 @@ def run_server_from_builder(config_builder, **kwargs) -> None:
         kwargs["port"] = engine_config.server.api.port
 
     # Show configuration info
-    print("🔧 Using programmatic configuration")
+    logger.info("Using programmatic configuration")
     agent_name = (
         engine_config.agent.config.get("name")  # type: ignore[call-arg, index]
         if hasattr(engine_config.agent.config, "get")
         else getattr(engine_config.agent.config, "name", "Unknown")
     )
-    print(f"🤖 Agent: {agent_name} ({engine_config.agent.type})")
+    logger.info("Agent: %s (%s)", agent_name, engine_config.agent.type)
 
     run_server(app, **kwargs)
@@ -0,0 +1,32 @@
+"""In-process diagnostics served under `/debug`."""
+
+from .flamegraph import render_flamegraph
+from .model import DebugConfig, LoopWatchdogConfig, ProfilerConfig, SlowRunsConfig
+from .profiler import ProfileResult, SamplingProfiler, stage_of
+from .timeline import (
+    RunTimeline,
+    SlowRunRecorder,
+    TimelineCallback,
+    current_timeline,
+    slow_runs,
+)
+from .watchdog import LoopWatchdog, blocking_site, loop_watchdog
+
+__all__ = [
+    "DebugConfig",
+    "LoopWatchdog",
+    "LoopWatchdogConfig",
+    "ProfileResult",
+    "ProfilerConfig",
+    "RunTimeline",
+    "SamplingProfiler",
+    "SlowRunRecorder",
+    "SlowRunsConfig",
+    "TimelineCallback",
+    "blocking_site",
+    "current_timeline",
+    "loop_watchdog",
+    "render_flamegraph",
+    "slow_runs",
+    "stage_of",
+]
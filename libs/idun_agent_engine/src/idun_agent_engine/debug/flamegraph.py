@@ -0,0 +1,95 @@
+"""Self-contained SVG flame graph rendering of collapsed stacks."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Mapping
+from html import escape
+from typing import Any
+
+FRAME_HEIGHT = 16
+FONT_SIZE = 11
+CHAR_WIDTH = 6.5
+MIN_WIDTH = 0.5
+"""Frames narrower than this many pixels are not drawn."""
+
+
+def _tree(stacks: Mapping[str, int]) -> dict[str, Any]:
+    root: dict[str, Any] = {"name": "all", "value": 0, "children": {}}
+    for stack, count in stacks.items():
+        root["value"] += count
+        node = root
+        for frame in stack.split(";"):
+            child = node["children"].get(frame)
+            if child is None:
+                child = node["children"][frame] = {
+                    "name": frame,
+                    "value": 0,
+                    "children": {},
+                }
+            child["value"] += count
+            node = child
+    return root
+
+
+def _depth(node: dict[str, Any]) -> int:
+    return 1 + max((_depth(c) for c in node["children"].values()), default=0)
+
+
+def _color(name: str) -> str:
+    digest = hashlib.md5(name.encode(), usedforsecurity=False).digest()
+    return f"rgb({205 + digest[0] % 50},{digest[1] % 230},{digest[2] % 55})"
+
+
+def render_flamegraph(
+    stacks: Mapping[str, int], title: str = "Flame graph", width: int = 1200
+) -> str:
+    """Render collapsed stacks as an SVG flame graph, root at the bottom.
+
+    Hovering a frame shows its name, sample count and share of all samples.
+    """
+    root = _tree(stacks)
+    total = root["value"] or 1
+    scale = width / total
+    depth = _depth(root)
+    top = 2 * FRAME_HEIGHT
+    height = top + depth * FRAME_HEIGHT + 4
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}" '
+        f'font-family="monospace" font-size="{FONT_SIZE}">',
+        '<rect width="100%" height="100%" fill="#fdfdf5"/>',
+        f'<text x="{width / 2}" y="{FRAME_HEIGHT}" text-anchor="middle" '
+        f'font-size="{FONT_SIZE + 3}">{escape(title)}</text>',
+    ]
+
+    def draw(node: dict[str, Any], x: float, level: int) -> None:
+        w = node["value"] * scale
+        if w < MIN_WIDTH:
+            return
+        y = height - (level + 1) * FRAME_HEIGHT - 2
+        name = escape(node["name"])
+        share = 100 * node["value"] / total
+        label = ""
+        chars = int((w - 4) / CHAR_WIDTH)
+        if chars >= 3:
+            text = node["name"]
+            if len(text) > chars:
+                text = text[: chars - 2] + ".."
+            label = (
+                f'<text x="{x + 2:.1f}" y="{y + FRAME_HEIGHT - 4}">'
+                f"{escape(text)}</text>"
+            )
+        parts.append(
+            f"<g><title>{name} ({node['value']} samples, {share:.2f}%)</title>"
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{FRAME_HEIGHT - 1}" '
+            f'fill="{_color(node["name"])}" rx="2"/>{label}</g>'
+        )
+        offset = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            draw(child, offset, level + 1)
+            offset += child["value"] * scale
+
+    draw(root, 0.0, 0)
+    parts.append("</svg>")
+    return "\n".join(parts)
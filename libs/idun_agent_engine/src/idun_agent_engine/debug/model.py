@@ -0,0 +1,69 @@
+"""Configuration models for the debug endpoints."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class ProfilerConfig(BaseModel):
+    """In-process sampling profiler served on `/debug/profile`.
+
+    Attributes:
+        enabled: Expose the endpoint (it also requires the admin token).
+        default_rate_hz: Stack samples per second when the request sets none.
+        max_rate_hz: Upper bound on the sampling rate a request may ask for.
+        max_seconds: Upper bound on the duration of one profile.
+        max_depth: Frames kept per stack, counted from the innermost one.
+    """
+
+    enabled: bool = False
+    default_rate_hz: float = Field(default=100.0, gt=0)
+    max_rate_hz: float = Field(default=500.0, gt=0)
+    max_seconds: float = Field(default=60.0, gt=0)
+    max_depth: int = Field(default=128, ge=1)
+
+
+class SlowRunsConfig(BaseModel):
+    """Event timelines of slow runs, served on `/debug/slow-runs`.
+
+    Attributes:
+        enabled: Record a timeline for every run.
+        threshold_seconds: Runs lasting at least this long are kept.
+        capacity: Slow runs kept per worker; the oldest are dropped first.
+        max_events: Events recorded per run; later ones are only counted.
+    """
+
+    enabled: bool = True
+    threshold_seconds: float = Field(default=5.0, ge=0)
+    capacity: int = Field(default=50, ge=1)
+    max_events: int = Field(default=2000, ge=1)
+
+
+class LoopWatchdogConfig(BaseModel):
+    """Event-loop lag monitor and blocking-call detector.
+
+    Attributes:
+        enabled: Run the heartbeat and the watchdog thread.
+        interval_seconds: Heartbeat period; lag is measured once per period.
+        block_threshold_seconds: Capture the loop's stack once it has been
+            blocked for this long.
+        capacity: Blocking captures kept per worker.
+        max_depth: Frames kept per captured stack.
+        shed_lag_seconds: Reject new runs with 503 while the smoothed loop lag
+            is over this value. Disabled when unset.
+    """
+
+    enabled: bool = True
+    interval_seconds: float = Field(default=0.1, gt=0)
+    block_threshold_seconds: float = Field(default=0.25, gt=0)
+    capacity: int = Field(default=20, ge=1)
+    max_depth: int = Field(default=64, ge=1)
+    shed_lag_seconds: float | None = Field(default=None, gt=0)
+
+
+class DebugConfig(BaseModel):
+    """Diagnostics endpoints under `/debug`, guarded by the admin token."""
+
+    profiler: ProfilerConfig = Field(default_factory=ProfilerConfig)
+    slow_runs: SlowRunsConfig = Field(default_factory=SlowRunsConfig)
+    loop_watchdog: LoopWatchdogConfig = Field(default_factory=LoopWatchdogConfig)
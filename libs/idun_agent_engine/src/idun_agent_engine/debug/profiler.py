@@ -0,0 +1,223 @@
+"""Sampling profiler for the running engine process.
+
+A background thread periodically captures the stack of every thread with
+`sys._current_frames()`; optionally, a coroutine on the event loop records
+where each suspended asyncio task is waiting. Stacks are aggregated in the
+collapsed format (`frame;frame;frame count`), one frame per `module:function`,
+and prefixed with the engine stage they belong to (graph execution, event
+translation, SSE serialization, checkpoint I/O, ...), so hotspots map back to
+engine modules whatever code is at the top of the stack.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any
+
+STAGE_RULES: tuple[tuple[str, str], ...] = (
+    ("idun_agent_engine.agent.langgraph.checkpoint", "checkpoint"),
+    ("langgraph.checkpoint", "checkpoint"),
+    ("aiosqlite", "checkpoint"),
+    ("sqlite3", "checkpoint"),
+    ("idun_agent_engine.observability", "observability"),
+    ("opentelemetry", "observability"),
+    ("langfuse", "observability"),
+    ("phoenix", "observability"),
+    ("openinference", "observability"),
+    ("idun_agent_engine.metrics", "metrics"),
+    ("idun_agent_engine.log", "logging"),
+    ("logging", "logging"),
+    ("langchain_core.callbacks", "callbacks"),
+    ("langchain_core.tracers", "callbacks"),
+    (
+        "idun_agent_engine.agent.langgraph.langgraph:LanggraphAgent._translate_events",
+        "translate",
+    ),
+    (
+        "idun_agent_engine.server.routers.agent:stream.<locals>.event_stream",
+        "serialize",
+    ),
+    ("idun_agent_engine.debug", "profiler"),
+    ("idun_agent_engine", "engine"),
+    ("langgraph", "graph"),
+    ("langchain", "graph"),
+    ("starlette", "http"),
+    ("fastapi", "http"),
+    ("uvicorn", "http"),
+    ("h11", "http"),
+    ("httpx", "http"),
+    ("httpcore", "http"),
+    ("selectors", "idle"),
+    ("asyncio", "event_loop"),
+    ("concurrent.futures", "threads"),
+    ("threading", "threads"),
+)
+"""(frame prefix, stage): the innermost frame matching a prefix names the stage.
+
+Frames of user graphs run inside LangGraph, so they fall under `graph`.
+"""
+
+MAX_TASKS_PER_SAMPLE = 256
+MAX_CACHED_LABELS = 50_000
+
+_labels: dict[CodeType, str] = {}
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    label = _labels.get(code)
+    if label is None:
+        if len(_labels) >= MAX_CACHED_LABELS:
+            _labels.clear()
+        module = frame.f_globals.get("__name__", "?")
+        label = _labels[code] = f"{module}:{code.co_qualname}"
+    return label
+
+
+def stage_of(labels: list[str]) -> str:
+    """Engine stage of a stack given root-to-leaf frame labels."""
+    for label in reversed(labels):
+        for prefix, stage in STAGE_RULES:
+            if label.startswith(prefix):
+                return stage
+    return "other"
+
+
+def _frame_labels(frame: FrameType | None, max_depth: int) -> list[str]:
+    """Root-to-leaf labels of a thread stack, keeping the innermost frames."""
+    labels: list[str] = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_labels(coro: Any, max_depth: int) -> list[str]:
+    """Root-to-leaf labels of the await chain of a suspended coroutine."""
+    labels: list[str] = []
+    while coro is not None and len(labels) < max_depth:
+        frame = (
+            getattr(coro, "cr_frame", None)
+            or getattr(coro, "gi_frame", None)
+            or getattr(coro, "ag_frame", None)
+        )
+        if frame is None:
+            break
+        labels.append(_label(frame))
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+            or getattr(coro, "ag_await", None)
+        )
+    return labels
+
+
+@dataclass
+class ProfileResult:
+    """Aggregated stacks of one profiling session."""
+
+    stacks: Counter[str] = field(default_factory=Counter)
+    samples: int = 0
+    duration_seconds: float = 0.0
+    sampling_seconds: float = 0.0
+
+    @property
+    def overhead(self) -> float:
+        """Fraction of the wall time spent taking samples."""
+        if not self.duration_seconds:
+            return 0.0
+        return self.sampling_seconds / self.duration_seconds
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph tools."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class SamplingProfiler:
+    """Samples thread stacks (and optionally asyncio task stacks) for a while."""
+
+    def __init__(
+        self, rate_hz: float, max_depth: int = 128, include_tasks: bool = False
+    ) -> None:
+        """Sample `rate_hz` times per second, keeping `max_depth` frames."""
+        self.interval = 1.0 / rate_hz
+        self.max_depth = max_depth
+        self.include_tasks = include_tasks
+        self.result = ProfileResult()
+        self._lock = threading.Lock()
+
+    def _add(self, thread: str, labels: list[str]) -> None:
+        stack = ";".join([f"[{stage_of(labels)}]", thread, *labels])
+        with self._lock:
+            self.result.stacks[stack] += 1
+
+    def _sample_threads(self, own: int, names: dict[int, str]) -> None:
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            name = names.get(ident)
+            if name is None:
+                names.update((t.ident or 0, t.name) for t in threading.enumerate())
+                name = names.get(ident, f"thread-{ident}")
+            self._add(name, _frame_labels(frame, self.max_depth))
+
+    def _run_threads(self, seconds: float, stop: threading.Event) -> None:
+        own = threading.get_ident()
+        names: dict[int, str] = {}
+        deadline = time.perf_counter() + seconds
+        while not stop.is_set():
+            start = time.perf_counter()
+            if start >= deadline:
+                break
+            self._sample_threads(own, names)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.result.samples += 1
+                self.result.sampling_seconds += elapsed
+            stop.wait(max(self.interval - elapsed, 0.0))
+
+    async def _run_tasks(self, seconds: float, stop: threading.Event) -> None:
+        own = asyncio.current_task()
+        deadline = time.perf_counter() + seconds
+        while not stop.is_set() and time.perf_counter() < deadline:
+            start = time.perf_counter()
+            for task in list(asyncio.all_tasks())[:MAX_TASKS_PER_SAMPLE]:
+                if task is own or task.done():
+                    continue
+                labels = _await_labels(task.get_coro(), self.max_depth)
+                if labels:
+                    self._add(f"task:{task.get_name()}", labels)
+            with self._lock:
+                self.result.sampling_seconds += time.perf_counter() - start
+            await asyncio.sleep(self.interval)
+
+    async def profile(self, seconds: float) -> ProfileResult:
+        """Sample for `seconds` without blocking the event loop."""
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._run_threads,
+            args=(seconds, stop),
+            name="idun-profiler",
+            daemon=True,
+        )
+        start = time.perf_counter()
+        thread.start()
+        try:
+            if self.include_tasks:
+                await self._run_tasks(seconds, stop)
+            while thread.is_alive():
+                await asyncio.sleep(min(self.interval, 0.05))
+        finally:
+            stop.set()
+            await asyncio.to_thread(thread.join)
+            self.result.duration_seconds = time.perf_counter() - start
+        return self.result
@@ -0,0 +1,265 @@
+"""Event timelines of agent runs, kept only for the slow ones.
+
+Every run appends `(offset, event, name, node, duration)` tuples to a
+`RunTimeline`: LangGraph events for streamed runs, callback events for invoked
+runs, and the checkpoint reads and writes made on its behalf. When the run ends
+the timeline is dropped unless the run took longer than the configured
+threshold, in which case it is rendered and kept in a bounded ring served on
+`/debug/slow-runs`. Fast runs therefore cost a list of small tuples and nothing
+else.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from ..metrics import engine_metrics
+from .model import SlowRunsConfig
+
+_current_timeline: ContextVar[RunTimeline | None] = ContextVar(
+    "idun_run_timeline", default=None
+)
+
+
+def current_timeline() -> RunTimeline | None:
+    """Return the timeline of the run executing in this context, if any."""
+    return _current_timeline.get()
+
+
+class RunTimeline:
+    """Cheap append-only record of what happened during one run."""
+
+    __slots__ = (
+        "run_id",
+        "session_id",
+        "mode",
+        "started_at",
+        "_start",
+        "_entries",
+        "_max_events",
+        "dropped",
+    )
+
+    def __init__(
+        self, run_id: str | None, session_id: str, mode: str, max_events: int
+    ) -> None:
+        """Start the run clock now."""
+        self.run_id = run_id
+        self.session_id = session_id
+        self.mode = mode
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._entries: list[tuple[float, str, str, str | None, float | None]] = []
+        self._max_events = max_events
+        self.dropped = 0
+
+    def elapsed(self) -> float:
+        """Seconds since the run started."""
+        return time.perf_counter() - self._start
+
+    def event(self, event: str, name: str, node: str | None = None) -> None:
+        """Record an instantaneous event, such as a LangGraph stream event."""
+        if len(self._entries) < self._max_events:
+            self._entries.append(
+                (time.perf_counter() - self._start, event, name, node, None)
+            )
+        else:
+            self.dropped += 1
+
+    def span(self, event: str, name: str, started: float) -> None:
+        """Record an operation that began at `started` (`perf_counter`) and ends now."""
+        now = time.perf_counter()
+        if len(self._entries) < self._max_events:
+            self._entries.append(
+                (started - self._start, event, name, None, now - started)
+            )
+        else:
+            self.dropped += 1
+
+    def to_dict(self, duration: float, status: str) -> dict[str, Any]:
+        """Render the timeline, with offsets and durations in milliseconds."""
+        events = []
+        for offset, event, name, node, span in self._entries:
+            entry: dict[str, Any] = {
+                "t_ms": round(offset * 1000, 3),
+                "event": event,
+                "name": name,
+            }
+            if node is not None:
+                entry["node"] = node
+            if span is not None:
+                entry["duration_ms"] = round(span * 1000, 3)
+            events.append(entry)
+        return {
+            "run_id": self.run_id or f"run_{uuid.uuid4()}",
+            "session_id": self.session_id,
+            "mode": self.mode,
+            "status": status,
+            "started_at": datetime.fromtimestamp(self.started_at, UTC).isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "events": events,
+            "dropped_events": self.dropped,
+        }
+
+
+class TimelineCallback(BaseCallbackHandler):
+    """Callback handler recording the events of an invoked run on its timeline."""
+
+    run_inline = True
+
+    def __init__(self, timeline: RunTimeline) -> None:
+        """Record onto `timeline`."""
+        self._timeline = timeline
+
+    def _record(self, event: str, kwargs: dict[str, Any], default: str) -> None:
+        metadata = kwargs.get("metadata") or {}
+        self._timeline.event(
+            event, kwargs.get("name") or default, metadata.get("langgraph_node")
+        )
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        """Record the chain start."""
+        self._record("on_chain_start", kwargs, "chain")
+
+    def on_chain_end(
+        self, outputs: dict[str, Any], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Record the chain end."""
+        self._record("on_chain_end", kwargs, "chain")
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Record the failed chain."""
+        self._record("on_chain_error", kwargs, type(error).__name__)
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        """Record the model call."""
+        self._record("on_chat_model_start", kwargs, "chat_model")
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the model response."""
+        self._record("on_chat_model_end", kwargs, "chat_model")
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        """Record the tool start."""
+        self._record("on_tool_start", kwargs, (serialized or {}).get("name", "tool"))
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the tool end."""
+        self._record("on_tool_end", kwargs, "tool")
+
+
+class SlowRunRecorder:
+    """Keeps the timelines of the slowest recent runs in a bounded ring."""
+
+    def __init__(self) -> None:
+        """Start with the default configuration."""
+        self.config = SlowRunsConfig()
+        self._runs: deque[dict[str, Any]] = deque(maxlen=self.config.capacity)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether runs are being timed."""
+        return self.config.enabled
+
+    def configure(self, config: SlowRunsConfig) -> None:
+        """Apply `config`, dropping the runs kept so far."""
+        self.config = config
+        with self._lock:
+            self._runs = deque(maxlen=config.capacity)
+
+    def start(
+        self, run_id: str | None, session_id: str, mode: str
+    ) -> RunTimeline | None:
+        """Open a timeline for a run, or return None when capture is off."""
+        if not self.config.enabled:
+            return None
+        return RunTimeline(run_id, session_id, mode, self.config.max_events)
+
+    def finish(self, timeline: RunTimeline, status: str) -> bool:
+        """Close `timeline`, keeping it if the run was slow; returns whether it was."""
+        duration = timeline.elapsed()
+        if duration < self.config.threshold_seconds:
+            return False
+        record = timeline.to_dict(duration, status)
+        with self._lock:
+            self._runs.append(record)
+        engine_metrics.slow_runs.labels(timeline.mode).inc()
+        return True
+
+    @contextmanager
+    def track(
+        self, run_id: str | None, session_id: str, mode: str
+    ) -> Iterator[RunTimeline | None]:
+        """Make a new timeline current for the duration of the block."""
+        timeline = self.start(run_id, session_id, mode)
+        if timeline is None:
+            yield None
+            return
+        token = _current_timeline.set(timeline)
+        status = "error"
+        try:
+            yield timeline
+            status = "success"
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                status = "cancelled"
+            raise
+        finally:
+            try:
+                _current_timeline.reset(token)
+            except ValueError:
+                # Async generators may be finalized from another context
+                _current_timeline.set(None)
+            self.finish(timeline, status)
+
+    def runs(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return the kept runs, most recent first."""
+        with self._lock:
+            runs = list(reversed(self._runs))
+        return runs if limit is None else runs[:limit]
+
+    def clear(self) -> int:
+        """Drop the kept runs and return how many there were."""
+        with self._lock:
+            count = len(self._runs)
+            self._runs.clear()
+        return count
+
+
+slow_runs = SlowRunRecorder()
+"""Process-wide slow-run recorder, configured from `server.debug.slow_runs`."""
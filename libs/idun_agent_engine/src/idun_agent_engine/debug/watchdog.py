@@ -0,0 +1,225 @@
+"""Event-loop lag monitor and blocking-call detector.
+
+A heartbeat coroutine sleeps for a fixed interval and measures how late it
+wakes up: that delay is the time the loop spent running something else without
+yielding, and is exported as `idun_event_loop_lag_seconds`. A watchdog thread
+checks the heartbeat; when it is overdue by more than the blocking threshold,
+the loop is stuck in synchronous code, and the thread captures the loop's stack
+while it still points at the culprit. The capture names the innermost frame
+outside the standard library, installed packages and the engine (normally the
+user's graph code) and the LangGraph node running it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import sys
+import sysconfig
+import threading
+import time
+from collections import deque
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from ..metrics import engine_metrics
+from .model import LoopWatchdogConfig
+from .profiler import _frame_labels
+
+logger = logging.getLogger(__name__)
+
+LAG_SMOOTHING = 0.3
+"""Weight of the latest heartbeat in the smoothed lag used for load shedding."""
+
+
+def _library_paths() -> tuple[str, ...]:
+    paths = sysconfig.get_paths()
+    engine = str(Path(__file__).resolve().parents[1])
+    roots = {paths["stdlib"], paths["purelib"], paths["platlib"], engine}
+    return tuple(str(Path(root).resolve()) for root in roots)
+
+
+_LIBRARY_PATHS = _library_paths()
+
+
+def _is_user_code(filename: str) -> bool:
+    if filename.startswith("<"):
+        return False
+    return not filename.startswith(_LIBRARY_PATHS)
+
+
+def _node_of(frame: FrameType) -> str | None:
+    """LangGraph node name from the runnable config held by a frame, if any."""
+    try:
+        config = frame.f_locals.get("config")
+    except Exception:  # noqa: BLE001 - frame may be finishing concurrently
+        return None
+    if not isinstance(config, dict):
+        return None
+    node = (config.get("metadata") or {}).get("langgraph_node")
+    return node if isinstance(node, str) else None
+
+
+def blocking_site(frame: FrameType, max_depth: int = 64) -> dict[str, Any]:
+    """Describe what a blocked thread is running, from its innermost frame.
+
+    Returns the culprit's file, line and function (the innermost user frame, or
+    the innermost frame when there is none), the LangGraph node it runs in, and
+    the root-to-leaf stack.
+    """
+    culprit: FrameType | None = None
+    node = None
+    current: FrameType | None = frame
+    while current is not None and (culprit is None or node is None):
+        code = current.f_code
+        if culprit is None and _is_user_code(code.co_filename):
+            culprit = current
+        if node is None:
+            node = _node_of(current)
+        current = current.f_back
+    culprit = culprit or frame
+    return {
+        "node": node,
+        "file": culprit.f_code.co_filename,
+        "line": culprit.f_lineno,
+        "function": culprit.f_code.co_qualname,
+        "stack": _frame_labels(frame, max_depth),
+    }
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and records what blocked the loop."""
+
+    def __init__(self) -> None:
+        """Start stopped with the default configuration."""
+        self.config = LoopWatchdogConfig()
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._blocked: deque[dict[str, Any]] = deque(maxlen=self.config.capacity)
+        self._lock = threading.Lock()
+        self._pending: dict[str, Any] | None = None
+        self._last_beat = 0.0
+        self._loop_thread: int | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the heartbeat is running."""
+        return self._heartbeat_task is not None
+
+    def configure(self, config: LoopWatchdogConfig) -> None:
+        """Apply `config`, dropping the captures kept so far."""
+        self.config = config
+        self.lag = self.max_lag = 0.0
+        with self._lock:
+            self._blocked = deque(maxlen=config.capacity)
+            self._pending = None
+
+    async def start(self) -> None:
+        """Start monitoring the running loop, if enabled."""
+        if not self.config.enabled or self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="idun-loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        self._stop.set()
+        task, self._heartbeat_task = self._heartbeat_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            await asyncio.to_thread(thread.join)
+
+    def should_shed(self) -> bool:
+        """Whether the smoothed lag is over `shed_lag_seconds`."""
+        limit = self.config.shed_lag_seconds
+        return limit is not None and self.running and self.lag >= limit
+
+    def blocked(self) -> list[dict[str, Any]]:
+        """Return the recorded blocking captures, most recent first."""
+        with self._lock:
+            return list(reversed(self._blocked))
+
+    def report(self) -> dict[str, Any]:
+        """Current lag figures and the recorded blocking captures."""
+        return {
+            "running": self.running,
+            "lag_ms": round(self.lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "threshold_ms": round(self.config.block_threshold_seconds * 1000, 3),
+            "blocked": self.blocked(),
+        }
+
+    async def _heartbeat(self) -> None:
+        interval = self.config.interval_seconds
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(now - start - interval, 0.0)
+            self._observe(lag)
+
+    def _observe(self, lag: float) -> None:
+        self.lag += LAG_SMOOTHING * (lag - self.lag)
+        self.max_lag = max(self.max_lag, lag)
+        engine_metrics.loop_lag.observe(lag)
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is not None:
+                pending["blocked_ms"] = round(lag * 1000, 3)
+                self._blocked.append(pending)
+        if pending is None:
+            return
+        engine_metrics.loop_blocked.labels(pending["node"] or "").inc()
+        logger.warning(
+            "Event loop blocked for %.0f ms by %s (%s:%d)%s",
+            lag * 1000,
+            pending["function"],
+            pending["file"],
+            pending["line"],
+            f" in node '{pending['node']}'" if pending["node"] else "",
+        )
+
+    def _watch(self) -> None:
+        config = self.config
+        check_every = max(config.block_threshold_seconds / 4, 0.005)
+        captured_beat = None
+        while not self._stop.wait(check_every):
+            beat = self._last_beat
+            overdue = time.perf_counter() - beat - config.interval_seconds
+            if overdue < config.block_threshold_seconds or beat == captured_beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread or 0)
+            if frame is None:
+                continue
+            capture = {
+                "started_at": datetime.fromtimestamp(
+                    time.time() - overdue, UTC
+                ).isoformat(),
+                **blocking_site(frame, config.max_depth),
+            }
+            del frame
+            captured_beat = beat
+            with self._lock:
+                if self._last_beat == beat:
+                    self._pending = capture
+
+
+loop_watchdog = LoopWatchdog()
+"""Process-wide loop watchdog, configured from `server.debug.loop_watchdog`."""
@@ -0,0 +1,21 @@
+"""Agent runs served by executor processes behind the HTTP front end."""
+
+from .model import ExecutorPoolConfig
+from .pool import (
+    ExecutorPool,
+    ExecutorPoolAgent,
+    ExecutorPoolError,
+    ExecutorRunError,
+    RelayedEvent,
+    provision_metrics_dir,
+)
+
+__all__ = [
+    "ExecutorPool",
+    "ExecutorPoolAgent",
+    "ExecutorPoolConfig",
+    "ExecutorPoolError",
+    "ExecutorRunError",
+    "RelayedEvent",
+    "provision_metrics_dir",
+]
@@ -0,0 +1,5 @@
+"""Entry point of executor processes: `python -m idun_agent_engine.executor`."""
+
+from .worker import main
+
+main()
@@ -0,0 +1,64 @@
+"""Executor pool configuration model."""
+
+from __future__ import annotations
+
+import os
+
+from pydantic import BaseModel, Field
+
+
+class ExecutorPoolConfig(BaseModel):
+    """Agent runs served by executor processes behind the HTTP front end.
+
+    The engine process keeps the HTTP server and hands every run to one of
+    `processes` executor processes over a local socket; each executor loads the
+    agent and runs up to `concurrency` runs at a time. An executor that exits
+    is started again, failing only the runs it was serving.
+
+    Runs of a session go to the executor the session hashes to. Token usage
+    and budgets are tracked by each executor for the sessions it served, so
+    with a session budget a run waits for a slot on that executor rather than
+    going to a less busy one.
+
+    A hot reload starts a new pool before the old one is stopped. The old pool
+    keeps serving the requests admitted before the swap and retires once none
+    of them holds it, so both pools only overlap while those runs finish.
+
+    Example YAML:
+      server:
+        executor_pool:
+          enabled: true
+          processes: 4
+          concurrency: 16
+
+    Attributes:
+        enabled: Run the agent in executor processes.
+        processes: Executor processes; None means one per CPU.
+        concurrency: Runs served at once by each executor process.
+        queue_timeout_seconds: How long a run waits for a free slot before it
+            is rejected.
+        start_timeout_seconds: How long an executor may take to load the agent
+            and accept runs, warmup included.
+        stop_timeout_seconds: How long an executor may take to exit on shutdown
+            before it is killed.
+        restart_backoff_seconds: Delay before an exited executor is started
+            again, doubled on each consecutive failure up to 30 seconds.
+        strict_affinity: Only run a session on the executor it hashes to.
+            None means strict when `server.usage` sets a session budget.
+        socket_dir: Directory of the executors' sockets; a private temporary
+            directory when unset.
+    """
+
+    enabled: bool = False
+    processes: int | None = Field(default=None, ge=1)
+    concurrency: int = Field(default=8, ge=1)
+    queue_timeout_seconds: float = Field(default=30.0, ge=0)
+    start_timeout_seconds: float = Field(default=60.0, gt=0)
+    stop_timeout_seconds: float = Field(default=10.0, gt=0)
+    restart_backoff_seconds: float = Field(default=1.0, ge=0)
+    strict_affinity: bool | None = None
+    socket_dir: str | None = None
+
+    def resolved_processes(self) -> int:
+        """Return the number of executor processes, resolving the CPU default."""
+        return self.processes or os.cpu_count() or 1
@@ -0,0 +1,557 @@
+"""Executor processes serving agent runs for the HTTP front end.
+
+`ExecutorPool` starts the executor processes, restarts those that exit, and
+hands each run to one with a free slot: the executor a session hashes to when
+it has one, else the least busy, unless affinity is strict. `ExecutorPoolAgent`
+puts the pool behind the `BaseAgent` interface, so the routes serve it like an
+in-process agent.
+
+Runs record their metrics, node profiles and token usage in the executors, so
+the front end serves `/metrics` and `/agent/profile` from the snapshots they
+write to a shared metrics directory; `provision_metrics_dir` supplies one when
+none is configured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from collections.abc import AsyncGenerator, AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ag_ui.core import events as ag_events
+
+from ..agent.base import BaseAgent
+from ..metrics import engine_metrics
+from ..usage import RunUsage, TokenBudgetExceededError, report_usage
+from .model import ExecutorPoolConfig
+from .protocol import DONE, ERROR, EVENT, REQUEST, json_frame, read_frame, write_frame
+
+if TYPE_CHECKING:
+    from ..core.engine_config import EngineConfig
+
+logger = logging.getLogger(__name__)
+
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+
+
+class ExecutorPoolError(Exception):
+    """Raised when no executor process can serve a run."""
+
+    def __init__(self, message: str, code: str) -> None:
+        """Describe the failure; `code` is reported on `RunErrorEvent`."""
+        super().__init__(message)
+        self.code = code
+
+
+class ExecutorRunError(Exception):
+    """Raised when the agent failed in its executor process."""
+
+    def __init__(self, message: str, error_type: str, code: str | None) -> None:
+        """Describe the exception raised in the executor."""
+        super().__init__(message)
+        self.error_type = error_type
+        self.code = code
+
+
+def provision_metrics_dir(
+    engine_config: EngineConfig, directory: str | None = None
+) -> str | None:
+    """Give a pooled engine without a metrics directory one shared with its executors.
+
+    Sets `directory`, or a new temporary directory, as the config's
+    `multiprocess_dir` when the pool and metrics are enabled and no directory
+    is configured. Returns the directory set, or None when none was needed;
+    the caller removes it on shutdown.
+    """
+    server = engine_config.server
+    metrics = server.metrics
+    if not (server.executor_pool.enabled and metrics.enabled) or metrics.resolved_dir():
+        return None
+    metrics.multiprocess_dir = directory or tempfile.mkdtemp(prefix="idun-metrics-")
+    return metrics.multiprocess_dir
+
+
+def _raise_remote(payload: bytes) -> None:
+    """Raise the exception described by an `ERROR` frame."""
+    error = json.loads(payload)
+    if error.get("budget") is not None:
+        raise TokenBudgetExceededError(**error["budget"])
+    raise ExecutorRunError(error["message"], error["type"], error.get("code"))
+
+
+@dataclass
+class RelayedEvent:
+    """An ag-ui event serialized by an executor, served without re-encoding."""
+
+    type: ag_events.EventType
+    data: str
+
+    @classmethod
+    def from_frame(cls, payload: bytes) -> RelayedEvent:
+        """Read an `EVENT` frame: the event type, a newline, then its JSON."""
+        split = payload.index(b"\n")
+        event_type = ag_events.EventType(payload[:split].decode())
+        return cls(event_type, str(memoryview(payload)[split + 1 :], "utf-8"))
+
+    @property
+    def run_id(self) -> str | None:
+        """The run id carried by lifecycle events."""
+        run_id: str | None = json.loads(self.data).get("run_id")
+        return run_id
+
+    def model_dump_json(self) -> str:
+        """Return the event's JSON as the executor serialized it."""
+        return self.data
+
+
+class _Executor:
+    """One executor process and the runs it serves."""
+
+    def __init__(self, index: int, socket_path: str) -> None:
+        self.index = index
+        self.socket_path = socket_path
+        self.process: asyncio.subprocess.Process | None = None
+        self.ready = False
+        self.active = 0
+        self.restarts = 0
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid if self.process is not None else None
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "pid": self.pid,
+            "ready": self.ready,
+            "active": self.active,
+            "restarts": self.restarts,
+        }
+
+
+class ExecutorPool:
+    """Executor processes running the agent, each serving a bounded number of runs.
+
+    Runs beyond the free slots wait up to `queue_timeout_seconds`; the runs
+    queued and in flight, their wait and the restarts are exported as metrics.
+    """
+
+    def __init__(self, config: ExecutorPoolConfig) -> None:
+        """Prepare `config.processes` executors; `start` launches them."""
+        self.config = config
+        self._socket_dir = config.socket_dir
+        self._owns_socket_dir = config.socket_dir is None
+        self._executors: list[_Executor] = []
+        self._supervisors: list[asyncio.Task[None]] = []
+        self._slots = asyncio.Condition()
+        self._config_line = b""
+        self._closing = False
+        self._queued = 0
+        self.strict_affinity = bool(config.strict_affinity)
+
+    @property
+    def queued(self) -> int:
+        """Runs waiting for a free slot."""
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        """Runs in flight on the executors."""
+        return sum(executor.active for executor in self._executors)
+
+    def describe(self) -> dict[str, Any]:
+        """Pool size and current load, for the agent's infos."""
+        return {
+            "processes": len(self._executors),
+            "concurrency": self.config.concurrency,
+            "strict_affinity": self.strict_affinity,
+            "active": self.active,
+            "queued": self.queued,
+            "executors": [executor.describe() for executor in self._executors],
+        }
+
+    async def start(self, engine_config_json: str) -> None:
+        """Launch executors serving the engine config given as JSON.
+
+        Returns once every executor accepts runs; the config must have the pool
+        disabled, since executors load it as their own.
+
+        Raises:
+            ExecutorPoolError: If an executor exits or times out while starting.
+        """
+        self._config_line = engine_config_json.encode() + b"\n"
+        if self._socket_dir is None:
+            self._socket_dir = tempfile.mkdtemp(prefix="idun-executors-")
+        Path(self._socket_dir).mkdir(parents=True, exist_ok=True)
+        self._executors = [
+            _Executor(index, os.path.join(self._socket_dir, f"executor-{index}.sock"))
+            for index in range(self.config.resolved_processes())
+        ]
+        try:
+            async with asyncio.TaskGroup() as group:
+                for executor in self._executors:
+                    group.create_task(self._spawn(executor))
+        except BaseExceptionGroup as e:
+            await self.close()
+            raise e.exceptions[0] from None
+        self._supervisors = [
+            asyncio.create_task(self._supervise(executor))
+            for executor in self._executors
+        ]
+        logger.info(
+            "Executor pool started: %d process(es), %d run(s) each",
+            len(self._executors),
+            self.config.concurrency,
+        )
+
+    async def _spawn(self, executor: _Executor) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(executor.socket_path)
+        process = executor.process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "idun_agent_engine.executor",
+            "--socket",
+            executor.socket_path,
+            stdin=asyncio.subprocess.PIPE,
+        )
+        # Stdin stays open: the executor exits when it closes with this process
+        assert process.stdin is not None
+        process.stdin.write(self._config_line)
+        await process.stdin.drain()
+
+        deadline = time.monotonic() + self.config.start_timeout_seconds
+        while not os.path.exists(executor.socket_path):
+            if process.returncode is not None:
+                raise ExecutorPoolError(
+                    f"Executor process exited with code {process.returncode} "
+                    "before accepting runs.",
+                    "executor_unavailable",
+                )
+            if time.monotonic() > deadline:
+                process.kill()
+                await process.wait()
+                raise ExecutorPoolError(
+                    "Executor process did not accept runs within "
+                    f"{self.config.start_timeout_seconds}s.",
+                    "executor_unavailable",
+                )
+            await asyncio.sleep(0.05)
+        executor.ready = True
+        async with self._slots:
+            self._slots.notify_all()
+
+    async def _supervise(self, executor: _Executor) -> None:
+        """Start `executor` again whenever its process exits."""
+        failures = 0
+        while True:
+            assert executor.process is not None
+            returncode = await executor.process.wait()
+            executor.ready = False
+            if self._closing:
+                return
+            logger.warning(
+                "Executor process %d exited with code %d, restarting it",
+                executor.process.pid,
+                returncode,
+            )
+            executor.restarts += 1
+            engine_metrics.pool_restarts.inc()
+            while not self._closing:
+                backoff = self.config.restart_backoff_seconds * 2**failures
+                await asyncio.sleep(min(backoff, MAX_RESTART_BACKOFF_SECONDS))
+                try:
+                    await self._spawn(executor)
+                except ExecutorPoolError as e:
+                    failures += 1
+                    logger.warning("Could not restart executor process: %s", e)
+                else:
+                    failures = 0
+                    break
+
+    def _pick(self, session_id: str) -> _Executor | None:
+        free = [
+            e for e in self._executors if e.ready and e.active < self.config.concurrency
+        ]
+        if not free:
+            return None
+        preferred = self._executors[
+            zlib.crc32(session_id.encode()) % len(self._executors)
+        ]
+        if preferred in free:
+            return preferred
+        if self.strict_affinity:
+            return None
+        return min(free, key=lambda e: e.active)
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, session_id: str) -> AsyncIterator[_Executor]:
+        """Hold a run slot on an executor for the duration of the block.
+
+        Raises:
+            ExecutorPoolError: If the pool is closed or no slot frees up in time.
+        """
+        if self._closing:
+            raise ExecutorPoolError("Executor pool is closed.", "executor_unavailable")
+        submitted = time.perf_counter()
+        self._queued += 1
+        engine_metrics.pool_queued.inc()
+        try:
+            async with asyncio.timeout(self.config.queue_timeout_seconds):
+                async with self._slots:
+                    picked = await self._slots.wait_for(lambda: self._pick(session_id))
+                    assert picked is not None
+                    executor = picked
+                    executor.active += 1
+        except TimeoutError:
+            raise ExecutorPoolError(
+                "No executor slot became free within "
+                f"{self.config.queue_timeout_seconds}s.",
+                "executor_busy",
+            ) from None
+        finally:
+            self._queued -= 1
+            engine_metrics.pool_queued.dec()
+        engine_metrics.pool_wait.observe(time.perf_counter() - submitted)
+        engine_metrics.pool_active.inc()
+        try:
+            yield executor
+        finally:
+            executor.active -= 1
+            engine_metrics.pool_active.dec()
+            async with self._slots:
+                # Waiters may be bound to other executors (strict affinity)
+                self._slots.notify_all()
+            if self._closing:
+                self._stop_idle()
+
+    async def request(
+        self, op: str, message: dict[str, Any] | None = None
+    ) -> AsyncGenerator[tuple[bytes, bytes]]:
+        """Send a request to an executor, yielding the frames it answers with.
+
+        The last frame is the first one that is not an `EVENT`. Closing the
+        generator early cancels the run in the executor.
+
+        Raises:
+            ExecutorPoolError: If no slot frees up in time or the executor
+                exits during the run.
+        """
+        session_id = str((message or {}).get("session_id", ""))
+        async with self._slot(session_id) as executor:
+            try:
+                reader, writer = await asyncio.open_unix_connection(
+                    executor.socket_path
+                )
+            except OSError as e:
+                raise ExecutorPoolError(
+                    f"Executor process {executor.pid} is not reachable: {e}",
+                    "executor_crashed",
+                ) from e
+            try:
+                request = {"op": op, "message": message}
+                await write_frame(writer, json_frame(REQUEST, request))
+                while True:
+                    kind, payload = await read_frame(reader)
+                    yield kind, payload
+                    if kind != EVENT:
+                        return
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                raise ExecutorPoolError(
+                    f"Executor process {executor.pid} exited during the run.",
+                    "executor_crashed",
+                ) from e
+            finally:
+                writer.close()
+
+    async def call(self, op: str, message: dict[str, Any] | None = None) -> Any:
+        """Send a request answered with a single result and return it.
+
+        Raises:
+            ExecutorPoolError: If no executor could serve the request.
+            ExecutorRunError: If the request failed in the executor.
+        """
+        async with contextlib.aclosing(self.request(op, message)) as frames:
+            async for kind, payload in frames:
+                if kind == ERROR:
+                    _raise_remote(payload)
+                return json.loads(payload)
+        raise ExecutorPoolError("Executor returned no result.", "executor_crashed")
+
+    def retire(self) -> None:
+        """Take no new runs and stop each executor once nothing is left for it.
+
+        Used when a hot reload replaced the pool and no request still holds it,
+        so the old executors do not outlive their runs. `close` must still be
+        called.
+        """
+        self._closing = True
+        self._stop_idle()
+
+    def _stop_idle(self) -> None:
+        if self._queued:
+            return
+        for executor in self._executors:
+            process = executor.process
+            if executor.active or process is None or process.returncode is not None:
+                continue
+            executor.ready = False
+            process.terminate()
+
+    async def close(self) -> None:
+        """Stop the executors, killing those still running after the stop timeout."""
+        self._closing = True
+        for task in self._supervisors:
+            task.cancel()
+        for task in self._supervisors:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        processes = [
+            e.process
+            for e in self._executors
+            if e.process is not None and e.process.returncode is None
+        ]
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                await asyncio.wait_for(process.wait(), self.config.stop_timeout_seconds)
+            except TimeoutError:
+                logger.warning(
+                    "Executor process %d did not stop, killing it", process.pid
+                )
+                process.kill()
+                await process.wait()
+        if self._owns_socket_dir and self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+
+
+class ExecutorPoolAgent(BaseAgent):
+    """Serves the configured agent from the processes of an `ExecutorPool`.
+
+    `initialize` takes the whole engine configuration, which each executor
+    loads as its own with the pool disabled.
+    """
+
+    def __init__(self, config: ExecutorPoolConfig) -> None:
+        """Create the agent; `initialize` starts the pool."""
+        self.pool = ExecutorPool(config)
+        self._description: dict[str, Any] = {}
+
+    @property
+    def id(self) -> str:
+        """Identifier reported by the executors' agent."""
+        return str(self._description.get("infos", {}).get("id", "executor-pool"))
+
+    @property
+    def agent_type(self) -> str:
+        """Type of the agent run by the executors."""
+        return str(self._description.get("agent_type", "ExecutorPool"))
+
+    @property
+    def name(self) -> str:
+        """Name of the agent run by the executors."""
+        return str(self._description.get("name") or self.agent_type)
+
+    @property
+    def agent_instance(self) -> Any:
+        """None: the agent lives in the executor processes."""
+        return None
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of the agent run by the executors."""
+        fingerprint: str = self._description["fingerprint"]
+        return fingerprint
+
+    @property
+    def persistence_path(self) -> str | None:
+        """SQLite file of the agent run by the executors, if any."""
+        path: str | None = self._description.get("persistence_path")
+        return path
+
+    @property
+    def infos(self) -> dict[str, Any]:
+        """The executors' agent infos, with the pool's size and load."""
+        return {
+            **self._description.get("infos", {}),
+            "executor_pool": self.pool.describe(),
+        }
+
+    async def initialize(self, config: dict[str, Any]) -> None:
+        """Start executors serving the engine configuration `config`.
+
+        Raises:
+            ExecutorPoolError: If the executors could not start.
+        """
+        from ..core.engine_config import EngineConfig
+
+        engine_config = EngineConfig.model_validate(config)
+        self._configuration = engine_config.agent.config
+        if self.pool.config.strict_affinity is None:
+            # Each executor only knows the usage of the sessions it served
+            usage = engine_config.server.usage
+            self.pool.strict_affinity = (
+                usage.enabled and usage.session_budget_tokens is not None
+            )
+        server = engine_config.server.model_copy(
+            update={"executor_pool": ExecutorPoolConfig()}
+        )
+        executor_config = engine_config.model_copy(update={"server": server})
+        await self.pool.start(executor_config.model_dump_json())
+        self._description = await self.pool.call("describe")
+
+    async def warmup(self, queries: list[str]) -> None:
+        """Nothing to do: each executor warms up before accepting runs."""
+        return None
+
+    async def invoke(self, message: Any) -> Any:
+        """Run the agent in an executor and return its response.
+
+        Raises:
+            ExecutorPoolError: If no executor could serve the run.
+            ExecutorRunError: If the agent failed.
+            TokenBudgetExceededError: If the session is over its token budget.
+        """
+        result = await self.pool.call("invoke", message)
+        if result["usage"] is not None:
+            report_usage(RunUsage(**result["usage"]))
+        return result["response"]
+
+    async def stream(self, message: Any) -> AsyncGenerator[Any]:
+        """Run the agent in an executor, relaying its ag-ui events."""
+        try:
+            async with contextlib.aclosing(
+                self.pool.request("stream", message)
+            ) as frames:
+                async for kind, payload in frames:
+                    if kind == EVENT:
+                        yield RelayedEvent.from_frame(payload)
+                    elif kind == ERROR:
+                        _raise_remote(payload)
+                    elif kind != DONE:
+                        raise ExecutorPoolError(
+                            f"Unexpected executor frame {kind!r}", "executor_crashed"
+                        )
+        except (ExecutorPoolError, ExecutorRunError) as e:
+            yield ag_events.RunErrorEvent(
+                type=ag_events.EventType.RUN_ERROR, message=str(e), code=e.code
+            )
+
+    def retire(self) -> None:
+        """Stop the executors as they finish their runs, once released."""
+        self.pool.retire()
+
+    async def close(self) -> None:
+        """Stop the executor processes."""
+        await self.pool.close()
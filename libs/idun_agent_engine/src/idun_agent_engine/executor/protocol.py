@@ -0,0 +1,55 @@
+"""Framing of the messages exchanged with executor processes.
+
+Each run opens its own connection to an executor. The front end sends one
+request frame, then the executor answers with a sequence of frames, each a
+4-byte big-endian payload length and a kind byte followed by the payload:
+
+- `EVENT`: an ag-ui event type, a newline, and the event's JSON as served;
+- `RESULT`: JSON carrying the return value of an invoke or describe request;
+- `ERROR`: JSON describing the exception that ended the run;
+- `DONE`: the end of a stream.
+
+Events are serialized once, in the executor, and relayed without decoding.
+Closing the connection cancels the run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+from typing import Any
+
+EVENT = b"E"
+RESULT = b"R"
+ERROR = b"X"
+DONE = b"D"
+REQUEST = b"Q"
+
+_HEADER = struct.Struct(">Ic")
+
+
+def frame(kind: bytes, payload: bytes = b"") -> tuple[bytes, bytes]:
+    """Return the header and payload of a frame, to write one after the other."""
+    return _HEADER.pack(len(payload), kind), payload
+
+
+def json_frame(kind: bytes, data: Any) -> tuple[bytes, bytes]:
+    """Return a frame carrying `data` as JSON."""
+    return frame(kind, json.dumps(data, default=str).encode())
+
+
+async def write_frame(writer: asyncio.StreamWriter, parts: tuple[bytes, bytes]) -> None:
+    """Write a frame and wait until the transport can take more."""
+    writer.writelines(parts)
+    await writer.drain()
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[bytes, bytes]:
+    """Read the next frame and return its kind and payload.
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection closed first.
+    """
+    length, kind = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return kind, await reader.readexactly(length)
@@ -0,0 +1,197 @@
+"""Executor process running agent runs for the HTTP front end.
+
+Started by `ExecutorPool` as `python -m idun_agent_engine.executor --socket
+PATH`, with the engine config as one JSON line on stdin. The executor
+loads the agent, warms it up when configured, then accepts runs on a unix
+socket at PATH; the socket appears only once runs can be served.
+
+It exits after finishing its runs on SIGTERM, or when its stdin closes because
+the front end is gone. SIGINT is left to the front end, which stops its
+executors itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import inspect
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from typing import Any
+
+from ..agent.base import BaseAgent
+from ..core.config_builder import ConfigBuilder
+from ..core.engine_config import EngineConfig
+from ..debug import slow_runs
+from ..log import configure_logging
+from ..metrics import MultiprocessCollector, engine_metrics, node_profiler
+from ..observability.tracing import engine_tracer
+from ..server.warmup import run_warmup
+from ..usage import TokenBudgetExceededError, usage_report, usage_tracker
+from .protocol import (
+    DONE,
+    ERROR,
+    EVENT,
+    RESULT,
+    frame,
+    json_frame,
+    read_frame,
+    write_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _error(error: Exception) -> dict[str, Any]:
+    """Describe an exception for the front end to raise it again."""
+    described: dict[str, Any] = {
+        "type": type(error).__name__,
+        "message": str(error),
+        "code": getattr(error, "code", None),
+    }
+    if isinstance(error, TokenBudgetExceededError):
+        described["budget"] = {
+            "session_id": error.session_id,
+            "used": error.used,
+            "budget": error.budget,
+        }
+    return described
+
+
+class _RunServer:
+    """Serves the runs sent on each connection by the front end."""
+
+    def __init__(self, agent: BaseAgent) -> None:
+        self.agent = agent
+
+    async def _describe(self) -> dict[str, Any]:
+        return {
+            "agent_type": self.agent.agent_type,
+            "name": getattr(self.agent, "name", None),
+            "fingerprint": self.agent.fingerprint,
+            "persistence_path": self.agent.persistence_path,
+            "infos": self.agent.infos,
+        }
+
+    async def _run(self, request: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        op = request.get("op")
+        try:
+            if op == "stream":
+                async for event in self.agent.stream(request["message"]):
+                    payload = f"{event.type.value}\n{event.model_dump_json()}"
+                    await write_frame(writer, frame(EVENT, payload.encode()))
+                await write_frame(writer, frame(DONE))
+            elif op == "invoke":
+                with usage_report() as report:
+                    response = await self.agent.invoke(request["message"])
+                usage = None
+                if report.usage is not None:
+                    usage = dataclasses.asdict(report.usage)
+                result = {"response": response, "usage": usage}
+                await write_frame(writer, json_frame(RESULT, result))
+            elif op == "describe":
+                await write_frame(writer, json_frame(RESULT, await self._describe()))
+            else:
+                raise ValueError(f"Unknown executor operation {op!r}")
+        except ConnectionError:
+            raise
+        except Exception as e:  # noqa: BLE001 - relayed to the front end
+            await write_frame(writer, json_frame(ERROR, _error(e)))
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the run requested on a connection, cancelling it on hang-up."""
+        try:
+            _, payload = await read_frame(reader)
+            run = asyncio.create_task(self._run(json.loads(payload), writer))
+            hangup = asyncio.create_task(reader.read())
+            await asyncio.wait({run, hangup}, return_when=asyncio.FIRST_COMPLETED)
+            hangup.cancel()
+            run.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await run
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _watch_parent(loop: asyncio.AbstractEventLoop, stop: asyncio.Event) -> None:
+    """Stop the executor once the front end closes its stdin."""
+    # Unbuffered, so the interpreter can exit while this thread still reads
+    while os.read(sys.stdin.fileno(), 4096):
+        pass
+    with contextlib.suppress(RuntimeError):
+        loop.call_soon_threadsafe(stop.set)
+
+
+async def serve(socket_path: str, config: EngineConfig) -> None:
+    """Load the agent described by `config` and serve runs until stopped."""
+    server_config = config.server
+    configure_logging(server_config.logging)
+    engine_tracer.configure(server_config.tracing)
+    node_profiler.configure(server_config.profiling)
+    usage_tracker.configure(server_config.usage)
+    slow_runs.configure(server_config.debug.slow_runs)
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    threading.Thread(target=_watch_parent, args=(loop, stop), daemon=True).start()
+
+    agent = await ConfigBuilder.initialize_agent_from_config(config)
+    if server_config.warmup.enabled:
+        await run_warmup(agent, server_config.warmup)
+
+    collector: MultiprocessCollector | None = None
+    metrics_task: asyncio.Task[None] | None = None
+    directory = server_config.metrics.resolved_dir()
+    if server_config.metrics.enabled and directory is not None:
+        collector = MultiprocessCollector(engine_metrics.registry, directory)
+        metrics_task = asyncio.create_task(
+            collector.publish(server_config.metrics.flush_interval_seconds)
+        )
+
+    # Bound under another name, so the socket only appears once it accepts runs
+    staging = f"{socket_path}.{os.getpid()}"
+    server = await asyncio.start_unix_server(_RunServer(agent).handle, staging)
+    os.replace(staging, socket_path)
+    logger.info("Executor %d serving runs on %s", os.getpid(), socket_path)
+
+    await stop.wait()
+    logger.info("Executor %d stopping", os.getpid())
+    server.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    # Waits for the connections of the runs in flight to close
+    await server.wait_closed()
+
+    close_fn = getattr(agent, "close", None)
+    if callable(close_fn):
+        result = close_fn()
+        if inspect.isawaitable(result):
+            await result
+    if metrics_task is not None and collector is not None:
+        metrics_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await metrics_task
+        with contextlib.suppress(OSError):
+            collector.write()
+    await asyncio.to_thread(engine_tracer.shutdown)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Read the engine config from stdin and serve runs on `--socket`."""
+    parser = argparse.ArgumentParser(description="Idun agent executor process")
+    parser.add_argument("--socket", required=True, help="Unix socket to serve on")
+    args = parser.parse_args(argv)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    config = EngineConfig.model_validate_json(sys.stdin.buffer.readline())
+    asyncio.run(serve(args.socket, config))
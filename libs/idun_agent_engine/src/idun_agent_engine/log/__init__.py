@@ -0,0 +1,23 @@
+"""Structured, non-blocking logging for the engine."""
+
+from .model import LoggingConfig
+from .redact import redact
+from .setup import (
+    JsonFormatter,
+    RateLimitFilter,
+    TextFormatter,
+    configure_logging,
+    log_context,
+    shutdown_logging,
+)
+
+__all__ = [
+    "JsonFormatter",
+    "LoggingConfig",
+    "RateLimitFilter",
+    "TextFormatter",
+    "configure_logging",
+    "log_context",
+    "redact",
+    "shutdown_logging",
+]
@@ -0,0 +1,31 @@
+"""Logging configuration model."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class LoggingConfig(BaseModel):
+    """Engine log output.
+
+    Records are handed to a background thread through a bounded queue, so
+    writing logs never blocks the event loop; when the queue is full records
+    are dropped and counted in `/metrics`.
+
+    Attributes:
+        level: Minimum level of engine records.
+        format: `json` (one object per line) or `text`.
+        queue_size: Records waiting to be written before new ones are dropped.
+        rate_limit_burst: Warnings and errors allowed per message template and
+            interval; repeats beyond that are dropped and their count reported
+            on the next record that gets through.
+        rate_limit_interval_seconds: Length of the rate limiting interval.
+    """
+
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
+    format: Literal["json", "text"] = "json"
+    queue_size: int = Field(default=10_000, gt=0)
+    rate_limit_burst: int = Field(default=5, ge=1)
+    rate_limit_interval_seconds: float = Field(default=60.0, gt=0)
@@ -0,0 +1,48 @@
+"""Masking of secrets in configuration dumps."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel
+
+REDACTED = "***"
+SECRET_MARKERS = (
+    "secret",
+    "token",
+    "password",
+    "passwd",
+    "api_key",
+    "apikey",
+    "authorization",
+    "credential",
+    "private_key",
+)
+"""Key fragments (case-insensitive) whose values are masked."""
+
+
+def is_secret_key(key: str) -> bool:
+    """Whether values stored under `key` should never be logged."""
+    lowered = key.lower().replace("-", "_")
+    return any(marker in lowered for marker in SECRET_MARKERS)
+
+
+def redact(value: Any) -> Any:
+    """Return a copy of `value` with the values of secret-looking keys masked.
+
+    Pydantic models are dumped first; dicts and lists are walked recursively.
+    """
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {
+            key: (
+                REDACTED
+                if isinstance(key, str) and is_secret_key(key) and item
+                else redact(item)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list | tuple):
+        return [redact(item) for item in value]
+    return value
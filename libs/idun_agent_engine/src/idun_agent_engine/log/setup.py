@@ -0,0 +1,210 @@
+"""Queue-based structured logging for the engine.
+
+Engine modules log through `logging.getLogger(__name__)`. `configure_logging`
+attaches a single queue handler to the `idun_agent_engine` logger: callers only
+format the message and enqueue it, while a listener thread serializes records
+and writes them to stdout. Fields bound with `log_context` (such as the
+session and run ids) are captured when the record is created and emitted as
+top-level keys.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from ..metrics import engine_metrics
+from .model import LoggingConfig
+
+ROOT_LOGGER = "idun_agent_engine"
+MAX_RATE_LIMIT_KEYS = 1024
+
+_context: ContextVar[dict[str, Any]] = ContextVar("idun_log_context", default={})
+_STANDARD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Add `fields` to every record logged within the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        try:
+            _context.reset(token)
+        except ValueError:
+            # Async generators may be finalized from another context
+            _context.set({})
+
+
+def _extra_fields(record: logging.LogRecord) -> dict[str, Any]:
+    return {
+        key: value
+        for key, value in record.__dict__.items()
+        if key not in _STANDARD_ATTRS and not key.startswith("_")
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with context and extra fields as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize `record`."""
+        data: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(_extra_fields(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human readable lines, with context and extra fields as `key=value`."""
+
+    def __init__(self) -> None:
+        """Use the engine's line layout."""
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render `record` on one line, followed by any traceback."""
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if not fields:
+            return line
+        head, sep, tail = line.partition("\n")
+        pairs = " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"{head} {pairs}{sep}{tail}"
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through at most `burst` warnings per message template and interval.
+
+    Records below WARNING are never limited. The number of dropped repeats is
+    attached as `suppressed` to the next record of the same template.
+    """
+
+    def __init__(self, burst: int, interval_seconds: float) -> None:
+        """Allow `burst` records per template every `interval_seconds`."""
+        super().__init__()
+        self.burst = burst
+        self.interval_seconds = interval_seconds
+        # template -> [window start, records let through, records dropped]
+        self._windows: dict[tuple[str, int, Any], list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return False for repeats over the limit."""
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval_seconds:
+                if window is None and len(self._windows) >= MAX_RATE_LIMIT_KEYS:
+                    self._windows.clear()
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                suppressed = window[2]
+                window[2] = 0
+            else:
+                window[2] += 1
+                engine_metrics.log_records_dropped.labels("rate_limited").inc()
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class _EngineQueueHandler(QueueHandler):
+    """Captures the log context and hands records to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens here, in the caller, so arguments are not shared
+        # with the listener thread; tracebacks are rendered once as text.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key, value in _context.get().items():
+            setattr(record, key, value)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            engine_metrics.log_records_dropped.labels("queue_full").inc()
+
+
+_listener: QueueListener | None = None
+_handler: QueueHandler | None = None
+_lock = threading.Lock()
+
+
+def configure_logging(config: LoggingConfig | None = None) -> None:
+    """Route engine logs through a bounded queue to a background writer.
+
+    Calling it again replaces the previous setup, flushing pending records.
+    """
+    global _listener, _handler
+    config = config or LoggingConfig()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if config.format == "json" else TextFormatter())
+    handler = _EngineQueueHandler(queue.Queue(maxsize=config.queue_size))
+    handler.addFilter(
+        RateLimitFilter(config.rate_limit_burst, config.rate_limit_interval_seconds)
+    )
+    listener = QueueListener(handler.queue, stream, respect_handler_level=False)
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    with _lock:
+        previous_listener, previous_handler = _listener, _handler
+        listener.start()
+        logger.addHandler(handler)
+        logger.setLevel(config.level)
+        logger.propagate = False
+        if previous_handler is not None:
+            logger.removeHandler(previous_handler)
+        if previous_listener is None:
+            atexit.register(shutdown_logging)
+        _listener, _handler = listener, handler
+    if previous_listener is not None:
+        previous_listener.stop()
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener, _handler
+    with _lock:
+        listener, handler = _listener, _handler
+        _listener = _handler = None
+    if handler is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(handler)
+    if listener is not None:
+        listener.stop()
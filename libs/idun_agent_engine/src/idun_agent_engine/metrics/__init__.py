@@ -0,0 +1,35 @@
+"""Low-overhead engine metrics exposed in the Prometheus text format."""
+
+from .engine import EngineMetrics, StreamTimer, engine_metrics
+from .model import ProfilingConfig
+from .multiprocess import MultiprocessCollector
+from .profiler import NodeProfiler, node_profiler, profile_report
+from .registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    Summary,
+    merge_snapshots,
+    render_text,
+)
+from .sketch import QuantileSketch
+
+__all__ = [
+    "Counter",
+    "EngineMetrics",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "MultiprocessCollector",
+    "NodeProfiler",
+    "ProfilingConfig",
+    "QuantileSketch",
+    "StreamTimer",
+    "Summary",
+    "engine_metrics",
+    "merge_snapshots",
+    "node_profiler",
+    "profile_report",
+    "render_text",
+]
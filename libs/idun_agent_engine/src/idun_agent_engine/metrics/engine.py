@@ -0,0 +1,250 @@
+"""Metrics recorded by the engine for HTTP requests and agent runs."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .registry import MetricsRegistry
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+TTFT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0)
+TOKEN_RATE_BUCKETS = (1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500)
+EVENT_COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+EXECUTOR_WAIT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class EngineMetrics:
+    """The engine's metric families, registered on a dedicated registry."""
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        """Create every engine metric on `registry` (a fresh one by default)."""
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.request_duration = r.histogram(
+            "idun_http_request_duration_seconds",
+            "HTTP request latency until the response body is fully sent.",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.runs_in_flight = r.gauge(
+            "idun_agent_runs_in_flight", "Agent runs currently executing."
+        )
+        self.run_duration = r.histogram(
+            "idun_agent_run_duration_seconds",
+            "Duration of agent runs.",
+            ("mode", "outcome"),
+            LATENCY_BUCKETS,
+        )
+        self.time_to_first_token = r.histogram(
+            "idun_agent_time_to_first_token_seconds",
+            "Time from the start of a streamed run to its first text token.",
+            (),
+            TTFT_BUCKETS,
+        )
+        self.tokens_per_second = r.histogram(
+            "idun_agent_tokens_per_second",
+            "Streamed text chunks per second after the first token, per run.",
+            (),
+            TOKEN_RATE_BUCKETS,
+        )
+        self.events_per_run = r.histogram(
+            "idun_agent_events_per_run",
+            "Number of ag-ui events emitted by a streamed run.",
+            (),
+            EVENT_COUNT_BUCKETS,
+        )
+        self.events = r.counter(
+            "idun_agent_events_total", "ag-ui events emitted, by type.", ("type",)
+        )
+        self.response_cache = r.counter(
+            "idun_response_cache_requests_total",
+            "Response cache lookups on /agent/invoke, by result.",
+            ("result",),
+        )
+        self.idempotent_replays = r.counter(
+            "idun_idempotent_replays_total",
+            "Requests answered from an earlier run sharing their Idempotency-Key.",
+            ("mode",),
+        )
+
+        self.observability_spans = r.counter(
+            "idun_observability_spans_total",
+            "Spans handled by the engine export path, by outcome.",
+            ("outcome",),
+        )
+        self.trace_sampling = r.counter(
+            "idun_trace_sampling_decisions_total",
+            "Head-based trace sampling decisions for agent runs.",
+            ("decision", "reason"),
+        )
+        self.agent_tokens = r.counter(
+            "idun_agent_tokens_total",
+            "Model tokens consumed by the agent, by direction.",
+            ("agent", "type"),
+        )
+        self.llm_calls = r.counter(
+            "idun_agent_llm_calls_total",
+            "Model responses reporting token usage.",
+            ("agent",),
+        )
+        self.agent_cost = r.counter(
+            "idun_agent_cost_usd_total",
+            "Estimated model cost in USD, for models with configured pricing.",
+            ("agent",),
+        )
+        self.session_tokens = r.gauge(
+            "idun_session_tokens",
+            "Tokens used by each recently active session on this worker.",
+            ("session",),
+        )
+        self.token_budget_exceeded = r.counter(
+            "idun_token_budget_exceeded_total",
+            "Runs rejected or aborted because their session ran out of budget.",
+            ("agent",),
+        )
+        self.log_records_dropped = r.counter(
+            "idun_log_records_dropped_total",
+            "Engine log records dropped before being written, by reason.",
+            ("reason",),
+        )
+        self.slow_runs = r.counter(
+            "idun_slow_runs_total",
+            "Runs over the slow-run threshold whose timeline was kept.",
+            ("mode",),
+        )
+        self.loop_lag = r.histogram(
+            "idun_event_loop_lag_seconds",
+            "Delay of the event loop heartbeat past its scheduled time.",
+            (),
+            LOOP_LAG_BUCKETS,
+        )
+        self.loop_blocked = r.counter(
+            "idun_event_loop_blocked_total",
+            "Times the event loop was blocked past the threshold, by graph node.",
+            ("node",),
+        )
+        self.executor_queued = r.gauge(
+            "idun_node_executor_queued",
+            "Graph node calls waiting for a worker of a dedicated executor.",
+            ("executor",),
+        )
+        self.executor_active = r.gauge(
+            "idun_node_executor_active",
+            "Graph node calls running on a dedicated executor.",
+            ("executor",),
+        )
+        self.executor_wait = r.histogram(
+            "idun_node_executor_wait_seconds",
+            "Time graph node calls waited for a worker of a dedicated executor.",
+            ("executor",),
+            EXECUTOR_WAIT_BUCKETS,
+        )
+        self.pool_queued = r.gauge(
+            "idun_executor_pool_queued_runs",
+            "Runs waiting for a free slot of the executor processes.",
+            (),
+        )
+        self.pool_active = r.gauge(
+            "idun_executor_pool_active_runs",
+            "Runs in flight on the executor processes.",
+            (),
+        )
+        self.pool_wait = r.histogram(
+            "idun_executor_pool_wait_seconds",
+            "Time runs waited for a free slot of the executor processes.",
+            (),
+            EXECUTOR_WAIT_BUCKETS,
+        )
+        self.pool_restarts = r.counter(
+            "idun_executor_pool_restarts_total",
+            "Executor processes started again after exiting.",
+            (),
+        )
+        self.node_duration = r.summary(
+            "idun_node_duration_seconds",
+            "Duration of graph nodes and tools run by the agent.",
+            ("kind", "node"),
+        )
+
+    @contextmanager
+    def track_run(self, mode: str) -> Iterator[None]:
+        """Count the run as in flight and record its duration and outcome."""
+        self.runs_in_flight.inc()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                outcome = "cancelled"
+            raise
+        finally:
+            self.runs_in_flight.dec()
+            self.run_duration.labels(mode, outcome).observe(time.perf_counter() - start)
+
+
+class StreamTimer:
+    """Per-run timing of the token stream, fed from the event translation."""
+
+    __slots__ = ("_start", "_first", "_last", "_tokens", "_metrics")
+
+    def __init__(self, metrics: EngineMetrics) -> None:
+        """Start timing a run."""
+        self._metrics = metrics
+        self._start = time.perf_counter()
+        self._first: float | None = None
+        self._last = 0.0
+        self._tokens = 0
+
+    def token(self) -> None:
+        """Record one streamed text chunk."""
+        now = time.perf_counter()
+        if self._first is None:
+            self._first = now
+            self._metrics.time_to_first_token.observe(now - self._start)
+        self._last = now
+        self._tokens += 1
+
+    def finish(self) -> None:
+        """Record the generation rate once the run is over."""
+        if self._first is not None and self._tokens > 1 and self._last > self._first:
+            self._metrics.tokens_per_second.observe(
+                (self._tokens - 1) / (self._last - self._first)
+            )
+
+
+engine_metrics = EngineMetrics()
+"""Process-wide engine metrics, shared by the routes and agent adapters."""
@@ -0,0 +1,23 @@
+"""Configuration models for engine metrics."""
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingConfig(BaseModel):
+    """Per-node latency profiling served on `/agent/profile` and `/metrics`.
+
+    Attributes:
+        enabled: Time every graph node and tool run by the agent.
+        window_seconds: Sliding window over which percentiles are reported.
+        window_slices: Number of slices the window advances by; more slices
+            make the window slide more smoothly at the cost of memory.
+        relative_accuracy: Relative error bound of reported percentiles.
+        max_buckets: Upper bound on buckets per sketch, which caps the memory
+            used by one node at a few kilobytes.
+    """
+
+    enabled: bool = True
+    window_seconds: float = Field(default=300.0, gt=0)
+    window_slices: int = Field(default=5, ge=1)
+    relative_accuracy: float = Field(default=0.02, gt=0, lt=1)
+    max_buckets: int = Field(default=256, ge=8)
@@ -0,0 +1,180 @@
+"""Aggregation of metrics across worker processes through a shared directory.
+
+Each worker periodically writes its registry snapshot to
+`<directory>/metrics-<pid>-<start>.json`, where `<start>` tells apart processes
+that reused a pid. Whichever worker serves a scrape refreshes its own file, then
+merges every snapshot in the directory. Snapshots of exited workers are folded
+into a single `exited.json` and removed, so their counters and histograms are
+kept (totals never go backwards) without one file per worker ever started;
+their gauges are dropped. Clear the directory when the deployment restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .registry import MetricsRegistry, Snapshot, merge_snapshots
+
+if sys.platform != "win32":
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+EXITED_FILE = "exited.json"
+"""Merged snapshots of exited workers, with the names of the files folded in."""
+
+
+def _start_time(pid: int) -> str | None:
+    """Return when process `pid` started, in clock ticks since boot, if known."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # The command name may contain spaces: count fields after its parenthesis
+    fields = stat.rpartition(")")[2].split()
+    return fields[19] if len(fields) > 19 else None
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _alive(pid: int, start: str) -> bool:
+    """Whether the process that wrote a snapshot is still running.
+
+    Where start times cannot be read, a live process with the same pid counts.
+    """
+    if not _pid_alive(pid):
+        return False
+    current = _start_time(pid)
+    return current is None or current == start
+
+
+class MultiprocessCollector:
+    """Writes this worker's snapshot and merges those of every worker."""
+
+    def __init__(self, registry: MetricsRegistry, directory: str) -> None:
+        """Bind the registry to the shared snapshot directory."""
+        self.registry = registry
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        start = _start_time(pid) or str(time.time_ns())
+        self._path = self.directory / f"metrics-{pid}-{start}.json"
+
+    def write(self) -> None:
+        """Atomically replace this worker's snapshot file."""
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.registry.snapshot()))
+        os.replace(tmp, self._path)
+
+    async def publish(self, interval: float) -> None:
+        """Write this worker's snapshot every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.write)
+            except OSError as e:
+                logger.warning("Could not write metrics snapshot: %s", e)
+
+    def collect(self) -> Snapshot:
+        """Refresh this worker's snapshot and merge all workers' snapshots.
+
+        Snapshots of exited workers are folded into the exited aggregate on the
+        way, under a lock so concurrent scrapes neither miss nor double them.
+        """
+        self.write()
+        with self._lock() as locked:
+            exited = self._read_exited()
+            folded = set(exited["folded"])
+            snapshots: list[Snapshot] = [exited["snapshot"]]
+            live: list[bool] = [False]
+            dead: list[Path] = []
+            for path in sorted(self.directory.glob("metrics-*-*.json")):
+                pid, _, start = path.stem.removeprefix("metrics-").partition("-")
+                if not pid.isdigit():
+                    continue
+                if path.name in folded:
+                    # Already in the aggregate: a fold stopped before removing it
+                    if locked:
+                        path.unlink(missing_ok=True)
+                    continue
+                alive = _alive(int(pid), start)
+                # A worker may be replacing its file right now; skip it this time
+                with contextlib.suppress(OSError, ValueError):
+                    snapshots.append(json.loads(path.read_text()))
+                    live.append(alive)
+                    if not alive:
+                        dead.append(path)
+            if locked and dead:
+                self._fold(snapshots, live, folded, dead)
+        return merge_snapshots(snapshots, live)
+
+    @contextlib.contextmanager
+    def _lock(self) -> Iterator[bool]:
+        """Hold the directory's fold lock; yields False where it is unavailable."""
+        if sys.platform == "win32":
+            yield False
+            return
+        with open(self.directory / ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_exited(self) -> dict[str, Any]:
+        try:
+            exited: dict[str, Any] = json.loads(
+                (self.directory / EXITED_FILE).read_text()
+            )
+        except (OSError, ValueError):
+            return {"folded": [], "snapshot": {}}
+        return exited
+
+    def _fold(
+        self,
+        snapshots: list[Snapshot],
+        live: list[bool],
+        folded: set[str],
+        dead: list[Path],
+    ) -> None:
+        """Merge the exited aggregate with the dead snapshots, then remove them.
+
+        The aggregate lists the files folded in, so they are not counted twice
+        if removing them fails; names are kept only while their file exists.
+        """
+        dead_snapshots = [
+            s for s, alive in zip(snapshots, live, strict=True) if not alive
+        ]
+        names = {name for name in folded if (self.directory / name).exists()}
+        exited = {
+            "folded": sorted(names | {path.name for path in dead}),
+            "snapshot": merge_snapshots(dead_snapshots, [False] * len(dead_snapshots)),
+        }
+        target = self.directory / EXITED_FILE
+        tmp = target.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(exited))
+            os.replace(tmp, target)
+            for path in dead:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Could not fold exited metrics snapshots: %s", e)
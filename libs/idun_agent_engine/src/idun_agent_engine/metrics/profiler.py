@@ -0,0 +1,201 @@
+"""Per-node latency profiling of agent runs.
+
+Every graph node and tool run is timed from its start and end events and
+recorded in the `idun_node_duration_seconds` summary, one quantile sketch per
+node. Streamed runs are timed from the LangGraph events the adapter already
+translates; invoked runs, which produce no event stream, through an inline
+callback handler.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .engine import engine_metrics
+from .model import ProfilingConfig
+from .registry import Snapshot, Summary, summary_sketch
+
+MAX_OPEN_RUNS = 10_000
+"""Upper bound on node runs timed at once by the shared callback handler."""
+
+WINDOWS = ("recent", "total")
+
+
+class RunNodeTimer:
+    """Times the nodes and tools of one streamed run from its LangGraph events."""
+
+    __slots__ = ("_profiler", "_open")
+
+    def __init__(self, profiler: NodeProfiler) -> None:
+        """Start with no open node."""
+        self._profiler = profiler
+        self._open: dict[str, tuple[str, str, float]] = {}
+
+    def observe(self, event: dict[str, Any]) -> None:
+        """Account for one `astream_events` event."""
+        kind = event["event"]
+        if kind == "on_chain_start":
+            metadata = event.get("metadata")
+            if metadata and metadata.get("langgraph_node") == event["name"]:
+                self._open[event["run_id"]] = (
+                    "node",
+                    event["name"],
+                    time.perf_counter(),
+                )
+        elif kind == "on_tool_start":
+            self._open[event["run_id"]] = ("tool", event["name"], time.perf_counter())
+        elif kind == "on_chain_end" or kind == "on_tool_end":
+            started = self._open.pop(event["run_id"], None)
+            if started is not None:
+                node_kind, name, start = started
+                self._profiler.record(node_kind, name, time.perf_counter() - start)
+
+
+class NodeTimingCallback(BaseCallbackHandler):
+    """Callback handler timing nodes and tools of invoked runs.
+
+    Shared by every run; open node runs are keyed by their unique run id.
+    """
+
+    run_inline = True
+
+    def __init__(self, profiler: NodeProfiler) -> None:
+        """Bind the handler to `profiler`."""
+        self._profiler = profiler
+        self._open: dict[UUID, tuple[str, str, float]] = {}
+
+    def _start(self, run_id: UUID, kind: str, name: str) -> None:
+        if len(self._open) < MAX_OPEN_RUNS:
+            self._open[run_id] = (kind, name, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._open.pop(run_id, None)
+        if started is not None:
+            kind, name, start = started
+            self._profiler.record(kind, name, time.perf_counter() - start)
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Open the run if it is a graph node."""
+        name = kwargs.get("name")
+        if name and metadata and metadata.get("langgraph_node") == name:
+            self._start(run_id, "node", name)
+
+    def on_chain_end(
+        self, outputs: dict[str, Any], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Record the node duration."""
+        self._finish(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Forget a failed node."""
+        self._open.pop(run_id, None)
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        """Open the tool run."""
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(run_id, "tool", name)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the tool duration."""
+        self._finish(run_id)
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Forget a failed tool run."""
+        self._open.pop(run_id, None)
+
+
+class NodeProfiler:
+    """Records node and tool durations into a windowed summary."""
+
+    def __init__(self, summary: Summary) -> None:
+        """Profile into `summary`, labelled by kind and node name."""
+        self.summary = summary
+        self.enabled = True
+        self.callback = NodeTimingCallback(self)
+
+    def configure(self, config: ProfilingConfig) -> None:
+        """Apply `config`, dropping the timings recorded so far."""
+        self.enabled = config.enabled
+        self.summary.configure(
+            window_seconds=config.window_seconds,
+            window_slices=config.window_slices,
+            relative_accuracy=config.relative_accuracy,
+            max_buckets=config.max_buckets,
+        )
+
+    def record(self, kind: str, name: str, seconds: float) -> None:
+        """Record one node or tool run."""
+        if self.enabled:
+            self.summary.labels(kind, name).observe(seconds)
+
+    def run_timer(self) -> RunNodeTimer | None:
+        """Return a timer for one streamed run, or None when profiling is off."""
+        return RunNodeTimer(self) if self.enabled else None
+
+    def reset(self) -> None:
+        """Drop every recorded timing."""
+        self.summary.reset()
+
+
+def profile_report(snapshot: Snapshot, window: str = "recent") -> dict[str, Any]:
+    """Summarize the node timings of a (merged) metrics snapshot.
+
+    `window` is `recent` for the sliding window or `total` for everything since
+    the last reset. Nodes are sorted by the total time spent in them.
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window {window!r}, expected one of {WINDOWS}")
+    family = snapshot.get(engine_metrics.node_duration.name)
+    if family is None:
+        return {"window": window, "window_seconds": None, "nodes": []}
+    nodes = []
+    for (kind, name), value in family["samples"]:
+        sketch = summary_sketch(family, value[window])
+        if not sketch.count:
+            continue
+        nodes.append(
+            {
+                "kind": kind,
+                "node": name,
+                "count": sketch.count,
+                "total_ms": round(sketch.sum * 1000, 3),
+                "mean_ms": round(sketch.sum / sketch.count * 1000, 3),
+                "p50_ms": round(sketch.quantile(0.5) * 1000, 3),
+                "p90_ms": round(sketch.quantile(0.9) * 1000, 3),
+                "p99_ms": round(sketch.quantile(0.99) * 1000, 3),
+                "max_ms": round(sketch.max * 1000, 3),
+            }
+        )
+    nodes.sort(key=lambda node: node["total_ms"], reverse=True)
+    return {
+        "window": window,
+        "window_seconds": family["window_seconds"],
+        "nodes": nodes,
+    }
+
+
+node_profiler = NodeProfiler(engine_metrics.node_duration)
+"""Process-wide node profiler, fed by the agent adapters."""
@@ -0,0 +1,502 @@
+"""Minimal metric primitives rendered in the Prometheus text format.
+
+Metrics are updated on every request and streamed event, so the primitives
+stay deliberately small: children are plain objects cached per label set,
+histograms preallocate their bucket counters and observe with a single bisect.
+Updates also come from other threads (span export, executor threads), so each
+family holds one lock guarding child creation and every child update.
+
+A registry can be serialized to a snapshot (plain JSON-compatible data) and
+snapshots from several processes merged before rendering, which is how
+multi-worker deployments are aggregated.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .sketch import QuantileSketch
+
+Snapshot = dict[str, Any]
+
+
+class _Metric:
+    """Common behaviour of metric families: naming and per-label-set children."""
+
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """Return the child for the given label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        """Drop the child for the given label values, if it exists."""
+        with self._lock:
+            self._children.pop(values, None)
+
+    def _samples(self) -> list[list[Any]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [[list(k), c.value()] for k, c in children]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Serialize the family and all its children."""
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": self._samples(),
+        }
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self._lock = lock
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self._children[()].inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self._lock = lock
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down. Summed across live workers when merged."""
+
+    type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild(self._lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled gauge."""
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the unlabelled gauge."""
+        self._children[()].dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self._children[()].set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_lock", "_counts", "_sum", "_count")
+
+    def __init__(self, bounds: tuple[float, ...], lock: threading.Lock) -> None:
+        self._bounds = bounds
+        self._lock = lock
+        # One slot per bucket plus the implicit +Inf bucket
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        bucket = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._sum += value
+            self._count += 1
+
+    def value(self) -> list[Any]:
+        with self._lock:
+            return [list(self._counts), self._sum, self._count]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed, preallocated buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+    ):
+        """Create a histogram; buckets are upper bounds, `+Inf` is implicit."""
+        self.buckets = tuple(sorted(b for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets, self._lock)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabelled histogram."""
+        self._children[()].observe(value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Serialize the family, including its bucket bounds."""
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+class _SummaryChild:
+    __slots__ = ("_family", "_total", "_slices")
+
+    def __init__(self, family: Summary) -> None:
+        self._family = family
+        self._total = family.new_sketch()
+        # (slot number, sketch) for the most recent slices of the window
+        self._slices: deque[tuple[int, QuantileSketch]] = deque(
+            maxlen=family.window_slices
+        )
+
+    def observe(self, value: float) -> None:
+        slot = int(time.time() // self._family.slice_seconds)
+        with self._family._lock:
+            if not self._slices or self._slices[-1][0] != slot:
+                self._slices.append((slot, self._family.new_sketch()))
+            self._slices[-1][1].add(value)
+            self._total.add(value)
+
+    def recent(self) -> QuantileSketch:
+        """Merge the slices still inside the window."""
+        family = self._family
+        oldest = int(time.time() // family.slice_seconds) - family.window_slices + 1
+        merged = family.new_sketch()
+        with family._lock:
+            for slot, sketch in self._slices:
+                if slot >= oldest:
+                    merged.merge(sketch)
+        return merged
+
+    def total(self) -> QuantileSketch:
+        return self._total
+
+    def value(self) -> dict[str, Any]:
+        recent = self.recent().to_dict()
+        with self._family._lock:
+            return {"recent": recent, "total": self._total.to_dict()}
+
+
+class Summary(_Metric):
+    """Quantiles over a sliding window, with cumulative sum and count.
+
+    Each child keeps one quantile sketch since the last reset plus one per
+    slice of the window, so memory is bounded by the sketch size whatever the
+    number of observations.
+    """
+
+    type = "summary"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        quantiles: Iterable[float] = (0.5, 0.9, 0.99),
+        window_seconds: float = 300.0,
+        window_slices: int = 5,
+        relative_accuracy: float = 0.02,
+        max_buckets: int = 256,
+    ):
+        """Create a summary; quantiles are rendered over the last `window_seconds`."""
+        self.quantiles = tuple(quantiles)
+        self.window_seconds = window_seconds
+        self.window_slices = window_slices
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        super().__init__(name, documentation, labelnames)
+
+    @property
+    def slice_seconds(self) -> float:
+        """Length of one window slice."""
+        return self.window_seconds / self.window_slices
+
+    def new_sketch(self) -> QuantileSketch:
+        """Return an empty sketch with this family's accuracy."""
+        return QuantileSketch(self.relative_accuracy, self.max_buckets)
+
+    def _new_child(self) -> _SummaryChild:
+        return _SummaryChild(self)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabelled summary."""
+        self._children[()].observe(value)
+
+    def configure(
+        self,
+        window_seconds: float,
+        window_slices: int,
+        relative_accuracy: float,
+        max_buckets: int,
+    ) -> None:
+        """Change the window and accuracy, dropping every recorded observation."""
+        self.window_seconds = window_seconds
+        self.window_slices = window_slices
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every recorded observation."""
+        with self._lock:
+            self._children.clear()
+            if not self.labelnames:
+                self._children[()] = self._new_child()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Serialize the family, including its quantiles and sketch accuracy."""
+        data = super().snapshot()
+        data["quantiles"] = list(self.quantiles)
+        data["window_seconds"] = self.window_seconds
+        data["relative_accuracy"] = self.relative_accuracy
+        data["max_buckets"] = self.max_buckets
+        return data
+
+
+def summary_sketch(family: dict[str, Any], data: dict[str, Any]) -> QuantileSketch:
+    """Rebuild one sketch of a summary snapshot sample."""
+    return QuantileSketch.from_dict(
+        data, family["relative_accuracy"], family["max_buckets"]
+    )
+
+
+def _merge_summary(
+    family: dict[str, Any], current: dict[str, Any], value: dict[str, Any]
+) -> dict[str, Any]:
+    merged = {}
+    for part in ("recent", "total"):
+        sketch = summary_sketch(family, current[part])
+        sketch.merge(summary_sketch(family, value[part]))
+        merged[part] = sketch.to_dict()
+    return merged
+
+
+class MetricsRegistry:
+    """Collection of metric families owned by one process."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        """Add a metric family and return it."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def summary(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        quantiles: Iterable[float] = (0.5, 0.9, 0.99),
+        window_seconds: float = 300.0,
+    ) -> Summary:
+        """Create and register a summary."""
+        return self.register(
+            Summary(name, documentation, labelnames, quantiles, window_seconds)
+        )
+
+    def snapshot(self) -> Snapshot:
+        """Serialize every family to JSON-compatible data."""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+def merge_snapshots(
+    snapshots: Iterable[Snapshot], include_gauges: Iterable[bool] | None = None
+) -> Snapshot:
+    """Sum snapshots from several processes into one.
+
+    Counters and histograms are summed, summary sketches are merged. Gauges are summed only for snapshots
+    flagged in `include_gauges` (live processes), so a dead worker's in-flight
+    gauge does not linger.
+    """
+    snapshots = list(snapshots)
+    flags = list(include_gauges) if include_gauges is not None else None
+    merged: Snapshot = {}
+    for index, snapshot in enumerate(snapshots):
+        live = flags[index] if flags is not None else True
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": []})
+            if family["type"] == "gauge" and not live:
+                continue
+            if family["type"] == "histogram" and family.get("buckets") != target.get(
+                "buckets"
+            ):
+                continue
+            if family["type"] == "summary" and family.get(
+                "relative_accuracy"
+            ) != target.get("relative_accuracy"):
+                continue
+            index_by_labels = {
+                tuple(labels): position
+                for position, (labels, _) in enumerate(target["samples"])
+            }
+            for labels, value in family["samples"]:
+                position = index_by_labels.get(tuple(labels))
+                if position is None:
+                    target["samples"].append([labels, value])
+                    index_by_labels[tuple(labels)] = len(target["samples"]) - 1
+                    continue
+                current = target["samples"][position][1]
+                if family["type"] == "summary":
+                    current = _merge_summary(family, current, value)
+                elif family["type"] == "histogram":
+                    counts = [a + b for a, b in zip(current[0], value[0], strict=True)]
+                    current = [counts, current[1] + value[1], current[2] + value[2]]
+                else:
+                    current = current + value
+                target["samples"][position][1] = current
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _summary_lines(
+    name: str, family: dict[str, Any], labels: list[str], value: dict[str, Any]
+) -> list[str]:
+    """Quantiles over the recent window, then cumulative sum and count."""
+    labelnames = family["labelnames"]
+    recent = summary_sketch(family, value["recent"])
+    lines = []
+    for q in family["quantiles"]:
+        quantile = f'quantile="{_number(q)}"'
+        lines.append(
+            f"{name}{_labels(labelnames, labels, quantile)} "
+            f"{_number(recent.quantile(q))}"
+        )
+    total = value["total"]
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(total['sum'])}")
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {total['count']}")
+    return lines
+
+
+def render_text(snapshot: Snapshot) -> str:
+    """Render a (merged) snapshot in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for name, family in snapshot.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family["labelnames"]
+        for labels, value in family["samples"]:
+            if family["type"] == "summary":
+                lines.extend(_summary_lines(name, family, labels, value))
+                continue
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(
+                [*family["buckets"], math.inf], counts, strict=True
+            ):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f"{name}_bucket{_labels(labelnames, labels, le)} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labelnames, labels)} {count}")
+    return "\n".join(lines) + "\n"
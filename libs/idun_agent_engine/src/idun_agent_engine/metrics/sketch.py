@@ -0,0 +1,131 @@
+"""Mergeable streaming quantile sketch with a bounded relative error.
+
+Values are counted in logarithmically sized buckets: bucket `k` covers
+`(gamma**(k-1), gamma**k]` with `gamma = (1 + a) / (1 - a)`, so any quantile is
+reported within a relative error `a` of a value that was actually observed.
+Memory grows with the spread of the observed values, not with their number, and
+is capped by collapsing the lowest buckets together. Two sketches with the same
+accuracy merge by adding their bucket counts, which is how windows and workers
+are combined.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+MIN_VALUE = 1e-9
+"""Values at or below this (including zero) are counted in a dedicated bucket."""
+
+
+class QuantileSketch:
+    """Log-bucket sketch answering quantile queries over a stream of durations."""
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_buckets",
+        "_log_gamma",
+        "_buckets",
+        "_zero",
+        "count",
+        "sum",
+        "min",
+        "max",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.02, max_buckets: int = 256):
+        """Create an empty sketch."""
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._buckets: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record one observation."""
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= MIN_VALUE:
+            self._zero += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self._buckets
+        buckets[key] = buckets.get(key, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Fold the lowest bucket into the next one, trading accuracy on the fast end."""
+        lowest = min(self._buckets)
+        count = self._buckets.pop(lowest)
+        following = min(self._buckets)
+        self._buckets[following] += count
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Add the observations of a sketch with the same accuracy."""
+        if other.count == 0:
+            return
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        while len(self._buckets) > self.max_buckets:
+            self._collapse()
+        self._zero += other._zero
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the `q` quantile (0 to 1); 0.0 for an empty sketch."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._zero
+        if rank < seen:
+            return max(self.min, 0.0)
+        gamma = math.exp(self._log_gamma)
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen > rank:
+                estimate = 2 * gamma**key / (gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to JSON-compatible data."""
+        return {
+            "buckets": [[key, count] for key, count in self._buckets.items()],
+            "zero": self._zero,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict[str, Any],
+        relative_accuracy: float = 0.02,
+        max_buckets: int = 256,
+    ) -> QuantileSketch:
+        """Rebuild a sketch written by `to_dict`."""
+        sketch = cls(relative_accuracy, max_buckets)
+        sketch._buckets = {int(key): count for key, count in data["buckets"]}
+        sketch._zero = data["zero"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
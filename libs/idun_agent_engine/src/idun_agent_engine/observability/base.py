@@ -10,7 +10,7 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 # Re-export config for backward compatibility
-from .model import ObservabilityConfig
+from .model import ExportConfig, ObservabilityConfig, ProviderConfig
 
 
 class ObservabilityHandlerBase(ABC):
@@ -21,9 +21,14 @@ class ObservabilityHandlerBase(ABC):
 
     provider: str
 
-    def __init__(self, options: dict[str, Any] | None = None) -> None:
-        """Initialize handler with provider-specific options."""
+    def __init__(
+        self,
+        options: dict[str, Any] | None = None,
+        export: ExportConfig | None = None,
+    ) -> None:
+        """Initialize handler with provider-specific options and export settings."""
         self.options: dict[str, Any] = options or {}
+        self.export_config: ExportConfig = export or ExportConfig()
 
     @abstractmethod
     def get_callbacks(self) -> list[Any]:
@@ -35,6 +40,31 @@ class ObservabilityHandlerBase(ABC):
         run_name = self.options.get("run_name")
         return run_name if isinstance(run_name, str) else None
 
+    def flush(self) -> None:
+        """Flush buffered telemetry to the provider. No-op by default."""
+        return None
+
+    def verify(self) -> bool | None:
+        """Check connectivity/credentials with the provider.
+
+        Performs network I/O, so it is only called from the background setup
+        task. Returns None when the provider offers no such check.
+        """
+        return None
+
+    @classmethod
+    def create_span_exporter(
+        cls, options: dict[str, Any]
+    ) -> tuple[Any, dict[str, Any]]:
+        """Return a span exporter for the shared dispatcher and resource attributes.
+
+        Used when several providers are configured. Providers that cannot
+        receive OpenTelemetry spans raise NotImplementedError.
+        """
+        raise NotImplementedError(
+            f"Provider '{cls.provider}' cannot be used in 'providers'."
+        )
+
 
 def _normalize_config(
     config: ObservabilityConfig | dict[str, Any] | None,
@@ -47,12 +77,69 @@ def _normalize_config(
             "provider": resolved.provider,
             "enabled": resolved.enabled,
             "options": resolved.options,
+            "export": resolved.export,
+            "providers": resolved.providers,
         }
     # Assume dict-like
     provider = (config or {}).get("provider")
     enabled = bool((config or {}).get("enabled", False))
     options = dict((config or {}).get("options", {}))
-    return {"provider": provider, "enabled": enabled, "options": options}
+    export = ExportConfig.model_validate((config or {}).get("export") or {})
+    providers = [
+        ProviderConfig.model_validate(p) for p in (config or {}).get("providers") or []
+    ]
+    return {
+        "provider": provider,
+        "enabled": enabled,
+        "options": options,
+        "export": export,
+        "providers": providers,
+    }
+
+
+def _handler_class(provider: str) -> type[ObservabilityHandlerBase] | None:
+    if provider == "langfuse":
+        from .langfuse.langfuse_handler import LangfuseHandler
+
+        return LangfuseHandler
+    if provider == "phoenix":
+        from .phoenix.phoenix_handler import PhoenixHandler
+
+        return PhoenixHandler
+    return None
+
+
+def _create_dispatching_handler(
+    providers: list[ProviderConfig], export: ExportConfig
+) -> tuple[ObservabilityHandlerBase | None, dict[str, Any]]:
+    """Build one span exporter per provider behind a shared dispatcher."""
+    from .dispatch import DispatchingHandler, TraceDispatcher
+
+    exporters: dict[str, Any] = {}
+    resource_attributes: dict[str, Any] = {}
+    for entry in providers:
+        if not entry.enabled:
+            continue
+        handler_class = _handler_class(entry.provider)
+        if handler_class is None:
+            raise ValueError(f"Unsupported provider '{entry.provider}'.")
+        exporter, attributes = handler_class.create_span_exporter(entry.options)
+        name = entry.provider
+        suffix = 2
+        while name in exporters:
+            name = f"{entry.provider}-{suffix}"
+            suffix += 1
+        exporters[name] = exporter
+        resource_attributes.update(attributes)
+
+    if not exporters:
+        return None, {"enabled": False}
+    dispatcher = TraceDispatcher(exporters, export, resource_attributes)
+    return DispatchingHandler(dispatcher, export=export), {
+        "enabled": True,
+        "provider": "multi",
+        "providers": list(exporters),
+    }
 
 
 def create_observability_handler(
@@ -60,13 +147,19 @@ def create_observability_handler(
 ) -> tuple[ObservabilityHandlerBase | None, dict[str, Any] | None]:
     """Factory to create an observability handler based on provider.
 
-    Accepts either an `ObservabilityConfig` or a raw dict.
+    Accepts either an `ObservabilityConfig` or a raw dict. When `providers` is
+    set, all of them are served by one `DispatchingHandler`.
     Returns (handler, info_dict). info_dict can be attached to agent infos for debugging.
     """
     normalized = _normalize_config(config)
     provider = normalized.get("provider")
     enabled = normalized.get("enabled", False)
     options: dict[str, Any] = normalized.get("options", {})
+    export: ExportConfig = normalized.get("export") or ExportConfig()
+
+    providers: list[ProviderConfig] = normalized.get("providers") or []
+    if enabled and providers:
+        return _create_dispatching_handler(providers, export)
 
     if not enabled or not provider:
         return None, {"enabled": False}
@@ -74,7 +167,7 @@ def create_observability_handler(
     if provider == "langfuse":
         from .langfuse.langfuse_handler import LangfuseHandler
 
-        handler = LangfuseHandler(options)
+        handler = LangfuseHandler(options, export)
         return handler, {
             "enabled": True,
             "provider": "langfuse",
@@ -85,7 +178,7 @@ def create_observability_handler(
     if provider == "phoenix":
         from .phoenix.phoenix_handler import PhoenixHandler
 
-        handler = PhoenixHandler(options)
+        handler = PhoenixHandler(options, export)
         info: dict[str, Any] = {
             "enabled": True,
             "provider": "phoenix",
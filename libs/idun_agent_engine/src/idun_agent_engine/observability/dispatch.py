@@ -0,0 +1,537 @@
+"""Engine-owned callback dispatcher shared by several observability providers.
+
+Attaching one LangChain callback handler per provider multiplies the work done
+on the request path for every event. With `providers`, a single
+`DispatchCallbackHandler` receives each event once and only appends a
+`TraceRecord` to a bounded queue. A background thread turns the records into
+OpenTelemetry spans (OpenInference attributes, understood by both Langfuse and
+Phoenix) and fans each batch out to one bounded export queue per provider, so
+a slow provider neither delays requests nor the other providers.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import Event, ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+from opentelemetry.trace import SpanContext, Status, StatusCode, TraceFlags
+
+from ..metrics import engine_metrics
+from .base import ObservabilityHandlerBase
+from .export import BoundedBatchSpanProcessor, BoundedBatchWorker
+from .model import ExportConfig
+
+MAX_VALUE_CHARS = 32_000
+"""Inputs and outputs are truncated to this many characters per span."""
+
+MAX_OPEN_RUNS = 10_000
+"""Runs started but not finished that are tracked before the oldest is dropped."""
+
+_HIDDEN_TAG = "langsmith:hidden"
+_SPAN_KINDS = {
+    "chain": "CHAIN",
+    "llm": "LLM",
+    "tool": "TOOL",
+    "retriever": "RETRIEVER",
+}
+_SCOPE = InstrumentationScope("idun_agent_engine.observability.dispatch")
+
+
+@dataclass(slots=True)
+class TraceRecord:
+    """One LangChain callback event in the engine's provider-neutral form.
+
+    Payloads are kept by reference; serialization happens off the request path.
+    """
+
+    phase: str  # "start", "end" or "error"
+    kind: str  # "chain", "llm", "tool" or "retriever"
+    run_id: UUID
+    parent_run_id: UUID | None
+    time_ns: int
+    payload: Any = None
+    name: str | None = None
+    tags: list[str] | None = None
+    metadata: dict[str, Any] | None = None
+    params: dict[str, Any] | None = None
+
+
+class DispatchCallbackHandler(BaseCallbackHandler):
+    """LangChain callback recording every event once into `sink`."""
+
+    # Recording is an append: run it inline instead of on an executor thread
+    run_inline = True
+    raise_error = False
+
+    def __init__(self, sink: Callable[[TraceRecord], None]) -> None:
+        """Record events into `sink`."""
+        self._sink = sink
+
+    def _start(
+        self,
+        kind: str,
+        serialized: dict[str, Any] | None,
+        payload: Any,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        tags: list[str] | None,
+        metadata: dict[str, Any] | None,
+        kwargs: dict[str, Any],
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        self._sink(
+            TraceRecord(
+                "start",
+                kind,
+                run_id,
+                parent_run_id,
+                time.time_ns(),
+                payload,
+                name,
+                tags,
+                metadata,
+                kwargs.get("invocation_params"),
+            )
+        )
+
+    def _finish(
+        self, phase: str, kind: str, payload: Any, run_id: UUID, parent: UUID | None
+    ) -> None:
+        self._sink(TraceRecord(phase, kind, run_id, parent, time.time_ns(), payload))
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a chain start."""
+        self._start(
+            "chain", serialized, inputs, run_id, parent_run_id, tags, metadata, kwargs
+        )
+
+    def on_chain_end(
+        self,
+        outputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a chain end."""
+        self._finish("end", "chain", outputs, run_id, parent_run_id)
+
+    def on_chain_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a chain failure."""
+        self._finish("error", "chain", error, run_id, parent_run_id)
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a chat model call."""
+        self._start(
+            "llm", serialized, messages, run_id, parent_run_id, tags, metadata, kwargs
+        )
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a completion model call."""
+        self._start(
+            "llm", serialized, prompts, run_id, parent_run_id, tags, metadata, kwargs
+        )
+
+    def on_llm_end(
+        self,
+        response: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a model response."""
+        self._finish("end", "llm", response, run_id, parent_run_id)
+
+    def on_llm_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a model failure."""
+        self._finish("error", "llm", error, run_id, parent_run_id)
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a tool call."""
+        self._start(
+            "tool", serialized, input_str, run_id, parent_run_id, tags, metadata, kwargs
+        )
+
+    def on_tool_end(
+        self,
+        output: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a tool result."""
+        self._finish("end", "tool", output, run_id, parent_run_id)
+
+    def on_tool_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a tool failure."""
+        self._finish("error", "tool", error, run_id, parent_run_id)
+
+    def on_retriever_start(
+        self,
+        serialized: dict[str, Any],
+        query: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a retriever query."""
+        self._start(
+            "retriever",
+            serialized,
+            query,
+            run_id,
+            parent_run_id,
+            tags,
+            metadata,
+            kwargs,
+        )
+
+    def on_retriever_end(
+        self,
+        documents: Sequence[Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record retrieved documents."""
+        self._finish("end", "retriever", documents, run_id, parent_run_id)
+
+    def on_retriever_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record a retriever failure."""
+        self._finish("error", "retriever", error, run_id, parent_run_id)
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+def _serialize(value: Any) -> str:
+    if isinstance(value, str):
+        text = value
+    else:
+        try:
+            text = json.dumps(value, default=_json_default, ensure_ascii=False)
+        except (TypeError, ValueError):
+            text = str(value)
+    return text[:MAX_VALUE_CHARS]
+
+
+def _llm_output(response: Any) -> tuple[Any, dict[str, int]]:
+    """Return the generated content and token usage of an `LLMResult`."""
+    usage: dict[str, int] = {}
+    content: Any = response
+    generations = getattr(response, "generations", None)
+    if generations and generations[0]:
+        generation = generations[0][0]
+        message = getattr(generation, "message", None)
+        content = getattr(message, "content", None) or generation.text
+        metadata = getattr(message, "usage_metadata", None) or {}
+        usage = {
+            "prompt": metadata.get("input_tokens", 0),
+            "completion": metadata.get("output_tokens", 0),
+            "total": metadata.get("total_tokens", 0),
+        }
+    token_usage = (getattr(response, "llm_output", None) or {}).get("token_usage")
+    if not any(usage.values()) and isinstance(token_usage, dict):
+        usage = {
+            "prompt": token_usage.get("prompt_tokens", 0),
+            "completion": token_usage.get("completion_tokens", 0),
+            "total": token_usage.get("total_tokens", 0),
+        }
+    return content, {k: v for k, v in usage.items() if v}
+
+
+@dataclass(slots=True)
+class _OpenRun:
+    start: TraceRecord
+    context: SpanContext
+    parent: SpanContext | None
+
+
+@dataclass
+class _SpanBuilder:
+    """Folds start/end records into finished spans; used by the worker only."""
+
+    resource: Resource
+    open_runs: dict[UUID, _OpenRun] = field(default_factory=dict)
+    # Hidden runs (LangGraph internals) are skipped; their children attach to
+    # the nearest visible ancestor.
+    aliases: dict[UUID, UUID | None] = field(default_factory=dict)
+
+    def _visible_parent(self, parent: UUID | None) -> UUID | None:
+        while parent is not None and parent in self.aliases:
+            parent = self.aliases[parent]
+        return parent
+
+    def add(self, record: TraceRecord) -> ReadableSpan | None:
+        """Consume `record`; return a span when it finishes one."""
+        if record.phase == "start":
+            self._open(record)
+            return None
+        if record.run_id in self.aliases:
+            del self.aliases[record.run_id]
+            return None
+        run = self.open_runs.pop(record.run_id, None)
+        if run is None:
+            return None
+        return self._finish(run, record)
+
+    def _open(self, record: TraceRecord) -> None:
+        parent_id = self._visible_parent(record.parent_run_id)
+        if record.tags and _HIDDEN_TAG in record.tags:
+            if len(self.aliases) >= MAX_OPEN_RUNS:
+                self.aliases.pop(next(iter(self.aliases)))
+            self.aliases[record.run_id] = parent_id
+            return
+        parent = self.open_runs.get(parent_id) if parent_id is not None else None
+        trace_id = parent.context.trace_id if parent else record.run_id.int
+        context = SpanContext(
+            trace_id=trace_id,
+            span_id=(record.run_id.int & (2**64 - 1)) or 1,
+            is_remote=False,
+            trace_flags=TraceFlags(TraceFlags.SAMPLED),
+        )
+        if len(self.open_runs) >= MAX_OPEN_RUNS:
+            # Runs that never finished (e.g. cancelled); forget the oldest
+            self.open_runs.pop(next(iter(self.open_runs)))
+        self.open_runs[record.run_id] = _OpenRun(
+            record, context, parent.context if parent else None
+        )
+
+    def _finish(self, run: _OpenRun, end: TraceRecord) -> ReadableSpan:
+        start = run.start
+        metadata = start.metadata or {}
+        attributes: dict[str, Any] = {
+            "openinference.span.kind": _SPAN_KINDS.get(start.kind, "CHAIN"),
+            "input.value": _serialize(start.payload),
+        }
+        session_id = metadata.get("thread_id")
+        if session_id is not None:
+            attributes["session.id"] = str(session_id)
+        if metadata:
+            attributes["metadata"] = _serialize(metadata)
+        if start.tags:
+            attributes["tag.tags"] = list(start.tags)
+
+        events: list[Event] = []
+        status = Status(StatusCode.OK)
+        if end.phase == "error":
+            status = Status(StatusCode.ERROR, str(end.payload))
+            events.append(
+                Event(
+                    "exception",
+                    {
+                        "exception.type": type(end.payload).__name__,
+                        "exception.message": str(end.payload),
+                    },
+                    end.time_ns,
+                )
+            )
+        elif start.kind == "llm":
+            content, usage = _llm_output(end.payload)
+            attributes["output.value"] = _serialize(content)
+            for key, count in usage.items():
+                attributes[f"llm.token_count.{key}"] = count
+        else:
+            attributes["output.value"] = _serialize(end.payload)
+
+        if start.kind == "llm":
+            params = start.params or {}
+            model = (
+                metadata.get("ls_model_name")
+                or params.get("model")
+                or params.get("model_name")
+            )
+            if model:
+                attributes["llm.model_name"] = str(model)
+            if params:
+                attributes["llm.invocation_parameters"] = _serialize(params)
+
+        return ReadableSpan(
+            name=start.name or start.kind,
+            context=run.context,
+            parent=run.parent,
+            resource=self.resource,
+            attributes=attributes,
+            events=events,
+            status=status,
+            start_time=start.time_ns,
+            end_time=end.time_ns,
+            instrumentation_scope=_SCOPE,
+        )
+
+
+class TraceDispatcher:
+    """Queues trace records and fans the resulting spans out to providers."""
+
+    def __init__(
+        self,
+        exporters: dict[str, SpanExporter],
+        config: ExportConfig | None = None,
+        resource_attributes: dict[str, Any] | None = None,
+    ) -> None:
+        """Create one bounded export queue per provider in `exporters`."""
+        self.config = config or ExportConfig()
+        self.processors = {
+            name: BoundedBatchSpanProcessor(exporter, self.config)
+            for name, exporter in exporters.items()
+        }
+        self._builder = _SpanBuilder(
+            Resource.create(
+                {"service.name": "idun-agent-engine", **(resource_attributes or {})}
+            )
+        )
+        self._worker: BoundedBatchWorker[TraceRecord] = BoundedBatchWorker(
+            self._dispatch,
+            self.config,
+            "idun-trace-dispatch",
+            engine_metrics.observability_spans.labels("dropped"),
+        )
+        self.callback = DispatchCallbackHandler(self._worker.put)
+
+    def _dispatch(self, records: list[TraceRecord]) -> None:
+        for record in records:
+            try:
+                span = self._builder.add(record)
+            except Exception:  # noqa: BLE001 - a bad payload must not stop tracing
+                continue
+            if span is not None:
+                for processor in self.processors.values():
+                    processor.on_end(span)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Convert queued records and export every provider's queue."""
+        deadline = time.monotonic() + timeout_millis / 1000
+        flushed = self._worker.force_flush(timeout_millis)
+        for processor in self.processors.values():
+            remaining = max(int((deadline - time.monotonic()) * 1000), 0)
+            flushed = processor.force_flush(remaining) and flushed
+        return flushed
+
+    def shutdown(self) -> None:
+        """Flush and stop the dispatcher and every provider queue."""
+        self._worker.shutdown()
+        for processor in self.processors.values():
+            processor.shutdown()
+
+    def stats(self) -> dict[str, Any]:
+        """Return record queue counters and per-provider export counters."""
+        return {
+            "queued_records": self._worker.queued,
+            "dropped_records": self._worker.dropped,
+            "open_runs": len(self._builder.open_runs),
+            "providers": {
+                name: processor.stats() for name, processor in self.processors.items()
+            },
+        }
+
+
+class DispatchingHandler(ObservabilityHandlerBase):
+    """Observability handler serving several providers through one dispatcher."""
+
+    provider = "multi"
+
+    def __init__(
+        self,
+        dispatcher: TraceDispatcher,
+        options: dict[str, Any] | None = None,
+        export: ExportConfig | None = None,
+    ) -> None:
+        """Wrap `dispatcher`."""
+        super().__init__(options, export)
+        self.dispatcher = dispatcher
+
+    def get_callbacks(self) -> list[Any]:
+        """Return the single shared dispatch callback."""
+        return [self.dispatcher.callback]
+
+    def flush(self) -> None:
+        """Export everything recorded so far, bounded by the export timeout."""
+        self.dispatcher.force_flush(
+            int(self.export_config.export_timeout_seconds * 1000)
+        )
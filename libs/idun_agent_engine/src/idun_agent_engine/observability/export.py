@@ -0,0 +1,244 @@
+"""Engine-owned span export path.
+
+`BoundedBatchSpanProcessor` replaces the synchronous span processors that
+tracing SDKs install by default. Ending a span only appends it to a bounded
+in-memory queue; a daemon thread exports batches in the background. When the
+collector cannot keep up the oldest queued spans are dropped and counted, so a
+slow or unreachable collector never adds latency to agent requests.
+
+`RunDecisionSampler` applies the engine's per-run sampling decision to
+OpenTelemetry spans, so unsampled runs record nothing.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+)
+from opentelemetry.trace import Link, SpanKind
+from opentelemetry.util.types import Attributes
+
+from ..metrics import engine_metrics
+from .model import ExportConfig
+from .sampling import current_decision
+
+
+class RunDecisionSampler(Sampler):
+    """OpenTelemetry sampler honouring the engine's per-run sampling decision.
+
+    Spans created while an unsampled run executes are dropped without being
+    recorded. Outside runs, spans follow their parent (root spans are sampled).
+    """
+
+    def __init__(self) -> None:
+        """Create the sampler."""
+        self._fallback = ParentBased(ALWAYS_ON)
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: Any = None,
+    ) -> SamplingResult:
+        """Drop spans of unsampled runs, defer to parent-based sampling otherwise."""
+        if current_decision() is False:
+            return SamplingResult(Decision.DROP)
+        return self._fallback.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+
+    def get_description(self) -> str:
+        """Describe the sampler."""
+        return "IdunRunDecisionSampler"
+
+
+class BoundedBatchWorker[T]:
+    """Drop-oldest bounded queue drained in batches by a daemon thread.
+
+    `put` never blocks on `handle_batch`: when the queue is full the oldest item
+    is discarded and counted.
+    """
+
+    def __init__(
+        self,
+        handle_batch: Callable[[list[T]], None],
+        config: ExportConfig,
+        name: str,
+        dropped_counter: Any = None,
+    ) -> None:
+        """Start the `name` thread feeding batches to `handle_batch`."""
+        self.config = config
+        self._handle_batch = handle_batch
+        self._dropped_counter = dropped_counter
+        self._queue: deque[T] = deque(maxlen=config.max_queue_size)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_requests = 0
+        self._flushed = threading.Condition(self._lock)
+        self._flush_generation = 0
+        self._shutdown = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def queued(self) -> int:
+        """Number of items waiting to be handled."""
+        return len(self._queue)
+
+    def put(self, item: T) -> None:
+        """Queue `item`, dropping the oldest queued item when full."""
+        if self._shutdown:
+            return
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                # deque(maxlen) discards the oldest entry on append
+                self.dropped += 1
+                if self._dropped_counter is not None:
+                    self._dropped_counter.inc()
+            self._queue.append(item)
+            if len(self._queue) >= self.config.max_batch_size:
+                self._wakeup.notify()
+
+    def _take_batch(self) -> list[T]:
+        size = min(len(self._queue), self.config.max_batch_size)
+        return [self._queue.popleft() for _ in range(size)]
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if (
+                    not self._shutdown
+                    and not self._flush_requests
+                    and len(self._queue) < self.config.max_batch_size
+                ):
+                    self._wakeup.wait(self.config.schedule_delay_seconds)
+                flushing = self._flush_requests > 0 or self._shutdown
+                stopping = self._shutdown
+            # Handle everything when flushing, otherwise one batch at a time
+            while True:
+                with self._lock:
+                    batch = self._take_batch()
+                if not batch:
+                    break
+                self._handle_batch(batch)
+                if not flushing:
+                    break
+            if flushing:
+                with self._lock:
+                    self._flush_requests = 0
+                    self._flush_generation += 1
+                    self._flushed.notify_all()
+            if stopping:
+                return
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Handle every queued item, waiting at most `timeout_millis`."""
+        deadline = time.monotonic() + timeout_millis / 1000
+        with self._lock:
+            if not self._thread.is_alive():
+                return not self._queue
+            generation = self._flush_generation
+            self._flush_requests += 1
+            self._wakeup.notify()
+            while self._flush_generation == generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._flushed.wait(remaining)
+        return True
+
+    def shutdown(self) -> bool:
+        """Handle what is queued (bounded by the export timeout) and stop.
+
+        Returns False if the worker was already shut down.
+        """
+        with self._lock:
+            if self._shutdown:
+                return False
+            self._shutdown = True
+            self._wakeup.notify()
+        self._thread.join(self.config.export_timeout_seconds)
+        return True
+
+
+class BoundedBatchSpanProcessor(SpanProcessor):
+    """Batching span processor with a drop-oldest bounded queue."""
+
+    def __init__(
+        self, exporter: SpanExporter, config: ExportConfig | None = None
+    ) -> None:
+        """Start the export thread for `exporter`."""
+        self.exporter = exporter
+        self.config = config or ExportConfig()
+        self.exported_spans = 0
+        self.failed_spans = 0
+        self._exported = engine_metrics.observability_spans.labels("exported")
+        self._failed = engine_metrics.observability_spans.labels("failed")
+        self._worker: BoundedBatchWorker[ReadableSpan] = BoundedBatchWorker(
+            self._export,
+            self.config,
+            "idun-span-export",
+            engine_metrics.observability_spans.labels("dropped"),
+        )
+
+    @property
+    def dropped_spans(self) -> int:
+        """Spans discarded because the queue was full."""
+        return self._worker.dropped
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        """Nothing to do when a span starts."""
+
+    def on_end(self, span: ReadableSpan) -> None:
+        """Queue a finished span; never blocks on the exporter."""
+        if span.context.trace_flags.sampled:
+            self._worker.put(span)
+
+    def _export(self, batch: list[ReadableSpan]) -> None:
+        try:
+            result = self.exporter.export(batch)
+        except Exception:  # noqa: BLE001 - exporter failures must never escape
+            result = SpanExportResult.FAILURE
+        if result == SpanExportResult.SUCCESS:
+            self.exported_spans += len(batch)
+            self._exported.inc(len(batch))
+        else:
+            self.failed_spans += len(batch)
+            self._failed.inc(len(batch))
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Export every queued span, waiting at most `timeout_millis`."""
+        return self._worker.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        """Flush what is queued (bounded by the export timeout) and stop."""
+        if self._worker.shutdown():
+            self.exporter.shutdown()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and span counters."""
+        return {
+            "queued": self._worker.queued,
+            "max_queue_size": self.config.max_queue_size,
+            "exported": self.exported_spans,
+            "failed": self.failed_spans,
+            "dropped": self.dropped_spans,
+        }
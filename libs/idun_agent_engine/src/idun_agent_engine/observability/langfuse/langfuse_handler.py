@@ -2,21 +2,33 @@
 
 from __future__ import annotations
 
+import base64
+import contextlib
+import logging
 import os
 from typing import Any
 
-from ..base import ObservabilityHandlerBase
+from ..base import ExportConfig, ObservabilityHandlerBase
 from ..utils import _resolve_env
 
+logger = logging.getLogger(__name__)
+
 
 class LangfuseHandler(ObservabilityHandlerBase):
     """Langfuse handler providing LangChain callbacks and client setup."""
 
     provider = "langfuse"
 
-    def __init__(self, options: dict[str, Any] | None = None):
-        """Initialize handler, resolving env and preparing callbacks."""
-        super().__init__(options)
+    def __init__(
+        self,
+        options: dict[str, Any] | None = None,
+        export: ExportConfig | None = None,
+    ):
+        """Initialize handler, resolving env and preparing callbacks.
+
+        No network calls happen here; credentials are checked by `verify()`.
+        """
+        super().__init__(options, export)
         opts = self.options
 
         # Resolve and set env vars as required by Langfuse
@@ -34,6 +46,14 @@ class LangfuseHandler(ObservabilityHandlerBase):
             os.environ["LANGFUSE_PUBLIC_KEY"] = public_key
         if secret_key:
             os.environ["LANGFUSE_SECRET_KEY"] = secret_key
+        # Langfuse exports from its own background batch processor; size its
+        # batches from the engine's export settings unless set explicitly.
+        os.environ.setdefault(
+            "LANGFUSE_FLUSH_AT", str(self.export_config.max_batch_size)
+        )
+        os.environ.setdefault(
+            "LANGFUSE_FLUSH_INTERVAL", str(self.export_config.schedule_delay_seconds)
+        )
 
         # Instantiate callback handler lazily to avoid hard dep if not installed
         self._callbacks: list[Any] = []
@@ -43,17 +63,6 @@ class LangfuseHandler(ObservabilityHandlerBase):
             from langfuse.langchain import CallbackHandler
 
             self._langfuse_client = get_client()
-
-            try:
-                if self._langfuse_client.auth_check():
-                    print("Langfuse client is authenticated and ready!")
-                else:
-                    print(
-                        "Authentication failed. Please check your credentials and host."
-                    )
-            except Exception:
-                pass
-
             self._callbacks = [CallbackHandler()]
         except Exception:
             self._callbacks = []
@@ -62,6 +71,33 @@ class LangfuseHandler(ObservabilityHandlerBase):
     def _resolve_env(value: str | None) -> str | None:
         return _resolve_env(value)
 
+    @classmethod
+    def create_span_exporter(
+        cls, options: dict[str, Any]
+    ) -> tuple[Any, dict[str, Any]]:
+        """Return an OTLP exporter for Langfuse's OpenTelemetry endpoint."""
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        host = (
+            cls._resolve_env(options.get("host"))
+            or os.getenv("LANGFUSE_HOST")
+            or "https://cloud.langfuse.com"
+        )
+        public_key = cls._resolve_env(options.get("public_key")) or os.getenv(
+            "LANGFUSE_PUBLIC_KEY", ""
+        )
+        secret_key = cls._resolve_env(options.get("secret_key")) or os.getenv(
+            "LANGFUSE_SECRET_KEY", ""
+        )
+        credentials = base64.b64encode(f"{public_key}:{secret_key}".encode()).decode()
+        exporter = OTLPSpanExporter(
+            endpoint=f"{host.rstrip('/')}/api/public/otel/v1/traces",
+            headers={"Authorization": f"Basic {credentials}"},
+        )
+        return exporter, {}
+
     def get_callbacks(self) -> list[Any]:
         """Return LangChain-compatible callback handlers (if available)."""
         return self._callbacks
@@ -69,3 +105,26 @@ class LangfuseHandler(ObservabilityHandlerBase):
     def get_client(self):
         """Return underlying Langfuse client instance (if created)."""
         return self._langfuse_client
+
+    def verify(self) -> bool | None:
+        """Check the Langfuse credentials against the host (network round trip)."""
+        if self._langfuse_client is None:
+            return None
+        try:
+            ok = bool(self._langfuse_client.auth_check())
+        except Exception:
+            return False
+        if ok:
+            logger.info("Langfuse client is authenticated and ready")
+        else:
+            logger.warning(
+                "Langfuse authentication failed. Please check your credentials and host."
+            )
+        return ok
+
+    def flush(self) -> None:
+        """Flush pending Langfuse events (best-effort)."""
+        if self._langfuse_client is None:
+            return
+        with contextlib.suppress(Exception):
+            self._langfuse_client.flush()
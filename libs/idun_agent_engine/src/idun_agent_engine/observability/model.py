@@ -2,13 +2,76 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from .utils import _resolve_env
 
 
+class ExportConfig(BaseModel):
+    """Span export settings for the engine-owned export path.
+
+    Spans are queued in memory and exported in batches by a background thread.
+    When the queue is full the oldest spans are dropped (and counted) instead of
+    slowing down agent requests.
+    """
+
+    max_queue_size: int = Field(default=2048, gt=0)
+    max_batch_size: int = Field(default=256, gt=0)
+    schedule_delay_seconds: float = Field(default=1.0, gt=0)
+    export_timeout_seconds: float = Field(default=10.0, gt=0)
+
+
+class SamplingConfig(BaseModel):
+    """Head-based sampling of agent runs.
+
+    Attributes:
+        ratio: Fraction of runs to trace, between 0 and 1.
+        sticky_sessions: Decide once per session (hash of the session id) so a
+            conversation is either fully traced or not at all.
+    """
+
+    ratio: float = Field(default=1.0, ge=0.0, le=1.0)
+    sticky_sessions: bool = Field(default=True)
+
+
+class EngineTracingConfig(BaseModel):
+    """OpenTelemetry spans around the engine's own request stages.
+
+    Independent of the provider callbacks, which only see LangChain runnables:
+    these spans cover request preparation, checkpoint load/save, event
+    translation and SSE serialization, and go to their own exporter so they
+    also work offline.
+
+    Attributes:
+        enabled: Record engine spans. When disabled instrumentation is a no-op.
+        exporter: `console` prints spans, `file` appends one JSON span per line
+            to `file_path`, `otlp` sends them to `endpoint` over HTTP.
+        file_path: Target of the `file` exporter.
+        endpoint: OTLP/HTTP traces endpoint; defaults to the OTel environment.
+        sample_ratio: Fraction of requests traced.
+        service_name: `service.name` resource attribute of the spans.
+        export: Queueing and batching of the export path.
+    """
+
+    enabled: bool = Field(default=False)
+    exporter: Literal["console", "file", "otlp"] = Field(default="console")
+    file_path: str = Field(default="idun_engine_spans.jsonl")
+    endpoint: str | None = Field(default=None)
+    sample_ratio: float = Field(default=1.0, ge=0.0, le=1.0)
+    service_name: str = Field(default="idun-agent-engine")
+    export: ExportConfig = Field(default_factory=ExportConfig)
+
+
+class ProviderConfig(BaseModel):
+    """One entry of `ObservabilityConfig.providers`."""
+
+    provider: str
+    enabled: bool = Field(default=True)
+    options: dict[str, Any] = Field(default_factory=dict)
+
+
 class ObservabilityConfig(BaseModel):
     """Provider-agnostic observability configuration based on Pydantic.
 
@@ -21,12 +84,38 @@ class ObservabilityConfig(BaseModel):
           public_key: ${LANGFUSE_PUBLIC_KEY}
           secret_key: ${LANGFUSE_SECRET_KEY}
           run_name: "my-run"
+        init_timeout_seconds: 10   # provider setup runs in the background
+        export:
+          max_queue_size: 2048
+        sampling:
+          ratio: 0.1               # force per request with `X-Idun-Trace: 1`
+
+    Several providers can be enabled at once with `providers` instead of
+    `provider`/`options`; they then share one engine-owned callback dispatcher:
+      observability:
+        enabled: true
+        providers:
+          - provider: langfuse
+            options: {host: ..., public_key: ..., secret_key: ...}
+          - provider: phoenix
+            options: {collector_endpoint: ...}
     """
 
     provider: str | None = Field(default=None)
     enabled: bool = Field(default=False)
     # Keep options generic to support different providers while remaining strongly-typed at the top level
     options: dict[str, Any] = Field(default_factory=dict)
+    # Provider setup (imports, credential checks) never blocks agent startup
+    init_timeout_seconds: float = Field(default=10.0, gt=0)
+    export: ExportConfig = Field(default_factory=ExportConfig)
+    sampling: SamplingConfig = Field(default_factory=SamplingConfig)
+    providers: list[ProviderConfig] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _single_provider_source(self) -> ObservabilityConfig:
+        if self.provider and self.providers:
+            raise ValueError("Set either 'provider' or 'providers', not both.")
+        return self
 
     def _resolve_value(self, value: Any) -> Any:
         if isinstance(value, dict):
@@ -38,8 +127,10 @@ class ObservabilityConfig(BaseModel):
     def resolved(self) -> ObservabilityConfig:
         """Return a copy with env placeholders resolved in options."""
         resolved_options = self._resolve_value(self.options)
-        return ObservabilityConfig(
-            provider=self.provider,
-            enabled=self.enabled,
-            options=resolved_options,
+        providers = [
+            p.model_copy(update={"options": self._resolve_value(p.options)})
+            for p in self.providers
+        ]
+        return self.model_copy(
+            update={"options": resolved_options, "providers": providers}
         )
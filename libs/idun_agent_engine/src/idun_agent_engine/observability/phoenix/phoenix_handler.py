@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import contextlib
 import os
 from typing import Any
 
-from ..base import ObservabilityHandlerBase
+from ..base import ExportConfig, ObservabilityHandlerBase
 from ..utils import _resolve_env
 
 
@@ -14,9 +15,13 @@ class PhoenixHandler(ObservabilityHandlerBase):
 
     provider = "phoenix"
 
-    def __init__(self, options: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        options: dict[str, Any] | None = None,
+        export: ExportConfig | None = None,
+    ):
         """Initialize handler, resolving env and setting up instrumentation."""
-        super().__init__(options)
+        super().__init__(options, export)
         opts = self.options
 
         # Resolve and set env vars as required by Phoenix
@@ -43,14 +48,29 @@ class PhoenixHandler(ObservabilityHandlerBase):
 
         # Configure tracer provider using phoenix.otel.register
         self._callbacks: list[Any] = []
+        self._tracer_provider: Any = None
+        self.span_processor: Any = None
         try:
             from openinference.instrumentation.langchain import LangChainInstrumentor
-            from phoenix.otel import register  # type: ignore
+            from phoenix.otel import SimpleSpanProcessor, register  # type: ignore
+
+            from ..export import BoundedBatchSpanProcessor, RunDecisionSampler
 
             tracer_provider = register(
-                project_name=self.project_name, auto_instrument=True
+                project_name=self.project_name,
+                auto_instrument=True,
+                sampler=RunDecisionSampler(),
+            )
+            # register() exports synchronously on the thread ending each span.
+            # Keep its exporter (endpoint and protocol inference) but replace the
+            # default processor with the engine's bounded background batcher.
+            exporter = SimpleSpanProcessor(endpoint=collector).span_exporter
+            self.span_processor = BoundedBatchSpanProcessor(
+                exporter, self.export_config
             )
+            tracer_provider.add_span_processor(self.span_processor)
             LangChainInstrumentor().instrument(tracer_provider=tracer_provider)
+            self._tracer_provider = tracer_provider
         except Exception:
             # Silent failure; user may not have phoenix installed
             pass
@@ -59,6 +79,42 @@ class PhoenixHandler(ObservabilityHandlerBase):
     def _resolve_env(value: str | None) -> str | None:
         return _resolve_env(value)
 
+    @classmethod
+    def create_span_exporter(
+        cls, options: dict[str, Any]
+    ) -> tuple[Any, dict[str, Any]]:
+        """Return an OTLP/HTTP exporter for the Phoenix collector.
+
+        Does not install Phoenix's global instrumentation: spans come from the
+        engine's shared dispatcher.
+        """
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        collector = (
+            cls._resolve_env(options.get("collector"))
+            or cls._resolve_env(options.get("collector_endpoint"))
+            or os.getenv("PHOENIX_COLLECTOR_ENDPOINT")
+            or "http://localhost:6006"
+        ).rstrip("/")
+        if not collector.endswith("/v1/traces"):
+            collector = f"{collector}/v1/traces"
+        api_key = cls._resolve_env(options.get("api_key")) or os.getenv(
+            "PHOENIX_API_KEY"
+        )
+        headers = {"authorization": f"Bearer {api_key}"} if api_key else None
+        project_name = options.get("project_name") or "default"
+        exporter = OTLPSpanExporter(endpoint=collector, headers=headers)
+        return exporter, {"openinference.project.name": project_name}
+
     def get_callbacks(self) -> list[Any]:
         """Return callbacks (Phoenix instruments globally; this may be empty)."""
         return self._callbacks
+
+    def flush(self) -> None:
+        """Force-flush spans buffered by the tracer provider (best-effort)."""
+        if self._tracer_provider is None:
+            return
+        with contextlib.suppress(Exception):
+            self._tracer_provider.force_flush()
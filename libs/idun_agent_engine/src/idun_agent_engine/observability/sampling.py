@@ -0,0 +1,97 @@
+"""Head-based trace sampling for agent runs.
+
+The decision is taken once, when a run starts. Unsampled runs get no callbacks
+attached and, for OpenTelemetry-based providers, their spans are dropped by the
+engine's sampler before any attribute is recorded, so they pay no tracing cost.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from ..metrics import engine_metrics
+from .model import SamplingConfig
+
+TRACE_HEADER = "X-Idun-Trace"
+"""Request header forcing a decision: `1`/`true` samples, `0`/`false` skips."""
+
+_run_sampled: ContextVar[bool | None] = ContextVar("idun_run_sampled", default=None)
+
+
+def parse_force_header(value: str | None) -> bool | None:
+    """Interpret the `X-Idun-Trace` header; None means no preference."""
+    if value is None:
+        return None
+    normalized = value.strip().lower()
+    if normalized in ("1", "true", "yes", "on"):
+        return True
+    if normalized in ("0", "false", "no", "off"):
+        return False
+    return None
+
+
+def current_decision() -> bool | None:
+    """Decision of the run executing in the current context, if any."""
+    return _run_sampled.get()
+
+
+@contextmanager
+def sampling_scope(sampled: bool | None) -> Iterator[None]:
+    """Expose the run's decision to OpenTelemetry samplers for its duration."""
+    token = _run_sampled.set(sampled)
+    try:
+        yield
+    finally:
+        try:
+            _run_sampled.reset(token)
+        except ValueError:
+            # Async generators may be finalized from another context
+            _run_sampled.set(None)
+
+
+class TraceSampler:
+    """Decides which runs are traced and keeps per-reason decision counts."""
+
+    def __init__(self, config: SamplingConfig | None = None) -> None:
+        """Create a sampler for `config` (sample everything by default)."""
+        self.config = config or SamplingConfig()
+        self.decisions: dict[str, int] = {"sampled": 0, "unsampled": 0}
+
+    def _session_score(self, session_id: str) -> float:
+        digest = hashlib.sha256(session_id.encode()).digest()
+        return int.from_bytes(digest[:8], "big") / 2**64
+
+    def decide(self, session_id: str | None, forced: bool | None = None) -> bool:
+        """Return whether to trace a run of `session_id`.
+
+        A forced decision wins. Otherwise sessions are sampled as a whole when
+        `sticky_sessions` is set (every run of a sampled session is traced), or
+        each run independently.
+        """
+        ratio = self.config.ratio
+        if forced is not None:
+            sampled, reason = forced, "forced"
+        elif ratio >= 1.0 or ratio <= 0.0:
+            sampled, reason = ratio >= 1.0, "ratio"
+        elif self.config.sticky_sessions and session_id:
+            sampled, reason = self._session_score(session_id) < ratio, "session"
+        else:
+            sampled, reason = random.random() < ratio, "ratio"
+
+        decision = "sampled" if sampled else "unsampled"
+        self.decisions[decision] += 1
+        engine_metrics.trace_sampling.labels(decision, reason).inc()
+        return sampled
+
+    def describe(self) -> dict[str, Any]:
+        """Configuration and live decision counts, for agent infos."""
+        return {
+            "ratio": self.config.ratio,
+            "sticky_sessions": self.config.sticky_sessions,
+            "decisions": self.decisions,
+        }
@@ -0,0 +1,164 @@
+"""Engine-native OpenTelemetry spans for the request hot path.
+
+Provider callbacks only see LangChain runnables. `engine_tracer` records spans
+for the engine's own stages (request preparation, checkpoint load/save, event
+translation, SSE serialization) on a private tracer provider, so they neither
+depend on nor interfere with the provider's global one.
+
+When tracing is disabled `engine_tracer.span()` returns a shared no-op context
+manager: instrumented code pays one attribute check per span.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Tracer
+
+from .export import BoundedBatchSpanProcessor
+from .model import EngineTracingConfig
+
+
+class _NoopSpan:
+    """Stand-in for a span (and its context manager) when tracing is disabled."""
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute."""
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        """Ignore the attributes."""
+
+    def update_name(self, name: str) -> None:
+        """Ignore the new name."""
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON document per line."""
+
+    def __init__(self, path: str) -> None:
+        """Export to `path`, creating parent directories as needed."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Write `spans` to the file."""
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock, self.path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        """Nothing to release; the file is opened per batch."""
+
+
+def _create_exporter(config: EngineTracingConfig) -> SpanExporter:
+    """Build the exporter selected by `config.exporter`."""
+    if config.exporter == "file":
+        return JsonLinesSpanExporter(config.file_path)
+    if config.exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter(endpoint=config.endpoint)
+    return ConsoleSpanExporter()
+
+
+class EngineTracer:
+    """Creates engine spans, or no-op stand-ins when tracing is disabled."""
+
+    def __init__(self) -> None:
+        """Start disabled; `configure` turns tracing on."""
+        self.config = EngineTracingConfig()
+        self._tracer: Tracer | None = None
+        self._provider: TracerProvider | None = None
+        self._processor: BoundedBatchSpanProcessor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being recorded."""
+        return self._tracer is not None
+
+    def configure(self, config: EngineTracingConfig) -> None:
+        """Apply `config`, replacing (and flushing) any previous setup."""
+        self.shutdown()
+        self.config = config
+        if not config.enabled:
+            return
+        self._processor = BoundedBatchSpanProcessor(
+            _create_exporter(config), config.export
+        )
+        self._provider = TracerProvider(
+            resource=Resource.create({"service.name": config.service_name}),
+            sampler=ParentBased(TraceIdRatioBased(config.sample_ratio)),
+        )
+        self._provider.add_span_processor(self._processor)
+        self._tracer = self._provider.get_tracer("idun_agent_engine")
+
+    def span(
+        self,
+        name: str,
+        attributes: dict[str, Any] | None = None,
+        start_time: int | None = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+    ) -> Any:
+        """Context manager running its body inside a span named `name`.
+
+        Args:
+            name: Span name.
+            attributes: Initial span attributes.
+            start_time: Start timestamp in nanoseconds since the epoch, for
+                stages that began before the span could be opened.
+            kind: OpenTelemetry span kind.
+        """
+        if self._tracer is None:
+            return _NOOP_SPAN
+        return self._tracer.start_as_current_span(
+            name, kind=kind, attributes=attributes, start_time=start_time
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Return the export queue counters, for diagnostics."""
+        if self._processor is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "exporter": self.config.exporter,
+            **self._processor.stats(),
+        }
+
+    def shutdown(self) -> None:
+        """Export queued spans and stop recording."""
+        provider, self._provider = self._provider, None
+        self._tracer = None
+        self._processor = None
+        if provider is not None:
+            provider.shutdown()
+
+
+engine_tracer = EngineTracer()
+"""Process-wide engine tracer, configured from `server.tracing` at startup."""
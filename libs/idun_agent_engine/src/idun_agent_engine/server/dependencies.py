@@ -1,23 +1,146 @@
 """Dependency injection helpers for FastAPI routes."""
 
-from fastapi import Request
+import asyncio
+import hmac
+from collections.abc import AsyncIterator
 
+from fastapi import FastAPI, HTTPException, Request
+
+from ..agent.base import BaseAgent
+from ..cache import ResponseCache, create_response_cache
 from ..core.config_builder import ConfigBuilder
+from ..debug import loop_watchdog
+from .idempotency import IdempotencyManager, create_idempotency_manager
+from .runs import AgentLeases, RunTracker
 
 
-async def get_agent(request: Request):
-    """Return the pre-initialized agent instance from the app state.
+async def ensure_agent(app: FastAPI) -> BaseAgent:
+    """Initialize the application's agent exactly once and return it.
 
-    Falls back to loading from the default config if not present (e.g., tests).
+    Concurrent callers wait on a shared lock, so only the first one pays for the
+    initialization and everyone else receives the same instance. A failed
+    initialization is not cached; the next caller retries.
     """
-    if hasattr(request.app.state, "agent"):
-        return request.app.state.agent
-    else:
-        # This is a fallback for cases where the lifespan event did not run,
-        # like in some testing scenarios.
-        # Consider logging a warning here.
-        print("⚠️  Agent not found in app state, initializing fallback agent...")
-
-        app_config = ConfigBuilder.load_from_file()
-        agent = await ConfigBuilder.initialize_agent_from_config(app_config)
+    agent: BaseAgent | None = getattr(app.state, "agent", None)
+    if agent is not None:
         return agent
+
+    lock = getattr(app.state, "agent_init_lock", None)
+    if lock is None:
+        lock = app.state.agent_init_lock = asyncio.Lock()
+
+    async with lock:
+        agent = getattr(app.state, "agent", None)
+        if agent is None:
+            engine_config = getattr(app.state, "engine_config", None)
+            if engine_config is None:
+                engine_config = ConfigBuilder.load_from_file()
+            agent = await ConfigBuilder.initialize_agent_from_config(engine_config)
+            app.state.agent = agent
+            app.state.config = engine_config
+    return agent
+
+
+def agent_leases(app: FastAPI) -> AgentLeases:
+    """Return the app's agent leases, creating them on first use."""
+    leases: AgentLeases | None = getattr(app.state, "agent_leases", None)
+    if leases is None:
+        leases = app.state.agent_leases = AgentLeases()
+    return leases
+
+
+async def get_agent(request: Request) -> AsyncIterator[BaseAgent]:
+    """Return the pre-initialized agent instance from the app state.
+
+    When the lifespan did not run (e.g., tests using a bare TestClient), the agent
+    is initialized once from the app's engine config and reused afterwards.
+
+    The request leases the instance until the route returns, so a hot reload
+    does not close it underneath the request. Routes whose work outlives the
+    route itself (a streamed body, a background run) take their own lease.
+    """
+    agent: BaseAgent | None = getattr(request.app.state, "agent", None)
+    if agent is None:
+        agent = await ensure_agent(request.app)
+    with agent_leases(request.app).hold(agent):
+        yield agent
+
+
+def get_run_tracker(request: Request) -> RunTracker:
+    """Return the app's run tracker, rejecting new runs while the engine drains.
+
+    New runs are also rejected while the event loop lags past
+    `server.debug.loop_watchdog.shed_lag_seconds`.
+    """
+    tracker = getattr(request.app.state, "run_tracker", None)
+    if tracker is None:
+        tracker = request.app.state.run_tracker = RunTracker()
+    if not tracker.accepting:
+        raise HTTPException(
+            status_code=503,
+            detail="Engine is shutting down and no longer accepts new runs.",
+        )
+    if loop_watchdog.should_shed():
+        raise HTTPException(
+            status_code=503,
+            detail="Engine is overloaded (event loop lagging), retry later.",
+            headers={"Retry-After": "1"},
+        )
+    return tracker
+
+
+def get_response_cache(request: Request) -> ResponseCache | None:
+    """Return the app's response cache, or None when caching is disabled.
+
+    The cache is created on first use from `server.response_cache`.
+    """
+    state = request.app.state
+    if not hasattr(state, "response_cache"):
+        engine_config = getattr(state, "engine_config", None)
+        state.response_cache = (
+            create_response_cache(engine_config.server.response_cache)
+            if engine_config is not None
+            else None
+        )
+    cache: ResponseCache | None = state.response_cache
+    return cache
+
+
+async def get_idempotency(request: Request) -> IdempotencyManager | None:
+    """Return the app's idempotency manager, or None when disabled.
+
+    Created on first use, in the agent's SQLite file when it has one.
+    """
+    state = request.app.state
+    if not hasattr(state, "idempotency"):
+        engine_config = getattr(state, "engine_config", None)
+        if engine_config is None:
+            state.idempotency = None
+        else:
+            agent = await ensure_agent(request.app)
+            state.idempotency = create_idempotency_manager(
+                engine_config.server.idempotency, agent.persistence_path
+            )
+    manager: IdempotencyManager | None = state.idempotency
+    return manager
+
+
+def require_admin(request: Request) -> None:
+    """Guard admin endpoints with the configured bearer token.
+
+    Admin endpoints are disabled (403) until `server.admin.token` or the
+    `IDUN_ADMIN_TOKEN` environment variable is set.
+    """
+    engine_config = getattr(request.app.state, "engine_config", None)
+    expected = engine_config.server.admin.resolved_token() if engine_config else None
+    if not expected:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled. Set server.admin.token to enable them.",
+        )
+
+    scheme, _, provided = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        provided.encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
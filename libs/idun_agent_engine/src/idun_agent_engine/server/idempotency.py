@@ -0,0 +1,400 @@
+"""Idempotency keys for agent runs.
+
+A request carrying an `Idempotency-Key` header claims the key before the graph
+runs. Retries with the same key never start a second run: they replay the stored
+result of a completed run, attach to a run still in progress in this worker, or
+wait for a run owned by another worker to complete.
+
+Keys live in a bounded, TTL-evicted table. When the agent persists to SQLite the
+table is kept in the same database file, so every worker sharing the
+checkpointer also shares the keys; otherwise an in-process table is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+import aiosqlite
+
+from .server_config import IdempotencyConfig
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyConflictError(Exception):
+    """The key was already used for a different request."""
+
+
+class IdempotencyUnavailableError(Exception):
+    """The run owning the key failed or could not be awaited; retry later."""
+
+
+@dataclass
+class IdempotencyRecord:
+    """State of one idempotency key."""
+
+    request_hash: str
+    status: Literal["running", "completed"]
+    owner: str
+    chunks: list[str] | None = None
+
+
+def request_fingerprint(route: str, session_id: str, query: str) -> str:
+    """Digest of the request a key was first used with."""
+    digest = hashlib.sha256()
+    for part in (route, session_id, query):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IdempotencyStore(ABC):
+    """Table of idempotency keys, bounded by `max_entries` and expiring entries."""
+
+    def __init__(self, config: IdempotencyConfig) -> None:
+        """Initialize the store with its configuration."""
+        self.config = config
+
+    @abstractmethod
+    async def claim(
+        self, key: str, request_hash: str, owner: str
+    ) -> IdempotencyRecord | None:
+        """Atomically claim `key` for a new run.
+
+        Returns None when the key was claimed, or the existing record otherwise.
+        Running claims expire after `run_timeout_seconds` so keys held by a
+        crashed worker are eventually released.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, key: str) -> IdempotencyRecord | None:
+        """Return the live record for `key`, if any."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(self, key: str, chunks: list[str]) -> None:
+        """Store the output of a finished run and keep it for `ttl_seconds`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Forget a key whose run failed, so a retry can run again."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release backend resources. No-op by default."""
+        return None
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Process-local store used when the agent has no SQLite persistence."""
+
+    def __init__(self, config: IdempotencyConfig) -> None:
+        """Create an empty store."""
+        super().__init__(config)
+        # key -> (expires_at, record); insertion order doubles as age order
+        self._entries: OrderedDict[str, tuple[float, IdempotencyRecord]] = OrderedDict()
+
+    async def claim(
+        self, key: str, request_hash: str, owner: str
+    ) -> IdempotencyRecord | None:
+        """Claim `key` unless a live record exists."""
+        existing = await self.get(key)
+        if existing is not None:
+            return existing
+        expires_at = time.monotonic() + self.config.run_timeout_seconds
+        self._entries[key] = (
+            expires_at,
+            IdempotencyRecord(request_hash, "running", owner),
+        )
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+        return None
+
+    async def get(self, key: str) -> IdempotencyRecord | None:
+        """Return the live record for `key`, dropping it once expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    async def complete(self, key: str, chunks: list[str]) -> None:
+        """Mark the run completed and restart its expiry at `ttl_seconds`."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        record = entry[1]
+        record.status, record.chunks = "completed", chunks
+        self._entries[key] = (time.monotonic() + self.config.ttl_seconds, record)
+
+    async def release(self, key: str) -> None:
+        """Forget `key`."""
+        self._entries.pop(key, None)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idun_idempotency_keys (
+    key TEXT PRIMARY KEY,
+    request_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    result TEXT,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idun_idempotency_keys_created
+    ON idun_idempotency_keys (created_at);
+"""
+
+
+class SqliteIdempotencyStore(IdempotencyStore):
+    """Store kept in the agent's SQLite database, shared by all its workers."""
+
+    def __init__(self, config: IdempotencyConfig, db_path: str) -> None:
+        """Prepare the store; the connection is opened lazily on first use."""
+        super().__init__(config)
+        self.db_path = db_path
+        self._connection: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._connection is not None:
+            return self._connection
+        async with self._connect_lock:
+            if self._connection is None:
+                conn = await aiosqlite.connect(self.db_path)
+                await conn.execute("PRAGMA busy_timeout=5000")
+                await conn.executescript(_SCHEMA)
+                await conn.commit()
+                self._connection = conn
+        return self._connection
+
+    async def claim(
+        self, key: str, request_hash: str, owner: str
+    ) -> IdempotencyRecord | None:
+        """Claim `key` with an atomic insert, evicting expired and excess rows."""
+        conn = await self._conn()
+        while True:
+            now = time.time()
+            await conn.execute(
+                "DELETE FROM idun_idempotency_keys WHERE expires_at <= ?", (now,)
+            )
+            cursor = await conn.execute(
+                "INSERT OR IGNORE INTO idun_idempotency_keys "
+                "(key, request_hash, status, owner, result, created_at, expires_at) "
+                "VALUES (?, ?, 'running', ?, NULL, ?, ?)",
+                (key, request_hash, owner, now, now + self.config.run_timeout_seconds),
+            )
+            if cursor.rowcount == 1:
+                await conn.execute(
+                    "DELETE FROM idun_idempotency_keys WHERE key IN ("
+                    "SELECT key FROM idun_idempotency_keys "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.config.max_entries,),
+                )
+                await conn.commit()
+                return None
+            await conn.commit()
+            existing = await self._get(conn, key, now)
+            # Released by its owner in the meantime: try to claim it again
+            if existing is not None:
+                return existing
+
+    async def get(self, key: str) -> IdempotencyRecord | None:
+        """Return the live record for `key`."""
+        return await self._get(await self._conn(), key, time.time())
+
+    async def _get(
+        self, conn: aiosqlite.Connection, key: str, now: float
+    ) -> IdempotencyRecord | None:
+        async with conn.execute(
+            "SELECT request_hash, status, owner, result FROM idun_idempotency_keys "
+            "WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        request_hash, status, owner, result = row
+        chunks = json.loads(result) if result is not None else None
+        return IdempotencyRecord(request_hash, status, owner, chunks)
+
+    async def complete(self, key: str, chunks: list[str]) -> None:
+        """Store the run output and restart its expiry at `ttl_seconds`."""
+        conn = await self._conn()
+        await conn.execute(
+            "UPDATE idun_idempotency_keys "
+            "SET status = 'completed', result = ?, expires_at = ? WHERE key = ?",
+            (json.dumps(chunks), time.time() + self.config.ttl_seconds, key),
+        )
+        await conn.commit()
+
+    async def release(self, key: str) -> None:
+        """Forget `key`."""
+        conn = await self._conn()
+        await conn.execute("DELETE FROM idun_idempotency_keys WHERE key = ?", (key,))
+        await conn.commit()
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+@dataclass
+class _Broadcast:
+    """Output of a run in progress, replayable by any number of followers."""
+
+    chunks: list[str] = field(default_factory=list)
+    done: bool = False
+    error: BaseException | None = None
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    async def publish(
+        self, chunk: str | None = None, error: BaseException | None = None
+    ) -> None:
+        async with self.changed:
+            if chunk is not None:
+                self.chunks.append(chunk)
+            else:
+                self.done, self.error = True, error
+            self.changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[str]:
+        position = 0
+        while True:
+            async with self.changed:
+                while position == len(self.chunks) and not self.done:
+                    await self.changed.wait()
+                pending = self.chunks[position:]
+                finished, error = self.done, self.error
+            for chunk in pending:
+                yield chunk
+            position += len(pending)
+            if finished and position == len(self.chunks):
+                if isinstance(error, asyncio.CancelledError):
+                    raise IdempotencyUnavailableError("The original run was cancelled.")
+                if error is not None:
+                    raise error
+                return
+
+
+class IdempotencyManager:
+    """Runs requests at most once per idempotency key."""
+
+    def __init__(self, store: IdempotencyStore) -> None:
+        """Create a manager over `store`."""
+        self.store = store
+        self._owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._local: dict[str, _Broadcast] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def execute(
+        self,
+        key: str,
+        request_hash: str,
+        produce: Callable[[], AsyncIterator[str]],
+    ) -> tuple[bool, AsyncIterator[str]]:
+        """Run `produce` once for `key` and return its output chunks.
+
+        The run executes in a background task, so it completes (and its result
+        is stored) even if the client that started it disconnects.
+
+        Returns:
+            Whether the output is replayed from an earlier request, and an
+            iterator over the output chunks.
+
+        Raises:
+            IdempotencyConflictError: The key was used with a different request.
+        """
+        existing = await self.store.claim(key, request_hash, self._owner)
+        if existing is None:
+            broadcast = self._local[key] = _Broadcast()
+            task = asyncio.create_task(self._run(key, broadcast, produce))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return False, broadcast.follow()
+
+        if existing.request_hash != request_hash:
+            raise IdempotencyConflictError(
+                f"Idempotency key '{key}' was already used for a different request."
+            )
+        if existing.status == "completed":
+            return True, self._replay(existing.chunks or [])
+        local = self._local.get(key)
+        if local is not None:
+            return True, local.follow()
+        return True, self._await_remote(key)
+
+    async def _run(
+        self,
+        key: str,
+        broadcast: _Broadcast,
+        produce: Callable[[], AsyncIterator[str]],
+    ) -> None:
+        try:
+            async for chunk in produce():
+                await broadcast.publish(chunk)
+        except BaseException as e:
+            await self.store.release(key)
+            await broadcast.publish(error=e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            await self.store.complete(key, broadcast.chunks)
+            await broadcast.publish()
+        finally:
+            self._local.pop(key, None)
+
+    @staticmethod
+    async def _replay(chunks: list[str]) -> AsyncIterator[str]:
+        for chunk in chunks:
+            yield chunk
+
+    async def _await_remote(self, key: str) -> AsyncIterator[str]:
+        """Wait for a run owned by another worker, then replay its output."""
+        while True:
+            record = await self.store.get(key)
+            if record is None:
+                raise IdempotencyUnavailableError(
+                    f"The run holding idempotency key '{key}' did not complete."
+                )
+            if record.status == "completed":
+                for chunk in record.chunks or []:
+                    yield chunk
+                return
+            await asyncio.sleep(self.store.config.poll_interval_seconds)
+
+    async def close(self) -> None:
+        """Close the underlying store."""
+        await self.store.close()
+
+
+def create_idempotency_manager(
+    config: IdempotencyConfig, db_path: str | None
+) -> IdempotencyManager | None:
+    """Build the manager on the agent's SQLite file, or in memory without one."""
+    if not config.enabled:
+        return None
+    store: IdempotencyStore = (
+        SqliteIdempotencyStore(config, db_path)
+        if db_path
+        else InMemoryIdempotencyStore(config)
+    )
+    return IdempotencyManager(store)
@@ -1,37 +1,169 @@
 """Server lifespan management utilities.
 
-Initializes the agent at startup and cleans up resources on shutdown.
+Initializes the agent at startup, optionally warms it up, and cleans up resources
+on shutdown. Readiness (`app.state.ready`) only flips to True once the agent is
+initialized and the warmup phase has completed.
+
+On shutdown (or as soon as SIGTERM is received) the engine stops admitting new
+runs and flips readiness to failing; in-flight runs are then drained before the
+agent flushes observability and closes its persistence.
 """
 
+import asyncio
+import contextlib
 import inspect
+import logging
+import shutil
+import signal
+from collections.abc import Callable
 from contextlib import asynccontextmanager
+from typing import Any
 
 from fastapi import FastAPI
 
-from ..core.config_builder import ConfigBuilder
+from ..cache import create_response_cache
+from ..debug import loop_watchdog, slow_runs
+from ..executor import provision_metrics_dir
+from ..metrics import MultiprocessCollector, engine_metrics, node_profiler
+from ..observability.tracing import engine_tracer
+from ..usage import usage_tracker
+from .dependencies import ensure_agent
+from .reloader import AgentReloader
+from .runs import RunTracker
+from .server_config import MetricsConfig
+from .warmup import run_warmup
+
+logger = logging.getLogger(__name__)
+
+
+def _start_metrics(app: FastAPI, config: MetricsConfig) -> asyncio.Task[None] | None:
+    """Set up multi-worker metrics aggregation when a shared directory is set."""
+    directory = config.resolved_dir() if config.enabled else None
+    if directory is None:
+        app.state.metrics_collector = None
+        return None
+    collector = MultiprocessCollector(engine_metrics.registry, directory)
+    app.state.metrics_collector = collector
+    return asyncio.create_task(collector.publish(config.flush_interval_seconds))
+
+
+def _install_sigterm_hook(app: FastAPI, tracker: RunTracker) -> Callable[[], None]:
+    """Chain a SIGTERM handler that starts draining before the previous handler.
+
+    Uvicorn installs its own signal handlers before running the lifespan, so the
+    previous handler is kept and called afterwards. Returns a function restoring it.
+    """
+    try:
+        previous = signal.getsignal(signal.SIGTERM)
+    except ValueError:  # pragma: no cover - not in main thread
+        return lambda: None
+
+    def _on_sigterm(signum: int, frame: Any) -> None:
+        app.state.ready = False
+        tracker.stop_accepting()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.raise_signal(signal.SIGTERM)
+
+    try:
+        signal.signal(signal.SIGTERM, _on_sigterm)
+    except ValueError:  # Signals can only be set from the main thread
+        return lambda: None
+
+    def _restore() -> None:
+        with contextlib.suppress(ValueError, TypeError):
+            signal.signal(signal.SIGTERM, previous)
+
+    return _restore
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan context to initialize and teardown the agent."""
     # Load config and initialize agent on startup
-    print("Server starting up...")
+    logger.info("Server starting up")
+    app.state.ready = False
     engine_config = app.state.engine_config
+    tracker = getattr(app.state, "run_tracker", None)
+    if tracker is None:
+        tracker = app.state.run_tracker = RunTracker()
 
-    # Use ConfigBuilder's centralized agent initialization
-    agent_instance = await ConfigBuilder.initialize_agent_from_config(engine_config)
+    engine_tracer.configure(engine_config.server.tracing)
+    if engine_tracer.enabled:
+        logger.info(
+            "Engine tracing enabled (%s exporter)", engine_tracer.config.exporter
+        )
+    node_profiler.configure(engine_config.server.profiling)
+    usage_tracker.configure(engine_config.server.usage)
+    slow_runs.configure(engine_config.server.debug.slow_runs)
+    loop_watchdog.configure(engine_config.server.debug.loop_watchdog)
+    await loop_watchdog.start()
 
-    # Store both in app state
-    app.state.agent = agent_instance
-    app.state.config = engine_config
+    # Executors publish the runs' metrics; the front end must be able to read them
+    app.state.pool_metrics_dir = provision_metrics_dir(engine_config)
+
+    # Use ConfigBuilder's centralized agent initialization (guarded, once-only)
+    agent_instance = await ensure_agent(app)
 
     agent_name = getattr(agent_instance, "name", "Unknown")
-    print(f"✅ Agent '{agent_name}' initialized and ready to serve!")
+    logger.info("Agent '%s' initialized", agent_name)
+
+    app.state.response_cache = create_response_cache(
+        engine_config.server.response_cache
+    )
+    if app.state.response_cache is not None:
+        logger.info("Response cache enabled (%s)", app.state.response_cache.backend)
+
+    if engine_config.server.warmup.enabled:
+        await run_warmup(agent_instance, engine_config.server.warmup)
+
+    watch_task: asyncio.Task[None] | None = None
+    if engine_config.server.reload.watch:
+        reloader = getattr(app.state, "reloader", None)
+        if reloader is None:
+            reloader = app.state.reloader = AgentReloader(app)
+        watch_task = asyncio.create_task(
+            reloader.watch(engine_config.server.reload.poll_interval_seconds)
+        )
+        logger.info("Watching config and graph files for changes")
+
+    metrics_task = _start_metrics(app, engine_config.server.metrics)
+
+    restore_sigterm = _install_sigterm_hook(app, tracker)
+    app.state.ready = True
+    logger.info("Agent '%s' ready to serve", agent_name)
 
     yield
 
-    # Clean up on shutdown
-    print("🔄 Idun Agent Engine shutting down...")
+    # Clean up on shutdown: stop admitting runs, drain in-flight ones, then close
+    app.state.ready = False
+    restore_sigterm()
+    if watch_task is not None:
+        watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watch_task
+    logger.info("Idun Agent Engine shutting down")
+
+    # A hot reload may have replaced the config since startup
+    engine_config = app.state.engine_config
+    drain_timeout = engine_config.server.shutdown.drain_timeout_seconds
+    if tracker.active_runs:
+        logger.info(
+            "Draining %d in-flight run(s) (timeout %ss)",
+            tracker.active_runs,
+            drain_timeout,
+        )
+    report = await tracker.drain(drain_timeout)
+    app.state.drain_report = report
+    logger.info(
+        "Drain finished in %ss: %d completed, %d cancelled",
+        report.duration_seconds,
+        report.completed,
+        report.forced_cancellations,
+    )
+
     agent = getattr(app.state, "agent", None)
     if agent is not None:
         close_fn = getattr(agent, "close", None)
@@ -39,4 +171,22 @@ async def lifespan(app: FastAPI):
             result = close_fn()
             if inspect.isawaitable(result):
                 await result
-    print("✅ Agent resources cleaned up successfully.")
+
+    for resource in ("response_cache", "idempotency"):
+        handle = getattr(app.state, resource, None)
+        if handle is not None:
+            await handle.close()
+
+    if metrics_task is not None:
+        metrics_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await metrics_task
+        # Publish the final counters so they outlive this worker
+        with contextlib.suppress(OSError):
+            app.state.metrics_collector.write()
+    if app.state.pool_metrics_dir is not None:
+        shutil.rmtree(app.state.pool_metrics_dir, ignore_errors=True)
+    await loop_watchdog.stop()
+    # Export the spans still queued, including those of the drained runs
+    await asyncio.to_thread(engine_tracer.shutdown)
+    logger.info("Agent resources cleaned up")
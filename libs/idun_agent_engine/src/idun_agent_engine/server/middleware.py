@@ -0,0 +1,96 @@
+"""ASGI middleware used by the engine server."""
+
+import time
+
+from opentelemetry.trace import SpanKind
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..metrics import EngineMetrics, engine_metrics
+from ..observability.tracing import EngineTracer, engine_tracer
+
+REQUEST_START_KEY = "idun_request_start_ns"
+"""Request state entry holding the request's start time, for stage spans."""
+
+
+class MetricsMiddleware:
+    """Record the latency of every HTTP request, labelled by route template.
+
+    Implemented as plain ASGI rather than `BaseHTTPMiddleware` so streamed
+    responses pass through untouched and are timed until their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: EngineMetrics = engine_metrics):
+        """Wrap `app`, recording into `metrics`."""
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and record it once the response is complete."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; keep the template
+            # (not the raw path) so label cardinality stays bounded.
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            self.metrics.request_duration.labels(
+                scope["method"], route, str(status)
+            ).observe(time.perf_counter() - start)
+
+
+class TracingMiddleware:
+    """Open a server span around every HTTP request when engine tracing is on.
+
+    The span is renamed after the matched route template once routing is done,
+    and the request start time is kept in the request state so the routes can
+    report the time spent before they run (body parsing, dependencies).
+    """
+
+    def __init__(self, app: ASGIApp, tracer: EngineTracer = engine_tracer):
+        """Wrap `app`, recording spans with `tracer`."""
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request inside a server span."""
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.time_ns()
+        scope.setdefault("state", {})[REQUEST_START_KEY] = start
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        with self.tracer.span(
+            method,
+            {"http.request.method": method, "url.path": scope["path"]},
+            start_time=start,
+            kind=SpanKind.SERVER,
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status)
@@ -0,0 +1,187 @@
+"""Hot reload of the agent configuration and graph.
+
+A reload re-reads the configuration (from `app.state.config_path` when the app
+was created from a file), builds a new agent in the background and atomically
+swaps it into `app.state.agent`. Requests already in flight keep the instance
+they resolved and finish on it, as it is closed only once their leases on it
+are released. The new instance shares the existing checkpointer when its
+configuration did not change.
+
+Watch mode polls the config file, the module named by the agent's definition
+(`graph_definition`, `crew_definition` or `agent_definition`) and the local
+modules it imports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+
+from ..agent.sources import evict_local_modules, local_sources
+from ..core.config_builder import ConfigBuilder
+from ..core.engine_config import EngineConfig
+from ..executor import provision_metrics_dir
+from ..metrics import MultiprocessCollector, engine_metrics
+from .dependencies import agent_leases
+from .runs import AgentLeases
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_FIELDS = ("graph_definition", "crew_definition", "agent_definition")
+"""Agent config fields naming a `path/to/file.py:variable` definition."""
+
+
+class AgentReloader:
+    """Serializes reloads for an application and optionally watches its sources."""
+
+    def __init__(self, app: FastAPI) -> None:
+        """Bind the reloader to the application whose agent it swaps."""
+        self._app = app
+        self._lock = asyncio.Lock()
+        self._reload_count = 0
+        self._retiring: set[asyncio.Task[None]] = set()
+
+    def _load_config(self) -> EngineConfig:
+        config_path = getattr(self._app.state, "config_path", None)
+        if config_path:
+            return ConfigBuilder.load_from_file(config_path)
+        engine_config: EngineConfig = self._app.state.engine_config
+        return engine_config
+
+    async def reload(self) -> dict[str, Any]:
+        """Build a new agent from the current config and swap it in.
+
+        Returns:
+            dict[str, Any]: Summary with old/new agent ids and the reload duration.
+
+        Raises:
+            Exception: Any configuration or graph loading error. The previous agent
+                keeps serving traffic in that case.
+        """
+        async with self._lock:
+            started = time.monotonic()
+            engine_config = self._load_config()
+            previous = getattr(self._app.state, "agent", None)
+            state = self._app.state
+            metrics_dir = provision_metrics_dir(
+                engine_config, getattr(state, "pool_metrics_dir", None)
+            )
+            if metrics_dir is not None:
+                state.pool_metrics_dir = metrics_dir
+            module_path = self._definition_module(engine_config)
+            if module_path is not None:
+                # Edited helper modules must be imported again, not reused
+                evict_local_modules(module_path)
+
+            agent = await ConfigBuilder.initialize_agent_from_config(
+                engine_config, previous_agent=previous
+            )
+
+            # Attribute assignment is atomic for requests resolving the agent.
+            self._app.state.agent = agent
+            self._app.state.engine_config = engine_config
+            self._app.state.config = engine_config
+            self._reload_count += 1
+            if (
+                metrics_dir is not None
+                and getattr(state, "metrics_collector", None) is None
+            ):
+                # The pool was enabled by this reload; serve its executors' metrics
+                state.metrics_collector = MultiprocessCollector(
+                    engine_metrics.registry, metrics_dir
+                )
+
+            if previous is not None:
+                leases = agent_leases(self._app)
+                task = asyncio.create_task(self._retire(previous, leases))
+                self._retiring.add(task)
+                task.add_done_callback(self._retiring.discard)
+
+            return {
+                "status": "reloaded",
+                "agent_id": getattr(agent, "id", None),
+                "previous_agent_id": getattr(previous, "id", None),
+                "reload_count": self._reload_count,
+                "duration_seconds": round(time.monotonic() - started, 3),
+            }
+
+    @staticmethod
+    async def _retire(previous: Any, leases: AgentLeases) -> None:
+        """Close a replaced agent once no request or run holds a lease on it.
+
+        When persistence was shared, ownership already moved to the new agent
+        and closing only flushes the old instance's observability. Agents that
+        can stop gracefully (an executor pool) are told to retire before the
+        close; retiring earlier would reject runs of requests that still hold
+        the old agent.
+        """
+        await leases.wait_released(previous)
+        retire_fn = getattr(previous, "retire", None)
+        if callable(retire_fn):
+            retire_fn()
+        close_fn = getattr(previous, "close", None)
+        if callable(close_fn):
+            result = close_fn()
+            if inspect.isawaitable(result):
+                await result
+
+    @staticmethod
+    def _definition_module(engine_config: EngineConfig) -> Path | None:
+        """Return the module file named by the agent's definition, if any."""
+        for field in DEFINITION_FIELDS:
+            definition = getattr(engine_config.agent.config, field, None)
+            if isinstance(definition, str) and ":" in definition:
+                return Path(definition.rsplit(":", 1)[0])
+        return None
+
+    def watched_paths(self) -> list[Path]:
+        """Return the files whose modification triggers a reload in watch mode."""
+        paths: list[Path] = []
+        config_path = getattr(self._app.state, "config_path", None)
+        if config_path:
+            paths.append(Path(config_path))
+        module_path = self._definition_module(self._app.state.engine_config)
+        if module_path is not None:
+            paths.extend(local_sources(module_path))
+        return [p if p.is_absolute() else Path.cwd() / p for p in paths]
+
+    @staticmethod
+    def _snapshot(paths: list[Path]) -> dict[Path, float | None]:
+        snapshot: dict[Path, float | None] = {}
+        for path in paths:
+            try:
+                snapshot[path] = os.stat(path).st_mtime
+            except OSError:
+                snapshot[path] = None
+        return snapshot
+
+    async def watch(self, poll_interval: float) -> None:
+        """Poll watched files and reload whenever one of them changes.
+
+        Runs until cancelled. Failed reloads are reported and the previous agent
+        keeps serving.
+        """
+        snapshot = self._snapshot(self.watched_paths())
+        while True:
+            await asyncio.sleep(poll_interval)
+            current = self._snapshot(self.watched_paths())
+            if current == snapshot:
+                continue
+            try:
+                result = await self.reload()
+                logger.info(
+                    "Agent reloaded in %ss (agent %s)",
+                    result["duration_seconds"],
+                    result["agent_id"],
+                )
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Hot reload failed, keeping previous agent: %s", e)
+            # The reloaded config may point at a different graph file.
+            snapshot = self._snapshot(self.watched_paths())
@@ -1,5 +1,5 @@
 """FastAPI routers for the engine service."""
 
-from . import agent, base
+from . import admin, agent, base
 
-__all__ = ["agent", "base"]
+__all__ = ["admin", "agent", "base"]
@@ -0,0 +1,69 @@
+"""Administrative routes, guarded by the configured admin token."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from idun_agent_engine.cache import ResponseCache
+from idun_agent_engine.metrics import node_profiler
+from idun_agent_engine.server.dependencies import (
+    get_response_cache,
+    get_run_tracker,
+    require_admin,
+)
+from idun_agent_engine.server.reloader import AgentReloader
+from idun_agent_engine.server.runs import RunTracker
+
+admin_router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def get_reloader(request: Request) -> AgentReloader:
+    """Return the app's reloader, creating it on first use."""
+    reloader = getattr(request.app.state, "reloader", None)
+    if reloader is None:
+        reloader = request.app.state.reloader = AgentReloader(request.app)
+    return reloader
+
+
+@admin_router.post("/reload")
+async def reload_agent(
+    _tracker: Annotated[RunTracker, Depends(get_run_tracker)],
+    reloader: Annotated[AgentReloader, Depends(get_reloader)],
+):
+    """Reload configuration and graph, then swap the new agent in atomically.
+
+    In-flight runs finish on the previous instance. On failure the previous agent
+    keeps serving and the error is returned.
+    """
+    try:
+        return await reloader.reload()
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}") from e
+
+
+def _require_cache(
+    cache: Annotated[ResponseCache | None, Depends(get_response_cache)],
+) -> ResponseCache:
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Response cache is disabled.")
+    return cache
+
+
+@admin_router.get("/cache")
+async def cache_stats(cache: Annotated[ResponseCache, Depends(_require_cache)]):
+    """Return response cache hit/miss counters and size."""
+    return await cache.stats()
+
+
+@admin_router.delete("/cache")
+async def clear_cache(cache: Annotated[ResponseCache, Depends(_require_cache)]):
+    """Drop every cached response."""
+    await cache.clear()
+    return {"status": "cleared"}
+
+
+@admin_router.delete("/profile")
+async def reset_profile():
+    """Drop the node timings recorded by this worker."""
+    node_profiler.reset()
+    return {"status": "reset"}
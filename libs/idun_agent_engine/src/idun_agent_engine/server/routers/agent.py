@@ -1,13 +1,48 @@
 """Agent routes for invoking and streaming agent responses."""
 
-from typing import Annotated
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from ag_ui.core.events import EventType
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
 from idun_agent_engine.agent.base import BaseAgent
-from idun_agent_engine.server.dependencies import get_agent
+from idun_agent_engine.cache import ResponseCache, make_cache_key
+from idun_agent_engine.executor import ExecutorPoolError
+from idun_agent_engine.log import log_context
+from idun_agent_engine.metrics import (
+    MultiprocessCollector,
+    engine_metrics,
+    node_profiler,
+    profile_report,
+)
+from idun_agent_engine.observability.sampling import TRACE_HEADER, parse_force_header
+from idun_agent_engine.observability.tracing import engine_tracer
+from idun_agent_engine.server.dependencies import (
+    agent_leases,
+    get_agent,
+    get_idempotency,
+    get_response_cache,
+    get_run_tracker,
+)
+from idun_agent_engine.server.idempotency import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    IdempotencyConflictError,
+    IdempotencyManager,
+    IdempotencyUnavailableError,
+    request_fingerprint,
+)
+from idun_agent_engine.server.middleware import REQUEST_START_KEY
+from idun_agent_engine.server.runs import RunTracker
+from idun_agent_engine.usage import TokenBudgetExceededError, usage_report
+
+logger = logging.getLogger(__name__)
 
 
 class ChatRequest(BaseModel):
@@ -18,43 +53,267 @@ class ChatRequest(BaseModel):
 
 
 class ChatResponse(BaseModel):
-    """Chat response payload containing session and response text."""
+    """Chat response payload containing session and response text.
+
+    `metadata` carries the run's token `usage` when the agent ran for this
+    request and its model reported usage; it is omitted for cache hits and
+    idempotent replays.
+    """
 
     session_id: str
     response: str
+    metadata: dict[str, Any] | None = None
 
 
 agent_router = APIRouter()
 
 
-@agent_router.post("/invoke", response_model=ChatResponse)
+def sse_event(event: BaseModel) -> str:
+    """Frame an ag-ui event as a server-sent event."""
+    return f"data: {event.model_dump_json()}\n\n"
+
+
+def _agent_message(request: ChatRequest, http_request: Request) -> dict[str, Any]:
+    """Build the agent input, carrying a forced tracing decision if requested."""
+    message: dict[str, Any] = {"query": request.query, "session_id": request.session_id}
+    forced = parse_force_header(http_request.headers.get(TRACE_HEADER))
+    if forced is not None:
+        message["trace"] = forced
+    return message
+
+
+def _trace_prepare(http_request: Request, request: ChatRequest) -> None:
+    """Record the time from request arrival until the route runs.
+
+    Covers body parsing, validation and dependency resolution, which happen
+    before any route code and so cannot be wrapped in a span directly.
+    """
+    if not engine_tracer.enabled:
+        return
+    start = getattr(http_request.state, REQUEST_START_KEY, None)
+    with engine_tracer.span(
+        "idun.request.prepare",
+        {"idun.session_id": request.session_id},
+        start_time=start,
+    ):
+        pass
+
+
+async def _run_idempotent(
+    idempotency: IdempotencyManager | None,
+    http_request: Request,
+    request: ChatRequest,
+    produce: Callable[[], AsyncIterator[str]],
+) -> tuple[bool, AsyncIterator[str]]:
+    """Run `produce` at most once per `Idempotency-Key`, if the header is set."""
+    key = http_request.headers.get(IDEMPOTENCY_HEADER)
+    if idempotency is None or not key:
+        return False, produce()
+    request_hash = request_fingerprint(
+        http_request.url.path, request.session_id, request.query
+    )
+    try:
+        replayed, chunks = await idempotency.execute(key, request_hash, produce)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    if replayed:
+        engine_metrics.idempotent_replays.labels(http_request.url.path).inc()
+    return replayed, chunks
+
+
+async def _releasing(
+    chunks: AsyncIterator[str], release: Callable[[], None]
+) -> AsyncIterator[str]:
+    """Relay `chunks`, then call `release` however the iteration ends."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        release()
+
+
+@agent_router.post(
+    "/invoke", response_model=ChatResponse, response_model_exclude_none=True
+)
 async def invoke(
     request: ChatRequest,
+    tracker: Annotated[RunTracker, Depends(get_run_tracker)],
     agent: Annotated[BaseAgent, Depends(get_agent)],
+    cache: Annotated[ResponseCache | None, Depends(get_response_cache)],
+    idempotency: Annotated[IdempotencyManager | None, Depends(get_idempotency)],
+    http_request: Request,
+    response: Response,
 ):
-    """Process a chat message with the agent without streaming."""
+    """Process a chat message with the agent without streaming.
+
+    When the response cache is enabled, exact repeats of a query are answered from
+    the cache. Clients can send `Cache-Control: no-cache` to skip the lookup, or
+    `no-store` to bypass the cache entirely; `X-Idun-Cache` reports the outcome.
+
+    Requests sharing an `Idempotency-Key` header run the agent once; repeats
+    receive the same response with `Idempotent-Replayed: true`.
+    """
+    _trace_prepare(http_request, request)
     try:
-        message = {"query": request.query, "session_id": request.session_id}
-        response_content = await agent.invoke(message)
+        cache_key: str | None = None
+        if cache is not None:
+            directives = http_request.headers.get("Cache-Control", "").lower()
+            if "no-store" in directives:
+                response.headers["X-Idun-Cache"] = "BYPASS"
+                engine_metrics.response_cache.labels("bypass").inc()
+            else:
+                cache_key = make_cache_key(
+                    agent.fingerprint,
+                    request.query,
+                    request.session_id if cache.config.session_scoped else None,
+                    cache.config.case_sensitive,
+                )
+                cached = None
+                if "no-cache" not in directives:
+                    cached = await cache.get(cache_key)
+                if cached is not None:
+                    response.headers["X-Idun-Cache"] = "HIT"
+                    engine_metrics.response_cache.labels("hit").inc()
+                    return ChatResponse(session_id=request.session_id, response=cached)
+                response.headers["X-Idun-Cache"] = "MISS"
+                engine_metrics.response_cache.labels("miss").inc()
+
+        metadata: dict[str, Any] | None = None
+        leases = agent_leases(http_request.app)
+
+        async def produce() -> AsyncIterator[str]:
+            nonlocal metadata
+            message = _agent_message(request, http_request)
+            # The run leases the agent itself: an idempotent one outlives the request
+            with (
+                leases.hold(agent),
+                log_context(session_id=request.session_id),
+                engine_metrics.track_run("invoke"),
+            ):
+                async with tracker.track():
+                    with usage_report() as report:
+                        content = await agent.invoke(message)
+                    if report.usage is not None and report.usage.llm_calls:
+                        metadata = {"usage": report.usage.to_dict()}
+                    yield content
+
+        replayed, chunks = await _run_idempotent(
+            idempotency, http_request, request, produce
+        )
+        response_content = "".join([chunk async for chunk in chunks])
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
 
-        return ChatResponse(session_id=request.session_id, response=response_content)
+        if cache is not None and cache_key and isinstance(response_content, str):
+            await cache.set(cache_key, response_content)
+        return ChatResponse(
+            session_id=request.session_id, response=response_content, metadata=metadata
+        )
+    except HTTPException:
+        raise
+    except TokenBudgetExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e)) from e
+    except ExecutorPoolError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        ) from e
+    except IdempotencyUnavailableError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
     except Exception as e:  # noqa: BLE001
+        logger.exception("Invoke failed", extra={"session_id": request.session_id})
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 @agent_router.post("/stream")
 async def stream(
     request: ChatRequest,
+    tracker: Annotated[RunTracker, Depends(get_run_tracker)],
     agent: Annotated[BaseAgent, Depends(get_agent)],
+    idempotency: Annotated[IdempotencyManager | None, Depends(get_idempotency)],
+    http_request: Request,
 ):
-    """Process a message with the agent, streaming ag-ui events."""
+    """Process a message with the agent, streaming ag-ui events.
+
+    With an `Idempotency-Key` header the run continues even if the client
+    disconnects; a retry with the same key attaches to the running stream or
+    replays the stored events from the start.
+    """
+    _trace_prepare(http_request, request)
+    leases = agent_leases(http_request.app)
+    # Counted from now, not when the body starts, so a drain waits for it
+    admission = tracker.admit()
     try:
 
-        async def event_stream():
-            message = {"query": request.query, "session_id": request.session_id}
-            async for event in agent.stream(message):
-                yield f"data: {event.model_dump_json()}\n\n"
+        async def event_stream() -> AsyncIterator[str]:
+            message = _agent_message(request, http_request)
+            emitted = 0
+            serialize_seconds = 0.0
+            with (
+                leases.hold(agent),
+                engine_tracer.span(
+                    "idun.sse.stream", {"idun.session_id": request.session_id}
+                ) as span,
+                log_context(session_id=request.session_id),
+                engine_metrics.track_run("stream"),
+            ):
+                async with tracker.track(admission):
+                    async for event in agent.stream(message):
+                        emitted += 1
+                        engine_metrics.events.labels(str(event.type.value)).inc()
+                        if event.type is EventType.RUN_STARTED:
+                            span.set_attribute("idun.run_id", event.run_id)
+                        start = time.perf_counter()
+                        chunk = sse_event(event)
+                        serialize_seconds += time.perf_counter() - start
+                        yield chunk
+                span.set_attributes(
+                    {
+                        "idun.events.count": emitted,
+                        "idun.sse.serialize_ms": serialize_seconds * 1000,
+                    }
+                )
+            engine_metrics.events_per_run.observe(emitted)
+
+        try:
+            replayed, events = await _run_idempotent(
+                idempotency, http_request, request, event_stream
+            )
+        except BaseException:
+            tracker.withdraw(admission)
+            raise
+        headers = {REPLAYED_HEADER: "true"} if replayed else None
+        # The body runs after the route returns: the response leases the agent
+        # and keeps the run admitted until it is sent, even if it never starts
+        release_lease = leases.acquire(agent)
+
+        def release() -> None:
+            release_lease()
+            tracker.withdraw(admission)
 
-        return StreamingResponse(event_stream(), media_type="text/event-stream")
+        return StreamingResponse(
+            _releasing(events, release),
+            media_type="text/event-stream",
+            headers=headers,
+            background=BackgroundTask(release),
+        )
+    except HTTPException:
+        raise
     except Exception as e:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@agent_router.get("/profile")
+def profile(request: Request, window: Literal["recent", "total"] = "recent"):
+    """Latency percentiles of every graph node and tool, slowest first.
+
+    `recent` covers the configured sliding window, `total` everything since
+    startup or the last `DELETE /admin/profile`. Aggregated across workers when
+    a shared metrics directory is set.
+    """
+    if not node_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled.")
+    collector: MultiprocessCollector | None = getattr(
+        request.app.state, "metrics_collector", None
+    )
+    snapshot = collector.collect() if collector else engine_metrics.registry.snapshot()
+    return profile_report(snapshot, window)
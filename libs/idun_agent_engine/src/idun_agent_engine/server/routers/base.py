@@ -1,8 +1,10 @@
 """Base routes for service health and landing info."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from ..._version import __version__
+from ...metrics import MultiprocessCollector, engine_metrics, render_text
 
 base_router = APIRouter()
 
@@ -13,6 +15,32 @@ def health_check():
     return {"status": "healthy", "engine_version": __version__}
 
 
+@base_router.get("/ready")
+def readiness_check(request: Request):
+    """Readiness endpoint; returns 503 until the agent is initialized and warmed up."""
+    if getattr(request.app.state, "ready", False):
+        return {"status": "ready", "engine_version": __version__}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "not_ready", "engine_version": __version__},
+    )
+
+
+@base_router.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request):
+    """Prometheus metrics, aggregated across workers when a shared dir is set."""
+    engine_config = getattr(request.app.state, "engine_config", None)
+    if engine_config is not None and not engine_config.server.metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    collector: MultiprocessCollector | None = getattr(
+        request.app.state, "metrics_collector", None
+    )
+    snapshot = collector.collect() if collector else engine_metrics.registry.snapshot()
+    return PlainTextResponse(
+        render_text(snapshot), media_type="text/plain; version=0.0.4"
+    )
+
+
 # Add a root endpoint with helpful information
 @base_router.get("/")
 def read_root():
@@ -21,6 +49,8 @@ def read_root():
         "message": "Welcome to your Idun Agent Engine server!",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
+        "metrics": "/metrics",
         "agent_endpoints": {"invoke": "/agent/invoke", "stream": "/agent/stream"},
     }
 
@@ -0,0 +1,89 @@
+"""Diagnostics routes, guarded by the configured admin token."""
+
+import threading
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+
+from idun_agent_engine.debug import (
+    SamplingProfiler,
+    loop_watchdog,
+    render_flamegraph,
+    slow_runs,
+)
+from idun_agent_engine.server.dependencies import require_admin
+
+debug_router = APIRouter(dependencies=[Depends(require_admin)])
+
+_profile_lock = threading.Lock()
+
+
+@debug_router.get("/profile")
+async def profile(
+    request: Request,
+    seconds: float = Query(default=10.0, gt=0),
+    rate: float | None = Query(default=None, gt=0),
+    format: Literal["collapsed", "svg"] = "collapsed",
+    tasks: bool = False,
+):
+    """Sample every thread's stack for `seconds` and return the aggregate.
+
+    `collapsed` returns one `stack count` line per distinct stack, ready for
+    flamegraph tools; `svg` returns a rendered flame graph. With `tasks=true`
+    the wait points of suspended asyncio tasks are sampled as well. Duration
+    and rate are capped by `server.debug.profiler`; one profile runs at a time.
+    """
+    config = request.app.state.engine_config.server.debug.profiler
+    if not config.enabled:
+        raise HTTPException(status_code=404, detail="Profiler is disabled.")
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    try:
+        profiler = SamplingProfiler(
+            rate_hz=min(rate or config.default_rate_hz, config.max_rate_hz),
+            max_depth=config.max_depth,
+            include_tasks=tasks,
+        )
+        result = await profiler.profile(min(seconds, config.max_seconds))
+    finally:
+        _profile_lock.release()
+
+    headers = {
+        "X-Idun-Profile-Samples": str(result.samples),
+        "X-Idun-Profile-Overhead": f"{result.overhead:.4f}",
+    }
+    if format == "svg":
+        title = (
+            f"Idun Agent Engine: {result.samples} samples "
+            f"over {result.duration_seconds:.1f}s"
+        )
+        return Response(
+            render_flamegraph(result.stacks, title),
+            media_type="image/svg+xml",
+            headers=headers,
+        )
+    return PlainTextResponse(result.collapsed(), headers=headers)
+
+
+@debug_router.get("/slow-runs")
+async def list_slow_runs(limit: int | None = Query(default=None, ge=1)):
+    """Return the timelines of the slow runs kept by this worker, newest first."""
+    if not slow_runs.enabled:
+        raise HTTPException(status_code=404, detail="Slow-run capture is disabled.")
+    return {
+        "threshold_seconds": slow_runs.config.threshold_seconds,
+        "runs": slow_runs.runs(limit),
+    }
+
+
+@debug_router.delete("/slow-runs")
+async def clear_slow_runs():
+    """Drop the slow runs kept by this worker."""
+    return {"cleared": slow_runs.clear()}
+
+
+@debug_router.get("/loop")
+async def loop_report():
+    """Return the event loop lag and what recently blocked the loop, newest first."""
+    return loop_watchdog.report()
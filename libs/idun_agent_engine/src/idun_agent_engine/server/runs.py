@@ -0,0 +1,192 @@
+"""Tracking of in-flight agent runs for graceful shutdown.
+
+Every invoke/stream run executes inside `RunTracker.track()`, which records the
+asyncio task driving it. A streamed run is counted from its admission, as its
+body only starts once the route has returned. On shutdown the tracker stops admitting new runs, waits
+for the active ones to finish, and cancels whatever is still running once the
+drain timeout expires.
+
+`AgentLeases` counts the requests and runs using each agent instance. A request
+takes a lease on the agent when it resolves it, so a hot reload closes the
+replaced instance only once the requests resolved before the swap are done
+with it, including those whose run has not started yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class DrainReport:
+    """Outcome of a drain, reported on shutdown."""
+
+    active_at_start: int
+    completed: int
+    forced_cancellations: int
+    duration_seconds: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a plain dictionary."""
+        return asdict(self)
+
+
+class RunTracker:
+    """Keeps track of active agent runs and drains them on shutdown."""
+
+    def __init__(self) -> None:
+        """Create a tracker that admits runs until a drain begins."""
+        # Active runs, with the task executing each once it has started
+        self._runs: dict[object, asyncio.Task[Any] | None] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = True
+
+    @property
+    def accepting(self) -> bool:
+        """Whether new runs are admitted."""
+        return self._accepting
+
+    @property
+    def active_runs(self) -> int:
+        """Number of runs admitted or executing."""
+        return len(self._runs)
+
+    def active_tasks(self) -> set[asyncio.Task[Any]]:
+        """Return a snapshot of the tasks currently executing runs."""
+        return {task for task in self._runs.values() if task is not None}
+
+    def stop_accepting(self) -> None:
+        """Stop admitting new runs. Safe to call from a signal handler."""
+        self._accepting = False
+
+    def admit(self) -> object:
+        """Count a run as active before it starts, and return its admission.
+
+        For runs started after the route returns (a streamed body), so a drain
+        beginning in between waits for them. Pass the admission to `track` when
+        the run starts, and `withdraw` it once the response is done.
+        """
+        admission = object()
+        self._runs[admission] = None
+        self._idle.clear()
+        return admission
+
+    def withdraw(self, admission: object) -> None:
+        """Stop counting an admitted run that never started; otherwise a no-op."""
+        if admission in self._runs and self._runs[admission] is None:
+            self._finish(admission)
+
+    @asynccontextmanager
+    async def track(self, admission: object | None = None) -> AsyncIterator[None]:
+        """Register the current task as an active run for the duration of the block.
+
+        Admission is checked by the caller (see `get_run_tracker`) so that a run
+        admitted just before a drain starts is still tracked rather than failing
+        midway. A run counted since its `admission` is tracked under it.
+        """
+        task = asyncio.current_task()
+        if task is None:  # pragma: no cover - always inside a task under ASGI
+            yield
+            return
+
+        run = object() if admission is None else admission
+        self._runs[run] = task
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._finish(run)
+
+    def _finish(self, run: object) -> None:
+        self._runs.pop(run, None)
+        if not self._runs:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> DrainReport:
+        """Stop admitting runs and wait up to `timeout` seconds for active ones.
+
+        Runs still active after the timeout are cancelled, or abandoned if they
+        never started; the tracker then waits briefly for the cancelled ones to
+        unwind so persistence is not closed underneath them.
+        """
+        self.stop_accepting()
+        started = time.monotonic()
+        active_at_start = len(self._runs)
+        pending: list[asyncio.Task[Any] | None] = []
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except TimeoutError:
+            pending = list(self._runs.values())
+            tasks = [task for task in pending if task is not None]
+            for task in tasks:
+                task.cancel(msg="Run cancelled, drain timeout exceeded")
+            if tasks:
+                await asyncio.wait(tasks, timeout=5.0)
+
+        return DrainReport(
+            active_at_start=active_at_start,
+            completed=max(active_at_start - len(pending), 0),
+            forced_cancellations=len(pending),
+            duration_seconds=round(time.monotonic() - started, 3),
+        )
+
+
+class AgentLeases:
+    """Reference counts of the requests and runs holding each agent instance."""
+
+    def __init__(self) -> None:
+        """Start with no agent leased."""
+        self._counts: dict[int, int] = {}
+        self._released: dict[int, asyncio.Event] = {}
+
+    def count(self, agent: object) -> int:
+        """Number of leases currently held on `agent`."""
+        return self._counts.get(id(agent), 0)
+
+    def acquire(self, agent: object) -> Callable[[], None]:
+        """Take a lease on `agent` and return the function releasing it.
+
+        Releasing more than once has no further effect.
+        """
+        key = id(agent)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            remaining = self._counts[key] - 1
+            if remaining:
+                self._counts[key] = remaining
+                return
+            del self._counts[key]
+            event = self._released.pop(key, None)
+            if event is not None:
+                event.set()
+
+        return release
+
+    @contextmanager
+    def hold(self, agent: object) -> Iterator[None]:
+        """Hold a lease on `agent` for the duration of the block."""
+        release = self.acquire(agent)
+        try:
+            yield
+        finally:
+            release()
+
+    async def wait_released(self, agent: object) -> None:
+        """Wait until no lease is held on `agent`."""
+        key = id(agent)
+        if not self._counts.get(key):
+            return
+        await self._released.setdefault(key, asyncio.Event()).wait()
@@ -1,7 +1,17 @@
 """Server configuration models."""
 
+import os
+
 from pydantic import BaseModel, Field
 
+from ..cache.model import ResponseCacheConfig
+from ..debug.model import DebugConfig
+from ..executor.model import ExecutorPoolConfig
+from ..log.model import LoggingConfig
+from ..metrics.model import ProfilingConfig
+from ..observability.model import EngineTracingConfig
+from ..usage.model import UsageConfig
+
 
 class ServerAPIConfig(BaseModel):
     """API server configuration.
@@ -13,7 +23,114 @@ class ServerAPIConfig(BaseModel):
     port: int = 8000
 
 
+class WarmupConfig(BaseModel):
+    """Warmup phase executed before the engine reports itself ready.
+
+    Attributes:
+        enabled: Run the warmup phase during startup.
+        queries: Synthetic queries sent through the agent to prime model clients.
+        timeout_seconds: Upper bound for the whole warmup phase.
+    """
+
+    enabled: bool = False
+    queries: list[str] = Field(default_factory=list)
+    timeout_seconds: float = 30.0
+
+
+class ShutdownConfig(BaseModel):
+    """Graceful shutdown settings.
+
+    Attributes:
+        drain_timeout_seconds: How long in-flight runs may keep going after
+            shutdown starts before they are cancelled.
+    """
+
+    drain_timeout_seconds: float = 30.0
+
+
+class AdminConfig(BaseModel):
+    """Administrative endpoints settings.
+
+    Attributes:
+        token: Bearer token required by `/admin/*` endpoints. Falls back to the
+            `IDUN_ADMIN_TOKEN` environment variable; admin endpoints are disabled
+            when neither is set.
+    """
+
+    token: str | None = None
+
+    def resolved_token(self) -> str | None:
+        """Return the configured token, resolving the environment fallback."""
+        return self.token or os.getenv("IDUN_ADMIN_TOKEN") or None
+
+
+class ReloadConfig(BaseModel):
+    """Hot reload settings.
+
+    Attributes:
+        watch: Poll the config file and graph source and reload on change.
+        poll_interval_seconds: Interval between file modification checks.
+    """
+
+    watch: bool = False
+    poll_interval_seconds: float = 1.0
+
+
+class IdempotencyConfig(BaseModel):
+    """`Idempotency-Key` handling for `/agent/invoke` and `/agent/stream`.
+
+    Attributes:
+        enabled: Honour the `Idempotency-Key` request header.
+        ttl_seconds: How long the result of a completed run is kept for replay.
+        max_entries: Upper bound on stored keys; the oldest are evicted first.
+        run_timeout_seconds: How long a key stays claimed by a run that never
+            completes (e.g. its worker crashed) before it can be reused.
+        poll_interval_seconds: Polling interval when waiting for a run owned by
+            another worker.
+    """
+
+    enabled: bool = True
+    ttl_seconds: float = Field(default=24 * 3600.0, gt=0)
+    max_entries: int = Field(default=10_000, gt=0)
+    run_timeout_seconds: float = Field(default=600.0, gt=0)
+    poll_interval_seconds: float = Field(default=0.25, gt=0)
+
+
+class MetricsConfig(BaseModel):
+    """Prometheus metrics served on `/metrics`.
+
+    Attributes:
+        enabled: Record request metrics and expose `/metrics`.
+        multiprocess_dir: Directory where each worker writes its metrics so any
+            worker can serve the aggregate. Falls back to the `IDUN_METRICS_DIR`
+            environment variable; unset means single-process metrics, except
+            with the executor pool, which then gets a temporary directory.
+        flush_interval_seconds: How often each worker refreshes its snapshot.
+    """
+
+    enabled: bool = True
+    multiprocess_dir: str | None = None
+    flush_interval_seconds: float = Field(default=1.0, gt=0)
+
+    def resolved_dir(self) -> str | None:
+        """Return the configured directory, resolving the environment fallback."""
+        return self.multiprocess_dir or os.getenv("IDUN_METRICS_DIR") or None
+
+
 class ServerConfig(BaseModel):
     """Configuration for the Engine's universal settings."""
 
     api: ServerAPIConfig = Field(default_factory=ServerAPIConfig)
+    warmup: WarmupConfig = Field(default_factory=WarmupConfig)
+    shutdown: ShutdownConfig = Field(default_factory=ShutdownConfig)
+    admin: AdminConfig = Field(default_factory=AdminConfig)
+    reload: ReloadConfig = Field(default_factory=ReloadConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
+    idempotency: IdempotencyConfig = Field(default_factory=IdempotencyConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    tracing: EngineTracingConfig = Field(default_factory=EngineTracingConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
+    usage: UsageConfig = Field(default_factory=UsageConfig)
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    debug: DebugConfig = Field(default_factory=DebugConfig)
+    executor_pool: ExecutorPoolConfig = Field(default_factory=ExecutorPoolConfig)
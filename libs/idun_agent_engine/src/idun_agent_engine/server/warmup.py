@@ -0,0 +1,36 @@
+"""Startup warmup of an agent, shared by the server and the executor processes.
+
+Warmup runs the configured synthetic queries before the engine reports ready,
+so the first real request does not pay for lazy imports, connections or
+provider handshakes.
+"""
+
+import asyncio
+import logging
+
+from ..agent.base import BaseAgent
+from .server_config import WarmupConfig
+
+logger = logging.getLogger(__name__)
+
+
+async def run_warmup(agent: BaseAgent, warmup_config: WarmupConfig) -> None:
+    """Run the configured warmup phase, bounded by its timeout.
+
+    Warmup failures are reported but do not prevent the engine from serving.
+    """
+    logger.info("Warming up agent with %d query(ies)", len(warmup_config.queries))
+    try:
+        await asyncio.wait_for(
+            agent.warmup(warmup_config.queries),
+            timeout=warmup_config.timeout_seconds,
+        )
+    except TimeoutError:
+        logger.warning(
+            "Warmup did not finish within %ss, continuing",
+            warmup_config.timeout_seconds,
+        )
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Warmup failed: %s", e)
+    else:
+        logger.info("Warmup complete")
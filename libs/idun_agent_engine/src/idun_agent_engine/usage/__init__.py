@@ -0,0 +1,24 @@
+"""Token usage accounting and budgets for agent runs."""
+
+from .model import ModelPricing, UsageConfig
+from .tracker import (
+    RunUsage,
+    TokenBudgetExceededError,
+    UsageCallback,
+    UsageTracker,
+    report_usage,
+    usage_report,
+    usage_tracker,
+)
+
+__all__ = [
+    "ModelPricing",
+    "RunUsage",
+    "TokenBudgetExceededError",
+    "UsageCallback",
+    "UsageConfig",
+    "UsageTracker",
+    "report_usage",
+    "usage_report",
+    "usage_tracker",
+]
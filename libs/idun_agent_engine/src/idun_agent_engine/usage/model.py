@@ -0,0 +1,35 @@
+"""Token accounting configuration model."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class ModelPricing(BaseModel):
+    """Price of one model, in USD per million tokens."""
+
+    input_per_million: float = Field(default=0.0, ge=0)
+    output_per_million: float = Field(default=0.0, ge=0)
+
+
+class UsageConfig(BaseModel):
+    """Token usage accounting and per-session budgets.
+
+    Usage reported by chat models is summed per run, per session and per agent.
+    Sessions are tracked per worker, most recently active first, up to
+    `max_sessions`; older sessions are forgotten along with their budget.
+
+    Example YAML:
+      server:
+        usage:
+          session_budget_tokens: 200000
+          pricing:
+            gpt-4o-mini: {input_per_million: 0.15, output_per_million: 0.6}
+    """
+
+    enabled: bool = Field(default=True)
+    # Runs of a session that used more tokens than this are aborted
+    session_budget_tokens: int | None = Field(default=None, gt=0)
+    max_sessions: int = Field(default=1000, gt=0)
+    # Keyed by the model name reported in the model's response metadata
+    pricing: dict[str, ModelPricing] = Field(default_factory=dict)
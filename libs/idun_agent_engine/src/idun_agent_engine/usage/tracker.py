@@ -0,0 +1,256 @@
+"""Per-run token accounting with per-session budgets.
+
+Adapters open a `RunUsage` when a run starts and feed it the usage metadata of
+every model response. Totals are added to the agent's counters and to the
+session's running total as they arrive, so a run that exceeds the session
+budget is aborted at its next model response rather than when it finishes.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from ..metrics import EngineMetrics, engine_metrics
+from .model import UsageConfig
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBudgetExceededError(Exception):
+    """Raised when a session has used up its token budget."""
+
+    code = "token_budget_exceeded"
+
+    def __init__(self, session_id: str, used: int, budget: int) -> None:
+        """Describe the session and its consumption."""
+        super().__init__(
+            f"Session '{session_id}' used {used} tokens, over its budget of {budget}."
+        )
+        self.session_id = session_id
+        self.used = used
+        self.budget = budget
+
+
+@dataclass
+class RunUsage:
+    """Tokens consumed by one agent run."""
+
+    agent: str
+    session_id: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    llm_calls: int = 0
+    cost_usd: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the totals reported to clients."""
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "llm_calls": self.llm_calls,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+@dataclass
+class UsageReport:
+    """Receives the usage of the run started in the current context."""
+
+    usage: RunUsage | None = None
+
+
+_report: ContextVar[UsageReport | None] = ContextVar("idun_usage_report", default=None)
+
+
+@contextmanager
+def usage_report() -> Iterator[UsageReport]:
+    """Collect the usage of the run an adapter starts within the block."""
+    report = UsageReport()
+    token = _report.set(report)
+    try:
+        yield report
+    finally:
+        _report.reset(token)
+
+
+def report_usage(usage: RunUsage) -> None:
+    """Hand the usage of a run to the enclosing `usage_report` block, if any."""
+    report = _report.get()
+    if report is not None:
+        report.usage = usage
+
+
+def message_usage(message: Any) -> tuple[int, int, int] | None:
+    """Extract (input, output, total) tokens from a model response message.
+
+    Reads the standard `usage_metadata`, falling back to the OpenAI-style
+    `token_usage` some providers still put in `response_metadata`.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        return (
+            input_tokens,
+            output_tokens,
+            usage.get("total_tokens", input_tokens + output_tokens),
+        )
+    metadata = getattr(message, "response_metadata", None) or {}
+    legacy = metadata.get("token_usage")
+    if legacy:
+        input_tokens = legacy.get("prompt_tokens", 0)
+        output_tokens = legacy.get("completion_tokens", 0)
+        return (
+            input_tokens,
+            output_tokens,
+            legacy.get("total_tokens", input_tokens + output_tokens),
+        )
+    return None
+
+
+def message_model(message: Any, metadata: dict[str, Any] | None = None) -> str | None:
+    """Name of the model that produced `message`, if it is known."""
+    response = getattr(message, "response_metadata", None) or {}
+    name = response.get("model_name") or response.get("model")
+    if not name and metadata:
+        name = metadata.get("ls_model_name")
+    return name
+
+
+class UsageTracker:
+    """Sums token usage per run, session and agent and enforces session budgets."""
+
+    def __init__(self, metrics: EngineMetrics) -> None:
+        """Record into `metrics`, with accounting enabled and no budget."""
+        self._metrics = metrics
+        self.config = UsageConfig()
+        self._sessions: OrderedDict[str, int] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether runs are accounted."""
+        return self.config.enabled
+
+    def configure(self, config: UsageConfig) -> None:
+        """Apply `config`, forgetting the sessions tracked so far."""
+        self.config = config
+        for session_id in self._sessions:
+            self._metrics.session_tokens.remove(session_id)
+        self._sessions.clear()
+
+    def session_tokens(self, session_id: str) -> int:
+        """Tokens used by a session on this worker, as far as it is tracked."""
+        return self._sessions.get(session_id, 0)
+
+    def _exceeded(self, run: RunUsage, used: int, budget: int) -> None:
+        self._metrics.token_budget_exceeded.labels(run.agent).inc()
+        logger.warning(
+            "Token budget exceeded, stopping run",
+            extra={"session_id": run.session_id, "used": used, "budget": budget},
+        )
+        raise TokenBudgetExceededError(run.session_id, used, budget)
+
+    def start_run(self, agent: str, session_id: str) -> RunUsage | None:
+        """Open the accounting of a run, or return None when accounting is off.
+
+        Raises:
+            TokenBudgetExceededError: If the session has no budget left.
+        """
+        if not self.enabled:
+            return None
+        run = RunUsage(agent, session_id)
+        budget = self.config.session_budget_tokens
+        used = self.session_tokens(session_id)
+        if budget is not None and used >= budget:
+            self._exceeded(run, used, budget)
+        report_usage(run)
+        return run
+
+    def record(
+        self,
+        run: RunUsage,
+        message: Any,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Add the usage of one model response to the run.
+
+        Raises:
+            TokenBudgetExceededError: If the session went over its budget.
+        """
+        usage = message_usage(message)
+        if usage is None:
+            return
+        input_tokens, output_tokens, total_tokens = usage
+        run.input_tokens += input_tokens
+        run.output_tokens += output_tokens
+        run.total_tokens += total_tokens
+        run.llm_calls += 1
+
+        metrics = self._metrics
+        metrics.agent_tokens.labels(run.agent, "input").inc(input_tokens)
+        metrics.agent_tokens.labels(run.agent, "output").inc(output_tokens)
+        metrics.llm_calls.labels(run.agent).inc()
+        pricing = self.config.pricing.get(message_model(message, metadata) or "")
+        if pricing is not None:
+            cost = (
+                input_tokens * pricing.input_per_million
+                + output_tokens * pricing.output_per_million
+            ) / 1_000_000
+            run.cost_usd += cost
+            metrics.agent_cost.labels(run.agent).inc(cost)
+
+        used = self._sessions.pop(run.session_id, 0) + total_tokens
+        self._sessions[run.session_id] = used
+        metrics.session_tokens.labels(run.session_id).set(used)
+        while len(self._sessions) > self.config.max_sessions:
+            evicted, _ = self._sessions.popitem(last=False)
+            metrics.session_tokens.remove(evicted)
+        budget = self.config.session_budget_tokens
+        if budget is not None and used > budget:
+            self._exceeded(run, used, budget)
+
+
+class UsageCallback(BaseCallbackHandler):
+    """Callback handler accounting the model responses of one invoked run.
+
+    Errors are raised into the run, so exceeding the budget aborts it.
+    """
+
+    run_inline = True
+    raise_error = True
+
+    def __init__(self, tracker: UsageTracker, run: RunUsage) -> None:
+        """Account into `run`."""
+        self._tracker = tracker
+        self._run = run
+
+    def on_llm_end(
+        self,
+        response: LLMResult,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record the usage of every generated message."""
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None:
+                    self._tracker.record(self._run, message)
+
+
+usage_tracker = UsageTracker(engine_metrics)
+"""Process-wide usage tracker, fed by the agent adapters."""
@@ -0,0 +1,92 @@
+"""Shared fixtures: stand-in LangGraph agents written under `tmp_path`.
+
+Graphs share one `State` and its imports; a test supplies only its nodes
+(`body`) and the order they run in (`path`).
+"""
+
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+GRAPH_HEADER = """
+import asyncio
+import operator
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, StateGraph
+
+
+class State(TypedDict):
+    messages: Annotated[list, operator.add]
+"""
+
+ECHO_NODE = """
+def reply(state):
+    return {"messages": [("ai", f"echo: {state['messages'][-1]}")]}
+"""
+
+
+def graph_source(body: str = ECHO_NODE, path: Sequence[str] = ("reply",)) -> str:
+    """Source of a graph over the shared `State` running the nodes of `path` in turn."""
+    lines = [GRAPH_HEADER, body, "", "graph = StateGraph(State)"]
+    lines += [f'graph.add_node("{node}", {node})' for node in path]
+    lines.append(f'graph.set_entry_point("{path[0]}")')
+    lines += [
+        f'graph.add_edge("{a}", "{b}")' for a, b in zip(path, path[1:], strict=False)
+    ]
+    lines.append(f'graph.add_edge("{path[-1]}", END)')
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def write_graph(tmp_path: Path) -> Callable[..., str]:
+    """Write a graph module under `tmp_path` and return its `graph_definition`.
+
+    Takes the `body` and `path` of `graph_source`, or a whole module `source`.
+    """
+
+    def write(
+        body: str = ECHO_NODE,
+        path: Sequence[str] = ("reply",),
+        *,
+        source: str | None = None,
+        filename: str = "agent.py",
+        variable: str = "graph",
+    ) -> str:
+        graph_file = tmp_path / filename
+        graph_file.write_text(
+            source if source is not None else graph_source(body, path)
+        )
+        return f"{graph_file}:{variable}"
+
+    return write
+
+
+@pytest.fixture
+def agent_config(write_graph: Callable[..., str]) -> Callable[..., dict[str, Any]]:
+    """Build the `agent` block of an engine config serving a written graph.
+
+    Graph arguments are those of `write_graph`; other keywords are added to
+    the agent's `config`.
+    """
+
+    def build(
+        body: str = ECHO_NODE,
+        path: Sequence[str] = ("reply",),
+        *,
+        source: str | None = None,
+        name: str = "Test Agent",
+        **config: Any,
+    ) -> dict[str, Any]:
+        definition = write_graph(body, path, source=source)
+        return {
+            "type": "langgraph",
+            "config": {"name": name, "graph_definition": definition, **config},
+        }
+
+    return build
@@ -0,0 +1,156 @@
+"""Tests for the Google ADK adapter, served with the benchmarks' fake model."""
+
+import asyncio
+import json
+
+import aiosqlite
+import pytest
+from fastapi.testclient import TestClient
+from google.adk.events import Event, EventActions
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from idun_agent_engine.agent.adk import AdkAgent, SqliteSessionService
+from idun_agent_engine.bench.runner import ADK_AGENT_PATH
+from idun_agent_engine.core.app_factory import create_app
+
+AGENT_SOURCE = """
+from google.adk.agents import LlmAgent
+
+from idun_agent_engine.bench.fake_adk_model import FakeStreamingLlm
+
+
+def lookup(query: str) -> str:
+    \"\"\"Look the query up.\"\"\"
+    return "result for " + query
+
+
+root_agent = LlmAgent(
+    name="helper",
+    model=FakeStreamingLlm(reply="the answer is here", tool_calls=1),
+    tools=[lookup],
+)
+"""
+
+
+def _events(response) -> list[dict]:
+    return [
+        json.loads(line[len("data: ") :])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_failing_agent_module_raises_value_error(tmp_path) -> None:
+    """Any error raised by the agent module, a SyntaxError included, is wrapped."""
+    (tmp_path / "agent.py").write_text("root_agent = (\n")
+    config = {"agent_definition": f"{tmp_path / 'agent.py'}:root_agent"}
+    with pytest.raises(ValueError, match="Failed to load agent"):
+        asyncio.run(AdkAgent().initialize(config))
+
+
+def test_runs_are_streamed_token_by_token_with_tool_calls(tmp_path) -> None:
+    """Stream relays tool calls and results, then the reply as it is generated."""
+    (tmp_path / "agent.py").write_text(AGENT_SOURCE)
+    config = {
+        "type": "adk",
+        "config": {
+            "name": "Helper",
+            "agent_definition": f"{tmp_path}/agent.py:root_agent",
+        },
+    }
+    app = create_app(config_dict={"agent": config})
+    with TestClient(app) as client:
+        streamed = client.post("/agent/stream", json={"session_id": "s", "query": "q"})
+        invoked = client.post("/agent/invoke", json={"session_id": "s", "query": "q"})
+
+    events = _events(streamed)
+    types = [e["type"] for e in events]
+    assert types[:3] == ["RUN_STARTED", "STEP_STARTED", "TOOL_CALL_START"]
+    assert types[-2:] == ["STEP_FINISHED", "RUN_FINISHED"]
+    start = types.index("TOOL_CALL_START")
+    assert events[start]["tool_call_name"] == "lookup"
+    assert json.loads(events[start + 1]["delta"]) == {"query": "query 0"}
+    result = events[types.index("TOOL_CALL_RESULT")]
+    assert json.loads(result["content"]) == {"result": "result for query 0"}
+    # One delta per word, and the complete response is not repeated
+    assert [e["delta"] for e in events if e["type"] == "TEXT_MESSAGE_CONTENT"] == [
+        "the",
+        " answer",
+        " is",
+        " here",
+    ]
+    assert types.count("TEXT_MESSAGE_END") == 1
+    assert events[-1]["result"] == {"output": "the answer is here"}
+    assert invoked.json()["response"] == "the answer is here"
+
+
+def test_sqlite_sessions_outlive_the_agent(tmp_path, monkeypatch) -> None:
+    """Sessions kept in the SQLite store are found again by a new agent instance."""
+    monkeypatch.chdir(tmp_path)
+    config = {
+        "name": "Bench",
+        "agent_definition": f"{ADK_AGENT_PATH}:root_agent",
+        "session_store": {"type": "sqlite", "db_url": "sqlite:///sessions.db"},
+    }
+
+    async def scenario() -> None:
+        first = AdkAgent()
+        await first.initialize(config)
+        assert first.persistence_path == "sessions.db"
+        await first.invoke({"session_id": "kept", "query": "hello"})
+        await first.close()
+
+        second = AdkAgent()
+        await second.initialize(config)
+        sessions = second.session_service
+        session = await sessions.get_session(
+            app_name="Bench", user_id="idun", session_id="kept"
+        )
+        assert session is not None
+        assert [e.author for e in session.events] == ["user", "bench"]
+        assert session.events[0].content.parts[0].text == "hello"
+        # A second turn appends to the stored conversation
+        await second.invoke({"session_id": "kept", "query": "again"})
+        session = await sessions.get_session(
+            app_name="Bench", user_id="idun", session_id="kept"
+        )
+        assert len(session.events) == 4
+        listed = await sessions.list_sessions(app_name="Bench", user_id="idun")
+        assert [s.id for s in listed.sessions] == ["kept"]
+        await second.close()
+
+    asyncio.run(scenario())
+
+
+def test_session_store_scopes_state_and_limits_events(tmp_path) -> None:
+    """App and user state are shared across sessions; temp state is never stored."""
+
+    async def scenario() -> None:
+        async with aiosqlite.connect(tmp_path / "sessions.db") as conn:
+            store = SqliteSessionService(conn)
+            await store.setup()
+            key = {"app_name": "app", "user_id": "u"}
+            first = await store.create_session(**key, session_id="a")
+            for i in range(3):
+                delta = {"count": i, "app:version": i, "user:name": "ada", "temp:x": 1}
+                await store.append_event(
+                    first,
+                    Event(author="agent", actions=EventActions(state_delta=delta)),
+                )
+            await store.append_event(first, Event(author="agent", partial=True))
+
+            loaded = await store.get_session(**key, session_id="a")
+            assert loaded is not None and len(loaded.events) == 3
+            assert loaded.state == {"count": 2, "app:version": 2, "user:name": "ada"}
+            other = await store.create_session(**key, session_id="b")
+            assert other.state == {"app:version": 2, "user:name": "ada"}
+            recent = await store.get_session(
+                **key, session_id="a", config=GetSessionConfig(num_recent_events=1)
+            )
+            assert recent is not None
+            assert [e.id for e in recent.events] == [loaded.events[-1].id]
+
+            await store.delete_session(**key, session_id="a")
+            assert await store.get_session(**key, session_id="a") is None
+
+    asyncio.run(scenario())
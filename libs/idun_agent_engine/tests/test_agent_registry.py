@@ -0,0 +1,94 @@
+"""Tests for the entry-point based agent adapter registry."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from idun_agent_engine.agent import AgentRegistry, agent_registry
+from idun_agent_engine.agent.langgraph import LangGraphAgentConfig
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.core.engine_config import AgentConfig
+
+ADAPTER_SOURCE = """
+from idun_agent_engine.agent import BaseAgent, BaseAgentConfig
+
+
+class EchoConfig(BaseAgentConfig):
+    prefix: str
+
+
+class EchoAgent(BaseAgent[EchoConfig]):
+    config_model = EchoConfig
+
+    id = "echo"
+    agent_type = "Echo"
+    agent_instance = None
+    infos = {"status": "Initialized"}
+
+    async def initialize(self, config):
+        self._configuration = EchoConfig.model_validate(config)
+
+    async def invoke(self, message):
+        return self._configuration.prefix + message["query"]
+
+    async def stream(self, message):
+        yield await self.invoke(message)
+"""
+
+
+def install_adapter(root: Path) -> None:
+    """Install an `echo` adapter distribution under `root`."""
+    (root / "echo_adapter.py").write_text(ADAPTER_SOURCE)
+    dist_info = root / "echo_adapter-0.1.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: echo-adapter\nVersion: 0.1\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[idun_agent_engine.adapters]\necho = echo_adapter:EchoAgent\n"
+    )
+
+
+def test_entry_point_adapters_load_only_when_selected(
+    tmp_path: Path, monkeypatch
+) -> None:
+    """Installed adapters are listed without import and served once selected."""
+    install_adapter(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "echo_adapter", raising=False)
+    agent_registry.discover()
+
+    assert "echo" in agent_registry.names()
+    assert "echo_adapter" not in sys.modules
+
+    with pytest.raises(ValidationError, match="prefix"):
+        AgentConfig(type="echo", config={"name": "Echo"})
+    assert "echo_adapter" in sys.modules
+
+    app = create_app(
+        config_dict={"agent": {"type": "echo", "config": {"prefix": "> "}}}
+    )
+    with TestClient(app) as client:
+        resp = client.post("/agent/invoke", json={"session_id": "s1", "query": "hi"})
+        assert resp.json()["response"] == "> hi"
+
+
+def test_builtin_types_resolve_case_insensitively() -> None:
+    """Built-ins validate with their model; unknown types list what is available."""
+    config = AgentConfig(
+        type="LangGraph", config={"graph_definition": "agent.py:graph"}
+    )
+    assert isinstance(config.config, LangGraphAgentConfig)
+    assert config.model_dump()["config"]["graph_definition"] == "agent.py:graph"
+
+    with pytest.raises(ValidationError, match="Available types: .*langgraph"):
+        AgentConfig(type="autogen", config={})
+
+    registry = AgentRegistry(group=None)
+    with pytest.raises(ValueError, match="Unsupported agent type: langgraph"):
+        registry.agent_class("langgraph")
+    registry.register("custom", "idun_agent_engine.agent.crewai.crewai:CrewAIAgent")
+    assert registry.agent_class("CUSTOM").__name__ == "CrewAIAgent"
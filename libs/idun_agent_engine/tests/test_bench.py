@@ -0,0 +1,45 @@
+"""Tests for the observability overhead benchmark."""
+
+import asyncio
+
+import httpx
+
+from idun_agent_engine.bench import (
+    BenchmarkSettings,
+    StandInCollector,
+    format_results,
+    run_scenario,
+)
+from idun_agent_engine.bench.runner import percentile
+
+
+def test_stand_in_collector_answers_like_the_backends() -> None:
+    """Credential checks succeed and export requests are counted."""
+    with StandInCollector() as collector:
+        projects = httpx.get(f"{collector.url}/api/public/projects")
+        assert projects.json()["data"]
+        assert httpx.post(f"{collector.url}/v1/traces", content=b"x" * 10).is_success
+        assert collector.stats() == {"requests": 1, "bytes": 10}
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    """p50 and p99 pick existing samples."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_baseline_scenario_reports_every_mode() -> None:
+    """The no-observability scenario measures invoke and stream end to end."""
+    settings = BenchmarkSettings(requests=6, concurrency=2, warmup_requests=1)
+    result = asyncio.run(run_scenario("none", settings))
+
+    assert [mode.mode for mode in result.modes] == ["invoke", "stream"]
+    invoke, stream = result.modes
+    assert invoke.errors == stream.errors == 0
+    assert invoke.throughput_rps > 0
+    assert invoke.ttft_p50_ms is None
+    assert stream.ttft_p50_ms is not None
+    assert stream.ttft_p50_ms <= stream.latency_p99_ms
+    assert "none      stream" in format_results([result])
@@ -0,0 +1,55 @@
+"""Tests for the `idun bench` load-testing command."""
+
+import json
+
+import pytest
+
+from idun_agent_engine.bench import arrival_offsets, graphs
+from idun_agent_engine.cli.main import main
+
+
+def test_arrival_offsets_are_reproducible() -> None:
+    """Uniform arrivals are evenly spaced; Poisson ones depend only on the seed."""
+    assert arrival_offsets(4, 2.0, "uniform") == [0.0, 0.5, 1.0, 1.5]
+    poisson = arrival_offsets(200, 100.0, "poisson", seed=7)
+    assert poisson == arrival_offsets(200, 100.0, "poisson", seed=7)
+    assert poisson != arrival_offsets(200, 100.0, "poisson", seed=8)
+    assert 1.0 < poisson[-1] < 3.0
+
+
+def test_bench_command_reports_streaming_latencies(
+    tmp_path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The built-in engine runs tool rounds and streams tokens at a fixed pace."""
+    for name in (
+        graphs.TOKENS_ENV,
+        graphs.TOKEN_DELAY_ENV,
+        graphs.TOOL_CALLS_ENV,
+        graphs.TOOL_LATENCY_ENV,
+    ):
+        monkeypatch.delenv(name, raising=False)
+    output = tmp_path / "bench.json"
+
+    status = main(
+        [
+            "bench",
+            "--requests=6",
+            "--concurrency=2",
+            "--rate=50",
+            "--warmup-requests=1",
+            "--tokens=5",
+            "--token-delay-ms=2",
+            "--tool-calls=1",
+            "--tool-latency-ms=20",
+            f"--output={output}",
+        ]
+    )
+
+    assert status == 0
+    invoke, stream = json.loads(output.read_text())["results"]
+    assert invoke["errors"] == stream["errors"] == 0
+    assert invoke["ttft_ms"] is None
+    assert stream["ttft_ms"]["p50"] >= 20
+    assert stream["itl_ms"]["p50"] >= 1
+    assert stream["tokens_per_second"] > 0
+    assert "stream" in capsys.readouterr().out
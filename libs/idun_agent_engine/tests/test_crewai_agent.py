@@ -0,0 +1,171 @@
+"""Tests for the CrewAI adapter, with a stand-in crew."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.agent.crewai import CrewAIAgent, CrewRunError
+from idun_agent_engine.core.app_factory import create_app
+
+CREW_SOURCE = """
+import threading
+import time
+
+
+class Step:
+    def __init__(self, tool, tool_input):
+        self.tool = tool
+        self.tool_input = tool_input
+
+
+class Output:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+class Task:
+    def __init__(self, name):
+        self.name = name
+
+
+class Crew:
+    steps = 1
+    step_seconds = 0.0
+    finished = threading.Event()
+
+    def __init__(self):
+        self.tasks = [Task("research"), Task("write")]
+        self.step_callback = None
+        self.task_callback = None
+
+    def copy(self):
+        return Crew()
+
+    def kickoff(self, inputs):
+        Crew.finished.clear()
+        try:
+            for i in range(Crew.steps):
+                time.sleep(Crew.step_seconds)
+                self.step_callback(Step("search", {"q": inputs["query"], "i": i}))
+            self.task_callback(Output("notes on " + inputs["query"]))
+            self.task_callback(Output("answer to " + inputs["query"]))
+            return Output("answer to " + inputs["query"])
+        finally:
+            Crew.finished.set()
+
+
+crew = Crew()
+"""
+
+
+def _agent_config(tmp_path, **options) -> dict:
+    (tmp_path / "crew.py").write_text(CREW_SOURCE)
+    return {
+        "type": "crewai",
+        "config": {"crew_definition": f"{tmp_path / 'crew.py'}:crew", **options},
+    }
+
+
+def _events(response) -> list[dict]:
+    return [
+        json.loads(line[len("data: ") :])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_crew_runs_are_served_and_streamed(tmp_path) -> None:
+    """Invoke returns the crew output; stream relays steps, tools and task outputs."""
+    app = create_app(config_dict={"agent": _agent_config(tmp_path)})
+    with TestClient(app) as client:
+        invoked = client.post("/agent/invoke", json={"session_id": "s", "query": "q"})
+        streamed = client.post("/agent/stream", json={"session_id": "s", "query": "q"})
+
+    assert invoked.json()["response"] == "answer to q"
+    events = _events(streamed)
+    types = [e["type"] for e in events]
+    assert types[0] == "RUN_STARTED" and types[-1] == "RUN_FINISHED"
+    assert [e["step_name"] for e in events if e["type"] == "STEP_STARTED"] == [
+        "research",
+        "write",
+    ]
+    tool_start = types.index("TOOL_CALL_START")
+    assert events[tool_start]["tool_call_name"] == "search"
+    assert json.loads(events[tool_start + 1]["delta"]) == {"q": "q", "i": 0}
+    assert [e["delta"] for e in events if e["type"] == "TEXT_MESSAGE_CONTENT"] == [
+        "notes on q",
+        "answer to q",
+    ]
+    assert events[-1]["result"] == {"output": "answer to q"}
+
+
+def test_timed_out_crew_is_stopped_and_frees_its_worker(tmp_path) -> None:
+    """A run over time fails with a code and its crew stops at its next step."""
+    config = _agent_config(
+        tmp_path, max_workers=1, run_timeout_seconds=0.2, queue_timeout_seconds=5
+    )["config"]
+
+    async def scenario() -> None:
+        agent = CrewAIAgent()
+        await agent.initialize(config)
+        crew_class = type(agent.agent_instance)
+        crew_class.steps, crew_class.step_seconds = 100, 0.05
+        started = time.perf_counter()
+        events = [e async for e in agent.stream({"session_id": "a", "query": "q"})]
+        assert events[-1].type.value == "RUN_ERROR"
+        assert events[-1].code == "crew_timeout"
+        # Cancelled at its next step rather than after 100 of them
+        assert await asyncio.to_thread(crew_class.finished.wait, 1.0)
+        assert time.perf_counter() - started < 1.0
+
+        crew_class.steps, crew_class.step_seconds = 1, 0.0
+        assert await agent.invoke({"session_id": "b", "query": "q"}) == "answer to q"
+        await agent.close()
+
+    asyncio.run(scenario())
+
+
+def test_busy_pool_rejects_runs_after_the_queue_timeout(tmp_path) -> None:
+    """With every worker taken, a new run waits at most queue_timeout_seconds."""
+    config = _agent_config(
+        tmp_path, max_workers=1, queue_timeout_seconds=0.05, run_timeout_seconds=5
+    )["config"]
+
+    async def scenario() -> None:
+        agent = CrewAIAgent()
+        await agent.initialize(config)
+        crew_class = type(agent.agent_instance)
+        crew_class.steps, crew_class.step_seconds = 4, 0.05
+        slow = asyncio.create_task(agent.invoke({"session_id": "a", "query": "q"}))
+        await asyncio.sleep(0.02)
+        with pytest.raises(CrewRunError) as rejected:
+            await agent.invoke({"session_id": "b", "query": "q"})
+        assert rejected.value.code == "crew_busy"
+        assert await slow == "answer to q"
+        assert agent.infos["runs"] == {"active": 0, "queued": 0}
+        await agent.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    ("source", "error"),
+    [
+        ("crew = (\n", ValueError),
+        ("raise RuntimeError('no API key')\n", ValueError),
+        (
+            "class Crew:\n    def kickoff(self, inputs):\n        return None\n\n\n"
+            "crew = Crew()\n",
+            TypeError,
+        ),
+    ],
+)
+def test_unusable_crew_definitions_are_rejected(tmp_path, source, error) -> None:
+    """Failing modules raise ValueError; a crew without copy() is refused."""
+    (tmp_path / "crew.py").write_text(source)
+    config = {"crew_definition": f"{tmp_path / 'crew.py'}:crew"}
+    with pytest.raises(error):
+        asyncio.run(CrewAIAgent().initialize(config))
@@ -0,0 +1,85 @@
+"""Tests for the in-process sampling profiler."""
+
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.debug import SamplingProfiler, render_flamegraph, stage_of
+
+ECHO_NODE = """
+async def echo(state):
+    return {"messages": [("ai", "pong")]}
+"""
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """Burn CPU until told to stop."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_samples_busy_threads_into_collapsed_stacks() -> None:
+    """A spinning thread dominates its samples and its frames are named."""
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="spinner")
+    worker.start()
+    try:
+        result = asyncio.run(SamplingProfiler(rate_hz=200).profile(0.3))
+    finally:
+        stop.set()
+        worker.join()
+
+    assert result.samples > 10
+    spinner = [s for s in result.stacks if ";spinner;" in s]
+    assert spinner
+    assert all("test_debug_profiler:busy_loop" in s for s in spinner)
+    assert 0 < result.overhead < 1
+    line = result.collapsed().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_stages_follow_the_innermost_engine_frame() -> None:
+    """User code runs under the graph stage; engine hot paths get their own."""
+    graph_frames = ["langgraph.pregel:Pregel.astream", "graph:echo"]
+    assert stage_of(graph_frames) == "graph"
+    translate = [
+        "idun_agent_engine.agent.langgraph.langgraph:LanggraphAgent._translate_events"
+    ]
+    assert stage_of([*graph_frames, *translate]) == "translate"
+    assert stage_of(["selectors:EpollSelector.select"]) == "idle"
+    svg = render_flamegraph({"[graph];main;a;b": 3, "[idle];main;c": 1}, "t<1>")
+    assert svg.startswith("<svg") and "t&lt;1&gt;" in svg and "75.00%" in svg
+
+
+def test_profile_endpoint_is_guarded_and_renders(agent_config) -> None:
+    """The endpoint needs the admin token and returns collapsed stacks or SVG."""
+    app = create_app(
+        config_dict={
+            "server": {
+                "admin": {"token": "secret"},
+                "debug": {"profiler": {"enabled": True, "max_seconds": 0.3}},
+            },
+            "agent": agent_config(
+                ECHO_NODE,
+                ("echo",),
+                name="Profiled Agent",
+            ),
+        }
+    )
+    headers = {"Authorization": "Bearer secret"}
+    with TestClient(app) as client:
+        assert client.get("/debug/profile").status_code == 401
+
+        # Asking for more than max_seconds is capped
+        resp = client.get(
+            "/debug/profile?seconds=30&rate=100&tasks=true", headers=headers
+        )
+        assert resp.status_code == 200
+        assert int(resp.headers["X-Idun-Profile-Samples"]) > 5
+        assert ";task:" in resp.text
+
+        svg = client.get("/debug/profile?seconds=0.1&format=svg", headers=headers)
+        assert svg.headers["content-type"] == "image/svg+xml"
+        assert svg.text.startswith("<svg")
@@ -0,0 +1,93 @@
+"""Tests for engine-native OpenTelemetry spans."""
+
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.observability.model import EngineTracingConfig
+from idun_agent_engine.observability.tracing import EngineTracer
+
+CHAT_NODE = """
+async def chat(state):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="one two")]))
+    return {"messages": [await model.ainvoke(state["messages"])]}
+"""
+
+
+def test_disabled_tracer_is_a_shared_noop() -> None:
+    """Without configuration spans are a shared object that ignores everything."""
+    tracer = EngineTracer()
+    tracer.configure(EngineTracingConfig(enabled=False))
+    assert not tracer.enabled
+    with tracer.span("a", {"k": 1}) as span:
+        span.set_attribute("k", 2)
+    assert tracer.span("a") is tracer.span("b")
+    assert tracer.stats() == {"enabled": False}
+
+
+def test_requests_export_stage_spans_to_file(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """Invoke and stream record request, checkpoint, agent and SSE spans."""
+    monkeypatch.chdir(tmp_path)
+    spans_file = tmp_path / "spans.jsonl"
+    app = create_app(
+        config_dict={
+            "server": {
+                "tracing": {
+                    "enabled": True,
+                    "exporter": "file",
+                    "file_path": str(spans_file),
+                }
+            },
+            "agent": agent_config(
+                CHAT_NODE,
+                ("chat",),
+                name="Traced Agent",
+                checkpointer={
+                    "type": "sqlite",
+                    "db_url": "sqlite:///checkpoint.db",
+                },
+            ),
+        }
+    )
+    payload = {"session_id": "s1", "query": "hi"}
+
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).status_code == 200
+        with client.stream("POST", "/agent/stream", json=payload) as resp:
+            assert "RUN_FINISHED" in resp.read().decode()
+
+    spans = [json.loads(line) for line in spans_file.read_text().splitlines()]
+    by_name: dict[str, list[dict]] = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+
+    assert {
+        "POST /agent/invoke",
+        "POST /agent/stream",
+        "idun.request.prepare",
+        "idun.agent.invoke",
+        "idun.agent.stream",
+        "idun.sse.stream",
+        "idun.checkpoint.load",
+        "idun.checkpoint.save",
+    } <= by_name.keys()
+
+    (sse,) = by_name["idun.sse.stream"]
+    (agent_stream,) = by_name["idun.agent.stream"]
+    assert sse["attributes"]["idun.session_id"] == "s1"
+    assert sse["attributes"]["idun.run_id"] == agent_stream["attributes"]["idun.run_id"]
+    assert sse["attributes"]["idun.events.count"] > 0
+    assert agent_stream["attributes"]["idun.events.count"] == (
+        sse["attributes"]["idun.events.count"]
+    )
+    assert "idun.events.translate_ms" in agent_stream["attributes"]
+
+    # Stage spans nest under the request span of the same trace
+    (root,) = by_name["POST /agent/stream"]
+    assert agent_stream["parent_id"] == sse["context"]["span_id"]
+    assert sse["context"]["trace_id"] == root["context"]["trace_id"]
+    assert root["attributes"]["http.response.status_code"] == 200
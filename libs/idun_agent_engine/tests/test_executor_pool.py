@@ -0,0 +1,191 @@
+"""Tests for agent runs served by executor processes."""
+
+import asyncio
+import json
+import os
+import signal
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.bench import graphs
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.core.config_builder import ConfigBuilder
+from idun_agent_engine.core.engine_config import EngineConfig
+from idun_agent_engine.executor import ExecutorPoolError
+from idun_agent_engine.metrics import engine_metrics
+
+GRAPH = f"{graphs.__file__}:streaming_graph"
+
+
+def _config(**pool) -> dict:
+    return {
+        "server": {"executor_pool": {"enabled": True, "processes": 1, **pool}},
+        "agent": {
+            "type": "langgraph",
+            "config": {"name": "pooled", "graph_definition": GRAPH},
+        },
+    }
+
+
+def _event_types(response) -> list[str]:
+    return [
+        json.loads(line[len("data: ") :])["type"]
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+@pytest.fixture(autouse=True)
+def plain_replies(monkeypatch):
+    """Pin the stand-in model of the executors, which read it from their environment."""
+    monkeypatch.setenv(graphs.TOKENS_ENV, "10")
+    monkeypatch.setenv(graphs.TOKEN_DELAY_ENV, "0")
+    monkeypatch.setenv(graphs.TOOL_CALLS_ENV, "0")
+
+
+@pytest.fixture
+def slow_replies(monkeypatch):
+    """Make the stand-in model of the executors reply in about half a second."""
+    monkeypatch.setenv(graphs.TOKEN_DELAY_ENV, "50")
+
+
+def test_runs_are_relayed_as_served_in_process() -> None:
+    """Invoke and stream answer as the in-process agent, usage included."""
+    config = _config()
+    with TestClient(create_app(config_dict=config)) as client:
+        invoked = client.post("/agent/invoke", json={"session_id": "s", "query": "q"})
+        streamed = client.post("/agent/stream", json={"session_id": "t", "query": "q"})
+        infos = client.app.state.agent.infos
+    config["server"]["executor_pool"]["enabled"] = False
+    with TestClient(create_app(config_dict=config)) as client:
+        expected = client.post("/agent/stream", json={"session_id": "t", "query": "q"})
+
+    assert invoked.json()["response"].startswith("token0 token1")
+    assert invoked.json()["metadata"]["usage"]["llm_calls"] == 1
+    assert _event_types(streamed) == _event_types(expected)
+    assert infos["name"] == "pooled"
+    assert infos["executor_pool"]["processes"] == 1
+    assert infos["executor_pool"]["executors"][0]["ready"]
+
+
+def test_front_end_serves_the_metrics_recorded_by_executors(monkeypatch) -> None:
+    """Without a configured metrics directory the pool provisions a shared one."""
+    monkeypatch.delenv("IDUN_METRICS_DIR", raising=False)
+    config = _config()
+    config["server"]["metrics"] = {"flush_interval_seconds": 0.05}
+    calls = engine_metrics.llm_calls.labels("pooled")
+    sample = 'idun_agent_llm_calls_total{agent="pooled"}'
+
+    with TestClient(create_app(config_dict=config)) as client:
+        metrics_dir = client.app.state.pool_metrics_dir
+        expected = calls.value() + 1
+        client.post("/agent/invoke", json={"session_id": "s", "query": "q"})
+        deadline = time.monotonic() + 5
+        while f"{sample} {expected:g}" not in client.get("/metrics").text:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    assert not os.path.exists(metrics_dir)
+
+
+def test_crashed_executor_fails_its_runs_and_is_restarted(slow_replies) -> None:
+    """Runs of an executor that dies end with an error; a new one takes over."""
+    engine_config = EngineConfig.model_validate(
+        _config(restart_backoff_seconds=0, queue_timeout_seconds=30)
+    )
+
+    async def scenario() -> None:
+        agent = await ConfigBuilder.initialize_agent_from_config(engine_config)
+        try:
+            first = agent.pool.describe()["executors"][0]["pid"]
+            events = []
+            async for event in agent.stream({"session_id": "s", "query": "q"}):
+                events.append(event)
+                if len(events) == 1:
+                    os.kill(first, signal.SIGKILL)
+            assert events[0].type.value == "RUN_STARTED"
+            assert events[-1].type.value == "RUN_ERROR"
+            assert events[-1].code == "executor_crashed"
+
+            async with asyncio.timeout(5):
+                while agent.pool.describe()["executors"][0]["ready"]:
+                    await asyncio.sleep(0.01)
+            # Waits for the replacement executor
+            assert (await agent.invoke({"session_id": "s", "query": "q"})).startswith(
+                "token0"
+            )
+            executor = agent.pool.describe()["executors"][0]
+            assert executor["pid"] != first and executor["restarts"] == 1
+        finally:
+            await agent.close()
+
+    asyncio.run(scenario())
+
+
+def test_busy_pool_rejects_runs_after_the_queue_timeout(slow_replies) -> None:
+    """With every slot taken, a new run waits at most queue_timeout_seconds."""
+    engine_config = EngineConfig.model_validate(
+        _config(concurrency=1, queue_timeout_seconds=0.05)
+    )
+
+    async def scenario() -> None:
+        agent = await ConfigBuilder.initialize_agent_from_config(engine_config)
+        try:
+            slow = asyncio.create_task(agent.invoke({"session_id": "a", "query": "q"}))
+            await asyncio.sleep(0.1)
+            with pytest.raises(ExecutorPoolError) as rejected:
+                await agent.invoke({"session_id": "b", "query": "q"})
+            assert rejected.value.code == "executor_busy"
+            assert (await slow).startswith("token0")
+            assert agent.pool.describe()["active"] == 0
+        finally:
+            await agent.close()
+
+    asyncio.run(scenario())
+
+
+def test_budgeted_sessions_stay_on_their_executor(slow_replies) -> None:
+    """With a session budget, a session waits for its executor over a free one."""
+    config = _config(processes=2, concurrency=1, queue_timeout_seconds=0.05)
+    config["server"]["usage"] = {"session_budget_tokens": 1000}
+    engine_config = EngineConfig.model_validate(config)
+
+    async def scenario() -> None:
+        agent = await ConfigBuilder.initialize_agent_from_config(engine_config)
+        try:
+            assert agent.pool.describe()["strict_affinity"]
+            slow = asyncio.create_task(agent.invoke({"session_id": "s", "query": "q"}))
+            await asyncio.sleep(0.1)
+            with pytest.raises(ExecutorPoolError) as rejected:
+                await agent.invoke({"session_id": "s", "query": "q"})
+            assert rejected.value.code == "executor_busy"
+            assert (await slow).startswith("token0")
+        finally:
+            await agent.close()
+
+    asyncio.run(scenario())
+
+
+def test_retired_pool_stops_executors_once_their_runs_end(slow_replies) -> None:
+    """After a reload, idle executors stop at once and busy ones after their run."""
+    engine_config = EngineConfig.model_validate(_config(processes=2, concurrency=1))
+
+    async def scenario() -> None:
+        agent = await ConfigBuilder.initialize_agent_from_config(engine_config)
+        processes = [e.process for e in agent.pool._executors]
+        try:
+            slow = asyncio.create_task(agent.invoke({"session_id": "s", "query": "q"}))
+            await asyncio.sleep(0.1)
+            agent.retire()
+            async with asyncio.timeout(5):
+                while not any(p.returncode is not None for p in processes):
+                    await asyncio.sleep(0.01)
+            assert not slow.done()
+            assert (await slow).startswith("token0")
+            async with asyncio.timeout(5):
+                await asyncio.gather(*(p.wait() for p in processes))
+        finally:
+            await agent.close()
+
+    asyncio.run(scenario())
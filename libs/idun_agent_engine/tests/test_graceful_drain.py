@@ -0,0 +1,137 @@
+"""Tests for in-flight run tracking and graceful drain."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.server.runs import RunTracker
+
+
+def test_drain_waits_for_active_runs() -> None:
+    """Runs finishing within the timeout complete and nothing is cancelled."""
+
+    async def scenario():
+        tracker = RunTracker()
+
+        async def run():
+            async with tracker.track():
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(run())
+        await asyncio.sleep(0)
+        assert tracker.active_runs == 1
+        report = await tracker.drain(timeout=1.0)
+        await task
+        return tracker, report
+
+    tracker, report = asyncio.run(scenario())
+    assert not tracker.accepting
+    assert report.active_at_start == 1
+    assert report.completed == 1
+    assert report.forced_cancellations == 0
+
+
+def test_drain_cancels_runs_after_timeout() -> None:
+    """Runs still active after the drain timeout are cancelled and counted."""
+
+    async def scenario():
+        tracker = RunTracker()
+
+        async def run():
+            async with tracker.track():
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(run())
+        await asyncio.sleep(0)
+        report = await tracker.drain(timeout=0.05)
+        assert task.cancelled()
+        return report
+
+    report = asyncio.run(scenario())
+    assert report.forced_cancellations == 1
+    assert report.completed == 0
+
+
+def test_drain_counts_runs_that_absorb_the_cancellation() -> None:
+    """A cancelled run ending in an error is still counted, once per drain."""
+
+    async def scenario():
+        tracker = RunTracker()
+
+        async def run():
+            async with tracker.track():
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    return "RUN_ERROR"
+
+        task = asyncio.create_task(run())
+        await asyncio.sleep(0)
+        report = await tracker.drain(timeout=0.05)
+        assert await task == "RUN_ERROR"
+        return report, await tracker.drain(timeout=0.05)
+
+    report, again = asyncio.run(scenario())
+    assert (report.forced_cancellations, report.completed) == (1, 0)
+    assert (again.active_at_start, again.forced_cancellations) == (0, 0)
+
+
+def test_drain_waits_for_runs_admitted_before_they_start() -> None:
+    """An admitted stream counts from admission and is tracked once it starts."""
+
+    async def scenario():
+        tracker = RunTracker()
+        started, unstarted = tracker.admit(), tracker.admit()
+
+        async def run():
+            await asyncio.sleep(0.05)
+            async with tracker.track(started):
+                tracker.withdraw(started)
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(run())
+        asyncio.get_running_loop().call_later(0.02, tracker.withdraw, unstarted)
+        assert tracker.active_runs == 2
+        report = await tracker.drain(timeout=1.0)
+        assert task.done()
+        return report
+
+    report = asyncio.run(scenario())
+    assert (report.active_at_start, report.completed) == (2, 2)
+    assert report.forced_cancellations == 0
+
+
+def test_new_runs_rejected_while_draining(tmp_path) -> None:
+    """Agent routes answer 503 once the tracker stops accepting runs."""
+    app = create_app(
+        config_dict={
+            "agent": {
+                "type": "langgraph",
+                "config": {
+                    "name": "Draining Agent",
+                    "graph_definition": str(tmp_path / "agent.py:graph"),
+                },
+            },
+        }
+    )
+    app.state.run_tracker.stop_accepting()
+    client = TestClient(app)
+
+    for route in ("/agent/invoke", "/agent/stream"):
+        resp = client.post(route, json={"session_id": "s1", "query": "hi"})
+        assert resp.status_code == 503
+
+
+def test_streamed_runs_leave_the_tracker(agent_config) -> None:
+    """A stream's admission ends with its response, replayed or not."""
+    app = create_app(config_dict={"agent": agent_config()})
+    payload = {"session_id": "s1", "query": "hi"}
+    with TestClient(app) as client:
+        for _ in range(2):
+            resp = client.post(
+                "/agent/stream", json=payload, headers={"Idempotency-Key": "k1"}
+            )
+            assert resp.status_code == 200
+        assert client.post("/agent/stream", json=payload).status_code == 200
+        assert app.state.run_tracker.active_runs == 0
@@ -0,0 +1,100 @@
+"""Tests for the process-wide compiled graph cache."""
+
+import asyncio
+from pathlib import Path
+
+from idun_agent_engine.agent.langgraph import (
+    LanggraphAgent,
+    graph_cache,
+    source_fingerprint,
+)
+from idun_agent_engine.agent.langgraph.graph_cache import local_sources
+
+GRAPH_SOURCE = """
+import operator
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, StateGraph
+
+from cached_helpers import reply
+
+with open(Path(__file__).with_name("loads.txt"), "a") as f:
+    f.write("loaded\\n")
+
+
+class State(TypedDict):
+    messages: Annotated[list, operator.add]
+
+
+graph = StateGraph(State)
+graph.add_node("reply", reply)
+graph.set_entry_point("reply")
+graph.add_edge("reply", END)
+"""
+
+HELPER_SOURCE = """
+from cached_helpers.text import PONG
+
+
+async def reply(state):
+    return {"messages": [("ai", PONG)]}
+"""
+
+
+def _write_project(root: Path, write_graph) -> Path:
+    """Write the graph module and its local helper package under `root`."""
+    (root / "cached_helpers").mkdir()
+    (root / "cached_helpers" / "__init__.py").write_text(HELPER_SOURCE)
+    (root / "cached_helpers" / "text.py").write_text('PONG = "pong"\n')
+    (root / "unrelated.py").write_text("X = 1\n")
+    return Path(write_graph(source=GRAPH_SOURCE).rpartition(":")[0])
+
+
+def test_fingerprint_covers_local_imports_only(tmp_path: Path, write_graph) -> None:
+    """Editing an imported local module changes the fingerprint, others do not."""
+    graph_file = _write_project(tmp_path, write_graph)
+    assert {p.relative_to(tmp_path).as_posix() for p in local_sources(graph_file)} == {
+        "agent.py",
+        "cached_helpers/__init__.py",
+        "cached_helpers/text.py",
+    }
+    before = source_fingerprint(graph_file)
+    (tmp_path / "unrelated.py").write_text("X = 2\n")
+    assert source_fingerprint(graph_file) == before
+    (tmp_path / "cached_helpers" / "text.py").write_text('PONG = "pang"\n')
+    assert source_fingerprint(graph_file) != before
+
+
+def test_unchanged_graph_is_loaded_and_compiled_once(
+    tmp_path: Path, monkeypatch, write_graph
+) -> None:
+    """A second agent on the same sources reuses the module and compiled graph."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    graph_file = _write_project(tmp_path, write_graph)
+    config = {"name": "Cached", "graph_definition": f"{graph_file}:graph"}
+    graph_cache.clear()
+
+    async def initialize(**overrides) -> LanggraphAgent:
+        agent = LanggraphAgent()
+        await agent.initialize({**config, **overrides})
+        return agent
+
+    first = asyncio.run(initialize())
+    second = asyncio.run(initialize())
+    assert first.infos["graph_load"]["cache"] == "miss"
+    assert second.infos["graph_load"]["cache"] == "hit"
+    assert second.infos["graph_load"]["compiled_from_cache"]
+    assert second.agent_instance is first.agent_instance
+    assert (tmp_path / "loads.txt").read_text().count("loaded") == 1
+
+    uncached = asyncio.run(initialize(cache_graph=False))
+    assert uncached.infos["graph_load"]["cache"] == "disabled"
+    assert uncached.agent_instance is not first.agent_instance
+
+    (tmp_path / "cached_helpers" / "text.py").write_text('PONG = "pang"\n')
+    edited = asyncio.run(initialize())
+    assert edited.infos["graph_load"]["cache"] == "miss"
+    assert edited.fingerprint != first.fingerprint
+    assert (tmp_path / "loads.txt").read_text().count("loaded") == 3
+    graph_cache.clear()
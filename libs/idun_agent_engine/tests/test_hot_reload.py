@@ -0,0 +1,168 @@
+"""Tests for hot reloading the agent through the admin endpoint."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import yaml
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.server.reloader import AgentReloader
+from idun_agent_engine.server.runs import AgentLeases
+
+REPLY_NODE = """
+def reply(state):
+    return {{"messages": [("ai", "{prefix}")]}}
+"""
+
+
+def _write_project(
+    tmp_path: Path, agent_config, prefix: str, admin_token: str | None
+) -> Path:
+    """Write a graph file and a config file pointing at it; return the config path."""
+    config = {
+        "server": {"admin": {"token": admin_token}},
+        "agent": agent_config(
+            REPLY_NODE.format(prefix=prefix),
+            name="Reloadable Agent",
+            checkpointer={"type": "sqlite", "db_url": "sqlite:///checkpoint.db"},
+        ),
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return config_path
+
+
+def test_reload_swaps_agent_and_shares_checkpointer(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """A reload picks up graph changes and keeps the same SQLite connection."""
+    monkeypatch.chdir(tmp_path)
+    config_path = _write_project(tmp_path, agent_config, "v1", admin_token="secret")
+    app = create_app(config_path=str(config_path))
+    headers = {"Authorization": "Bearer secret"}
+    payload = {"session_id": "s1", "query": "hi"}
+
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).json()["response"] == "v1"
+        old_agent = app.state.agent
+        connection = old_agent._connection
+
+        _write_project(tmp_path, agent_config, "v2", admin_token="secret")
+        resp = client.post("/admin/reload", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["previous_agent_id"] == old_agent.id
+
+        new_agent = app.state.agent
+        assert new_agent is not old_agent
+        assert new_agent._connection is connection
+        assert old_agent._connection is None
+        assert client.post("/agent/invoke", json=payload).json()["response"] == "v2"
+
+
+def test_failed_reload_leaves_the_connection_with_the_serving_agent(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """A graph that fails to load does not take the shared connection away."""
+    monkeypatch.chdir(tmp_path)
+    config_path = _write_project(tmp_path, agent_config, "v1", admin_token="secret")
+    app = create_app(config_path=str(config_path))
+    payload = {"session_id": "s1", "query": "hi"}
+
+    with TestClient(app) as client:
+        agent = app.state.agent
+        connection = agent._connection
+        _write_project(tmp_path, agent_config, "v2", admin_token="secret")
+        (tmp_path / "agent.py").write_text("graph = undefined_name\n")
+        resp = client.post("/admin/reload", headers={"Authorization": "Bearer secret"})
+        assert resp.status_code == 500
+
+        assert app.state.agent is agent
+        assert agent._connection is connection
+        assert client.post("/agent/invoke", json=payload).json()["response"] == "v1"
+
+
+HELPER_NODE = """
+from reply_text import TEXT
+
+def reply(state):
+    return {"messages": [("ai", TEXT)]}
+"""
+
+
+def test_reload_reimports_edited_helper_modules(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """Helper modules of the graph are watched and re-imported on reload."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "reply_text", raising=False)
+    (tmp_path / "reply_text.py").write_text('TEXT = "v1"\n')
+    config = {
+        "server": {"admin": {"token": "secret"}},
+        "agent": agent_config(HELPER_NODE, name="Helper Agent"),
+    }
+    app = create_app(config_dict=config)
+    payload = {"session_id": "s1", "query": "hi"}
+
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).json()["response"] == "v1"
+        watched = AgentReloader(app).watched_paths()
+        assert tmp_path / "reply_text.py" in watched
+
+        (tmp_path / "reply_text.py").write_text('TEXT = "v2"\n')
+        resp = client.post("/admin/reload", headers={"Authorization": "Bearer secret"})
+        assert resp.status_code == 200
+        assert client.post("/agent/invoke", json=payload).json()["response"] == "v2"
+
+
+def test_admin_endpoints_require_token(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """Admin routes are disabled without a token and reject a wrong one."""
+    monkeypatch.delenv("IDUN_ADMIN_TOKEN", raising=False)
+    config_path = _write_project(tmp_path, agent_config, "v1", admin_token=None)
+    client = TestClient(create_app(config_path=str(config_path)))
+    assert client.post("/admin/reload").status_code == 403
+
+    config_path = _write_project(tmp_path, agent_config, "v1", admin_token="secret")
+    client = TestClient(create_app(config_path=str(config_path)))
+    resp = client.post("/admin/reload", headers={"Authorization": "Bearer nope"})
+    assert resp.status_code == 401
+
+
+def test_replaced_agent_is_closed_once_its_leases_are_released() -> None:
+    """A request that resolved the old agent before the swap finishes on it."""
+
+    class Replaced:
+        retired = closed = False
+
+        def retire(self) -> None:
+            self.retired = True
+
+        async def close(self) -> None:
+            self.closed = True
+
+    async def scenario() -> None:
+        leases, previous = AgentLeases(), Replaced()
+        release = leases.acquire(previous)
+        retiring = asyncio.create_task(AgentReloader._retire(previous, leases))
+        await asyncio.sleep(0.05)
+        assert not previous.retired and not previous.closed
+        release()
+        release()
+        await asyncio.wait_for(retiring, 1)
+        assert previous.retired and previous.closed
+        assert leases.count(previous) == 0
+
+    asyncio.run(scenario())
+
+
+def test_requests_release_their_agent_lease(agent_config) -> None:
+    """Invoke and stream hold the agent only while they are being served."""
+    app = create_app(config_dict={"agent": agent_config()})
+    payload = {"session_id": "s1", "query": "hi"}
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).status_code == 200
+        assert client.post("/agent/stream", json=payload).status_code == 200
+        assert app.state.agent_leases.count(app.state.agent) == 0
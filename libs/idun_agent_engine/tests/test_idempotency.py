@@ -0,0 +1,154 @@
+"""Tests for Idempotency-Key handling on agent runs."""
+
+import asyncio
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.server.idempotency import (
+    IdempotencyManager,
+    InMemoryIdempotencyStore,
+    SqliteIdempotencyStore,
+)
+from idun_agent_engine.server.server_config import IdempotencyConfig
+
+REPLY_NODE = """
+def reply(state):
+    return {"messages": [("ai", f"turn {len(state['messages'])}")]}
+"""
+
+
+async def _collect(chunks) -> list[str]:
+    """Drain an async iterator of chunks into a list."""
+    return [chunk async for chunk in chunks]
+
+
+def test_invoke_replays_result_for_repeated_key(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """A retried invoke returns the stored answer without adding a turn."""
+    monkeypatch.chdir(tmp_path)
+    app = create_app(
+        config_dict={
+            "agent": agent_config(
+                REPLY_NODE,
+                name="Idempotent Agent",
+                checkpointer={
+                    "type": "sqlite",
+                    "db_url": "sqlite:///checkpoint.db",
+                },
+            ),
+        }
+    )
+    payload = {"session_id": "s1", "query": "hi"}
+    headers = {"Idempotency-Key": "retry-1"}
+
+    with TestClient(app) as client:
+        first = client.post("/agent/invoke", json=payload, headers=headers)
+        retry = client.post("/agent/invoke", json=payload, headers=headers)
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        assert isinstance(app.state.idempotency.store, SqliteIdempotencyStore)
+
+        conflict = client.post(
+            "/agent/invoke", json={**payload, "query": "other"}, headers=headers
+        )
+        assert conflict.status_code == 422
+
+        # Only one turn was recorded, so the next run sees a single prior exchange
+        fresh = client.post("/agent/invoke", json=payload)
+        assert fresh.json()["response"] != first.json()["response"]
+        assert fresh.json()["response"] == "turn 3"
+
+
+def test_follower_attaches_to_running_stream() -> None:
+    """A repeat of an in-progress key receives every chunk of the single run."""
+    manager = IdempotencyManager(InMemoryIdempotencyStore(IdempotencyConfig()))
+    runs = 0
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def produce():
+            nonlocal runs
+            runs += 1
+            yield "a"
+            await release.wait()
+            yield "b"
+
+        replayed, owner = await manager.execute("k", "h", produce)
+        assert not replayed
+        owner_task = asyncio.create_task(_collect(owner))
+        await asyncio.sleep(0)
+
+        replayed, follower = await manager.execute("k", "h", produce)
+        assert replayed
+        follower_task = asyncio.create_task(_collect(follower))
+        release.set()
+        assert await owner_task == ["a", "b"]
+        assert await follower_task == ["a", "b"]
+
+        replayed, again = await manager.execute("k", "h", produce)
+        assert replayed and await _collect(again) == ["a", "b"]
+
+    asyncio.run(scenario())
+    assert runs == 1
+
+
+def test_other_worker_waits_for_completion(tmp_path: Path) -> None:
+    """Managers sharing the SQLite file wait for the owner instead of rerunning."""
+    config = IdempotencyConfig(poll_interval_seconds=0.01)
+    db_path = str(tmp_path / "checkpoint.db")
+
+    async def scenario() -> None:
+        worker_a = IdempotencyManager(SqliteIdempotencyStore(config, db_path))
+        worker_b = IdempotencyManager(SqliteIdempotencyStore(config, db_path))
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            yield "done"
+
+        async def never():
+            raise AssertionError("the second worker must not run the agent")
+            yield ""
+
+        _, owner = await worker_a.execute("k", "h", slow)
+        replayed, waiter = await worker_b.execute("k", "h", never)
+        assert replayed
+        waiter_task = asyncio.create_task(_collect(waiter))
+        release.set()
+        assert await _collect(owner) == ["done"]
+        assert await waiter_task == ["done"]
+        await worker_a.close()
+        await worker_b.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_run_releases_key() -> None:
+    """A failure is reported to the caller and the key can be retried."""
+    manager = IdempotencyManager(InMemoryIdempotencyStore(IdempotencyConfig()))
+
+    async def scenario() -> None:
+        async def failing():
+            raise RuntimeError("boom")
+            yield ""
+
+        async def working():
+            yield "ok"
+
+        _, chunks = await manager.execute("k", "h", failing)
+        try:
+            await _collect(chunks)
+        except RuntimeError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("the failure should propagate")
+
+        replayed, chunks = await manager.execute("k", "h", working)
+        assert not replayed and await _collect(chunks) == ["ok"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+"""Tests for the engine's structured logging."""
+
+import json
+import logging
+import time
+
+import pytest
+
+from idun_agent_engine.core.engine_config import EngineConfig
+from idun_agent_engine.log import (
+    LoggingConfig,
+    configure_logging,
+    log_context,
+    redact,
+    shutdown_logging,
+)
+
+logger = logging.getLogger("idun_agent_engine.tests")
+
+
+def _records(capsys: pytest.CaptureFixture[str]) -> list[dict]:
+    """Flush the writer thread and decode every JSON line written to stdout."""
+    shutdown_logging()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_records_are_json_with_context_fields(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Context and extra fields become top-level keys; tracebacks are kept."""
+    configure_logging(LoggingConfig(level="DEBUG"))
+    with log_context(session_id="s1", run_id="run_1"):
+        logger.info("hello %s", "world", extra={"tokens": 3})
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed")
+    logger.debug("outside")
+
+    hello, failed, outside = _records(capsys)
+    assert hello["message"] == "hello world"
+    assert hello["level"] == "INFO"
+    assert (hello["session_id"], hello["run_id"], hello["tokens"]) == ("s1", "run_1", 3)
+    assert "RuntimeError: boom" in failed["exception"]
+    assert "session_id" not in outside
+
+
+def test_repeated_warnings_are_rate_limited(capsys: pytest.CaptureFixture[str]) -> None:
+    """Repeats over the burst are dropped and counted on the next record."""
+    configure_logging(
+        LoggingConfig(rate_limit_burst=2, rate_limit_interval_seconds=0.2)
+    )
+    for attempt in range(5):
+        logger.warning("backend unreachable (attempt %d)", attempt)
+    logger.info("info is never limited")
+    time.sleep(0.25)
+    logger.warning("backend unreachable (attempt %d)", 5)
+
+    records = _records(capsys)
+    warnings = [r for r in records if r["level"] == "WARNING"]
+    assert [w["message"][-2] for w in warnings] == ["0", "1", "5"]
+    assert warnings[-1]["suppressed"] == 3
+    assert any(r["message"] == "info is never limited" for r in records)
+
+
+def test_config_dumps_redact_secrets() -> None:
+    """Credentials are masked wherever they appear in the configuration."""
+    config = EngineConfig.model_validate(
+        {
+            "server": {"admin": {"token": "admin-secret"}},
+            "agent": {
+                "type": "langgraph",
+                "config": {
+                    "name": "Agent",
+                    "graph_definition": "agent.py:graph",
+                    "observability": {
+                        "provider": "langfuse",
+                        "options": {"public_key": "pk", "secret_key": "sk"},
+                    },
+                },
+            },
+        }
+    )
+    dumped = json.dumps(redact(config))
+    assert "admin-secret" not in dumped
+    assert '"secret_key": "***"' in dumped
+    assert '"public_key": "pk"' in dumped
@@ -0,0 +1,95 @@
+"""Tests for the event-loop lag monitor and blocking-call detector."""
+
+import asyncio
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.debug import LoopWatchdog, LoopWatchdogConfig
+
+FETCH_NODE = """
+async def fetch(state):
+    time.sleep(0.3)  # a synchronous call inside an async node
+    return {"messages": [("ai", "done")]}
+"""
+
+
+def stuck() -> None:
+    """Block the calling thread."""
+    time.sleep(0.3)
+
+
+def test_watchdog_captures_the_blocking_frame_and_sheds() -> None:
+    """A blocked loop is recorded with its culprit and raises the shed signal."""
+    watchdog = LoopWatchdog()
+    watchdog.configure(
+        LoopWatchdogConfig(
+            interval_seconds=0.02, block_threshold_seconds=0.1, shed_lag_seconds=0.05
+        )
+    )
+
+    async def scenario() -> None:
+        await watchdog.start()
+        await asyncio.sleep(0.05)
+        assert not watchdog.should_shed()
+        stuck()
+        await asyncio.sleep(0.001)
+        assert watchdog.should_shed()
+        await watchdog.stop()
+
+    asyncio.run(scenario())
+    (capture,) = watchdog.blocked()
+    assert capture["function"] == "stuck"
+    assert capture["file"] == __file__
+    assert capture["blocked_ms"] >= 250
+    assert capture["node"] is None
+    assert not watchdog.running and not watchdog.should_shed()
+
+
+def test_loop_endpoint_points_to_the_offending_node(
+    tmp_path: Path, agent_config
+) -> None:
+    """Sync code in a graph node is reported with its node, file and line."""
+    app = create_app(
+        config_dict={
+            "server": {
+                "admin": {"token": "secret"},
+                "debug": {
+                    "loop_watchdog": {
+                        "interval_seconds": 0.02,
+                        "block_threshold_seconds": 0.1,
+                    }
+                },
+            },
+            "agent": agent_config(
+                FETCH_NODE,
+                ("fetch",),
+                name="Blocking Agent",
+            ),
+        }
+    )
+    headers = {"Authorization": "Bearer secret"}
+    with TestClient(app) as client:
+        payload = {"session_id": "s1", "query": "hi"}
+        assert client.post("/agent/invoke", json=payload).status_code == 200
+
+        deadline = time.monotonic() + 5
+        while not (report := client.get("/debug/loop", headers=headers).json())[
+            "blocked"
+        ]:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+
+        (capture,) = report["blocked"]
+        assert capture["node"] == "fetch"
+        assert capture["file"] == str(tmp_path / "agent.py")
+        source = (tmp_path / "agent.py").read_text().splitlines()
+        line = next(i for i, text in enumerate(source, 1) if "time.sleep" in text)
+        assert (capture["function"], capture["line"]) == ("fetch", line)
+        assert report["max_lag_ms"] >= 250
+
+        metrics = client.get("/metrics").text
+        assert 'idun_event_loop_blocked_total{node="fetch"} 1' in metrics
+        assert "idun_event_loop_lag_seconds_count" in metrics
@@ -0,0 +1,129 @@
+"""Tests for the metrics registry and the /metrics endpoint."""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.metrics import (
+    MetricsRegistry,
+    MultiprocessCollector,
+    render_text,
+)
+
+CHAT_NODE = """
+async def chat(state):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="one two three")]))
+    return {"messages": [await model.ainvoke(state["messages"])]}
+"""
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Bucket lines are cumulative and end with +Inf, sum and count."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), (0.1, 1))
+    latency.labels("/a").observe(0.05)
+    latency.labels("/a").observe(0.5)
+    latency.labels("/a").observe(5)
+    registry.counter("calls_total", "Calls.").inc(2)
+
+    text = render_text(registry.snapshot())
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert "# TYPE calls_total counter\ncalls_total 2" in text
+
+
+def test_updates_from_several_threads_are_not_lost() -> None:
+    """Children are created once and counted exactly under concurrent updates."""
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ("worker",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("worker",))
+
+    def work() -> None:
+        for _ in range(10_000):
+            calls.labels("w").inc()
+            latency.labels("w").observe(0.2)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls.labels("w").value() == 80_000
+    assert latency.labels("w").value()[2] == 80_000
+
+
+def test_collector_merges_workers_and_drops_dead_gauges(tmp_path: Path) -> None:
+    """Counters of every worker are summed; gauges only count live workers."""
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs.").inc(3)
+    registry.gauge("in_flight", "In flight.").set(2)
+    collector = MultiprocessCollector(registry, str(tmp_path))
+
+    # Snapshot left behind by a worker that has exited
+    dead_pid = 2**22 + 1
+    assert dead_pid != os.getpid()
+    dead = tmp_path / f"metrics-{dead_pid}-1.json"
+    dead.write_text(json.dumps(registry.snapshot()))
+
+    text = render_text(collector.collect())
+    assert "runs_total 6" in text
+    assert "in_flight 2" in text
+
+
+def test_collector_folds_exited_workers_into_one_file(tmp_path: Path) -> None:
+    """Exited snapshots, even under a reused pid, are folded in and kept once."""
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs.").inc(3)
+    collector = MultiprocessCollector(registry, str(tmp_path))
+
+    # Written by earlier processes: one exited, one whose pid is now ours
+    for name in (f"metrics-{2**22 + 1}-1.json", f"metrics-{os.getpid()}-0.json"):
+        (tmp_path / name).write_text(json.dumps(registry.snapshot()))
+
+    for _ in range(2):
+        assert "runs_total 9" in render_text(collector.collect())
+    snapshots = sorted(path.name for path in tmp_path.glob("*.json"))
+    assert snapshots == ["exited.json", collector._path.name]
+
+
+def test_metrics_endpoint_reports_runs(agent_config) -> None:
+    """Invoke and stream runs show up in the request, run and token metrics."""
+    app = create_app(
+        config_dict={
+            "agent": agent_config(
+                CHAT_NODE,
+                ("chat",),
+                name="Measured Agent",
+            ),
+        }
+    )
+    payload = {"session_id": "s1", "query": "hi"}
+
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).status_code == 200
+        with client.stream("POST", "/agent/stream", json=payload) as resp:
+            assert "RUN_FINISHED" in resp.read().decode()
+
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        text = resp.text
+
+    assert 'route="/agent/invoke",status="200"' in text
+    assert (
+        'idun_agent_run_duration_seconds_count{mode="stream",outcome="success"}' in text
+    )
+    assert 'idun_agent_events_total{type="RUN_FINISHED"}' in text
+    count_line = next(
+        line
+        for line in text.splitlines()
+        if line.startswith("idun_agent_time_to_first_token_seconds_count")
+    )
+    assert int(count_line.split()[-1]) >= 1
+    assert "idun_agent_runs_in_flight 0" in text
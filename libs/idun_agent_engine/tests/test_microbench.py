@@ -0,0 +1,61 @@
+"""Tests for the hot-path micro-benchmarks."""
+
+import pytest
+
+from idun_agent_engine.bench.micro import (
+    CASES,
+    MicroResult,
+    compare,
+    format_micro_results,
+    load_baseline,
+    run_micro_sync,
+    save_baseline,
+)
+from idun_agent_engine.cli.main import main
+
+
+def test_every_case_runs() -> None:
+    """Each case sets up offline and reports a positive time per operation."""
+    results = run_micro_sync(repeats=1, target_seconds=0.001)
+
+    assert [r.name for r in results] == list(CASES)
+    assert all(r.median_us > 0 and r.number >= 1 for r in results)
+
+
+def test_baseline_flags_only_regressions_beyond_tolerance(tmp_path) -> None:
+    """A saved baseline round-trips and slowdowns over the tolerance are flagged."""
+    path = tmp_path / "baseline.json"
+    save_baseline(
+        [
+            MicroResult("fast", 10, 5, 100.0, 90.0),
+            MicroResult("slow", 10, 5, 100.0, 90.0),
+        ],
+        path,
+    )
+    baseline = load_baseline(path)
+    current = [
+        MicroResult("fast", 10, 5, 120.0, 110.0),
+        MicroResult("slow", 10, 5, 150.0, 140.0),
+        MicroResult("new", 10, 5, 1.0, 1.0),
+    ]
+
+    regressions = compare(current, baseline, tolerance=0.25)
+
+    assert [(r.name, r.ratio) for r in regressions] == [("slow", 1.5)]
+    assert "+20.0%" in format_micro_results(current, baseline)
+
+
+def test_microbench_command_fails_on_regression(
+    tmp_path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The command exits non-zero when a case is slower than its baseline."""
+    path = tmp_path / "baseline.json"
+    save_baseline([MicroResult("config_validate", 1, 1, 0.001, 0.001)], path)
+
+    status = main(
+        ["microbench", "config_validate", "--repeats=1", "--target-seconds=0.001"]
+        + [f"--baseline={path}"]
+    )
+
+    assert status == 1
+    assert "REGRESSION config_validate" in capsys.readouterr().out
@@ -0,0 +1,143 @@
+"""Tests for the dedicated executors of synchronous and CPU-bound nodes."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from idun_agent_engine.agent.langgraph import LanggraphAgent, NodeExecutor
+from idun_agent_engine.metrics import engine_metrics
+
+GRAPH_SOURCE = """
+import operator
+import os
+import threading
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, StateGraph, add_messages
+
+from idun_agent_engine.agent.langgraph import cpu_bound
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+    where: Annotated[list, operator.add]
+
+
+def parse(state):
+    return {"where": [f"parse:{threading.current_thread().name}"]}
+
+
+@cpu_bound
+def count_words(state):
+    words = sum(len(str(m.content).split()) for m in state["messages"])
+    return {"where": [f"count_words:{os.getpid()}"], "messages": [("ai", str(words))]}
+
+
+def closure_node():
+    def inner(state):
+        return {}
+
+    return inner
+
+
+graph = StateGraph(State)
+graph.add_node("parse", parse)
+graph.add_node("count_words", count_words)
+graph.set_entry_point("parse")
+graph.add_edge("parse", "count_words")
+graph.add_edge("count_words", END)
+
+bad_graph = StateGraph(State)
+bad_graph.add_node("inner", closure_node())
+bad_graph.set_entry_point("inner")
+bad_graph.add_edge("inner", END)
+"""
+
+
+def _config(write_graph, variable="graph", **executors) -> dict:
+    return {
+        "name": "Executors",
+        "graph_definition": write_graph(
+            source=GRAPH_SOURCE, filename="executor_graph.py", variable=variable
+        ),
+        "cache_graph": False,
+        "executors": executors,
+    }
+
+
+def test_sync_and_cpu_nodes_run_on_dedicated_executors(write_graph) -> None:
+    """Sync nodes run on the agent's threads, CPU-bound ones in another process."""
+    wait = engine_metrics.executor_wait.labels("cpu")
+
+    async def scenario() -> None:
+        agent = LanggraphAgent()
+        await agent.initialize(_config(write_graph, sync_workers=2, cpu_workers=1))
+        observed = wait.value()[2]
+        state = await agent.agent_instance.ainvoke(
+            {"messages": [("user", "three small words")], "where": []}
+        )
+        parse, count = state["where"]
+        assert parse.startswith("parse:idun-node")
+        assert count != f"count_words:{os.getpid()}"
+        assert state["messages"][-1].content == "3"
+        assert wait.value()[2] == observed + 1
+        assert agent.infos["executors"] == {
+            "sync": {"workers": 2, "active": 0, "queued": 0},
+            "cpu": {"workers": 1, "active": 0, "queued": 0},
+        }
+        await agent.close()
+
+    asyncio.run(scenario())
+
+
+def test_default_config_leaves_nodes_on_the_default_executor(write_graph) -> None:
+    """Without a pool size or a CPU executor, no node is moved."""
+
+    async def scenario() -> None:
+        agent = LanggraphAgent()
+        await agent.initialize(_config(write_graph, cpu_workers=0))
+        state = await agent.agent_instance.ainvoke(
+            {"messages": [("user", "hi")], "where": []}
+        )
+        assert not state["where"][0].startswith("parse:idun-node")
+        assert state["where"][1] == f"count_words:{os.getpid()}"
+        assert "executors" not in agent.infos
+        await agent.close()
+
+    asyncio.run(scenario())
+
+
+def test_executor_queue_is_reported(write_graph) -> None:
+    """Calls beyond the pool size are counted as queued while they wait."""
+    release = threading.Event()
+    queued = engine_metrics.executor_queued.labels("sync")
+
+    async def scenario() -> None:
+        executor = NodeExecutor("sync", 1)
+        before = queued.value()
+        calls = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert executor.describe() == {"workers": 1, "active": 1, "queued": 2}
+        assert queued.value() == before + 2
+        release.set()
+        assert await asyncio.gather(*calls) == [True, True, True]
+        assert queued.value() == before
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_invalid_cpu_nodes_are_rejected(write_graph) -> None:
+    """Unknown node names and closures cannot be routed to worker processes."""
+
+    async def scenario() -> None:
+        with pytest.raises(ValueError, match="not nodes of the graph"):
+            await LanggraphAgent().initialize(_config(write_graph, cpu_nodes=["nope"]))
+        with pytest.raises(ValueError, match="module-level function"):
+            await LanggraphAgent().initialize(
+                _config(write_graph, "bad_graph", cpu_nodes=["inner"])
+            )
+
+    asyncio.run(scenario())
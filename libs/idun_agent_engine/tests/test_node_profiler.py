@@ -0,0 +1,108 @@
+"""Tests for per-node latency profiling."""
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.metrics import (
+    MetricsRegistry,
+    QuantileSketch,
+    merge_snapshots,
+    render_text,
+)
+
+NODES = """
+from langchain_core.tools import tool
+
+
+@tool
+async def lookup(query: str) -> str:
+    \"\"\"Look the query up.\"\"\"
+    await asyncio.sleep(0.02)
+    return query
+
+
+async def research(state):
+    await lookup.ainvoke({"query": "docs"})
+    return {"messages": []}
+
+
+async def chat(state):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="pong")]))
+    return {"messages": [await model.ainvoke(state["messages"])]}
+"""
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy() -> None:
+    """Quantiles are within the configured error and merging halves is lossless."""
+    values = [i / 1000 for i in range(1, 1001)]
+    whole, low, high = QuantileSketch(0.01), QuantileSketch(0.01), QuantileSketch(0.01)
+    for value in values:
+        whole.add(value)
+        (low if value <= 0.5 else high).add(value)
+    low.merge(high)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(whole.quantile(q) - exact) <= 0.01 * exact
+        assert low.quantile(q) == whole.quantile(q)
+    assert QuantileSketch.from_dict(whole.to_dict(), 0.01).quantile(0.9) == (
+        whole.quantile(0.9)
+    )
+
+
+def test_summary_merges_across_workers_and_renders_quantiles() -> None:
+    """Worker snapshots merge sketch counts and render as a Prometheus summary."""
+    snapshots = []
+    for _ in range(2):
+        registry = MetricsRegistry()
+        summary = registry.summary("node_seconds", "Node time.", ("node",))
+        for value in (0.1, 0.2, 0.3):
+            summary.labels("chat").observe(value)
+        snapshots.append(registry.snapshot())
+
+    text = render_text(merge_snapshots(snapshots))
+    lines = dict(line.rsplit(" ", 1) for line in text.splitlines() if line[0] != "#")
+    assert abs(float(lines['node_seconds{node="chat",quantile="0.5"}']) - 0.2) < 0.004
+    assert 'node_seconds_count{node="chat"} 6' in text
+    assert "# TYPE node_seconds summary" in text
+
+
+def test_profile_endpoint_reports_nodes_and_tools(agent_config) -> None:
+    """Invoked and streamed runs are profiled per node and tool, and can be reset."""
+    app = create_app(
+        config_dict={
+            "server": {"admin": {"token": "secret"}},
+            "agent": agent_config(
+                NODES,
+                ("research", "chat"),
+                name="Profiled Agent",
+            ),
+        }
+    )
+    payload = {"session_id": "s1", "query": "hi"}
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).status_code == 200
+        with client.stream("POST", "/agent/stream", json=payload) as resp:
+            assert "RUN_FINISHED" in resp.read().decode()
+
+        report = client.get("/agent/profile").json()
+        nodes = {(n["kind"], n["node"]): n for n in report["nodes"]}
+        assert set(nodes) == {
+            ("node", "research"),
+            ("node", "chat"),
+            ("tool", "lookup"),
+        }
+        assert all(node["count"] == 2 for node in nodes.values())
+        assert nodes["tool", "lookup"]["p50_ms"] >= 20
+        # The tool runs inside the research node, which is therefore slowest
+        assert report["nodes"][0]["node"] == "research"
+
+        metrics = client.get("/metrics").text
+        assert (
+            'idun_node_duration_seconds_count{kind="tool",node="lookup"} 2' in metrics
+        )
+
+        assert client.delete("/admin/profile").status_code == 401
+        headers = {"Authorization": "Bearer secret"}
+        assert client.delete("/admin/profile", headers=headers).status_code == 200
+        assert client.get("/agent/profile?window=total").json()["nodes"] == []
@@ -0,0 +1,111 @@
+"""Tests for the shared observability dispatcher serving several providers."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from pydantic import ValidationError
+
+from idun_agent_engine.bench import StandInCollector
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.observability import ObservabilityConfig
+from idun_agent_engine.observability.dispatch import TraceDispatcher
+from idun_agent_engine.observability.model import ExportConfig
+
+CHAT_NODE = """
+async def chat(state):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="pong")]))
+    return {"messages": [await model.ainvoke(state["messages"])]}
+"""
+
+
+def test_one_callback_fans_spans_out_to_every_provider() -> None:
+    """Each event is recorded once and every provider receives the same spans."""
+    first, second = InMemorySpanExporter(), InMemorySpanExporter()
+    dispatcher = TraceDispatcher(
+        {"first": first, "second": second},
+        ExportConfig(schedule_delay_seconds=0.01),
+    )
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="hello")]))
+    chain = RunnableLambda(lambda text: [("user", text)]) | model
+
+    chain.invoke(
+        "hi",
+        config={"callbacks": [dispatcher.callback], "metadata": {"thread_id": "s1"}},
+    )
+    assert dispatcher.force_flush(5000)
+
+    spans = first.get_finished_spans()
+    assert [s.name for s in spans] == [s.name for s in second.get_finished_spans()]
+    by_kind = {s.attributes["openinference.span.kind"]: s for s in spans}
+    llm, chain_span = by_kind["LLM"], by_kind["CHAIN"]
+    assert llm.attributes["output.value"] == "hello"
+    assert llm.attributes["session.id"] == "s1"
+    root = next(s for s in spans if s.parent is None)
+    assert {s.context.trace_id for s in spans} == {root.context.trace_id}
+    assert chain_span.end_time >= chain_span.start_time
+    assert dispatcher.stats()["providers"]["first"]["exported"] == len(spans)
+    dispatcher.shutdown()
+
+
+def test_provider_and_providers_are_exclusive() -> None:
+    """A config names either one provider or a list of them."""
+    with pytest.raises(ValidationError):
+        ObservabilityConfig(
+            provider="langfuse", providers=[{"provider": "phoenix"}], enabled=True
+        )
+
+
+def test_agent_exports_to_langfuse_and_phoenix(agent_config) -> None:
+    """With a providers list, both backends receive the agent's spans."""
+    with StandInCollector() as collector:
+        app = create_app(
+            config_dict={
+                "agent": agent_config(
+                    CHAT_NODE,
+                    ("chat",),
+                    name="Dispatched Agent",
+                    observability={
+                        "enabled": True,
+                        "export": {"schedule_delay_seconds": 0.05},
+                        "providers": [
+                            {
+                                "provider": "langfuse",
+                                "options": {
+                                    "host": collector.url,
+                                    "public_key": "pk",
+                                    "secret_key": "sk",
+                                },
+                            },
+                            {
+                                "provider": "phoenix",
+                                "options": {"collector_endpoint": collector.url},
+                            },
+                        ],
+                    },
+                ),
+            }
+        )
+        with TestClient(app) as client:
+            agent = app.state.agent
+            deadline = time.monotonic() + 10
+            while agent.infos["observability"]["status"] != "ready":
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert agent.infos["observability"]["providers"] == ["langfuse", "phoenix"]
+
+            resp = client.post(
+                "/agent/invoke", json={"session_id": "s1", "query": "hi"}
+            )
+            assert resp.json()["response"] == "pong"
+            # Closing the agent (on shutdown) flushes the dispatcher
+
+        paths = collector.requests_by_path()
+    assert paths.get("/api/public/otel/v1/traces", 0) >= 1
+    assert paths.get("/v1/traces", 0) >= 1
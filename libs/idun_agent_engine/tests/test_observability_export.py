@@ -0,0 +1,113 @@
+"""Tests for background observability setup and the bounded span export path."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import TracerProvider
+
+from idun_agent_engine.agent.langgraph.langgraph import LanggraphAgent
+from idun_agent_engine.observability.export import BoundedBatchSpanProcessor
+from idun_agent_engine.observability.model import ExportConfig
+
+REPLY_NODE = """
+def reply(state):
+    return {"messages": [("ai", "pong")]}
+"""
+
+
+class _SlowCollector(BaseHTTPRequestHandler):
+    """Stand-in OTLP collector that stalls on every export request."""
+
+    release = threading.Event()
+    requests = 0
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        """Consume the payload, wait until released, then accept it."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).requests += 1
+        self.release.wait(10)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        """Keep test output quiet."""
+
+
+def test_slow_collector_never_delays_span_end() -> None:
+    """Ending spans stays cheap while the collector stalls; overflow drops oldest."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowCollector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    exporter = OTLPSpanExporter(
+        endpoint=f"http://127.0.0.1:{server.server_port}/v1/traces", timeout=10
+    )
+    processor = BoundedBatchSpanProcessor(
+        exporter,
+        ExportConfig(max_queue_size=8, max_batch_size=4, schedule_delay_seconds=0.01),
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer("test")
+
+    try:
+        start = time.perf_counter()
+        for i in range(50):
+            with tracer.start_as_current_span(f"span-{i}"):
+                pass
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.5
+        assert processor.dropped_spans > 0
+        assert processor.stats()["queued"] <= 8
+
+        _SlowCollector.release.set()
+        assert processor.force_flush(10_000)
+        stats = processor.stats()
+        assert stats["exported"] + stats["dropped"] == 50
+        assert _SlowCollector.requests >= 1
+    finally:
+        _SlowCollector.release.set()
+        provider.shutdown()
+        server.shutdown()
+
+
+def test_observability_setup_does_not_block_initialize(
+    write_graph, monkeypatch
+) -> None:
+    """A stalled provider setup times out in the background; the agent serves."""
+    stall = threading.Event()
+
+    def slow_handler(config):
+        stall.wait(5)
+        return None, None
+
+    monkeypatch.setattr(
+        "idun_agent_engine.observability.create_observability_handler", slow_handler
+    )
+
+    async def scenario() -> None:
+        agent = LanggraphAgent()
+        start = time.perf_counter()
+        await agent.initialize(
+            {
+                "name": "Traced Agent",
+                "graph_definition": write_graph(REPLY_NODE),
+                "observability": {
+                    "provider": "langfuse",
+                    "enabled": True,
+                    "init_timeout_seconds": 0.2,
+                },
+            }
+        )
+        assert agent.infos["observability"]["status"] == "initializing"
+        assert await agent.invoke({"query": "hi", "session_id": "s1"}) == "pong"
+        assert time.perf_counter() - start < 1.0
+
+        await asyncio.sleep(0.4)
+        assert agent.infos["observability"]["status"] == "timed_out"
+        stall.set()
+        await agent.close()
+
+    asyncio.run(scenario())
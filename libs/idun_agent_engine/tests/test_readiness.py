@@ -0,0 +1,61 @@
+"""Tests for readiness gating, warmup and once-only agent initialization."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.core.config_builder import ConfigBuilder
+from idun_agent_engine.server.dependencies import ensure_agent
+
+
+def test_ready_only_after_lifespan(write_graph) -> None:
+    """/ready is red before the lifespan ran and green after warmup."""
+    config = (
+        ConfigBuilder()
+        .with_langgraph_agent(name="Ready Agent", graph_definition=write_graph())
+        .with_warmup(["ping"])
+        .build()
+    )
+    app = create_app(engine_config=config)
+
+    resp = TestClient(app).get("/ready")
+    assert resp.status_code == 503
+
+    with TestClient(app) as client:
+        resp = client.get("/ready")
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "ready"
+        # Health stays independent from readiness
+        assert client.get("/health").status_code == 200
+
+
+def test_ensure_agent_initializes_once(write_graph) -> None:
+    """Concurrent fallback initialization yields a single shared agent."""
+    config = (
+        ConfigBuilder()
+        .with_langgraph_agent(name="Once Agent", graph_definition=write_graph())
+        .build()
+    )
+    app = create_app(engine_config=config)
+
+    async def _concurrent_init():
+        return await asyncio.gather(*(ensure_agent(app) for _ in range(5)))
+
+    agents = asyncio.run(_concurrent_init())
+    assert all(agent is agents[0] for agent in agents)
+    assert app.state.agent is agents[0]
+
+
+def test_with_api_port_keeps_warmup_settings() -> None:
+    """Changing the port does not drop other server settings."""
+    config = (
+        ConfigBuilder()
+        .with_warmup(["hello"], timeout_seconds=5)
+        .with_api_port(9001)
+        .with_langgraph_agent(name="A", graph_definition="agent.py:graph")
+        .build()
+    )
+    assert config.server.api.port == 9001
+    assert config.server.warmup.enabled is True
+    assert config.server.warmup.queries == ["hello"]
@@ -0,0 +1,121 @@
+"""Tests for the exact-match response cache."""
+
+import asyncio
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.cache import (
+    ResponseCacheConfig,
+    create_response_cache,
+    make_cache_key,
+)
+from idun_agent_engine.core.app_factory import create_app
+
+REPLY_NODE = """
+def reply(state):
+    return {"messages": [("ai", "pong")]}
+"""
+
+
+def test_keys_normalize_whitespace_and_scope() -> None:
+    """Whitespace never splits entries; fingerprint and session scope do."""
+    key = make_cache_key("fp", "  hello   world ")
+    assert key == make_cache_key("fp", "hello world")
+    assert key != make_cache_key("fp2", "hello world")
+    assert key != make_cache_key("fp", "hello world", session_id="s1")
+    assert key != make_cache_key("fp", "Hello World")
+    assert make_cache_key("fp", "Hello", case_sensitive=False) == make_cache_key(
+        "fp", "hello", case_sensitive=False
+    )
+
+
+def test_memory_backend_evicts_lru_by_bytes() -> None:
+    """The least recently used entry goes first once max_bytes is exceeded."""
+    cache = create_response_cache(
+        ResponseCacheConfig(enabled=True, backend="memory", max_bytes=10)
+    )
+    assert cache is not None
+
+    async def scenario() -> None:
+        await cache.set("a", "1234")
+        await cache.set("b", "1234")
+        assert await cache.get("a") == "1234"  # "b" is now least recently used
+        await cache.set("c", "1234")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "1234"
+        assert (await cache.stats())["evictions"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_backend_expires_entries(tmp_path: Path, monkeypatch) -> None:
+    """Entries are shared between instances and dropped once their TTL passed."""
+    config = ResponseCacheConfig(
+        enabled=True, backend="sqlite", sqlite_path=str(tmp_path / "cache.db")
+    )
+
+    async def scenario() -> None:
+        writer = create_response_cache(config)
+        reader = create_response_cache(config)
+        assert writer is not None and reader is not None
+        await writer.set("k", "value")
+        assert await reader.get("k") == "value"
+
+        monkeypatch.setattr("time.time", lambda: 10**12)
+        assert await reader.get("k") is None
+        assert (await reader.stats())["entries"] == 0
+        await writer.close()
+        await reader.close()
+
+    asyncio.run(scenario())
+
+
+def test_invoke_hits_cache_and_honours_cache_control(agent_config) -> None:
+    """Repeats are served from the cache; no-store bypasses it."""
+    app = create_app(
+        config_dict={
+            "server": {
+                "admin": {"token": "secret"},
+                "response_cache": {"enabled": True},
+            },
+            "agent": agent_config(
+                REPLY_NODE,
+                name="Cached Agent",
+            ),
+        }
+    )
+    payload = {"session_id": "s1", "query": "ping"}
+
+    with TestClient(app) as client:
+        first = client.post("/agent/invoke", json=payload)
+        assert first.headers["X-Idun-Cache"] == "MISS"
+
+        calls = 0
+        original_invoke = app.state.agent.invoke
+
+        async def counting_invoke(message):
+            nonlocal calls
+            calls += 1
+            return await original_invoke(message)
+
+        app.state.agent.invoke = counting_invoke
+        second = client.post("/agent/invoke", json={**payload, "session_id": "s2"})
+        assert second.headers["X-Idun-Cache"] == "HIT"
+        assert second.json() == {
+            "session_id": "s2",
+            "response": first.json()["response"],
+        }
+        assert calls == 0
+
+        bypass = client.post(
+            "/agent/invoke", json=payload, headers={"Cache-Control": "no-store"}
+        )
+        assert bypass.headers["X-Idun-Cache"] == "BYPASS"
+        assert calls == 1
+
+        headers = {"Authorization": "Bearer secret"}
+        stats = client.get("/admin/cache", headers=headers).json()
+        assert stats["hits"] == 1 and stats["entries"] == 1
+        assert client.delete("/admin/cache", headers=headers).status_code == 200
+        assert client.get("/admin/cache", headers=headers).json()["entries"] == 0
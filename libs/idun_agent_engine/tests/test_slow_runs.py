@@ -0,0 +1,92 @@
+"""Tests for slow-run timeline capture."""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.debug import SlowRunRecorder, SlowRunsConfig
+
+WORK_NODE = """
+async def work(state):
+    if "slow" in str(state["messages"][-1]):
+        await asyncio.sleep(0.2)
+    return {"messages": [("ai", "done")]}
+"""
+
+
+def test_recorder_keeps_only_slow_runs_in_a_bounded_ring() -> None:
+    """Fast runs are discarded, slow ones kept up to capacity, newest first."""
+    recorder = SlowRunRecorder()
+    recorder.configure(SlowRunsConfig(threshold_seconds=0, capacity=2, max_events=3))
+    for run in range(3):
+        with recorder.track(f"run_{run}", "s1", "stream") as timeline:
+            for _ in range(5):
+                timeline.event("on_chain_stream", "work", "work")
+
+    runs = recorder.runs()
+    assert [r["run_id"] for r in runs] == ["run_2", "run_1"]
+    assert len(runs[0]["events"]) == 3 and runs[0]["dropped_events"] == 2
+    assert runs[0]["events"][0]["node"] == "work"
+
+    recorder.configure(SlowRunsConfig(threshold_seconds=60))
+    with recorder.track("run_fast", "s1", "invoke"):
+        pass
+    assert recorder.runs() == []
+
+
+def test_slow_runs_endpoint_serves_timelines(
+    tmp_path: Path, monkeypatch, agent_config
+) -> None:
+    """Slow invoked and streamed runs are kept with node events and checkpoint I/O."""
+    monkeypatch.chdir(tmp_path)
+    app = create_app(
+        config_dict={
+            "server": {
+                "admin": {"token": "secret"},
+                "debug": {"slow_runs": {"threshold_seconds": 0.15}},
+            },
+            "agent": agent_config(
+                WORK_NODE,
+                ("work",),
+                name="Timed Agent",
+                checkpointer={
+                    "type": "sqlite",
+                    "db_url": "sqlite:///checkpoint.db",
+                },
+            ),
+        }
+    )
+    headers = {"Authorization": "Bearer secret"}
+    with TestClient(app) as client:
+        for query in ("fast", "slow"):
+            payload = {"session_id": "s1", "query": query}
+            assert client.post("/agent/invoke", json=payload).status_code == 200
+        with client.stream(
+            "POST", "/agent/stream", json={"session_id": "s2", "query": "slow"}
+        ) as resp:
+            assert "RUN_FINISHED" in resp.read().decode()
+
+        assert client.get("/debug/slow-runs").status_code == 401
+        runs = client.get("/debug/slow-runs", headers=headers).json()["runs"]
+        assert [(r["mode"], r["session_id"]) for r in runs] == [
+            ("stream", "s2"),
+            ("invoke", "s1"),
+        ]
+        stream, invoke = runs
+        assert stream["status"] == "success" and stream["duration_ms"] >= 200
+        assert stream["run_id"].startswith("run_")
+        assert any(
+            e["event"] == "on_chain_start" and e.get("node") == "work"
+            for e in stream["events"]
+        )
+        checkpoints = [e for e in stream["events"] if e["event"] == "checkpoint"]
+        assert {e["name"] for e in checkpoints} >= {"load", "save"}
+        assert all("duration_ms" in e for e in checkpoints)
+        assert any(e.get("node") == "work" for e in invoke["events"])
+
+        metrics = client.get("/metrics").text
+        assert 'idun_slow_runs_total{mode="invoke"} 1' in metrics
+
+        cleared = client.delete("/debug/slow-runs", headers=headers).json()
+        assert cleared == {"cleared": 2}
@@ -0,0 +1,117 @@
+"""Tests for head-based trace sampling of agent runs."""
+
+import time
+
+from fastapi.testclient import TestClient
+from langchain_core.callbacks import BaseCallbackHandler
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from idun_agent_engine.core.app_factory import create_app
+from idun_agent_engine.observability.base import ObservabilityHandlerBase
+from idun_agent_engine.observability.export import RunDecisionSampler
+from idun_agent_engine.observability.model import SamplingConfig
+from idun_agent_engine.observability.sampling import TraceSampler, sampling_scope
+
+REPLY_NODE = """
+def reply(state):
+    return {"messages": [("ai", "pong")]}
+"""
+
+
+class _Recorder(BaseCallbackHandler):
+    """Callback counting the graph runs it is attached to."""
+
+    def __init__(self) -> None:
+        """Start with no recorded runs."""
+        self.runs = 0
+
+    def on_chain_start(self, serialized, inputs, **kwargs) -> None:
+        """Count top-level chain starts only."""
+        if kwargs.get("parent_run_id") is None:
+            self.runs += 1
+
+
+class _RecordingHandler(ObservabilityHandlerBase):
+    """Observability handler returning a shared recorder callback."""
+
+    provider = "recording"
+    recorder = _Recorder()
+
+    def get_callbacks(self):
+        """Return the recorder."""
+        return [self.recorder]
+
+
+def test_sticky_sessions_and_forced_decisions() -> None:
+    """A session keeps its decision; forced decisions override the ratio."""
+    sampler = TraceSampler(SamplingConfig(ratio=0.5, sticky_sessions=True))
+    decisions = {f"s{i}": sampler.decide(f"s{i}") for i in range(200)}
+    assert 0 < sum(decisions.values()) < 200
+    assert all(sampler.decide(sid) == sampled for sid, sampled in decisions.items())
+
+    never = TraceSampler(SamplingConfig(ratio=0.0))
+    assert never.decide("s1") is False
+    assert never.decide("s1", forced=True) is True
+    assert never.describe()["decisions"] == {"sampled": 1, "unsampled": 1}
+
+
+def test_unsampled_runs_record_no_spans() -> None:
+    """The OpenTelemetry sampler drops spans created inside unsampled runs."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=RunDecisionSampler())
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+
+    with (
+        sampling_scope(False),
+        tracer.start_as_current_span("unsampled"),
+        tracer.start_as_current_span("child"),
+    ):
+        pass
+    with sampling_scope(True), tracer.start_as_current_span("sampled"):
+        pass
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["sampled"]
+
+
+def test_routes_skip_callbacks_unless_sampled(agent_config, monkeypatch) -> None:
+    """With ratio 0 only runs forced by the X-Idun-Trace header get callbacks."""
+    monkeypatch.setattr(
+        "idun_agent_engine.observability.create_observability_handler",
+        lambda config: (_RecordingHandler(config.get("options")), {"enabled": True}),
+    )
+    app = create_app(
+        config_dict={
+            "agent": agent_config(
+                REPLY_NODE,
+                name="Sampled Agent",
+                observability={
+                    "provider": "langfuse",
+                    "enabled": True,
+                    "sampling": {"ratio": 0.0},
+                },
+            ),
+        }
+    )
+    payload = {"session_id": "s1", "query": "hi"}
+    recorder = _RecordingHandler.recorder
+
+    with TestClient(app) as client:
+        agent = app.state.agent
+        deadline = time.monotonic() + 5
+        while agent.infos["observability"]["status"] != "ready":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        client.post("/agent/invoke", json=payload)
+        assert recorder.runs == 0
+
+        client.post("/agent/invoke", json=payload, headers={"X-Idun-Trace": "1"})
+        assert recorder.runs == 1
+
+        assert agent.infos["sampling"]["decisions"] == {"sampled": 1, "unsampled": 1}
+        assert "idun_trace_sampling_decisions_total" in client.get("/metrics").text
@@ -0,0 +1,96 @@
+"""Tests for token usage accounting and session budgets."""
+
+import json
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from idun_agent_engine.core.app_factory import create_app
+
+CHAT_NODE = """
+from idun_agent_engine.bench.fake_model import FakeStreamingChatModel
+
+
+model = FakeStreamingChatModel(reply="one two three")
+
+
+async def chat(state):
+    return {"messages": [await model.ainvoke(state["messages"][-1:])]}
+"""
+
+
+def _app(agent_config, usage: dict[str, Any]) -> Any:
+    """Serve the fake-model graph with the given usage settings."""
+    return create_app(
+        config_dict={
+            "server": {"usage": usage},
+            "agent": agent_config(
+                CHAT_NODE,
+                ("chat",),
+                name="Usage Agent",
+            ),
+        }
+    )
+
+
+def _stream_events(client: TestClient, session_id: str) -> list[dict[str, Any]]:
+    """Stream one run and return its decoded ag-ui events."""
+    payload = {"session_id": session_id, "query": "hi"}
+    with client.stream("POST", "/agent/stream", json=payload) as resp:
+        body = resp.read().decode()
+    return [
+        json.loads(line[len("data: ") :])
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_usage_is_reported_per_run_and_counted_per_agent(agent_config) -> None:
+    """Invoke metadata and RunFinished carry usage; /metrics sums it per agent."""
+    pricing = {"idun-bench-fake": {"input_per_million": 1e6, "output_per_million": 2e6}}
+    app = _app(agent_config, {"pricing": pricing})
+    expected = {
+        "input_tokens": 1,
+        "output_tokens": 3,
+        "total_tokens": 4,
+        "llm_calls": 1,
+        "cost_usd": 7.0,
+    }
+    with TestClient(app) as client:
+        resp = client.post("/agent/invoke", json={"session_id": "a", "query": "hi"})
+        assert resp.json()["metadata"] == {"usage": expected}
+
+        finished = _stream_events(client, "b")[-1]
+        assert finished["type"] == "RUN_FINISHED"
+        assert finished["result"] == {"usage": expected}
+
+        metrics = client.get("/metrics").text
+    assert 'idun_agent_tokens_total{agent="Usage Agent",type="output"} 6' in metrics
+    assert 'idun_session_tokens{session="b"} 4' in metrics
+
+
+def test_session_budget_aborts_and_rejects_runs(agent_config) -> None:
+    """A run crossing the budget is aborted and later runs are refused."""
+    app = _app(agent_config, {"session_budget_tokens": 6})
+    payload = {"session_id": "s", "query": "hi"}
+    with TestClient(app) as client:
+        assert client.post("/agent/invoke", json=payload).status_code == 200
+        # 4 tokens used: this run starts, then goes over budget at 8
+        aborted = client.post("/agent/invoke", json=payload)
+        assert aborted.status_code == 429
+        assert "budget of 6" in aborted.json()["detail"]
+        assert client.post("/agent/invoke", json=payload).status_code == 429
+
+        events = _stream_events(client, "s")
+        assert [e["type"] for e in events] == ["RUN_ERROR"]
+        assert events[0]["code"] == "token_budget_exceeded"
+
+        # Streams are cut at the model response that crosses the budget
+        assert _stream_events(client, "u")[-1]["type"] == "RUN_FINISHED"
+        types = [e["type"] for e in _stream_events(client, "u")]
+        assert types[0] == "RUN_STARTED"
+        assert types[-1] == "RUN_ERROR"
+
+        # Other sessions keep their own budget
+        other = client.post("/agent/invoke", json={"session_id": "t", "query": "hi"})
+        assert other.status_code == 200